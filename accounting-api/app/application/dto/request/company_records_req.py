@@ -0,0 +1,25 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class CompanyRecordsReq(BaseModel):
+    company_id: str = Field(description="회사 ID")
+    limit: int = Field(100, ge=1, le=1000, description="페이지 크기")
+    cursor: Optional[str] = Field(None, description="이전 페이지의 next_cursor")
+    date_from: Optional[datetime] = Field(None, description="거래일시 시작 (포함)")
+    date_to: Optional[datetime] = Field(None, description="거래일시 끝 (미포함)")
+
+    def decode_cursor(self) -> Optional[Tuple[datetime, int]]:
+        if not self.cursor:
+            return None
+
+        transaction_date, transaction_id = base64.urlsafe_b64decode(self.cursor.encode()).decode().split('|')
+
+        return datetime.fromisoformat(transaction_date), int(transaction_id)
+
+    @staticmethod
+    def encode_cursor(transaction_date: datetime, transaction_id: int) -> str:
+        return base64.urlsafe_b64encode(f"{transaction_date.isoformat()}|{transaction_id}".encode()).decode()
@@ -0,0 +1,10 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class CompanySummaryReq(BaseModel):
+    company_id: str = Field(description="회사 ID")
+    month_from: Optional[date] = Field(None, description="시작 월 (포함, 일자는 무시)")
+    month_to: Optional[date] = Field(None, description="끝 월 (포함, 일자는 무시)")
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from pydantic import Field
+
+from app.application.dto.request.company_records_req import CompanyRecordsReq
+
+
+class TransactionSearchReq(CompanyRecordsReq):
+    query: str = Field(min_length=1, max_length=200, description="적요 검색어 (부분 일치, 대소문자 무시)")
+    category_id: Optional[str] = Field(None, description="계정과목 ID")
+    amount_min: Optional[int] = Field(None, ge=0, description="최소 금액 (포함)")
+    amount_max: Optional[int] = Field(None, ge=0, description="최대 금액 (포함)")
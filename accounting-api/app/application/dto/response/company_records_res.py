@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -7,4 +7,4 @@ from app.domain.entity.company_record import CompanyRecord
 
 class CompanyRecordsRes(BaseModel):
     records: List[CompanyRecord] = Field(default_factory=list)
-
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
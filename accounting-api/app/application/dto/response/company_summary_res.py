@@ -0,0 +1,21 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.domain.entity.category_summary import CategorySummary
+
+
+class CompanySummaryRes(BaseModel):
+    summaries: List[CategorySummary] = Field(default_factory=list)
+    transaction_count: int = Field(0, description="조회 구간 전체 거래 건수")
+    amount_in: int = Field(0, description="조회 구간 전체 입금액 합계")
+    amount_out: int = Field(0, description="조회 구간 전체 출금액 합계")
+
+    @staticmethod
+    def of(summaries: List[CategorySummary]) -> 'CompanySummaryRes':
+        return CompanySummaryRes(
+            summaries=summaries,
+            transaction_count=sum(summary.transaction_count for summary in summaries),
+            amount_in=sum(summary.amount_in for summary in summaries),
+            amount_out=sum(summary.amount_out for summary in summaries)
+        )
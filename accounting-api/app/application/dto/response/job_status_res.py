@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.infrastructure.model.model import ProcessingJob
+
+
+class JobStatusRes(BaseModel):
+    job_id: UUID = Field(description="작업 ID")
+    status: str = Field(description="작업 상태 (pending, processing, completed, failed)")
+    total_rows: int = Field(0, description="전체 거래 내역 수")
+    processed_rows: int = Field(0, description="처리된 거래 내역 수")
+    rows_per_sec: Optional[float] = Field(None, description="초당 처리 행 수 (처리 중일 때)")
+    eta_seconds: Optional[float] = Field(None, description="예상 남은 시간(초) (처리 중일 때)")
+    error_message: Optional[str] = Field(None, description="실패 사유")
+    created_at: Optional[datetime] = Field(None, description="생성일시")
+    started_at: Optional[datetime] = Field(None, description="시작일시")
+    completed_at: Optional[datetime] = Field(None, description="완료일시")
+
+    @classmethod
+    def of(cls, job: ProcessingJob, snapshot: Optional[dict]) -> 'JobStatusRes':
+        res = cls(
+            job_id=job.job_id,
+            status=job.status,
+            total_rows=job.total_rows or 0,
+            processed_rows=job.processed_rows or 0,
+            error_message=job.error_message,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            completed_at=job.completed_at
+        )
+
+        # DB 는 일정 간격으로만 갱신되므로 처리 중에는 프로세서가 발행한 실시간 스냅샷을 우선
+        if snapshot and job.status == 'processing':
+            res.processed_rows = max(res.processed_rows, int(snapshot.get('processed_rows') or 0))
+            res.rows_per_sec = float(snapshot['rows_per_sec']) if snapshot.get('rows_per_sec') else None
+            res.eta_seconds = float(snapshot['eta_seconds']) if snapshot.get('eta_seconds') else None
+
+        return res
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.infrastructure.model.model import ProcessingJob
+
+
+class ReclassifyJobRes(BaseModel):
+    job_id: UUID = Field(description="재분류 작업 ID")
+    status: str = Field(description="작업 상태")
+    scope: str = Field(description="재분류 범위 (job: 요청한 업로드 작업만, rules: 같은 규칙으로 분류된 모든 업로드 작업)")
+    source_job_id: UUID = Field(description="요청한 업로드 작업 ID")
+    base_rules_hash: str = Field(description="대상 거래 내역을 분류했던 이전 규칙")
+    rules_hash: str = Field(description="새 규칙")
+    created_at: Optional[datetime] = Field(None, description="생성일시")
+
+    @classmethod
+    def of(cls, job: ProcessingJob, scope: str, source_job_id: UUID) -> 'ReclassifyJobRes':
+        return cls(
+            job_id=job.job_id,
+            status=job.status,
+            scope=scope,
+            source_job_id=source_job_id,
+            base_rules_hash=job.base_rules_hash,
+            rules_hash=job.rules_hash,
+            created_at=job.created_at
+        )
@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.domain.entity.transaction_record import TransactionRecord
+
+
+class TransactionSearchRes(BaseModel):
+    records: List[TransactionRecord] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
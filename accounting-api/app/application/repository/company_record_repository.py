@@ -1,11 +1,16 @@
 from abc import abstractmethod
-from typing import List
+from typing import List, AsyncIterator
 
+from app.application.dto.request.company_records_req import CompanyRecordsReq
 from app.application.dto.response.company_records_res import CompanyRecord
 
 
 class CompanyRecordRepository:
 
     @abstractmethod
-    async def find_company_records(self, company_id: str) -> List[CompanyRecord]:
+    async def find_company_records(self, req: CompanyRecordsReq) -> List[CompanyRecord]:
+        pass
+
+    @abstractmethod
+    def stream_company_records(self, req: CompanyRecordsReq) -> AsyncIterator[CompanyRecord]:
         pass
@@ -0,0 +1,12 @@
+from abc import ABCMeta, abstractmethod
+from typing import AsyncIterator, Optional
+
+
+class JobProgressRepository(metaclass=ABCMeta):
+    @abstractmethod
+    async def find_snapshot(self, job_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def subscribe(self, job_id: str) -> AsyncIterator[Optional[dict]]:
+        pass
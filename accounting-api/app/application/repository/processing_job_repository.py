@@ -1,4 +1,6 @@
 from abc import ABCMeta, abstractmethod
+from typing import Optional
+from uuid import UUID
 
 from app.infrastructure.model.model import ProcessingJob
 
@@ -7,3 +9,11 @@ class ProcessingJobRepository(metaclass=ABCMeta):
     @abstractmethod
     async def save(self, processing_job: ProcessingJob):
         pass
+
+    @abstractmethod
+    async def find_by_content(self, content_hash: str, rules_hash: str) -> Optional[ProcessingJob]:
+        pass
+
+    @abstractmethod
+    async def find_by_id(self, job_id: UUID) -> Optional[ProcessingJob]:
+        pass
@@ -0,0 +1,7 @@
+from abc import ABCMeta, abstractmethod
+
+
+class RulesSetRepository(metaclass=ABCMeta):
+    @abstractmethod
+    async def save_if_absent(self, rules_hash: str, rules_data: dict):
+        pass
@@ -0,0 +1,11 @@
+from abc import ABCMeta, abstractmethod
+from typing import List
+
+from app.application.dto.request.transaction_search_req import TransactionSearchReq
+from app.domain.entity.transaction_record import TransactionRecord
+
+
+class TransactionSearchRepository(metaclass=ABCMeta):
+    @abstractmethod
+    async def search(self, req: TransactionSearchReq) -> List[TransactionRecord]:
+        pass
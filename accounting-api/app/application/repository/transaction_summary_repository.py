@@ -0,0 +1,11 @@
+from abc import ABCMeta, abstractmethod
+from typing import List
+
+from app.application.dto.request.company_summary_req import CompanySummaryReq
+from app.domain.entity.category_summary import CategorySummary
+
+
+class TransactionSummaryRepository(metaclass=ABCMeta):
+    @abstractmethod
+    async def find_company_summary(self, req: CompanySummaryReq) -> List[CategorySummary]:
+        pass
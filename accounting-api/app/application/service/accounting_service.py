@@ -1,86 +1,266 @@
+import csv
+import hashlib
+import io
 import json
 import os
 import re
 import uuid
+import zlib
 from datetime import datetime
+from typing import AsyncIterator, Iterable
+from uuid import UUID
 
-import aiofiles
-from fastapi import UploadFile, Depends
+import aiofiles.os
+import zstandard
+from fastapi import UploadFile, Depends, HTTPException
 
+from app.application.dto.request.company_records_req import CompanyRecordsReq
+from app.application.dto.request.company_summary_req import CompanySummaryReq
+from app.application.dto.request.transaction_search_req import TransactionSearchReq
 from app.application.dto.response.company_records_res import CompanyRecordsRes
+from app.application.dto.response.company_summary_res import CompanySummaryRes
+from app.application.dto.response.job_status_res import JobStatusRes
+from app.application.dto.response.reclassify_job_res import ReclassifyJobRes
+from app.application.dto.response.transaction_search_res import TransactionSearchRes
 from app.application.repository.company_record_repository import CompanyRecordRepository
+from app.application.repository.job_progress_repository import JobProgressRepository
 from app.application.repository.processing_job_repository import ProcessingJobRepository
+from app.application.repository.rules_set_repository import RulesSetRepository
+from app.application.repository.transaction_search_repository import TransactionSearchRepository
+from app.application.repository.transaction_summary_repository import TransactionSummaryRepository
+from app.domain.entity.company_record import CompanyRecord
 from app.infrastructure.database.redis_db import get_redis
 from app.infrastructure.model.model import ProcessingJob
-from app.infrastructure.repository.postgres_company_record_repository import PostgresCompanyRecordRepository
+from app.infrastructure.repository.cached_company_record_repository import CachedCompanyRecordRepository
 from app.infrastructure.repository.postgres_processing_job_repository import PostgresProcessingJobRepository
+from app.infrastructure.repository.postgres_rules_set_repository import PostgresRulesSetRepository
+from app.infrastructure.repository.postgres_transaction_search_repository import PostgresTransactionSearchRepository
+from app.infrastructure.repository.postgres_transaction_summary_repository import \
+    PostgresTransactionSummaryRepository
+from app.infrastructure.repository.redis_job_progress_repository import RedisJobProgressRepository
+from app.infrastructure.storage.transaction_upload_writer import TransactionUpload, TransactionUploadWriter
+
+
+def hash_rules(rules_data: dict) -> str:
+    # accounting-processor 의 hash_rules 와 같은 정규화(키 정렬, 공백 제거) 후 sha256
+    # 두 구현이 같은 해시를 내는지는 양쪽 테스트가 같은 규칙/해시(test_rules_hash)로 고정한다
+    canonical = json.dumps(rules_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
 
 class AccountingService:
     UPLOAD_PATH = '/app/shared/uploads'
     CHUNK_SIZE = 1024 * 1024
     TASK_TYPE = 'process_transactions'
+    RECLASSIFY_TASK_TYPE = 'reclassify_transactions'
+    JOB_TYPE_RECLASSIFY = 'reclassify'
+    RECLASSIFY_SCOPE_JOB = 'job'
+    RECLASSIFY_SCOPE_RULES = 'rules'
     REDIS_QUEUE_NAME = 'accounting_tasks'
+    STREAM_FORMAT_NDJSON = 'ndjson'
+    STREAM_FORMAT_CSV = 'csv'
+    JOB_TERMINAL_STATUSES = ('completed', 'failed')
 
     def __init__(
             self,
             processing_job_repository: ProcessingJobRepository = Depends(PostgresProcessingJobRepository),
-            company_record_repository: CompanyRecordRepository = Depends(PostgresCompanyRecordRepository),
+            company_record_repository: CompanyRecordRepository = Depends(CachedCompanyRecordRepository),
+            rules_set_repository: RulesSetRepository = Depends(PostgresRulesSetRepository),
+            job_progress_repository: JobProgressRepository = Depends(RedisJobProgressRepository),
+            transaction_summary_repository: TransactionSummaryRepository = Depends(
+                PostgresTransactionSummaryRepository),
+            transaction_search_repository: TransactionSearchRepository = Depends(PostgresTransactionSearchRepository),
             redis=Depends(get_redis)
     ):
         self.__company_record_repository = company_record_repository
+        self.__rules_set_repository = rules_set_repository
+        self.__job_progress_repository = job_progress_repository
+        self.__transaction_summary_repository = transaction_summary_repository
+        self.__transaction_search_repository = transaction_search_repository
         self.__processing_job_repository = processing_job_repository
         self.__redis_client = redis
 
     async def process(self, transactions_file: UploadFile, rules_file: UploadFile) -> ProcessingJob:
-        transactions_path = await self.__process_transactions_file(transactions_file)
-        rules_data = await self.__process_rules_file(rules_file)
+        upload = await self.__process_transactions_file(transactions_file)
+        rules_hash = await self.__process_rules_file(rules_file)
+
+        # 같은 내용의 CSV 를 같은 규칙으로 다시 올리면 기존 작업을 반환
+        duplicate = await self.__processing_job_repository.find_by_content(upload.content_hash, rules_hash)
+        if duplicate:
+            await aiofiles.os.remove(upload.file_path)
+            return duplicate
 
         job = ProcessingJob(
             job_id=uuid.uuid4(),
             status="pending",
-            csv_file_path=transactions_path,
-            rules_data=rules_data,
+            csv_file_path=upload.file_path,
+            content_hash=upload.content_hash,
+            rules_hash=rules_hash,
+            total_rows=upload.total_rows,
             created_at=datetime.now()
         )
         await self.__save_and_publish_job(job)
 
         return job
 
-    async def get_company_records(self, company_id: str) -> CompanyRecordsRes:
-        company_records = await self.__company_record_repository.find_company_records(company_id)
+    async def reclassify(self, job_id: UUID, rules_file: UploadFile,
+                         scope: str = RECLASSIFY_SCOPE_JOB) -> ReclassifyJobRes:
+        """
+        거래 내역을 새 규칙으로 다시 분류하는 작업 생성
+        scope 가 job 이면 job_id 작업만, rules 이면 job_id 작업과 같은 규칙으로 분류된 모든 업로드 작업이 대상
+        """
+        source = await self.__processing_job_repository.find_by_id(job_id)
+        if not source:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if source.status != 'completed' or source.job_type == self.JOB_TYPE_RECLASSIFY or not source.rules_hash:
+            raise HTTPException(status_code=400,
+                                detail="Only completed upload jobs with stored rules can be reclassified")
+
+        rules_hash = await self.__process_rules_file(rules_file)
+        if rules_hash == source.rules_hash:
+            raise HTTPException(status_code=400, detail="Rules are unchanged")
+
+        job = ProcessingJob(
+            job_id=uuid.uuid4(),
+            status="pending",
+            job_type=self.JOB_TYPE_RECLASSIFY,
+            rules_hash=rules_hash,
+            base_rules_hash=source.rules_hash,
+            source_job_id=source.job_id if scope == self.RECLASSIFY_SCOPE_JOB else None,
+            created_at=datetime.now()
+        )
+        await self.__save_and_publish_job(job, self.RECLASSIFY_TASK_TYPE)
+
+        return ReclassifyJobRes.of(job, scope, source.job_id)
+
+    async def get_job(self, job_id: UUID) -> JobStatusRes:
+        job = await self.__processing_job_repository.find_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        snapshot = await self.__job_progress_repository.find_snapshot(str(job_id))
+
+        return JobStatusRes.of(job, snapshot)
+
+    async def stream_job_events(self, job: JobStatusRes) -> AsyncIterator[str]:
+        """
+        작업 진행 이벤트를 SSE 로 전달하고, 작업이 끝나면(completed / failed) 스트림을 닫는다
+        """
+        yield self.__to_sse('status', job.model_dump_json())
+
+        if job.status in self.JOB_TERMINAL_STATUSES:
+            return
+
+        async for event in self.__job_progress_repository.subscribe(str(job.job_id)):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield self.__to_sse('progress', json.dumps(event))
+
+            if event.get('phase') in self.JOB_TERMINAL_STATUSES:
+                return
 
-        return CompanyRecordsRes(records=company_records)
+    async def get_company_records(self, req: CompanyRecordsReq) -> CompanyRecordsRes:
+        self.__validate_cursor(req)
+        company_records = await self.__company_record_repository.find_company_records(req)
 
-    async def __process_transactions_file(self, file: UploadFile) -> str:
+        if len(company_records) <= req.limit:
+            return CompanyRecordsRes(records=company_records)
+
+        company_records = company_records[:req.limit]
+        last = company_records[-1]
+
+        return CompanyRecordsRes(
+            records=company_records,
+            next_cursor=CompanyRecordsReq.encode_cursor(last.transaction_date, last.transaction_id)
+        )
+
+    async def search_transactions(self, req: TransactionSearchReq) -> TransactionSearchRes:
+        self.__validate_cursor(req)
+        records = await self.__transaction_search_repository.search(req)
+
+        if len(records) <= req.limit:
+            return TransactionSearchRes(records=records)
+
+        records = records[:req.limit]
+        last = records[-1]
+
+        return TransactionSearchRes(
+            records=records,
+            next_cursor=TransactionSearchReq.encode_cursor(last.transaction_date, last.transaction_id)
+        )
+
+    async def get_company_summary(self, req: CompanySummaryReq) -> CompanySummaryRes:
+        summaries = await self.__transaction_summary_repository.find_company_summary(req)
+
+        return CompanySummaryRes.of(summaries)
+
+    async def get_records_cache_stats(self) -> dict:
+        return await CachedCompanyRecordRepository.stats(self.__redis_client)
+
+    async def stream_company_records(self, req: CompanyRecordsReq, fmt: str) -> AsyncIterator[str]:
+        if fmt == self.STREAM_FORMAT_CSV:
+            yield self.__to_csv_line(CompanyRecord.model_fields.keys())
+
+        async for record in self.__company_record_repository.stream_company_records(req):
+            if fmt == self.STREAM_FORMAT_CSV:
+                yield self.__to_csv_line(record.model_dump(mode='json').values())
+            else:
+                yield record.model_dump_json() + "\n"
+
+    @staticmethod
+    def __validate_cursor(req: CompanyRecordsReq):
+        try:
+            req.decode_cursor()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @staticmethod
+    def __to_sse(event: str, data: str) -> str:
+        return f"event: {event}\ndata: {data}\n\n"
+
+    @staticmethod
+    def __to_csv_line(values: Iterable) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+
+        return buffer.getvalue()
+
+    async def __process_transactions_file(self, file: UploadFile) -> TransactionUpload:
         file_id = str(uuid.uuid4())
-        filename = re.match(r'^(.+)\.[^.]+$', file.filename).group(1) or file.filename  # without extension
+        filename = re.sub(r'(\.csv)?(\.gz|\.zst)?$', '', file.filename or '', flags=re.IGNORECASE) or 'transactions'
         new_filename = f"{filename}-{file_id}.csv"
         file_path = os.path.join(self.UPLOAD_PATH, new_filename)
 
         await file.seek(0)
-        await self.__save_file_stream(file, file_path)
-
-        return file_path
+        try:
+            return await TransactionUploadWriter(file_path).write(file)
+        except (ValueError, zlib.error, zstandard.ZstdError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid transactions file: {str(e)}")
 
-    async def __process_rules_file(self, file: UploadFile) -> dict:
+    async def __process_rules_file(self, file: UploadFile) -> str:
         await file.seek(0)
         content = await file.read()
+        rules_data = json.loads(content.decode())
 
-        return json.loads(content.decode())
+        # 같은 규칙은 내용 해시로 한 번만 저장하고 작업은 해시로 참조 (프로세서의 컴파일 캐시 키)
+        rules_hash = hash_rules(rules_data)
+        await self.__rules_set_repository.save_if_absent(rules_hash, rules_data)
 
-    async def __save_file_stream(self, file: UploadFile, file_path: str):
-        async with aiofiles.open(file_path, 'wb') as f:
-            while chunk := await file.read(1024 * 1024):
-                await f.write(chunk)
+        return rules_hash
 
-    async def __save_and_publish_job(self, job: ProcessingJob):
+    async def __save_and_publish_job(self, job: ProcessingJob, task_type: str = TASK_TYPE):
         await self.__processing_job_repository.save(job)
-        await self.__publish_job(job)
+        await self.__publish_job(job, task_type)
 
-    async def __publish_job(self, job: ProcessingJob):
+    async def __publish_job(self, job: ProcessingJob, task_type: str):
         task = {
+            "task_id": str(uuid.uuid4()),
             "job_id": str(job.job_id),
-            "task": self.TASK_TYPE
+            "task": task_type,
+            "attempts": 0,
+            "enqueued_at": datetime.now().isoformat()
         }
         await self.__redis_client.lpush(self.REDIS_QUEUE_NAME, json.dumps(task))
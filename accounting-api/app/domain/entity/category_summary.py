@@ -0,0 +1,17 @@
+from datetime import date
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class CategorySummary(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+    company_id: str = Field(..., description="회사 ID")
+    category_id: str = Field(..., description="계정과목 ID")
+    category_name: str = Field(..., description="계정과목명")
+    month: date = Field(..., description="집계 월 (1일)")
+    transaction_count: int = Field(..., description="거래 건수")
+    amount_in: int = Field(..., description="입금액 합계")
+    amount_out: int = Field(..., description="출금액 합계")
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from pydantic import Field
+
+from app.domain.entity.company_record import CompanyRecord
+
+
+class TransactionRecord(CompanyRecord):
+    description: str = Field(..., description="적요")
+    amount_in: int = Field(0, description="입금액")
+    amount_out: int = Field(0, description="출금액")
+    transaction_location: Optional[str] = Field(None, description="거래점")
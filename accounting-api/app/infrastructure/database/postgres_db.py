@@ -1,12 +1,14 @@
+import logging
 import os
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 USER = os.getenv("POSTGRES_USER")
 PASSWORD = os.getenv("POSTGRES_PASSWORD")
 DB = os.getenv("POSTGRES_DATABASE")
@@ -15,10 +17,73 @@ HOST = os.getenv("POSTGRES_HOST", "postgres")
 
 DATABASE_URL = f"postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DB}"
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+engine_config = {
+    # SQL 로그는 요청 경로에서 모든 문장을 포맷/출력하므로 디버깅할 때만 켠다
+    "echo": os.getenv("DB_ECHO", "false").lower() == "true",
+    "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+    "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", 10)),
+    # 풀이 다 찼을 때 커넥션을 기다리는 최대 시간 (초과하면 요청 실패)
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    # 끊긴 커넥션(DB 재시작, 유휴 연결 정리)을 체크아웃할 때 걸러낸다
+    "pool_pre_ping": True,
+    # 컴파일된 SQL 문 캐시 (조회 쿼리 모양별 1개)
+    "query_cache_size": int(os.getenv("DB_QUERY_CACHE_SIZE", 500)),
+    "connect_args": {
+        # 커넥션별 asyncpg prepared statement 캐시 (같은 쿼리는 parse/plan 없이 실행)
+        "prepared_statement_cache_size": int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 256)),
+        "server_settings": {"application_name": "accounting-api"}
+    }
+}
+
+__engine: Optional[AsyncEngine] = None
+__session_factory: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    프로세스에서 공유하는 엔진 (lifespan 시작 시 생성, 그 전에 호출되면 그때 생성)
+    """
+    global __engine, __session_factory
+
+    if __engine is None:
+        __engine = create_async_engine(DATABASE_URL, **engine_config)
+        __session_factory = async_sessionmaker(__engine, class_=AsyncSession, expire_on_commit=False)
+        logger.info(f"DB 엔진 생성 (pool_size={engine_config['pool_size']}, "
+                    f"max_overflow={engine_config['max_overflow']})")
+
+    return __engine
+
+
+def get_session_factory() -> async_sessionmaker:
+    get_engine()
+
+    return __session_factory
+
+
+async def close_engine() -> None:
+    global __engine, __session_factory
+
+    if __engine is not None:
+        await __engine.dispose()
+        logger.info("DB 엔진 종료")
+
+    __engine = None
+    __session_factory = None
+
+
+def pool_stats() -> Dict[str, int]:
+    pool = get_engine().sync_engine.pool
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # overflow() 는 풀이 덜 찼을 때 음수를 돌려준다
+        "overflow": max(pool.overflow(), 0)
+    }
 
 
 async def get_postgres() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
         yield session
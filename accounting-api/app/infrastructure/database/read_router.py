@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.infrastructure.database.postgres_db import USER, PASSWORD, DB, HOST, PORT, engine_config, get_engine
+
+logger = logging.getLogger(__name__)
+
+Host = Tuple[str, int]
+
+
+def parse_hosts(value: str, default_port: int = 5432) -> List[Host]:
+    """
+    'host[:port],host[:port]' 형식의 목록
+    """
+    hosts = []
+
+    for item in filter(None, (item.strip() for item in value.split(','))):
+        host, _, port = item.partition(':')
+        hosts.append((host, int(port or default_port)))
+
+    return hosts
+
+
+def parse_replicas(value: str) -> Dict[int, List[Host]]:
+    """
+    '[샤드 번호/]host[:port],...' 형식의 목록 (샤드 번호가 없으면 0)
+    """
+    replicas: Dict[int, List[Host]] = {}
+
+    for item in filter(None, (item.strip() for item in value.split(','))):
+        shard, _, address = item.rpartition('/')
+        replicas.setdefault(int(shard or 0), []).extend(parse_hosts(address))
+
+    return replicas
+
+
+# accounting-processor 의 app/database/tenant_shards.py 와 같은 목록/순서를 써야 같은 회사가 같은 샤드로 간다
+TENANT_SHARDS: List[Host] = parse_hosts(os.getenv("POSTGRES_TENANT_SHARDS", "")) or [(HOST, int(PORT))]
+READ_REPLICAS: Dict[int, List[Host]] = parse_replicas(os.getenv("POSTGRES_READ_REPLICAS", ""))
+# 재생 지연이 이 시간을 넘거나 확인에 실패한 복제본은 다음 확인까지 쓰지 않고 샤드 기본 DB 에서 읽는다
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", 5))
+
+# 기본 DB(복제 중이 아님)는 0, WAL 을 모두 재생했으면 0, 아니면 마지막으로 재생한 트랜잭션 이후 경과 시간
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+def tenant_shard_of(company_id: str) -> int:
+    """
+    accounting-processor 의 tenant_shards.tenant_shard_of 와 같은 규칙 (company_id md5 앞 8자리 % 샤드 수)
+    """
+    if len(TENANT_SHARDS) == 1:
+        return 0
+
+    return int(hashlib.md5(company_id.encode()).hexdigest()[:8], 16) % len(TENANT_SHARDS)
+
+
+class ReadTarget:
+    """
+    조회를 보낼 DB 하나 (샤드 기본 DB 또는 그 복제본)의 엔진과 마지막으로 확인한 복제 지연
+    """
+
+    def __init__(self, shard: int, host: Host, engine: AsyncEngine, replica: bool):
+        self.shard = shard
+        self.host = host
+        self.engine = engine
+        self.replica = replica
+        self.session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        # 확인 전이거나 확인에 실패하면 None
+        self.lag: Optional[float] = None
+        self.reads = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.host[0]}:{self.host[1]}"
+
+    @property
+    def healthy(self) -> bool:
+        return self.lag is not None and self.lag <= REPLICA_MAX_LAG_SECONDS
+
+
+__primaries: List[ReadTarget] = []
+__replicas: Dict[int, List[ReadTarget]] = {}
+__turns: Dict[int, itertools.count] = {}
+__monitor: Optional[asyncio.Task] = None
+
+
+def __create_engine(host: Host) -> AsyncEngine:
+    # 기본 DB 는 작업/규칙 조회와 같은 엔진(커넥션 풀)을 함께 쓴다
+    if host == (HOST, int(PORT)):
+        return get_engine()
+
+    return create_async_engine(f"postgresql+asyncpg://{USER}:{PASSWORD}@{host[0]}:{host[1]}/{DB}", **engine_config)
+
+
+def __targets() -> List[ReadTarget]:
+    if not __primaries:
+        __primaries.extend(ReadTarget(shard, host, __create_engine(host), replica=False)
+                           for shard, host in enumerate(TENANT_SHARDS))
+        for shard, hosts in READ_REPLICAS.items():
+            __replicas[shard] = [ReadTarget(shard, host, __create_engine(host), replica=True) for host in hosts]
+            __turns[shard] = itertools.count()
+
+        logger.info(f"조회 라우터 생성 (테넌트 샤드 {len(__primaries)}개, "
+                    f"복제본 {sum(len(replicas) for replicas in __replicas.values())}개)")
+
+    return __primaries
+
+
+def __all_targets() -> List[ReadTarget]:
+    return __primaries + [replica for replicas in __replicas.values() for replica in replicas]
+
+
+def __choose(company_id: str) -> ReadTarget:
+    """
+    회사의 테넌트 샤드에서 지연이 허용 범위 안인 복제본을 차례로 고르고, 없으면 샤드 기본 DB
+    """
+    primaries = __targets()
+    shard = tenant_shard_of(company_id)
+    healthy = [replica for replica in __replicas.get(shard, []) if replica.healthy]
+
+    if healthy:
+        return healthy[next(__turns[shard]) % len(healthy)]
+
+    return primaries[shard]
+
+
+@asynccontextmanager
+async def read_session(company_id: str) -> AsyncIterator[AsyncSession]:
+    """
+    회사 거래 내역/집계 조회용 세션 (쓰기와 작업/규칙 조회는 get_postgres 세션으로 기본 DB 에서)
+    """
+    target = __choose(company_id)
+    target.reads += 1
+
+    async with target.session_factory() as session:
+        yield session
+
+
+async def __check(replica: ReadTarget) -> None:
+    healthy = replica.healthy
+
+    try:
+        async with replica.engine.connect() as connection:
+            lag = await asyncio.wait_for(connection.scalar(REPLICA_LAG_SQL), REPLICA_CHECK_INTERVAL)
+        replica.lag = float(lag) if lag is not None else None
+    except Exception as e:
+        replica.lag = None
+        if healthy:
+            logger.warning(f"복제본 {replica.name} 확인 실패, 샤드 {replica.shard} 기본 DB 에서 조회합니다: {str(e)}")
+        return
+
+    if healthy and not replica.healthy:
+        logger.warning(f"복제본 {replica.name} 지연 {replica.lag:.1f}초 > {REPLICA_MAX_LAG_SECONDS}초, "
+                       f"샤드 {replica.shard} 기본 DB 에서 조회합니다")
+    elif not healthy and replica.healthy:
+        logger.info(f"복제본 {replica.name} 조회 재개 (지연 {replica.lag:.1f}초)")
+
+
+async def __monitor_lag() -> None:
+    replicas = [target for target in __all_targets() if target.replica]
+
+    while True:
+        await asyncio.gather(*map(__check, replicas))
+        await asyncio.sleep(REPLICA_CHECK_INTERVAL)
+
+
+async def start_read_router() -> None:
+    """
+    엔진을 만들고 복제본이 있으면 지연 확인 태스크를 시작 (첫 확인이 끝나기 전에는 기본 DB 에서 조회)
+    """
+    global __monitor
+
+    __targets()
+    if __replicas and __monitor is None:
+        __monitor = asyncio.create_task(__monitor_lag())
+
+
+async def close_read_router() -> None:
+    global __monitor
+
+    if __monitor is not None:
+        __monitor.cancel()
+        try:
+            await __monitor
+        except asyncio.CancelledError:
+            pass
+        __monitor = None
+
+    for target in __all_targets():
+        # 기본 DB 엔진은 close_engine 이 닫는다
+        if target.host != (HOST, int(PORT)):
+            await target.engine.dispose()
+
+    __primaries.clear()
+    __replicas.clear()
+    __turns.clear()
+
+
+def read_router_stats() -> List[Dict]:
+    return [
+        {"shard": target.shard, "host": target.name, "role": "replica" if target.replica else "primary",
+         "lag": target.lag, "healthy": target.healthy if target.replica else True, "reads": target.reads}
+        for target in __all_targets()
+    ]
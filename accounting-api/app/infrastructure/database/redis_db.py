@@ -1,9 +1,55 @@
+import logging
 import os
+from typing import Dict, Optional
 
 import redis.asyncio as redis
 
+logger = logging.getLogger(__name__)
+
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
+redis_config = {
+    # 작업 진행 상황 구독(SSE)도 구독하는 동안 커넥션 하나를 점유한다
+    "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", 64)),
+    # 커넥션이 모두 사용 중이면 바로 실패하지 않고 이 시간까지 반납을 기다린다
+    "timeout": float(os.getenv("REDIS_POOL_TIMEOUT", 5)),
+    "socket_connect_timeout": float(os.getenv("REDIS_CONNECT_TIMEOUT", 2)),
+    "health_check_interval": int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+}
+
+__client: Optional[redis.Redis] = None
+
+
+async def get_redis() -> redis.Redis:
+    """
+    프로세스에서 공유하는 클라이언트 (lifespan 시작 시 생성, 요청마다 풀에서 커넥션을 빌려 쓴다)
+    """
+    global __client
+
+    if __client is None:
+        __client = redis.Redis.from_pool(redis.BlockingConnectionPool.from_url(REDIS_URL, **redis_config))
+        logger.info(f"Redis 커넥션 풀 생성 (max_connections={redis_config['max_connections']})")
+
+    return __client
+
+
+async def close_redis() -> None:
+    global __client
+
+    if __client is not None:
+        # from_pool 로 만든 클라이언트는 aclose 때 풀의 커넥션도 모두 닫는다
+        await __client.aclose()
+        logger.info("Redis 커넥션 풀 종료")
+
+    __client = None
+
+
+def redis_pool_stats() -> Dict[str, int]:
+    if __client is None:
+        return {"max": redis_config['max_connections'], "idle": 0, "in_use": 0}
+
+    # redis-py 가 풀 사용량을 공개하지 않아 내부 목록의 길이로 계산
+    pool = __client.connection_pool
 
-async def get_redis():
-    return await redis.from_url(REDIS_URL)
+    return {"max": pool.max_connections, "idle": len(pool._available_connections),
+            "in_use": len(pool._in_use_connections)}
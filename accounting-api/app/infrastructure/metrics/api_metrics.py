@@ -0,0 +1,65 @@
+import time
+
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from redis.exceptions import RedisError
+from starlette.responses import Response
+
+from app.infrastructure.database.postgres_db import pool_stats
+from app.infrastructure.database.read_router import read_router_stats
+from app.infrastructure.database.redis_db import redis_pool_stats
+from app.infrastructure.repository.cached_company_record_repository import CachedCompanyRecordRepository
+
+REQUEST_SECONDS = Histogram('accounting_api_request_seconds', 'API 요청 처리 시간 (스트리밍 응답은 헤더 전송까지)',
+                            ['method', 'route', 'status'])
+REQUESTS_IN_PROGRESS = Gauge('accounting_api_requests_in_progress', '처리 중인 API 요청 수', ['method'])
+RECORDS_CACHE = Gauge('accounting_api_records_cache', '거래 내역 조회 캐시 누적 적중/미스 수', ['result'])
+DB_POOL = Gauge('accounting_api_db_pool', 'SQLAlchemy 커넥션 풀 상태 (size, checked_in, checked_out, overflow)',
+                ['state'])
+READ_ROUTER_READS = Gauge('accounting_api_read_router_reads', '조회 라우터가 DB 별로 보낸 거래 내역/집계 조회 수',
+                          ['shard', 'host', 'role'])
+REPLICA_LAG = Gauge('accounting_api_replica_lag_seconds', '마지막으로 확인한 복제본 재생 지연 (확인 실패 시 -1)',
+                    ['shard', 'host'])
+REPLICA_HEALTHY = Gauge('accounting_api_replica_healthy', '복제본 조회 여부 (지연이 허용 범위 안이면 1)', ['shard', 'host'])
+REDIS_POOL = Gauge('accounting_api_redis_pool', 'Redis 커넥션 풀 상태 (max, idle, in_use)', ['state'])
+REDIS_ERRORS = Counter('accounting_api_metrics_redis_errors', '지표 수집 중 Redis 조회 실패 수')
+
+
+async def record_request_metrics(request: Request, call_next):
+    # 경로 파라미터별로 라벨이 늘어나지 않도록 실제 경로 대신 라우트 템플릿으로 기록
+    method = request.method
+    started = time.perf_counter()
+    status = 500
+
+    REQUESTS_IN_PROGRESS.labels(method).inc()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_PROGRESS.labels(method).dec()
+        route = request.scope.get('route')
+        REQUEST_SECONDS.labels(method, route.path if route else 'unmatched', status) \
+            .observe(time.perf_counter() - started)
+
+
+async def render_metrics(redis) -> Response:
+    # 캐시 적중률과 커넥션 풀 상태는 수집 시점에 읽어서 기록
+    try:
+        stats = await CachedCompanyRecordRepository.stats(redis)
+        RECORDS_CACHE.labels('hit').set(stats['hits'])
+        RECORDS_CACHE.labels('miss').set(stats['misses'])
+    except RedisError:
+        REDIS_ERRORS.inc()
+
+    for state, value in pool_stats().items():
+        DB_POOL.labels(state).set(value)
+    for state, value in redis_pool_stats().items():
+        REDIS_POOL.labels(state).set(value)
+    for target in read_router_stats():
+        READ_ROUTER_READS.labels(target['shard'], target['host'], target['role']).set(target['reads'])
+        if target['role'] == 'replica':
+            REPLICA_LAG.labels(target['shard'], target['host']).set(-1 if target['lag'] is None else target['lag'])
+            REPLICA_HEALTHY.labels(target['shard'], target['host']).set(int(target['healthy']))
+
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, BigInteger
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, JSON, BigInteger, Date
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 
@@ -27,12 +27,25 @@ class Category(Base):
     deleted_at = Column(DateTime, nullable=True)
 
 
+class RulesSet(Base):
+    __tablename__ = "rules_sets"
+
+    rules_hash = Column(String(64), primary_key=True)
+    rules_data = Column(JSON, nullable=False)
+    created_at = Column(DateTime)
+
+
 class ProcessingJob(Base):
     __tablename__ = "processing_jobs"
 
     job_id = Column(UUID, primary_key=True)
     status = Column(String(20), default="pending")
+    job_type = Column(String(20), default="process")
     csv_file_path = Column(String(500))
+    content_hash = Column(String(64))
+    rules_hash = Column(String(64), ForeignKey("rules_sets.rules_hash"))
+    base_rules_hash = Column(String(64), ForeignKey("rules_sets.rules_hash"))
+    source_job_id = Column(UUID, ForeignKey("processing_jobs.job_id"))
     rules_data = Column(JSON)
     total_rows = Column(Integer, default=0)
     processed_rows = Column(Integer, default=0)
@@ -43,6 +56,18 @@ class ProcessingJob(Base):
     deleted_at = Column(DateTime, nullable=True)
 
 
+class ProcessingJobCheckpoint(Base):
+    __tablename__ = "processing_job_checkpoints"
+
+    job_id = Column(UUID, ForeignKey("processing_jobs.job_id"), primary_key=True)
+    shard_no = Column(Integer, primary_key=True)
+    range_start = Column(BigInteger, nullable=False)
+    range_end = Column(BigInteger, nullable=False)
+    committed_offset = Column(BigInteger, nullable=False)
+    committed_rows = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
@@ -50,11 +75,24 @@ class Transaction(Base):
     job_id = Column(UUID, ForeignKey("processing_jobs.job_id"))
     company_id = Column(String(50), ForeignKey("companies.company_id"))
     category_id = Column(String(50), ForeignKey("categories.category_id"))
-    transaction_date = Column(DateTime, nullable=False)
+    transaction_date = Column(DateTime, primary_key=True)
     description = Column(Text, nullable=False)
     amount_in = Column(Integer, default=0)
     amount_out = Column(Integer, default=0)
     balance_after = Column(Integer, nullable=False)
     transaction_location = Column(String(200))
+    row_fingerprint = Column(UUID)
     created_at = Column(DateTime)
     deleted_at = Column(DateTime, nullable=True)
+
+
+class TransactionSummary(Base):
+    __tablename__ = "transaction_summaries"
+
+    company_id = Column(String(50), ForeignKey("companies.company_id"), primary_key=True)
+    category_id = Column(String(50), ForeignKey("categories.category_id"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    transaction_count = Column(BigInteger, nullable=False, default=0)
+    amount_in = Column(BigInteger, nullable=False, default=0)
+    amount_out = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime)
@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import os
+import time
+from typing import List, AsyncIterator, Dict
+
+from fastapi import Depends
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from app.application.dto.request.company_records_req import CompanyRecordsReq
+from app.application.dto.response.company_records_res import CompanyRecord
+from app.application.repository.company_record_repository import CompanyRecordRepository
+from app.infrastructure.database.redis_db import get_redis
+from app.infrastructure.repository.postgres_company_record_repository import PostgresCompanyRecordRepository
+
+logger = logging.getLogger(__name__)
+
+# accounting-processor 의 RecordCacheInvalidator 가 작업 완료 시 증가시키는 회사별 버전 키
+RECORDS_VERSION_KEY = 'records:version:{company_id}'
+RECORDS_KEY = 'records:v{version}:{company_id}:{digest}'
+RECORDS_INDEX_KEY = 'records:index:{company_id}'
+RECORDS_HITS_KEY = 'records:cache:hits'
+RECORDS_MISSES_KEY = 'records:cache:misses'
+
+records_adapter = TypeAdapter(List[CompanyRecord])
+
+
+class CachedCompanyRecordRepository(CompanyRecordRepository):
+    """
+    회사별 거래 내역 조회 결과를 Redis 에 캐시하는 read-through 저장소
+
+    - 키: 회사별 버전 + 회사 ID + 조회 조건(필터, 커서, 페이지 크기) 해시
+    - 프로세서가 작업 완료 시 버전을 올리면 이전 버전 키는 더 이상 조회되지 않고 TTL 로 만료
+    - 회사별 인덱스 ZSET 으로 캐시 항목 수를 제한하고, 초과분은 오래된 항목부터 제거
+    """
+    TTL = int(os.getenv("RECORDS_CACHE_TTL", 60))
+    MAX_ENTRIES_PER_COMPANY = int(os.getenv("RECORDS_CACHE_MAX_ENTRIES", 100))
+
+    def __init__(self,
+                 delegate: PostgresCompanyRecordRepository = Depends(PostgresCompanyRecordRepository),
+                 redis=Depends(get_redis)):
+        self.__delegate = delegate
+        self.__redis = redis
+
+    async def find_company_records(self, req: CompanyRecordsReq) -> List[CompanyRecord]:
+        try:
+            key = await self.__cache_key(req)
+            cached = await self.__redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Records cache unavailable: {str(e)}")
+            return await self.__delegate.find_company_records(req)
+
+        if cached is not None:
+            await self.__count(RECORDS_HITS_KEY)
+            return records_adapter.validate_json(cached)
+
+        await self.__count(RECORDS_MISSES_KEY)
+        company_records = await self.__delegate.find_company_records(req)
+
+        try:
+            await self.__store(req.company_id, key, records_adapter.dump_json(company_records))
+        except RedisError as e:
+            logger.warning(f"Records cache store failed: {str(e)}")
+
+        return company_records
+
+    def stream_company_records(self, req: CompanyRecordsReq) -> AsyncIterator[CompanyRecord]:
+        # 전체 내보내기는 캐시하지 않는다
+        return self.__delegate.stream_company_records(req)
+
+    @staticmethod
+    async def stats(redis) -> Dict[str, float]:
+        try:
+            hits, misses = await redis.mget(RECORDS_HITS_KEY, RECORDS_MISSES_KEY)
+        except RedisError as e:
+            logger.warning(f"Records cache stats unavailable: {str(e)}")
+            return {"available": False, "hits": 0, "misses": 0, "hit_ratio": 0.0}
+
+        hits, misses = int(hits or 0), int(misses or 0)
+
+        return {
+            "available": True,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0
+        }
+
+    async def __cache_key(self, req: CompanyRecordsReq) -> str:
+        version = await self.__redis.get(RECORDS_VERSION_KEY.format(company_id=req.company_id))
+        digest = hashlib.sha1(req.model_dump_json().encode()).hexdigest()
+
+        return RECORDS_KEY.format(version=int(version or 0), company_id=req.company_id, digest=digest)
+
+    async def __count(self, counter_key: str):
+        # 통계 카운터 실패로 조회가 실패하지 않도록 한다
+        try:
+            await self.__redis.incr(counter_key)
+        except RedisError as e:
+            logger.warning(f"Records cache counter failed: {str(e)}")
+
+    async def __store(self, company_id: str, key: str, value: bytes):
+        index_key = RECORDS_INDEX_KEY.format(company_id=company_id)
+
+        pipeline = self.__redis.pipeline()
+        pipeline.set(key, value, ex=self.TTL)
+        pipeline.zadd(index_key, {key: time.time()})
+        pipeline.expire(index_key, self.TTL)
+        pipeline.zcard(index_key)
+        *_, size = await pipeline.execute()
+
+        overflow = size - self.MAX_ENTRIES_PER_COMPANY
+        if overflow > 0:
+            evicted = [member for member, _ in await self.__redis.zpopmin(index_key, overflow)]
+            await self.__redis.delete(*evicted)
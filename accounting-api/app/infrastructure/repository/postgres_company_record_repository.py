@@ -1,26 +1,55 @@
-from typing import List
+from typing import List, AsyncIterator
 
-from fastapi import Depends
-from sqlalchemy import select, and_, null, desc
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, null, desc, tuple_, Select
 
+from app.application.dto.request.company_records_req import CompanyRecordsReq
 from app.application.dto.response.company_records_res import CompanyRecord
 from app.application.repository.company_record_repository import CompanyRecordRepository
-from app.infrastructure.database.postgres_db import get_postgres
+from app.infrastructure.database.read_router import read_session
 from app.infrastructure.model.model import Transaction, Company, Category
 
 
 class PostgresCompanyRecordRepository(CompanyRecordRepository):
+    STREAM_BATCH_SIZE = 1000
 
-    def __init__(self, session: AsyncSession = Depends(get_postgres)):
-        self.__session = session
+    async def find_company_records(self, req: CompanyRecordsReq) -> List[CompanyRecord]:
+        query = self.__records_query(req)
 
-    async def find_company_records(self, company_id: str) -> List[CompanyRecord]:
-        query = select(
+        # (transaction_date, transaction_id) 키셋 페이지네이션
+        cursor = req.decode_cursor()
+        if cursor:
+            query = query.where(tuple_(Transaction.transaction_date, Transaction.transaction_id) < cursor)
+
+        # 회사의 테넌트 샤드(복제본이 있으면 복제본)에서 조회
+        async with read_session(req.company_id) as session:
+            result = await session.execute(query.limit(req.limit + 1))
+
+            return list(map(CompanyRecord.model_validate, result.mappings()))
+
+    async def stream_company_records(self, req: CompanyRecordsReq) -> AsyncIterator[CompanyRecord]:
+        # 응답 전송이 끝날 때까지 서버 사이드 커서를 유지하는 세션
+        async with read_session(req.company_id) as session:
+            result = await session.stream(
+                self.__records_query(req).execution_options(yield_per=self.STREAM_BATCH_SIZE)
+            )
+
+            async for row in result.mappings():
+                yield CompanyRecord.model_validate(row)
+
+    def __records_query(self, req: CompanyRecordsReq) -> Select:
+        conditions = [
+            Transaction.company_id == req.company_id,
+            Transaction.deleted_at == null()
+        ]
+        if req.date_from:
+            conditions.append(Transaction.transaction_date >= req.date_from)
+        if req.date_to:
+            conditions.append(Transaction.transaction_date < req.date_to)
+
+        return select(
             Transaction.transaction_id,
             Transaction.transaction_date,
             Transaction.category_id,
-            Transaction.transaction_date,
             Transaction.created_at,
             Transaction.company_id,
             Company.company_name,
@@ -30,12 +59,5 @@ class PostgresCompanyRecordRepository(CompanyRecordRepository):
         ).join(
             Company, Transaction.company_id == Company.company_id
         ).where(
-            and_(
-                Transaction.company_id == company_id,
-                Transaction.deleted_at == null()
-            )
-        ).order_by(desc(Transaction.transaction_date))
-
-        result = await self.__session.execute(query)
-
-        return list(map(CompanyRecord.model_validate, result.mappings()))
+            and_(*conditions)
+        ).order_by(desc(Transaction.transaction_date), desc(Transaction.transaction_id))
@@ -1,4 +1,8 @@
+from typing import Optional
+from uuid import UUID
+
 from fastapi import Depends
+from sqlalchemy import select, null, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.repository.processing_job_repository import ProcessingJobRepository
@@ -18,3 +22,22 @@ class PostgresProcessingJobRepository(ProcessingJobRepository):
         except Exception as e:
             await self.__session.rollback()
             raise e
+
+    async def find_by_content(self, content_hash: str, rules_hash: str) -> Optional[ProcessingJob]:
+        result = await self.__session.execute(
+            select(ProcessingJob).where(
+                ProcessingJob.content_hash == content_hash,
+                ProcessingJob.rules_hash == rules_hash,
+                ProcessingJob.status != 'failed',
+                ProcessingJob.deleted_at == null()
+            ).order_by(desc(ProcessingJob.created_at)).limit(1)
+        )
+
+        return result.scalars().first()
+
+    async def find_by_id(self, job_id: UUID) -> Optional[ProcessingJob]:
+        result = await self.__session.execute(
+            select(ProcessingJob).where(ProcessingJob.job_id == job_id, ProcessingJob.deleted_at == null())
+        )
+
+        return result.scalars().first()
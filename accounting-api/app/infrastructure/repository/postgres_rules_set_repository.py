@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from fastapi import Depends
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.repository.rules_set_repository import RulesSetRepository
+from app.infrastructure.database.postgres_db import get_postgres
+from app.infrastructure.model.model import RulesSet
+
+
+class PostgresRulesSetRepository(RulesSetRepository):
+
+    def __init__(self, session: AsyncSession = Depends(get_postgres)):
+        self.__session = session
+
+    async def save_if_absent(self, rules_hash: str, rules_data: dict):
+        try:
+            # 같은 규칙은 한 번만 저장 (동시 업로드도 충돌 없이 무시)
+            await self.__session.execute(
+                insert(RulesSet)
+                .values(rules_hash=rules_hash, rules_data=rules_data, created_at=datetime.now())
+                .on_conflict_do_nothing(index_elements=[RulesSet.rules_hash])
+            )
+            await self.__session.commit()
+        except Exception as e:
+            await self.__session.rollback()
+            raise e
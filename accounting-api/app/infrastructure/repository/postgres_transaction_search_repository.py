@@ -0,0 +1,94 @@
+from typing import List, Optional
+
+from sqlalchemy import select, and_, or_, null, desc, func, tuple_, cast, Text, ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY, array
+
+from app.application.dto.request.transaction_search_req import TransactionSearchReq
+from app.application.repository.transaction_search_repository import TransactionSearchRepository
+from app.domain.entity.transaction_record import TransactionRecord
+from app.infrastructure.database.read_router import read_session
+from app.infrastructure.model.model import Transaction, Company, Category
+
+
+class PostgresTransactionSearchRepository(TransactionSearchRepository):
+    """
+    적요 부분 일치 검색
+
+    - 3자 이상 검색어는 트라이그램 인덱스(idx_transactions_description_trgm)로 후보를 찾는다
+    - 2자 검색어(예: '쿠팡')는 트라이그램을 만들 수 없으므로 적요의 2자 조각 배열에 그 검색어가 있는지를 조건에 더해
+      바이그램 인덱스(idx_transactions_description_bigram)로 찾는다. 최종 판정은 두 경우 모두 LIKE
+    - 알려진 한계: 1자 검색어는 쓸 수 있는 인덱스가 없어 회사의 거래 내역을 최신순으로 읽으며 걸러내므로
+      드문 글자일수록 회사의 거래 내역을 끝까지 읽을 수 있다
+    """
+
+    async def search(self, req: TransactionSearchReq) -> List[TransactionRecord]:
+        keyword = req.query.lower()
+        conditions = [
+            Transaction.company_id == req.company_id,
+            Transaction.deleted_at == null(),
+            func.lower(Transaction.description).like(f"%{self.__escape_like(keyword)}%", escape='\\')
+        ]
+        if len(keyword) == 2:
+            conditions.append(self.__has_bigram(keyword))
+        if req.category_id:
+            conditions.append(Transaction.category_id == req.category_id)
+        if req.date_from:
+            conditions.append(Transaction.transaction_date >= req.date_from)
+        if req.date_to:
+            conditions.append(Transaction.transaction_date < req.date_to)
+        if req.amount_min is not None or req.amount_max is not None:
+            # 거래 금액은 0 이 아닌 입금액 또는 출금액
+            conditions.append(or_(self.__amount_between(Transaction.amount_in, req.amount_min, req.amount_max),
+                                  self.__amount_between(Transaction.amount_out, req.amount_min, req.amount_max)))
+
+        # (transaction_date, transaction_id) 키셋 페이지네이션
+        cursor = req.decode_cursor()
+        if cursor:
+            conditions.append(tuple_(Transaction.transaction_date, Transaction.transaction_id) < cursor)
+
+        query = select(
+            Transaction.transaction_id,
+            Transaction.transaction_date,
+            Transaction.category_id,
+            Transaction.created_at,
+            Transaction.company_id,
+            Transaction.description,
+            func.coalesce(Transaction.amount_in, 0).label('amount_in'),
+            func.coalesce(Transaction.amount_out, 0).label('amount_out'),
+            Transaction.transaction_location,
+            Company.company_name,
+            Category.category_name
+        ).join(
+            Category, Transaction.category_id == Category.category_id
+        ).join(
+            Company, Transaction.company_id == Company.company_id
+        ).where(
+            and_(*conditions)
+        ).order_by(desc(Transaction.transaction_date), desc(Transaction.transaction_id)).limit(req.limit + 1)
+
+        # 회사의 테넌트 샤드(복제본이 있으면 복제본)에서 조회
+        async with read_session(req.company_id) as session:
+            result = await session.execute(query)
+
+            return list(map(TransactionRecord.model_validate, result.mappings()))
+
+    @staticmethod
+    def __amount_between(column, amount_min: Optional[int], amount_max: Optional[int]) -> ColumnElement:
+        conditions = [column > 0]
+        if amount_min is not None:
+            conditions.append(column >= amount_min)
+        if amount_max is not None:
+            conditions.append(column <= amount_max)
+
+        return and_(*conditions)
+
+    @staticmethod
+    def __has_bigram(bigram: str) -> ColumnElement:
+        # init.sql 의 description_bigrams 인덱스 식과 같아야 인덱스를 쓴다
+        bigrams = func.description_bigrams(func.lower(Transaction.description), type_=ARRAY(Text))
+
+        return bigrams.contains(cast(array([bigram]), ARRAY(Text)))
+
+    @staticmethod
+    def __escape_like(keyword: str) -> str:
+        return keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
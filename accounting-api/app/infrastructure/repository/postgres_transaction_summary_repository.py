@@ -0,0 +1,39 @@
+from typing import List
+
+from sqlalchemy import select, and_
+
+from app.application.dto.request.company_summary_req import CompanySummaryReq
+from app.application.repository.transaction_summary_repository import TransactionSummaryRepository
+from app.domain.entity.category_summary import CategorySummary
+from app.infrastructure.database.read_router import read_session
+from app.infrastructure.model.model import TransactionSummary, Category
+
+
+class PostgresTransactionSummaryRepository(TransactionSummaryRepository):
+
+    async def find_company_summary(self, req: CompanySummaryReq) -> List[CategorySummary]:
+        # 프로세서가 증분 유지하는 집계 테이블만 읽으므로 비용은 거래 건수와 무관하게 (카테고리 수 × 월 수)
+        conditions = [TransactionSummary.company_id == req.company_id]
+        if req.month_from:
+            conditions.append(TransactionSummary.month >= req.month_from.replace(day=1))
+        if req.month_to:
+            conditions.append(TransactionSummary.month <= req.month_to.replace(day=1))
+
+        async with read_session(req.company_id) as session:
+            result = await session.execute(
+                select(
+                    TransactionSummary.company_id,
+                    TransactionSummary.category_id,
+                    Category.category_name,
+                    TransactionSummary.month,
+                    TransactionSummary.transaction_count,
+                    TransactionSummary.amount_in,
+                    TransactionSummary.amount_out
+                ).join(
+                    Category, TransactionSummary.category_id == Category.category_id
+                ).where(
+                    and_(*conditions)
+                ).order_by(TransactionSummary.month, TransactionSummary.category_id)
+            )
+
+            return list(map(CategorySummary.model_validate, result.mappings()))
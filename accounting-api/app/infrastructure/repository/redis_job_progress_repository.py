@@ -0,0 +1,45 @@
+import json
+import os
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends
+
+from app.application.repository.job_progress_repository import JobProgressRepository
+from app.infrastructure.database.redis_db import get_redis
+
+# accounting-processor 의 JobProgressTracker 가 갱신/발행하는 키/채널
+JOB_PROGRESS_KEY = 'job:progress:{job_id}'
+JOB_EVENTS_CHANNEL = 'job:events:{job_id}'
+
+
+class RedisJobProgressRepository(JobProgressRepository):
+    # 이벤트가 없을 때 None 을 돌려주는 간격 (SSE keep-alive 용)
+    IDLE_INTERVAL = float(os.getenv("JOB_EVENTS_IDLE_INTERVAL", 15))
+
+    def __init__(self, redis=Depends(get_redis)):
+        self.__redis = redis
+
+    async def find_snapshot(self, job_id: str) -> Optional[dict]:
+        snapshot = await self.__redis.hgetall(JOB_PROGRESS_KEY.format(job_id=job_id))
+        if not snapshot:
+            return None
+
+        return {key.decode(): value.decode() for key, value in snapshot.items()}
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Optional[dict]]:
+        """
+        구독 직후 현재 스냅샷을 먼저 전달해, 구독 전에 발행된 진행 상황도 놓치지 않는다
+        """
+        channel = JOB_EVENTS_CHANNEL.format(job_id=job_id)
+        pubsub = self.__redis.pubsub()
+        await pubsub.subscribe(channel)
+
+        try:
+            yield await self.find_snapshot(job_id)
+
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.IDLE_INTERVAL)
+                yield json.loads(message['data']) if message else None
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
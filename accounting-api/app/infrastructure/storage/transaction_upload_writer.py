@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+import zstandard
+from fastapi import UploadFile
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_DECOMPRESSOR_TYPE = type(zlib.decompressobj())
+
+
+@dataclass
+class TransactionUpload:
+    file_path: str
+    total_rows: int
+    content_hash: str
+
+
+class TransactionUploadWriter:
+    """
+    업로드된 거래 내역 CSV 를 한 번만 읽으면서 디스크에 저장하는 파이프라인
+
+    - gzip / zstd 압축 업로드는 청크 단위로 압축을 풀어 원본 CSV 로 저장
+    - 저장하면서 헤더 검증, 행 수 계산, 원본 내용 sha256 계산을 함께 수행
+    - 임시 파일에 쓴 뒤 완료 시 교체하므로 중단된 업로드가 처리 대상 경로에 남지 않는다
+    """
+    CHUNK_SIZE = 1024 * 1024
+    REQUIRED_COLUMNS = ('거래일시', '적요', '입금액', '출금액', '거래후잔액')
+
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+        self.__decompressor = None
+        self.__sha256 = hashlib.sha256()
+        self.__header = b''
+        self.__header_checked = False
+        self.__lines = 0
+        self.__quoted = False
+        self.__last_byte = b''
+
+    async def write(self, file: UploadFile) -> TransactionUpload:
+        temp_path = f"{self.__file_path}.part"
+
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                # 압축 형식은 앞 바이트(magic)로 판단하므로 첫 청크가 그보다 짧으면 더 읽는다
+                chunk = await file.read(self.CHUNK_SIZE)
+                while chunk and len(chunk) < len(ZSTD_MAGIC) and (more := await file.read(self.CHUNK_SIZE)):
+                    chunk += more
+                self.__decompressor = self.__create_decompressor(chunk)
+
+                while chunk:
+                    # 압축 해제/해시/행 수 계산은 이벤트 루프를 막지 않도록 스레드에서 수행
+                    data = await asyncio.to_thread(self.__consume, chunk)
+                    if data:
+                        await f.write(data)
+                    chunk = await file.read(self.CHUNK_SIZE)
+
+                data = self.__finish()
+                if data:
+                    await f.write(data)
+
+            if not self.__header_checked:
+                self.__check_header(self.__header)
+
+            await aiofiles.os.replace(temp_path, self.__file_path)
+        except BaseException:
+            if await aiofiles.os.path.exists(temp_path):
+                await aiofiles.os.remove(temp_path)
+            raise
+
+        # 마지막 행이 개행 없이 끝나는 경우 포함, 헤더 제외 (프로세서의 count_rows 와 같은 기준)
+        lines = self.__lines + (1 if self.__last_byte not in (b'', b'\n') else 0)
+
+        return TransactionUpload(
+            file_path=self.__file_path,
+            total_rows=max(lines - 1, 0),
+            content_hash=self.__sha256.hexdigest()
+        )
+
+    def __consume(self, chunk: bytes) -> bytes:
+        data = self.__decompress(chunk) if self.__decompressor else chunk
+        self.__inspect(data)
+
+        return data
+
+    def __finish(self) -> bytes:
+        if self.__decompressor is None:
+            return b''
+
+        data = self.__decompressor.flush()
+        self.__inspect(data)
+
+        return data
+
+    def __decompress(self, chunk: bytes) -> bytes:
+        data = self.__decompressor.decompress(chunk)
+
+        # 여러 멤버를 이어 붙인 gzip 파일은 멤버마다 새 decompressor 로 이어서 푼다
+        while isinstance(self.__decompressor, GZIP_DECOMPRESSOR_TYPE) \
+                and self.__decompressor.eof and self.__decompressor.unused_data:
+            unused = self.__decompressor.unused_data
+            self.__decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            data += self.__decompressor.decompress(unused)
+
+        return data
+
+    def __inspect(self, data: bytes) -> None:
+        if not data:
+            return
+
+        self.__sha256.update(data)
+        self.__count_lines(data)
+        self.__last_byte = data[-1:]
+
+        if not self.__header_checked:
+            self.__header += data
+            newline = self.__header.find(b'\n')
+            if newline >= 0:
+                self.__check_header(self.__header[:newline])
+            elif len(self.__header) > self.CHUNK_SIZE:
+                raise ValueError("CSV header line is too long")
+
+    def __count_lines(self, data: bytes) -> None:
+        # 따옴표로 감싼 필드(적요 등) 안의 개행은 행 끝이 아니다 (프로세서의 count_row_ends 와 같은 기준)
+        if b'"' not in data:
+            self.__lines += 0 if self.__quoted else data.count(b'\n')
+            return
+
+        parts = data.split(b'"')
+        self.__lines += sum(part.count(b'\n') for part in parts[1 if self.__quoted else 0::2])
+        self.__quoted ^= len(parts) % 2 == 0
+
+    def __check_header(self, header: bytes) -> None:
+        try:
+            columns = [column.strip().strip('"') for column in header.decode('utf-8').rstrip('\r').split(',')]
+        except UnicodeDecodeError:
+            raise ValueError("CSV must be UTF-8 encoded")
+
+        missing = [column for column in self.REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+
+        self.__header_checked = True
+        self.__header = b''
+
+    @staticmethod
+    def __create_decompressor(head: bytes) -> Optional[object]:
+        if head.startswith(GZIP_MAGIC):
+            return zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if head.startswith(ZSTD_MAGIC):
+            return zstandard.ZstdDecompressor().decompressobj(read_across_frames=True)
+
+        return None
@@ -1,16 +1,54 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from app.infrastructure.database.postgres_db import engine
+from app.infrastructure.database.postgres_db import get_engine, close_engine
+from app.infrastructure.database.read_router import start_read_router, close_read_router
+from app.infrastructure.database.redis_db import get_redis, close_redis
+from app.infrastructure.metrics.api_metrics import record_request_metrics
 from app.infrastructure.model.model import Base
 from app.presentation.accounting_controller import router
+from app.presentation.metrics_controller import router as metrics_router
 
-app = FastAPI(title="Accounting API", version="1.0.0")
+logger = logging.getLogger(__name__)
 
-app.include_router(router)
+# 스키마는 database/init.sql 과 migrations 로 관리하므로 로컬 개발용으로만 켠다
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # 요청마다 클라이언트/커넥션을 만들지 않도록 프로세스에서 공유할 엔진과 Redis 클라이언트를 먼저 만든다
+    engine = get_engine()
+    redis = await get_redis()
+    # 테넌트 샤드/복제본 엔진과 복제 지연 확인 태스크
+    await start_read_router()
+
+    if DB_CREATE_ALL:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
 
+    # 첫 요청이 연결 수립을 기다리지 않도록 커넥션을 하나씩 미리 연다
+    try:
+        async with engine.connect():
+            pass
+        await redis.ping()
+    except Exception as e:
+        logger.warning(f"시작 시 연결 확인 실패 (요청 시 다시 연결): {str(e)}")
 
-@app.on_event("startup")
-async def startup():
-    # DB 테이블 생성 (이미 있으면 무시)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield
+    finally:
+        await close_read_router()
+        await close_redis()
+        await close_engine()
+
+
+app = FastAPI(title="Accounting API", version="1.0.0", lifespan=lifespan)
+
+app.middleware("http")(record_request_metrics)
+
+app.include_router(router)
+app.include_router(metrics_router)
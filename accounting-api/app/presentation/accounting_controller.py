@@ -1,5 +1,13 @@
+from datetime import datetime, date
+from typing import Optional
+from uuid import UUID
+
 from fastapi import APIRouter, UploadFile, Depends, File, Query
+from fastapi.responses import StreamingResponse
 
+from app.application.dto.request.company_records_req import CompanyRecordsReq
+from app.application.dto.request.company_summary_req import CompanySummaryReq
+from app.application.dto.request.transaction_search_req import TransactionSearchReq
 from app.application.service.accounting_service import AccountingService
 
 router = APIRouter(prefix="/api/v1/accounting")
@@ -16,7 +24,85 @@ async def process_transactions(
     return job
 
 
+@router.post("/jobs/{job_id}/reclassify")
+async def reclassify_transactions(
+        job_id: UUID,
+        rules_file: UploadFile = File,
+        scope: str = Query(AccountingService.RECLASSIFY_SCOPE_JOB, pattern="^(job|rules)$"),
+        accounting_service: AccountingService = Depends(AccountingService)
+):
+    # 저장된 거래 내역을 새 규칙으로 다시 분류 (바뀐 키워드를 포함하는 행만)
+    # scope=job: job_id 작업만, scope=rules: job_id 작업과 같은 규칙으로 분류된 모든 업로드 작업
+    return await accounting_service.reclassify(job_id, rules_file, scope)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: UUID, accounting_service: AccountingService = Depends(AccountingService)):
+    return await accounting_service.get_job(job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: UUID, accounting_service: AccountingService = Depends(AccountingService)):
+    # 없는 작업은 스트림을 열기 전에 404
+    job = await accounting_service.get_job(job_id)
+
+    return StreamingResponse(accounting_service.stream_job_events(job), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @router.get("/records")
 async def get_company_records(company_id: str = Query(alias="companyId"),
+                              limit: int = Query(100, ge=1, le=1000),
+                              cursor: Optional[str] = Query(None),
+                              date_from: Optional[datetime] = Query(None, alias="from"),
+                              date_to: Optional[datetime] = Query(None, alias="to"),
                               accounting_service: AccountingService = Depends(AccountingService)):
-    return await accounting_service.get_company_records(company_id)
+    req = CompanyRecordsReq(company_id=company_id, limit=limit, cursor=cursor, date_from=date_from, date_to=date_to)
+
+    return await accounting_service.get_company_records(req)
+
+
+@router.get("/records/search")
+async def search_transactions(company_id: str = Query(alias="companyId"),
+                              query: str = Query(alias="q", min_length=1, max_length=200),
+                              category_id: Optional[str] = Query(None, alias="categoryId"),
+                              date_from: Optional[datetime] = Query(None, alias="from"),
+                              date_to: Optional[datetime] = Query(None, alias="to"),
+                              amount_min: Optional[int] = Query(None, alias="minAmount", ge=0),
+                              amount_max: Optional[int] = Query(None, alias="maxAmount", ge=0),
+                              limit: int = Query(100, ge=1, le=1000),
+                              cursor: Optional[str] = Query(None),
+                              accounting_service: AccountingService = Depends(AccountingService)):
+    # 적요 부분 일치 검색 (트라이그램 인덱스) + 회사/카테고리/기간/금액 조건, 최신순 키셋 페이지네이션
+    req = TransactionSearchReq(company_id=company_id, query=query, category_id=category_id, date_from=date_from,
+                               date_to=date_to, amount_min=amount_min, amount_max=amount_max, limit=limit,
+                               cursor=cursor)
+
+    return await accounting_service.search_transactions(req)
+
+
+@router.get("/records/cache-stats")
+async def get_records_cache_stats(accounting_service: AccountingService = Depends(AccountingService)):
+    return await accounting_service.get_records_cache_stats()
+
+
+@router.get("/summaries")
+async def get_company_summary(company_id: str = Query(alias="companyId"),
+                              month_from: Optional[date] = Query(None, alias="from"),
+                              month_to: Optional[date] = Query(None, alias="to"),
+                              accounting_service: AccountingService = Depends(AccountingService)):
+    req = CompanySummaryReq(company_id=company_id, month_from=month_from, month_to=month_to)
+
+    return await accounting_service.get_company_summary(req)
+
+
+@router.get("/records/stream")
+async def stream_company_records(company_id: str = Query(alias="companyId"),
+                                 fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                                 date_from: Optional[datetime] = Query(None, alias="from"),
+                                 date_to: Optional[datetime] = Query(None, alias="to"),
+                                 accounting_service: AccountingService = Depends(AccountingService)):
+    req = CompanyRecordsReq(company_id=company_id, date_from=date_from, date_to=date_to)
+    media_type = "text/csv" if fmt == AccountingService.STREAM_FORMAT_CSV else "application/x-ndjson"
+
+    return StreamingResponse(accounting_service.stream_company_records(req, fmt), media_type=media_type)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app.infrastructure.database.redis_db import get_redis
+from app.infrastructure.metrics.api_metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(redis=Depends(get_redis)):
+    return await render_metrics(redis)
@@ -0,0 +1,60 @@
+import asyncio
+
+import fakeredis
+from redis.exceptions import RedisError
+
+from app.application.dto.request.company_records_req import CompanyRecordsReq
+from app.infrastructure.repository.cached_company_record_repository import CachedCompanyRecordRepository
+
+REQ = CompanyRecordsReq(company_id='com_1')
+
+
+class FakeDelegate:
+
+    def __init__(self):
+        self.calls = 0
+
+    async def find_company_records(self, req):
+        self.calls += 1
+        return []
+
+
+class FailingCounters(fakeredis.FakeAsyncRedis):
+    # 조회/저장은 되지만 통계 카운터 증가만 실패
+    async def incr(self, *args, **kwargs):
+        raise RedisError("counter failed")
+
+
+def test_hits_and_misses_are_counted_separately():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        repository = CachedCompanyRecordRepository(FakeDelegate(), redis_client)
+        for _ in range(3):
+            await repository.find_company_records(REQ)
+
+        return await CachedCompanyRecordRepository.stats(redis_client)
+
+    assert asyncio.run(scenario()) == {'available': True, 'hits': 2, 'misses': 1, 'hit_ratio': 0.6667}
+
+
+def test_counter_failure_does_not_fail_the_lookup():
+    async def scenario():
+        delegate = FakeDelegate()
+        repository = CachedCompanyRecordRepository(delegate, FailingCounters())
+
+        # 첫 조회는 미스로 저장, 두 번째 조회는 캐시 적중
+        results = [await repository.find_company_records(REQ) for _ in range(2)]
+
+        return results, delegate.calls
+
+    assert asyncio.run(scenario()) == ([[], []], 1)
+
+
+def test_stats_without_redis_reports_unavailable():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    redis_client = fakeredis.FakeAsyncRedis(server=server)
+
+    stats = asyncio.run(CachedCompanyRecordRepository.stats(redis_client))
+
+    assert stats == {'available': False, 'hits': 0, 'misses': 0, 'hit_ratio': 0.0}
@@ -0,0 +1,130 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+import random
+
+import pytest
+import zstandard
+from fastapi import HTTPException, UploadFile
+
+from app.application.service.accounting_service import AccountingService
+from app.infrastructure.storage.transaction_upload_writer import TransactionUploadWriter
+
+ROWS = 2000
+
+
+class ChunkedUpload:
+    """
+    네트워크 업로드처럼 요청한 크기와 상관없이 정해진 조각 단위로 돌려주는 UploadFile 대역
+    """
+
+    def __init__(self, data: bytes, sizes):
+        self.__pieces = []
+        offset = 0
+        for size in sizes:
+            if offset >= len(data):
+                break
+            self.__pieces.append(data[offset:offset + size])
+            offset += size
+        if offset < len(data):
+            self.__pieces.append(data[offset:])
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.__pieces.pop(0) if self.__pieces else b''
+
+
+def csv_bytes(rows: int = ROWS, trailing_newline: bool = True) -> bytes:
+    rng = random.Random(3)
+    lines = ['거래일시,적요,입금액,출금액,거래후잔액,거래점']
+    for i in range(rows):
+        description = f"거래 {i}"
+        if rng.random() < 0.1:
+            description = f'"{description}\n둘째 줄"'
+        if rng.random() < 0.1:
+            description = f'"{description.strip(chr(34))} ""인용"" 포함"'
+        lines.append(f"2025-07-{i % 28 + 1:02d} 12:00:00,{description},{i},0,{i * 10},온라인")
+
+    return ('\n'.join(lines) + ('\n' if trailing_newline else '')).encode()
+
+
+def split_sizes(seed: int, size: int):
+    # 첫 조각들은 압축 형식 magic 보다 짧게
+    rng = random.Random(seed)
+    return [1, 2] + [rng.randint(1, size) for _ in range(100_000)]
+
+
+def write(tmp_path, upload):
+    return asyncio.run(TransactionUploadWriter(str(tmp_path / 'upload.csv')).write(upload))
+
+
+def gzip_members(data: bytes) -> bytes:
+    # 여러 멤버를 이어 붙인 gzip (pigz 등)
+    middle = len(data) // 2
+    return gzip.compress(data[:middle]) + gzip.compress(data[middle:])
+
+
+@pytest.mark.parametrize('compress', [
+    lambda data: data,
+    gzip.compress,
+    gzip_members,
+    lambda data: zstandard.ZstdCompressor().compress(data),
+], ids=['plain', 'gzip', 'gzip members', 'zstd'])
+@pytest.mark.parametrize('max_chunk', [64, 4096])
+def test_chunked_upload_is_stored_decompressed_with_rows_and_hash(tmp_path, compress, max_chunk):
+    data = csv_bytes()
+
+    upload = write(tmp_path, ChunkedUpload(compress(data), split_sizes(max_chunk, max_chunk)))
+
+    with open(upload.file_path, 'rb') as f:
+        assert f.read() == data
+    # 따옴표 안의 개행은 행 끝이 아니다
+    assert upload.total_rows == ROWS
+    assert upload.content_hash == hashlib.sha256(data).hexdigest()
+    assert not os.path.exists(f"{upload.file_path}.part")
+
+
+def test_last_row_without_newline_is_counted(tmp_path):
+    upload = write(tmp_path, ChunkedUpload(csv_bytes(rows=3, trailing_newline=False), split_sizes(0, 7)))
+
+    assert upload.total_rows == 3
+
+
+@pytest.mark.parametrize('data', [
+    '거래일시,적요,입금액\n2025-07-01 12:00:00,쿠팡,1000\n'.encode(),
+    gzip.compress('거래일시,적요,입금액,출금액\n'.encode()),
+    b'',
+], ids=['plain', 'gzip', 'empty'])
+def test_missing_columns_are_rejected_and_nothing_is_left(tmp_path, data):
+    with pytest.raises(ValueError, match='missing columns'):
+        write(tmp_path, ChunkedUpload(data, split_sizes(1, 3)))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_header_check_does_not_wait_for_the_whole_file(tmp_path):
+    class Unfinished(ChunkedUpload):
+        async def read(self, size: int = -1) -> bytes:
+            data = await super().read(size)
+            # 헤더 뒤의 데이터를 읽으려 하면 이미 헤더 검사가 끝났어야 한다
+            if not data:
+                raise AssertionError("read past the header")
+            return data
+
+    with pytest.raises(ValueError, match='missing columns'):
+        write(tmp_path, Unfinished('적요,입금액\n'.encode() + b'x' * 100, [4, 4, 4, 4, 100]))
+
+
+def test_invalid_upload_is_a_bad_request(tmp_path, monkeypatch):
+    monkeypatch.setattr(AccountingService, 'UPLOAD_PATH', str(tmp_path))
+    service = AccountingService(None, None, None, None, None, None, None)
+    transactions = UploadFile(io.BytesIO('적요,입금액\n쿠팡,1000\n'.encode()), filename='bank.csv')
+    rules = UploadFile(io.BytesIO(b'{"companies": []}'), filename='rules.json')
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(service.process(transactions, rules))
+
+    assert e.value.status_code == 400
+    assert '거래일시' in e.value.detail
+    assert os.listdir(tmp_path) == []
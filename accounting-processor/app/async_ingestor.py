@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor
+from typing import Optional
+
+from app.classifier.description_memo import DescriptionMemo
+from app.classifier.rule_matcher import Matcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+from app.entity.ingest_result import IngestResult
+from app.entity.transaction_block import TransactionBlock
+from app.metrics.worker_metrics import (
+    STAGE_SECONDS, BATCH_SECONDS, ROWS_PROCESSED, ROWS_SKIPPED, ROWS_REJECTED, DESCRIPTION_MEMO_LOOKUPS
+)
+from app.progress.job_progress_tracker import JobProgressTracker
+from app.reader.rejects_report import RejectsReport
+from app.reader.transaction_csv_reader import TransactionCsvReader, ByteRange
+from app.repository.transaction_block_writer import TransactionBlockWriter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransactionIngestor:
+    """
+    TransactionIngestor 의 비동기 버전: 읽기/분류와 DB 쓰기를 크기가 제한된 큐로 이어 겹쳐 실행
+
+    - 읽기/분류/레코드 변환은 executor 에서 실행해 이벤트 루프를 막지 않는다
+    - 쓰기가 밀리면 큐가 차서 다음 청크를 읽지 않으므로 메모리에 올라오는 청크는 pipeline_depth + 2 개 이하
+    """
+
+    def __init__(self, progress_tracker: JobProgressTracker, block_writer: TransactionBlockWriter,
+                 executor: Optional[Executor] = None,
+                 pipeline_depth: int = int(os.getenv("ASYNC_PIPELINE_DEPTH", 2))):
+        self.__progress_tracker = progress_tracker
+        self.__block_writer = block_writer
+        self.__executor = executor
+        self.__pipeline_depth = pipeline_depth
+
+    async def ingest_range(self, job_id: str, csv_file_path: str, matcher: Matcher,
+                           shard_no: int, byte_range: ByteRange) -> IngestResult:
+        loop = asyncio.get_running_loop()
+        memo = DescriptionMemo()
+        frame_builder = TransactionFrameBuilder(matcher, memo)
+        rejects = RejectsReport(csv_file_path, shard_no)
+        blocks = TransactionCsvReader(csv_file_path).read_blocks(byte_range, rejects)
+        queue: asyncio.Queue[Optional[TransactionBlock]] = asyncio.Queue(maxsize=self.__pipeline_depth)
+        result = IngestResult()
+
+        def next_block() -> Optional[TransactionBlock]:
+            started = time.perf_counter()
+            item = next(blocks, None)
+            if item is None:
+                return None
+
+            end_offset, chunk = item
+            read = time.perf_counter()
+            block = self.__block_writer.prepare(end_offset, frame_builder.build(job_id, chunk))
+
+            STAGE_SECONDS.labels('read').observe(read - started)
+            STAGE_SECONDS.labels('classify').observe(time.perf_counter() - read)
+            return block
+
+        async def produce():
+            try:
+                # 생성기를 한 번에 하나의 executor 작업에서만 진행시킨다
+                while (block := await loop.run_in_executor(self.__executor, next_block)) is not None:
+                    await queue.put(block)
+            except Exception:
+                # 쓰기 단계가 대기에서 빠져나와 아래에서 예외를 전파하도록 종료 표시를 넣는다
+                await queue.put(None)
+                raise
+
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+
+        try:
+            while (block := await queue.get()) is not None:
+                started = time.perf_counter()
+                await self.__block_writer.ensure_months(block.months)
+                partitioned = time.perf_counter()
+
+                saved = await self.__block_writer.write(job_id, shard_no, block)
+                STAGE_SECONDS.labels('partition').observe(partitioned - started)
+                STAGE_SECONDS.labels('write').observe(time.perf_counter() - partitioned)
+                rejected = await asyncio.to_thread(rejects.flush, block.end_offset)
+
+                result.processed_rows += block.rows
+                result.skipped_rows += block.rows - saved
+                result.rejected_rows += rejected
+                result.company_ids |= block.company_ids
+                await asyncio.to_thread(self.__progress_tracker.advance, job_id, block.rows)
+
+                ROWS_PROCESSED.inc(block.rows)
+                ROWS_SKIPPED.inc(block.rows - saved)
+                ROWS_REJECTED.inc(rejected)
+                BATCH_SECONDS.observe(time.perf_counter() - started)
+
+            # 읽기/분류 단계의 예외를 전파
+            await producer
+        finally:
+            producer.cancel()
+
+        await asyncio.to_thread(self.__progress_tracker.checkpoint, job_id)
+        DESCRIPTION_MEMO_LOOKUPS.labels('hit').inc(memo.hits)
+        DESCRIPTION_MEMO_LOOKUPS.labels('miss').inc(memo.misses)
+
+        logger.info(f"Job {job_id} shard {shard_no} {byte_range}: {result.processed_rows} rows, "
+                    f"{result.skipped_rows} duplicates skipped, {result.rejected_rows} rejected, "
+                    f"description memo hits {memo.hits} / misses {memo.misses} ({memo.hit_rate:.1%})")
+        if result.rejected_rows:
+            logger.warning(f"Job {job_id} shard {shard_no}: {result.rejected_rows} rejected rows written to "
+                           f"{rejects.path}")
+
+        return result
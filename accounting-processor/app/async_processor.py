@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import traceback
+from typing import List, Optional
+
+from app.async_ingestor import AsyncTransactionIngestor
+from app.cache.record_cache_invalidator import RecordCacheInvalidator
+from app.classifier.matcher_cache import MatcherCache
+from app.entity.ingest_result import IngestResult
+from app.entity.processing_job import ProcessingJob
+from app.entity.shard_checkpoint import ShardCheckpoint
+from app.progress.job_progress_tracker import JobProgressTracker
+from app.reader.transaction_csv_reader import TransactionCsvReader
+from app.repository.impl.postgres_processing_job_checkpoint_repository import \
+    PostgresProcessingJobCheckpointRepository
+from app.repository.impl.postgres_rules_set_repository import PostgresRulesSetRepository
+from app.repository.processing_job_checkpoint_repository import ProcessingJobCheckpointRepository
+from app.repository.processing_job_repository import ProcessingJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransactionProcessor:
+    """
+    TransactionProcessor 의 비동기 버전 (한 이벤트 루프에서 여러 작업을 동시에 처리)
+
+    - 청크 적재는 AsyncTransactionIngestor 가 asyncpg 로 수행
+    - 작업 상태/체크포인트 계획 등 작업당 몇 번뿐인 조회/갱신은 기존 동기 저장소를 스레드에서 호출
+    - 작업 단위 동시 처리로 병렬화하므로 샤드 프로세스로 나누지 않는다 (이전 시도의 샤드 체크포인트는 차례로 이어서 처리)
+    """
+
+    def __init__(self, processing_job_repository: ProcessingJobRepository,
+                 ingestor: AsyncTransactionIngestor,
+                 progress_tracker: JobProgressTracker,
+                 record_cache_invalidator: Optional[RecordCacheInvalidator] = None,
+                 matcher_cache: Optional[MatcherCache] = None,
+                 checkpoint_repository: Optional[ProcessingJobCheckpointRepository] = None):
+        self.__processing_job_repository = processing_job_repository
+        self.__ingestor = ingestor
+        self.__progress_tracker = progress_tracker
+        self.__record_cache_invalidator = record_cache_invalidator
+        self.__matcher_cache = matcher_cache or MatcherCache(PostgresRulesSetRepository())
+        self.__checkpoint_repository = checkpoint_repository or PostgresProcessingJobCheckpointRepository()
+        # MatcherCache 는 스레드 안전하지 않으므로 조회/컴파일을 한 번에 하나씩
+        self.__matcher_lock = asyncio.Lock()
+
+    async def process_job(self, job_id: str):
+        try:
+            job_info = await asyncio.to_thread(self.__processing_job_repository.find_and_update_status, job_id)
+            processing_job = ProcessingJob.from_job_info(job_id, job_info)
+
+            reader = TransactionCsvReader(processing_job.csv_file_path)
+            if not processing_job.total_rows:
+                processing_job.set_total_rows(await asyncio.to_thread(reader.count_rows))
+
+            checkpoints = await asyncio.to_thread(self.__plan, job_id, reader)
+            processing_job.processed(sum(checkpoint.committed_rows for checkpoint in checkpoints))
+            await asyncio.to_thread(self.__processing_job_repository.update_progress, processing_job)
+            await asyncio.to_thread(self.__progress_tracker.start, job_id, processing_job.total_rows,
+                                    processing_job.processed_rows)
+
+            async with self.__matcher_lock:
+                matcher = await asyncio.to_thread(self.__matcher_cache.get, processing_job.rules_hash,
+                                                  processing_job.rules_data)
+
+            result = IngestResult()
+            for checkpoint in checkpoints:
+                if not checkpoint.done:
+                    result.merge(await self.__ingestor.ingest_range(job_id, processing_job.csv_file_path, matcher,
+                                                                    checkpoint.shard_no, checkpoint.remaining_range))
+
+            processing_job.processed(result.processed_rows)
+            processing_job.complete()
+            await asyncio.to_thread(self.__processing_job_repository.complete_job, processing_job)
+
+            await asyncio.to_thread(self.__checkpoint_repository.delete_by_job, job_id)
+            await asyncio.to_thread(self.__progress_tracker.complete, job_id, processing_job.processed_rows)
+
+            if self.__record_cache_invalidator:
+                await asyncio.to_thread(self.__record_cache_invalidator.invalidate, result.company_ids)
+
+            return {
+                "job_id": job_id,
+                "status": "completed",
+                "processed_rows": processing_job.processed_rows,
+                "skipped_rows": result.skipped_rows,
+                "rejected_rows": result.rejected_rows,
+                "total_rows": processing_job.total_rows
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing job {job_id}: {str(e)}, trace: {traceback.format_exc()}")
+            await asyncio.to_thread(self.__processing_job_repository.fail_job, job_id, e)
+            await asyncio.to_thread(self.__progress_tracker.fail, job_id, e)
+
+            raise
+
+    def __plan(self, job_id: str, reader: TransactionCsvReader) -> List[ShardCheckpoint]:
+        checkpoints = self.__checkpoint_repository.find_by_job(job_id)
+
+        if checkpoints:
+            resumed = sum(checkpoint.committed_rows for checkpoint in checkpoints)
+            logger.info(f"Job {job_id} resumes from checkpoints ({resumed} rows already committed)")
+            return checkpoints
+
+        return self.__checkpoint_repository.save_plan(job_id, reader.split_byte_ranges(1))
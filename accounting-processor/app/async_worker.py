@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+
+import redis
+
+from app.async_ingestor import AsyncTransactionIngestor
+from app.async_processor import AsyncTransactionProcessor
+from app.cache.record_cache_invalidator import RecordCacheInvalidator
+from app.database.asyncpg_db import get_async_pool, close_async_pool
+from app.database.postgres_db import close_pool
+from app.database.redis_db import get_async_redis, get_redis
+from app.metrics.worker_metrics import JOBS, JOB_SECONDS
+from app.progress.job_progress_tracker import JobProgressTracker
+from app.queue.async_reliable_task_queue import AsyncReliableTaskQueue
+from app.queue.task_queue_core import Task, TASK_RECLASSIFY
+from app.reclassifier import TransactionReclassifier
+from app.repository.impl.asyncpg_transaction_block_writer import AsyncpgTransactionBlockWriter
+from app.repository.impl.postgres_processing_job_repository import PostgresProcessingJobRepository
+from app.repository.impl.postgres_transaction_repository import PostgresTransactionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWorker:
+    """
+    하나의 이벤트 루프에서 최대 JOB_CONCURRENCY 개의 작업을 동시에 처리하는 워커 (WORKER_RUNTIME=async)
+
+    처리 중인 작업이 JOB_CONCURRENCY 개면 큐에서 더 가져오지 않아, 남은 작업은 다른 워커가 가져갈 수 있다
+    """
+    REDIS_QUEUE_NAME = 'accounting_tasks'
+    RESERVE_TIMEOUT = 5
+    REAP_INTERVAL = float(os.getenv("TASK_REAP_INTERVAL", 30))
+    HEARTBEAT_INTERVAL = float(os.getenv("TASK_HEARTBEAT_INTERVAL", 30))
+    JOB_CONCURRENCY = int(os.getenv("ASYNC_JOB_CONCURRENCY", 4))
+    # 읽기/분류를 실행할 스레드 수 (GIL 때문에 분류끼리는 겹치지 않지만 DB/Redis 대기와는 겹친다)
+    CLASSIFY_THREADS = int(os.getenv("ASYNC_CLASSIFY_THREADS", 2))
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.processing_job_repository = PostgresProcessingJobRepository()
+        self.running = True
+        self.__jobs: Set[asyncio.Task] = set()
+        self.__last_reaped_at = 0.0
+
+    def signal_handler(self):
+        if not self.running:
+            logger.info("종료 시그널 재수신. 즉시 종료합니다")
+            raise SystemExit(1)
+
+        logger.info(f"종료 시그널 받음. 처리 중인 작업 {len(self.__jobs)}개를 마친 뒤 워커를 중지합니다...")
+        self.running = False
+
+    def run(self):
+        asyncio.run(self.__main())
+
+    async def __main(self):
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, self.signal_handler)
+        loop.add_signal_handler(signal.SIGTERM, self.signal_handler)
+
+        self.redis_client = get_async_redis()
+        self.task_queue = AsyncReliableTaskQueue(self.redis_client, self.worker_id, queue_name=self.REDIS_QUEUE_NAME)
+        executor = ThreadPoolExecutor(max_workers=self.CLASSIFY_THREADS, thread_name_prefix='classify')
+        progress_tracker = JobProgressTracker(self.processing_job_repository)
+        self.processor = AsyncTransactionProcessor(
+            self.processing_job_repository,
+            AsyncTransactionIngestor(progress_tracker, AsyncpgTransactionBlockWriter(), executor),
+            progress_tracker,
+            record_cache_invalidator=RecordCacheInvalidator(get_redis())
+        )
+        # 재분류는 적재 파이프라인이 없는 배치 UPDATE 이므로 동기 구현을 스레드에서 실행
+        self.reclassifier = TransactionReclassifier(
+            self.processing_job_repository,
+            PostgresTransactionRepository(),
+            record_cache_invalidator=RecordCacheInvalidator(get_redis()),
+            progress_tracker=progress_tracker
+        )
+
+        logger.info(f"비동기 워커 시작 (동시 작업 {self.JOB_CONCURRENCY}개). 작업 대기 중...")
+
+        try:
+            await get_async_pool()
+            await self.__consume()
+        finally:
+            executor.shutdown(wait=True)
+            await close_async_pool()
+            close_pool()
+            await self.redis_client.aclose()
+
+            logger.info("워커 종료")
+
+    async def __consume(self):
+        slots = asyncio.Semaphore(self.JOB_CONCURRENCY)
+
+        while self.running:
+            await slots.acquire()
+            if not self.running:
+                slots.release()
+                break
+
+            try:
+                await self.__reap_stalled_tasks()
+                task = await self.task_queue.reserve(timeout=self.RESERVE_TIMEOUT)
+            except redis.ConnectionError:
+                logger.error("Redis 연결 실패. 5초 후 재시도...")
+                slots.release()
+                await asyncio.sleep(5)
+                continue
+            except Exception as e:
+                logger.error(f"예상치 못한 오류: {str(e)}")
+                slots.release()
+                await asyncio.sleep(1)
+                continue
+
+            if task is None:
+                slots.release()
+                continue
+
+            job = asyncio.create_task(self.__handle(task))
+            self.__jobs.add(job)
+            job.add_done_callback(self.__jobs.discard)
+            job.add_done_callback(lambda _: slots.release())
+
+        if self.__jobs:
+            await asyncio.gather(*self.__jobs, return_exceptions=True)
+
+    async def __handle(self, task: Task):
+        logger.info(f"작업 시작: {task.job_id} (시도 {task.attempts + 1})")
+
+        heartbeat = asyncio.create_task(self.__heartbeat(task))
+        started = time.perf_counter()
+
+        try:
+            if task.task_type == TASK_RECLASSIFY:
+                await asyncio.to_thread(self.reclassifier.process_job, task.job_id)
+            else:
+                await self.processor.process_job(task.job_id)
+            await self.task_queue.ack(task)
+            JOBS.labels('completed').inc()
+            logger.info(f"작업 완료: {task.job_id}")
+
+        except Exception as e:
+            logger.error(f"작업 실패: {task.job_id}, 오류: {str(e)}")
+            await self.task_queue.fail(task, str(e))
+            JOBS.labels('failed').inc()
+
+        finally:
+            JOB_SECONDS.observe(time.perf_counter() - started)
+            heartbeat.cancel()
+
+    async def __heartbeat(self, task: Task):
+        # 처리 중인 작업이 가시성 시간 초과로 회수되지 않도록 주기적으로 만료 시각을 연장
+        while True:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            try:
+                await self.task_queue.heartbeat(task)
+            except redis.RedisError as e:
+                logger.warning(f"하트비트 실패: {task.job_id}, 오류: {str(e)}")
+
+    async def __reap_stalled_tasks(self):
+        if time.monotonic() - self.__last_reaped_at < self.REAP_INTERVAL:
+            return
+
+        self.__last_reaped_at = time.monotonic()
+
+        for payload in await self.task_queue.reap_stalled():
+            await asyncio.to_thread(self.processing_job_repository.fail_job, payload['job_id'],
+                                    Exception(payload.get('last_error')))
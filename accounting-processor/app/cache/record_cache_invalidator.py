@@ -0,0 +1,35 @@
+import json
+import logging
+from typing import Iterable
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# accounting-api 의 CachedCompanyRecordRepository 와 공유하는 키
+RECORDS_VERSION_KEY = 'records:version:{company_id}'
+RECORDS_INVALIDATED_CHANNEL = 'records:invalidated'
+
+
+class RecordCacheInvalidator:
+    """
+    회사별 버전 키를 증가시켜 API 의 거래 내역 캐시를 무효화 (이전 버전 키는 TTL 로 자연 만료)
+    """
+
+    def __init__(self, redis_client):
+        self.__redis = redis_client
+
+    def invalidate(self, company_ids: Iterable[str]) -> None:
+        company_ids = sorted(company_ids)
+        if not company_ids:
+            return
+
+        try:
+            pipeline = self.__redis.pipeline()
+            for company_id in company_ids:
+                pipeline.incr(RECORDS_VERSION_KEY.format(company_id=company_id))
+            pipeline.publish(RECORDS_INVALIDATED_CHANNEL, json.dumps({"company_ids": company_ids}))
+            pipeline.execute()
+        except redis.RedisError as e:
+            # 캐시 무효화 실패가 작업 실패로 이어지지 않도록 하고, 남은 캐시는 TTL 로 만료
+            logger.error(f"Record cache invalidation failed for {company_ids}: {str(e)}")
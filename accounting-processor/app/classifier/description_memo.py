@@ -0,0 +1,45 @@
+import os
+from collections import OrderedDict
+from typing import Optional
+
+
+class DescriptionMemo:
+    """
+    작업 단위로 유지하는 정규화(소문자) 적요 → 적요 분류 결과(matcher.match_text) LRU 메모
+
+    - 정기 카드 정산, 급여 등 반복되는 적요는 청크가 달라도 한 번만 분류
+    - KeywordMatcher 는 matcher.targets 의 인덱스(우선순위), RuleMatcher 는 적요 조건을 만족하는 규칙 마스크를 보관
+    """
+
+    def __init__(self, capacity: int = int(os.getenv("DESCRIPTION_MEMO_SIZE", 100000))):
+        self.__capacity = capacity
+        self.__priorities: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[int]:
+        priority = self.__priorities.get(text)
+
+        if priority is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__priorities.move_to_end(text)
+
+        return priority
+
+    def put(self, text: str, priority: int) -> None:
+        self.__priorities[text] = priority
+
+        if len(self.__priorities) > self.__capacity:
+            self.__priorities.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self.__priorities)
@@ -0,0 +1,128 @@
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+NO_MATCH = -1
+
+
+class KeywordMatcher:
+    """
+    rules_data 의 모든 키워드를 하나의 Aho-Corasick 오토마톤으로 컴파일한 분류기
+
+    - 규칙 순서(회사 → 카테고리 → 키워드)가 곧 우선순위이며, 기존 중첩 루프와 동일하게 first-match-wins 를 유지
+    - 분류 비용은 규칙 수와 무관하게 적요 길이에 선형
+    """
+
+    def __init__(self, targets: List[Tuple[str, str]], patterns: List[Tuple[str, int]]):
+        self.__targets = targets
+        self.__goto = [{}]
+        self.__fail = [0]
+        self.__best = [NO_MATCH]
+
+        for pattern, priority in patterns:
+            self.__insert(pattern, priority)
+
+        self.__build_failure_links()
+
+    @classmethod
+    def from_rules(cls, rules: dict) -> 'KeywordMatcher':
+        targets = []
+        patterns = []
+
+        for company in rules.get('companies', []):
+            company_id = company['company_id']
+
+            for category in company.get('categories', []):
+                priority = len(targets)
+                targets.append((company_id, category['category_id']))
+
+                for keyword in category.get('keywords', []):
+                    patterns.append((keyword.lower(), priority))
+
+        return cls(targets, patterns)
+
+    def match(self, description: str, *conditions) -> Tuple[Optional[str], Optional[str]]:
+        # 키워드 규칙은 금액/날짜 조건(conditions)을 보지 않는다
+        priority = self.match_priority(description.lower())
+
+        if priority == NO_MATCH:
+            return None, None
+
+        return self.__targets[priority]
+
+    def match_priority(self, text: str) -> int:
+        goto = self.__goto
+        fail = self.__fail
+        best = self.__best
+
+        state = 0
+        found = best[0]
+
+        for char in text:
+            while char not in goto[state] and state:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            priority = best[state]
+            if priority != NO_MATCH and (found == NO_MATCH or priority < found):
+                found = priority
+                if found == 0:
+                    break
+
+        return found
+
+    def match_text(self, text: str) -> int:
+        return self.match_priority(text)
+
+    def resolve(self, text_results: List[int], codes: np.ndarray, *conditions) -> np.ndarray:
+        # 적요만으로 분류가 끝나므로 고유 적요 결과를 행으로 펼치기만 한다
+        return np.array(text_results, dtype=np.int64)[codes]
+
+    @property
+    def targets(self) -> List[Tuple[str, str]]:
+        return self.__targets
+
+    def __insert(self, pattern: str, priority: int) -> None:
+        state = 0
+
+        for char in pattern:
+            next_state = self.__goto[state].get(char)
+
+            if next_state is None:
+                next_state = len(self.__goto)
+                self.__goto[state][char] = next_state
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__best.append(NO_MATCH)
+
+            state = next_state
+
+        # 같은 키워드가 여러 카테고리에 있으면 먼저 선언된 규칙이 우선
+        if self.__best[state] == NO_MATCH or priority < self.__best[state]:
+            self.__best[state] = priority
+
+    def __build_failure_links(self) -> None:
+        queue = deque(self.__goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for char, next_state in self.__goto[state].items():
+                fallback = self.__fail[state]
+                while char not in self.__goto[fallback] and fallback:
+                    fallback = self.__fail[fallback]
+
+                self.__fail[next_state] = self.__goto[fallback].get(char, 0)
+                self.__best[next_state] = self.__min_priority(self.__best[next_state],
+                                                              self.__best[self.__fail[next_state]])
+                queue.append(next_state)
+
+    @staticmethod
+    def __min_priority(a: int, b: int) -> int:
+        if a == NO_MATCH:
+            return b
+        if b == NO_MATCH:
+            return a
+
+        return min(a, b)
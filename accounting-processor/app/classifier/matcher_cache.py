@@ -0,0 +1,122 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+from app.classifier.rule_matcher import COMPILER_VERSION, Matcher, compile_rules
+from app.metrics.worker_metrics import MATCHER_CACHE_LOOKUPS
+from app.repository.rules_set_repository import RulesSetRepository
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_BYTES = hashlib.sha256().digest_size
+
+
+def hash_rules(rules_data: dict) -> str:
+    # accounting-api 와 같은 정규화(키 정렬, 공백 제거) 후 sha256
+    # 두 구현이 같은 해시를 내는지는 양쪽 테스트가 같은 규칙/해시(test_rules_hash)로 고정한다
+    canonical = json.dumps(rules_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class MatcherCache:
+    """
+    rules_hash 로 컴파일된 matcher(KeywordMatcher / RuleMatcher)를 재사용하는 LRU 캐시
+
+    - 메모리 → 디스크(cache_dir 의 pickle) → rules_sets 조회 후 컴파일 순으로 찾는다
+    - 디스크 캐시는 워커 재시작 후에도 유지되어 같은 규칙의 첫 작업부터 컴파일 비용이 없다
+    - 디스크 캐시 파일명에 COMPILER_VERSION 을 넣어 컴파일 방식이 바뀐 배포 후 이전 pickle 을 쓰지 않는다
+    - 공유 볼륨의 pickle 은 쓸 수 있는 누구나 코드 실행에 쓸 수 있으므로, 파일마다 cache_key 로 만든
+      HMAC-SHA256 서명을 붙이고 서명이 맞는 파일만 불러온다 (cache_key 가 없으면 디스크 캐시를 쓰지 않는다)
+    """
+
+    def __init__(self, rules_set_repository: RulesSetRepository,
+                 capacity: int = int(os.getenv("MATCHER_CACHE_SIZE", 32)),
+                 cache_dir: Optional[str] = os.getenv("MATCHER_CACHE_DIR", "/app/shared/rules_cache"),
+                 cache_key: Optional[str] = os.getenv("MATCHER_CACHE_KEY")):
+        if cache_dir and not cache_key:
+            logger.warning("MATCHER_CACHE_KEY is not set, compiled rules disk cache is disabled")
+            cache_dir = None
+
+        self.__rules_set_repository = rules_set_repository
+        self.__capacity = capacity
+        self.__cache_dir = cache_dir
+        self.__cache_key = cache_key.encode() if cache_key else b''
+        self.__matchers: OrderedDict[str, Matcher] = OrderedDict()
+
+    def get(self, rules_hash: Optional[str], rules_data: Optional[dict] = None) -> Matcher:
+        # rules_hash 가 없는 이전 작업은 rules_data 로부터 해시를 계산
+        key = rules_hash or hash_rules(rules_data)
+
+        matcher = self.__matchers.get(key)
+        if matcher is not None:
+            self.__matchers.move_to_end(key)
+            MATCHER_CACHE_LOOKUPS.labels('memory').inc()
+            return matcher
+
+        matcher = self.__load(key)
+        if matcher is None:
+            matcher = compile_rules(rules_data if rules_data is not None
+                                    else self.__rules_set_repository.find_rules(key))
+            self.__dump(key, matcher)
+            MATCHER_CACHE_LOOKUPS.labels('compiled').inc()
+        else:
+            MATCHER_CACHE_LOOKUPS.labels('disk').inc()
+
+        self.__matchers[key] = matcher
+        if len(self.__matchers) > self.__capacity:
+            self.__matchers.popitem(last=False)
+
+        return matcher
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.__cache_dir, f"v{COMPILER_VERSION}-{key}.pkl")
+
+    def __load(self, key: str) -> Optional[Matcher]:
+        if not self.__cache_dir:
+            return None
+
+        try:
+            with open(self.__path(key), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Compiled rules cache load failed ({key}): {str(e)}")
+            return None
+
+        signature, payload = data[:SIGNATURE_BYTES], data[SIGNATURE_BYTES:]
+        if not hmac.compare_digest(signature, self.__sign(key, payload)):
+            logger.warning(f"Compiled rules cache signature mismatch ({key}), recompiling")
+            return None
+
+        try:
+            return pickle.loads(payload)
+        except Exception as e:
+            logger.warning(f"Compiled rules cache load failed ({key}): {str(e)}")
+            return None
+
+    def __dump(self, key: str, matcher: Matcher) -> None:
+        if not self.__cache_dir:
+            return
+
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+
+            payload = pickle.dumps(matcher, protocol=pickle.HIGHEST_PROTOCOL)
+            # 다른 워커가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            with tempfile.NamedTemporaryFile('wb', dir=self.__cache_dir, delete=False) as f:
+                f.write(self.__sign(key, payload) + payload)
+            os.replace(f.name, self.__path(key))
+        except OSError as e:
+            logger.warning(f"Compiled rules cache store failed ({key}): {str(e)}")
+
+    def __sign(self, key: str, payload: bytes) -> bytes:
+        # 서명에 rules_hash 를 넣어 다른 규칙의 캐시 파일을 이름만 바꿔 쓸 수 없게 한다
+        return hmac.new(self.__cache_key, key.encode() + b'\0' + payload, hashlib.sha256).digest()
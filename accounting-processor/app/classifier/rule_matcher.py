@@ -0,0 +1,374 @@
+import re
+from collections import deque
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.classifier.keyword_matcher import KeywordMatcher, NO_MATCH
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+AMOUNT_FIELDS = ('amount_in', 'amount_out')
+# 규칙에 하나라도 있으면 RuleMatcher 로 컴파일하는 확장 키
+EXTENDED_KEYS = ('conditions', 'priority')
+EPOCH = date(1970, 1, 1)
+# 오토마톤 상태별 출력 (include 규칙, exclude 규칙, 정규식 트리거) 위치
+INCLUDE, EXCLUDE, TRIGGER = 0, 1, 2
+
+
+class IntervalTable:
+    """
+    범위 조건을 정렬된 경계값과 구간별 규칙 비트마스크로 컴파일한 bisect 테이블
+
+    - 값이 속한 구간은 searchsorted 로 찾고, 그 구간의 마스크가 곧 조건을 만족하는 규칙 집합
+    - 조건이 없는 규칙은 모든 구간의 마스크에 포함
+    - 한 규칙의 범위가 여러 개면 합집합 (겹치는 범위도 규칙별로 걸친 범위 수를 세어 하나라도 걸치면 포함)
+    """
+
+    def __init__(self, ranges: List[Tuple[int, Optional[int], Optional[int]]], unconditional: int):
+        # 경계값 → {규칙 순위: 걸친 범위 수 증감}
+        events: Dict[int, Dict[int, int]] = {}
+        counts: Dict[int, int] = {}
+
+        for rank, low, high in ranges:
+            if low is None:
+                counts[rank] = counts.get(rank, 0) + 1
+            else:
+                deltas = events.setdefault(low, {})
+                deltas[rank] = deltas.get(rank, 0) + 1
+            if high is not None:
+                deltas = events.setdefault(high + 1, {})
+                deltas[rank] = deltas.get(rank, 0) - 1
+
+        current = sum(1 << rank for rank, count in counts.items() if count)
+        self.boundaries = np.array(sorted(events), dtype=np.int64)
+        self.masks = [unconditional | current]
+        for boundary in self.boundaries.tolist():
+            for rank, delta in events[boundary].items():
+                counts[rank] = counts.get(rank, 0) + delta
+                if counts[rank]:
+                    current |= 1 << rank
+                else:
+                    current &= ~(1 << rank)
+            self.masks.append(unconditional | current)
+
+    def locate(self, values: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.boundaries, values, side='right')
+
+
+class RuleMatcher:
+    """
+    rules_data v2(conditions, priority) 를 인덱스 구조로 컴파일한 분류기
+
+    - 규칙은 (priority, 선언 순서) 로 정렬한 순위를 비트 위치로 쓰고, 조건마다 만족하는 규칙 집합을 비트마스크로 계산
+    - include/exclude 키워드는 하나의 Aho-Corasick 오토마톤으로 한 번에 찾는다
+    - 정규식은 반드시 포함되는 리터럴을 같은 오토마톤에 넣어 두고, 리터럴이 나온 적요에서만 실행
+      (리터럴을 뽑을 수 없는 정규식만 모든 고유 적요에 실행)
+    - 금액/날짜 범위는 IntervalTable 로 구간을 찾아 마스크를 AND 하고, 남은 비트 중 가장 낮은 순위가 분류 결과
+    - 적요 결과(후보 마스크)는 금액/날짜와 무관하므로 DescriptionMemo 로 재사용할 수 있다
+    """
+
+    def __init__(self, rules: dict):
+        categories = []
+        for company in rules.get('companies', []):
+            for category in company.get('categories', []):
+                categories.append((company['company_id'], category))
+
+        # priority 가 없는 규칙은 priority 가 있는 규칙 뒤에 선언 순서대로
+        order = sorted(range(len(categories)),
+                       key=lambda i: (categories[i][1].get('priority') is None,
+                                      categories[i][1].get('priority') or 0, i))
+
+        self.__targets = []
+        self.__goto = [{}]
+        self.__fail = [0]
+        self.__outputs = [[0, 0, 0]]
+        # (규칙 비트, 정규식, exclude 여부). 리터럴로 걸러지지 않는 정규식 번호는 __unfiltered_regex 마스크
+        self.__regexes: List[Tuple[int, re.Pattern, bool]] = []
+        self.__unfiltered_regex = 0
+        self.__text_free = 0
+
+        amount_ranges = {field: [] for field in AMOUNT_FIELDS}
+        amount_free = {field: 0 for field in AMOUNT_FIELDS}
+        date_ranges = []
+        date_free = 0
+
+        for rank, index in enumerate(order):
+            company_id, category = categories[index]
+            self.__targets.append((company_id, category['category_id']))
+            bit = 1 << rank
+
+            conditions = category.get('conditions', {})
+            includes = list(category.get('keywords', [])) + list(conditions.get('include_keywords', []))
+            include_regex = conditions.get('include_regex', [])
+
+            if not includes and not include_regex:
+                self.__text_free |= bit
+            for keyword in includes:
+                self.__insert(keyword.lower(), INCLUDE, bit)
+            for keyword in conditions.get('exclude_keywords', []):
+                self.__insert(keyword.lower(), EXCLUDE, bit)
+            for pattern in include_regex:
+                self.__add_regex(category, pattern, bit, False)
+            for pattern in conditions.get('exclude_regex', []):
+                self.__add_regex(category, pattern, bit, True)
+
+            restricted = set()
+            for amount_range in self.__as_list(conditions.get('amount_range')):
+                field = amount_range.get('field', 'amount_out')
+                if field not in AMOUNT_FIELDS:
+                    raise ValueError(f"Invalid amount_range field in {category['category_id']}: {field}")
+                amount_ranges[field].append(self.__range(category, rank, amount_range.get('min_amount'),
+                                                         amount_range.get('max_amount'), int))
+                restricted.add(field)
+            for field in AMOUNT_FIELDS:
+                if field not in restricted:
+                    amount_free[field] |= bit
+
+            date_range = conditions.get('date_range')
+            if date_range:
+                date_ranges.append(self.__range(category, rank, date_range.get('from'), date_range.get('to'),
+                                                self.__to_day))
+            else:
+                date_free |= bit
+
+        self.__build_failure_links()
+        # 출력이 없는 상태(대부분)는 스캔 중 마스크 연산을 건너뛰도록 None 으로 둔다
+        self.__outputs = [tuple(outputs) if any(outputs) else None for outputs in self.__outputs]
+
+        # 조건이 없는 축은 테이블 없이 건너뛴다
+        self.__tables = []
+        for field in AMOUNT_FIELDS:
+            if amount_ranges[field]:
+                self.__tables.append((field, IntervalTable(amount_ranges[field], amount_free[field])))
+        if date_ranges:
+            self.__tables.append(('transaction_date', IntervalTable(date_ranges, date_free)))
+
+    @classmethod
+    def from_rules(cls, rules: dict) -> 'RuleMatcher':
+        return cls(rules)
+
+    @property
+    def targets(self) -> List[Tuple[str, str]]:
+        return self.__targets
+
+    def match(self, description: str, amount_in: int = 0, amount_out: int = 0,
+              transaction_date: Optional[date] = None) -> Tuple[Optional[str], Optional[str]]:
+        mask = self.match_text(description.lower())
+        values = {'amount_in': amount_in, 'amount_out': amount_out,
+                  'transaction_date': self.__to_day(transaction_date or date.today())}
+
+        for name, table in self.__tables:
+            mask &= table.masks[int(table.locate(np.array([values[name]]))[0])]
+
+        if not mask:
+            return None, None
+
+        return self.__targets[self.__lowest_rank(mask)]
+
+    def match_text(self, text: str) -> int:
+        """
+        소문자 적요가 텍스트 조건(include/exclude 키워드, 정규식)을 만족하는 규칙 마스크
+        """
+        goto = self.__goto
+        fail = self.__fail
+        outputs = self.__outputs
+
+        state = 0
+        included = self.__text_free
+        excluded = 0
+        triggered = self.__unfiltered_regex
+
+        for char in text:
+            while char not in goto[state] and state:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            output = outputs[state]
+            if output is not None:
+                included |= output[INCLUDE]
+                excluded |= output[EXCLUDE]
+                triggered |= output[TRIGGER]
+
+        # include 정규식을 먼저 실행해야 exclude 정규식을 후보 규칙에만 실행할 수 있다
+        if triggered:
+            matched = []
+            while triggered:
+                index = self.__lowest_rank(triggered)
+                triggered &= triggered - 1
+                matched.append(self.__regexes[index])
+
+            for bit, regex, is_exclude in sorted(matched, key=lambda item: item[2]):
+                if is_exclude:
+                    if included & bit and not excluded & bit and regex.search(text):
+                        excluded |= bit
+                elif not included & bit and regex.search(text):
+                    included |= bit
+
+        return included & ~excluded
+
+    def resolve(self, text_results: List[int], codes: np.ndarray, amount_in: np.ndarray, amount_out: np.ndarray,
+                dates: np.ndarray) -> np.ndarray:
+        """
+        고유 적요별 match_text 결과(text_results)와 행별 적요 코드/금액/날짜로 행별 순위를 계산
+
+        (적요 마스크, 금액/날짜 구간) 조합이 같은 행은 한 번만 계산
+        """
+        mask_ids = {}
+        masks = []
+        unique_mask_ids = np.empty(len(text_results), dtype=np.int64)
+        for i, mask in enumerate(text_results):
+            mask_id = mask_ids.get(mask)
+            if mask_id is None:
+                mask_id = mask_ids[mask] = len(masks)
+                masks.append(mask)
+            unique_mask_ids[i] = mask_id
+
+        ranks = np.full(len(codes), NO_MATCH, dtype=np.int64)
+        row_mask_ids = unique_mask_ids[codes]
+
+        # 텍스트 조건을 만족하는 규칙이 없는 행은 금액/날짜를 볼 필요가 없다
+        candidates = np.flatnonzero(row_mask_ids != mask_ids.get(0, -1))
+        if not len(candidates):
+            return ranks
+
+        values = {'amount_in': amount_in, 'amount_out': amount_out,
+                  'transaction_date': dates.astype('datetime64[D]').astype(np.int64)}
+        keys = np.column_stack([row_mask_ids[candidates]] +
+                               [table.locate(values[name][candidates]) for name, table in self.__tables])
+        combinations, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        combination_ranks = np.empty(len(combinations), dtype=np.int64)
+        for j, key in enumerate(combinations.tolist()):
+            mask = masks[key[0]]
+            for (_, table), interval in zip(self.__tables, key[1:]):
+                mask &= table.masks[interval]
+                if not mask:
+                    break
+            combination_ranks[j] = self.__lowest_rank(mask) if mask else NO_MATCH
+
+        ranks[candidates] = combination_ranks[inverse.reshape(-1)]
+
+        return ranks
+
+    def __add_regex(self, category: dict, pattern: str, bit: int, is_exclude: bool) -> None:
+        regex = self.__compile_regex(category, pattern)
+        index = len(self.__regexes)
+        self.__regexes.append((bit, regex, is_exclude))
+
+        literal = self.__required_literal(regex)
+        if literal:
+            self.__insert(literal.lower(), TRIGGER, 1 << index)
+        else:
+            self.__unfiltered_regex |= 1 << index
+
+    def __insert(self, pattern: str, slot: int, bit: int) -> None:
+        state = 0
+
+        for char in pattern:
+            next_state = self.__goto[state].get(char)
+
+            if next_state is None:
+                next_state = len(self.__goto)
+                self.__goto[state][char] = next_state
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__outputs.append([0, 0, 0])
+
+            state = next_state
+
+        self.__outputs[state][slot] |= bit
+
+    def __build_failure_links(self) -> None:
+        queue = deque(self.__goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for char, next_state in self.__goto[state].items():
+                fallback = self.__fail[state]
+                while char not in self.__goto[fallback] and fallback:
+                    fallback = self.__fail[fallback]
+
+                self.__fail[next_state] = self.__goto[fallback].get(char, 0)
+                for slot, bits in enumerate(self.__outputs[self.__fail[next_state]]):
+                    self.__outputs[next_state][slot] |= bits
+                queue.append(next_state)
+
+    @staticmethod
+    def __lowest_rank(mask: int) -> int:
+        return (mask & -mask).bit_length() - 1
+
+    @staticmethod
+    def __required_literal(regex: re.Pattern) -> str:
+        """
+        정규식이 일치하려면 반드시 포함해야 하는 가장 긴 리터럴 (최상위 연속 문자만 본다)
+        """
+        longest = ''
+        current = ''
+
+        for op, value in sre_parse.parse(regex.pattern, regex.flags):
+            if op is sre_parse.LITERAL:
+                current += chr(value)
+                continue
+            longest = max(longest, current, key=len)
+            current = ''
+
+        return max(longest, current, key=len)
+
+    @staticmethod
+    def __as_list(value) -> list:
+        if value is None:
+            return []
+
+        return value if isinstance(value, list) else [value]
+
+    @staticmethod
+    def __compile_regex(category: dict, pattern: str) -> re.Pattern:
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid regex in {category['category_id']}: {pattern} ({str(e)})")
+
+    @staticmethod
+    def __range(category: dict, rank: int, low, high, convert) -> Tuple[int, Optional[int], Optional[int]]:
+        low = convert(low) if low is not None else None
+        high = convert(high) if high is not None else None
+
+        if low is not None and high is not None and low > high:
+            raise ValueError(f"Invalid range in {category['category_id']}: {low} > {high}")
+
+        return rank, low, high
+
+    @staticmethod
+    def __to_day(value) -> int:
+        if isinstance(value, str):
+            value = date.fromisoformat(value[:10])
+        if hasattr(value, 'date'):
+            value = value.date()
+
+        return (value - EPOCH).days
+
+
+Matcher = Union[KeywordMatcher, RuleMatcher]
+
+# compile_rules 결과(매처 종류, 컴파일 구조)가 바뀌면 올린다. MatcherCache 의 디스크 캐시 키에 들어가
+# 이전 버전이 같은 rules_hash 로 저장한 pickle 을 읽지 않는다
+# 3: 겹치는 금액 범위 수정 (2: conditions/priority 를 RuleMatcher 로 컴파일, 1: 버전 없는 KeywordMatcher)
+COMPILER_VERSION = 3
+
+
+def compile_rules(rules: dict) -> Matcher:
+    """
+    키워드만 쓰는 규칙은 KeywordMatcher, conditions/priority 를 쓰는 규칙은 RuleMatcher 로 컴파일
+    """
+    extended = any(key in category
+                   for company in rules.get('companies', [])
+                   for category in company.get('categories', [])
+                   for key in EXTENDED_KEYS)
+
+    return RuleMatcher.from_rules(rules) if extended else KeywordMatcher.from_rules(rules)
@@ -0,0 +1,124 @@
+import bisect
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+CategoryKey = Tuple[str, str]
+
+
+@dataclass
+class RulesDiff:
+    """
+    두 규칙 세트의 차이로 분류 결과가 바뀔 수 있는 적요의 조건
+
+    - 바뀐 카테고리(추가/삭제/내용 변경/우선순위 이동)의 포함 키워드(이전, 이후 모두)를 하나도 포함하지 않는 적요는
+      이전 규칙과 새 규칙의 분류 결과가 같다
+    - 바뀐 카테고리에 정규식 포함 조건이 있거나 포함 키워드가 없으면(모든 적요가 후보) full_scan
+    """
+    changed_categories: Set[CategoryKey] = field(default_factory=set)
+    keywords: Set[str] = field(default_factory=set)
+    full_scan: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return not self.changed_categories
+
+
+def diff_rules(old_rules: dict, new_rules: dict) -> RulesDiff:
+    old_categories = _index_categories(old_rules)
+    new_categories = _index_categories(new_rules)
+    if old_categories is None or new_categories is None:
+        # 같은 (회사, 카테고리) 가 여러 번 선언된 규칙은 비교하지 않고 전체를 다시 분류
+        return RulesDiff(full_scan=True, changed_categories={('*', '*')})
+
+    changed = set(old_categories.keys() ^ new_categories.keys())
+    unchanged = []
+    for key in old_categories.keys() & new_categories.keys():
+        if _signature(old_categories[key][1]) == _signature(new_categories[key][1]):
+            unchanged.append(key)
+        else:
+            changed.add(key)
+
+    changed |= _moved(unchanged, old_categories, new_categories)
+
+    diff = RulesDiff(changed_categories=changed)
+    for key in changed:
+        for categories in (old_categories, new_categories):
+            if key not in categories:
+                continue
+
+            includes, unbounded = _include_keywords(categories[key][1])
+            diff.keywords |= includes
+            diff.full_scan |= unbounded
+
+    return diff
+
+
+def _index_categories(rules: dict):
+    categories: Dict[CategoryKey, Tuple[tuple, dict]] = {}
+    index = 0
+
+    for company in rules.get('companies', []):
+        for category in company.get('categories', []):
+            key = (company['company_id'], category['category_id'])
+            if key in categories:
+                return None
+
+            # RuleMatcher 와 같은 우선순위 (priority 가 없는 규칙은 뒤에 선언 순서대로)
+            categories[key] = ((category.get('priority') is None, category.get('priority') or 0, index), category)
+            index += 1
+
+    return categories
+
+
+def _signature(category: dict) -> str:
+    # priority 는 상대 순서로 비교하므로 제외. 키워드는 대소문자를 구분하지 않는다
+    conditions = dict(category.get('conditions', {}))
+    for name in ('include_keywords', 'exclude_keywords'):
+        if name in conditions:
+            conditions[name] = sorted({keyword.lower() for keyword in conditions[name]})
+
+    return json.dumps({
+        'keywords': sorted({keyword.lower() for keyword in category.get('keywords', [])}),
+        'conditions': conditions
+    }, sort_keys=True, ensure_ascii=False)
+
+
+def _moved(keys: List[CategoryKey], old_categories: dict, new_categories: dict) -> Set[CategoryKey]:
+    """
+    두 규칙 세트에 모두 있는 카테고리 중 서로의 상대 순서가 바뀐 카테고리
+    (새 순서의 최장 증가 부분 수열에 남는 카테고리는 상대 순서가 그대로이므로 제외)
+    """
+    keys = sorted(keys, key=lambda key: old_categories[key][0])
+    ranks = [new_categories[key][0] for key in keys]
+
+    tails: List[tuple] = []
+    tail_indexes: List[int] = []
+    previous = [-1] * len(keys)
+
+    for i, rank in enumerate(ranks):
+        position = bisect.bisect_left(tails, rank)
+        if position == len(tails):
+            tails.append(rank)
+            tail_indexes.append(i)
+        else:
+            tails[position] = rank
+            tail_indexes[position] = i
+        previous[i] = tail_indexes[position - 1] if position else -1
+
+    kept = set()
+    i = tail_indexes[-1] if tail_indexes else -1
+    while i != -1:
+        kept.add(keys[i])
+        i = previous[i]
+
+    return set(keys) - kept
+
+
+def _include_keywords(category: dict) -> Tuple[Set[str], bool]:
+    conditions = category.get('conditions', {})
+    includes = {keyword.lower() for keyword in category.get('keywords', [])}
+    includes |= {keyword.lower() for keyword in conditions.get('include_keywords', [])}
+
+    # 포함 키워드가 없으면 모든 적요가, 정규식이 있으면 키워드 밖의 적요도 이 카테고리에 걸릴 수 있다
+    return includes, not includes or bool(conditions.get('include_regex'))
@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+from app.classifier.description_memo import DescriptionMemo
+from app.classifier.rule_matcher import Matcher
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_COLUMNS = [
+    'job_id', 'company_id', 'category_id',
+    'transaction_date', 'description',
+    'amount_in', 'amount_out', 'balance_after',
+    'transaction_location', 'created_at'
+]
+# DEBUG 로그에 남길 행 표본 간격 (0 이면 남기지 않음). 행마다 로그를 남기면 적재보다 로그 출력이 느려진다
+ROW_LOG_SAMPLE_EVERY = int(os.getenv("ROW_LOG_SAMPLE_EVERY", 1000))
+FINGERPRINT_COLUMN = 'row_fingerprint'
+FINGERPRINT_SEPARATOR = '\x1f'
+
+
+def fingerprint_rows(frame: pd.DataFrame) -> pd.Series:
+    """
+    (거래일시, 적요, 입금액, 출금액, 거래후잔액) 기준 행 지문 (md5, UUID 컬럼에 저장)
+    같은 내역을 다시 업로드하면 같은 지문이 만들어져 중복 적재를 막는다
+    """
+    keys = frame['transaction_date'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    for column in ('description', 'amount_in', 'amount_out', 'balance_after'):
+        keys = keys + FINGERPRINT_SEPARATOR + frame[column].astype(str)
+
+    return pd.Series([hashlib.md5(key.encode()).hexdigest() for key in keys], index=frame.index, dtype=object)
+
+
+def summarize_rows(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    분류된 거래 내역을 (회사, 카테고리, 월) 별 건수/입출금 합계로 집계 (transaction_summaries 증분)
+    """
+    classified = frame[frame['company_id'].notna()]
+    month = classified['transaction_date'].dt.to_period('M').dt.start_time.rename('month')
+
+    return classified.groupby(['company_id', 'category_id', month], sort=False).agg(
+        transaction_count=('amount_in', 'size'),
+        amount_in=('amount_in', 'sum'),
+        amount_out=('amount_out', 'sum')
+    ).reset_index()
+
+
+class TransactionFrameBuilder:
+    """
+    CSV DataFrame 을 행 단위 객체 생성 없이 컬럼 단위로 변환/분류하여 transactions 컬럼 구성의 DataFrame 으로 만든다
+    """
+
+    def __init__(self, matcher: Matcher, memo: Optional[DescriptionMemo] = None):
+        self.__matcher = matcher
+        self.__memo = memo
+
+        targets = matcher.targets
+        # 마지막 원소는 NO_MATCH(-1) 인덱스로 조회되는 미분류 값
+        self.__company_ids = np.array([company_id for company_id, _ in targets] + [None], dtype=object)
+        self.__category_ids = np.array([category_id for _, category_id in targets] + [None], dtype=object)
+
+    def build(self, job_id: UUID, df: pd.DataFrame) -> pd.DataFrame:
+        descriptions = df['적요'].fillna('').astype(str)
+        transaction_dates = self.__to_dates(df['거래일시'])
+        amount_in = self.__to_amounts(df['입금액']).fillna(0)
+        amount_out = self.__to_amounts(df['출금액']).fillna(0)
+        company_ids, category_ids = self.classify(descriptions, amount_in, amount_out, transaction_dates)
+
+        frame = pd.DataFrame({
+            'job_id': str(job_id),
+            'company_id': company_ids,
+            'category_id': category_ids,
+            'transaction_date': transaction_dates,
+            'description': descriptions.to_numpy(),
+            'amount_in': amount_in,
+            'amount_out': amount_out,
+            'balance_after': self.__to_amounts(df['거래후잔액']),
+            'transaction_location': self.__to_locations(df),
+            'created_at': datetime.now()
+        }, index=df.index)
+
+        if ROW_LOG_SAMPLE_EVERY and logger.isEnabledFor(logging.DEBUG):
+            for row in frame.iloc[::ROW_LOG_SAMPLE_EVERY].itertuples(index=False):
+                logger.debug(f"ROW_DATA: {row}")
+
+        return frame[TRANSACTION_COLUMNS]
+
+    def classify(self, descriptions: pd.Series, amount_in: pd.Series, amount_out: pd.Series,
+                 transaction_dates: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        행별 (company_id, category_id) 배열 (미분류는 None). 저장된 거래 내역 재분류에도 사용
+        """
+        # 반복되는 적요는 한 번만 분류 (청크 안에서는 factorize, 청크 사이에서는 memo)
+        # 금액/날짜 조건은 적요 결과와 합쳐 matcher.resolve 가 행 단위로 판정
+        codes, uniques = pd.factorize(descriptions.str.lower())
+        match_text = self.__matcher.match_text if self.__memo is None else self.__memoized_match
+        text_results = [match_text(text) for text in uniques]
+
+        priorities = self.__matcher.resolve(text_results, codes,
+                                            amount_in.to_numpy(dtype=np.int64), amount_out.to_numpy(dtype=np.int64),
+                                            transaction_dates.to_numpy())
+
+        return self.__company_ids[priorities], self.__category_ids[priorities]
+
+    def __memoized_match(self, text: str) -> int:
+        result = self.__memo.get(text)
+
+        if result is None:
+            result = self.__matcher.match_text(text)
+            self.__memo.put(text, result)
+
+        return result
+
+    @staticmethod
+    def __to_dates(column: pd.Series) -> pd.Series:
+        dates = pd.to_datetime(column, errors='coerce')
+
+        # 거래일시는 행 지문과 파티션 키에 들어가므로 임의 값으로 채우지 않는다 (TransactionCsvReader 가 거부 행으로 뺀다)
+        invalid = dates.isna()
+        if invalid.any():
+            raise ValueError(f"Invalid transaction dates: {int(invalid.sum())} rows")
+
+        return dates
+
+    @staticmethod
+    def __to_amounts(column: pd.Series) -> pd.Series:
+        return pd.to_numeric(column, errors='coerce').round().astype('Int64')
+
+    @staticmethod
+    def __to_locations(df: pd.DataFrame) -> pd.Series:
+        if '거래점' not in df.columns:
+            return pd.Series(None, index=df.index, dtype=object)
+
+        return df['거래점'].astype(object).where(df['거래점'].notna(), None)
@@ -0,0 +1,46 @@
+import logging
+import os
+from typing import Dict, Optional
+
+import asyncpg
+
+from app.database.tenant_shards import Host, PRIMARY_HOST
+
+logger = logging.getLogger(__name__)
+
+async_db_config = {
+    "host": os.getenv("POSTGRES_HOST", "postgres"),
+    "port": int(os.getenv("POSTGRES_PORT", 5432)),
+    "database": os.getenv("POSTGRES_DATABASE"),
+    "user": os.getenv("POSTGRES_USER"),
+    "password": os.getenv("POSTGRES_PASSWORD"),
+    "min_size": int(os.getenv("POSTGRES_POOL_MIN", 1)),
+    "max_size": int(os.getenv("POSTGRES_POOL_MAX", 10))
+}
+
+# DB(host, port)별 풀. 기본 DB 외에는 테넌트 샤드
+__async_pools: Dict[Host, asyncpg.Pool] = {}
+
+
+async def get_async_pool(host: Optional[Host] = None) -> asyncpg.Pool:
+    """
+    비동기 워커의 이벤트 루프에서 공유하는 asyncpg 풀 (루프 안에서 처음 호출할 때 생성, host 가 없으면 기본 DB)
+    """
+    host = host or PRIMARY_HOST
+
+    if host not in __async_pools:
+        __async_pools[host] = await asyncpg.create_pool(**dict(async_db_config, host=host[0], port=host[1]))
+        logger.info(f"asyncpg 커넥션 풀 생성 ({host[0]}:{host[1]}, min={async_db_config['min_size']}, "
+                    f"max={async_db_config['max_size']})")
+
+    return __async_pools[host]
+
+
+async def close_async_pool() -> None:
+    for async_pool in __async_pools.values():
+        await async_pool.close()
+
+    if __async_pools:
+        logger.info("asyncpg 커넥션 풀 종료")
+
+    __async_pools.clear()
@@ -1,47 +1,199 @@
 import contextlib
+import logging
 import os
-from typing import Any, Generator
+import threading
+import time
+from typing import Any, Dict, Generator, Iterator, Optional
 
 import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 
+from app.database.tenant_shards import Host, PRIMARY_HOST, TENANT_SHARDS
+from app.metrics.worker_metrics import DB_POOL_IN_USE, DB_POOL_MAX
+
+logger = logging.getLogger(__name__)
+
 db_config = {
-    "host": "postgres",
-    "port": 5432,
+    "host": os.getenv("POSTGRES_HOST", "postgres"),
+    "port": int(os.getenv("POSTGRES_PORT", 5432)),
     "database": os.getenv("POSTGRES_DATABASE"),
     "user": os.getenv("POSTGRES_USER"),
     "password": os.getenv("POSTGRES_PASSWORD"),
-    "minconn": 5,
-    "maxconn": 10
+    "minconn": int(os.getenv("POSTGRES_POOL_MIN", 1)),
+    "maxconn": int(os.getenv("POSTGRES_POOL_MAX", 10))
 }
 
+# 이 시간 이상 유휴 상태였던 커넥션은 꺼내기 전에 SELECT 1 로 확인
+HEALTH_CHECK_INTERVAL = float(os.getenv("POSTGRES_HEALTH_CHECK_INTERVAL", 30))
+
+# DB(host, port)별 커넥션 풀. 기본 DB 외에는 테넌트 샤드 (use_tenant_shard 로 선택)
+__connection_pools: Dict[Host, pool.ThreadedConnectionPool] = {}
+__pool_pid: Optional[int] = None
+__pool_lock = threading.Lock()
+__last_used = {}
+__bound = threading.local()
+__target = threading.local()
+
+
+def current_database() -> Host:
+    """
+    현재 스레드가 사용하는 DB (use_tenant_shard 블록 밖이면 기본 DB)
+    """
+    return getattr(__target, 'host', None) or PRIMARY_HOST
+
+
+def get_connection_pool() -> pool.ThreadedConnectionPool:
+    global __pool_pid
+
+    host = current_database()
+
+    # fork 된 자식 프로세스는 부모의 소켓을 공유하지 않도록 자신만의 풀을 새로 만든다
+    if __pool_pid != os.getpid() or host not in __connection_pools:
+        with __pool_lock:
+            if __pool_pid != os.getpid():
+                __connection_pools.clear()
+                __last_used.clear()
+                __pool_pid = os.getpid()
+                DB_POOL_IN_USE.set(0)
+                DB_POOL_MAX.set(0)
+
+            if host not in __connection_pools:
+                __connection_pools[host] = psycopg2.pool.ThreadedConnectionPool(
+                    **dict(db_config, host=host[0], port=host[1]))
+                DB_POOL_MAX.inc(db_config['maxconn'])
+                logger.info(f"Postgres 커넥션 풀 생성 ({host[0]}:{host[1]}, min={db_config['minconn']}, "
+                            f"max={db_config['maxconn']})")
+
+    return __connection_pools[host]
+
+
+def close_pool() -> None:
+    with __pool_lock:
+        if __pool_pid == os.getpid():
+            for connection_pool in __connection_pools.values():
+                if not connection_pool.closed:
+                    connection_pool.closeall()
+
+            if __connection_pools:
+                DB_POOL_IN_USE.set(0)
+                DB_POOL_MAX.set(0)
+                logger.info("Postgres 커넥션 풀 종료")
 
-def __get_postgres_connection_pool():
-    return psycopg2.pool.ThreadedConnectionPool(**db_config)
+        __connection_pools.clear()
+        __last_used.clear()
 
 
 @contextlib.contextmanager
-def __get_connection() -> Generator[Any, None, None]:
-    connection_pool = __get_postgres_connection_pool()
-    connection = None
+def use_tenant_shard(shard: int) -> Generator[None, None, None]:
+    """
+    블록 안의 get_connection / get_cursor / transaction 이 shard 번째 테넌트 샤드 DB 를 사용
+    """
+    previous = getattr(__target, 'host', None)
+    __target.host = TENANT_SHARDS[shard]
+    try:
+        yield
+    finally:
+        __target.host = previous
+
+
+def each_tenant_shard() -> Iterator[int]:
+    """
+    모든 테넌트 샤드를 차례로 선택하며 샤드 번호를 반환 (반복 본문이 해당 샤드 DB 를 사용)
+    """
+    for shard in range(len(TENANT_SHARDS)):
+        with use_tenant_shard(shard):
+            yield shard
+
+
+def __is_healthy(connection) -> bool:
+    if connection.closed:
+        return False
+
+    if time.monotonic() - __last_used.get(id(connection), 0) < HEALTH_CHECK_INTERVAL:
+        return True
 
     try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def __acquire(connection_pool: pool.ThreadedConnectionPool):
+    connection = connection_pool.getconn()
+
+    if not __is_healthy(connection):
+        logger.warning("비정상 커넥션 폐기 후 재연결")
+        connection_pool.putconn(connection, close=True)
         connection = connection_pool.getconn()
+
+    DB_POOL_IN_USE.inc()
+    return connection
+
+
+def __release(connection_pool: pool.ThreadedConnectionPool, connection) -> None:
+    DB_POOL_IN_USE.dec()
+    __last_used[id(connection)] = time.monotonic()
+    connection_pool.putconn(connection, close=bool(connection.closed))
+
+
+@contextlib.contextmanager
+def transaction() -> Generator[Any, None, None]:
+    """
+    현재 스레드에 하나의 커넥션을 묶어 블록 전체를 하나의 트랜잭션으로 실행
+    블록 안의 get_connection / get_cursor 는 같은 커넥션을 사용하며 개별 커밋하지 않는다
+    (커넥션은 DB 별로 묶이므로 블록 안에서 다른 테넌트 샤드를 선택하면 그 샤드는 별도로 커밋된다)
+    """
+    bound_connection = __bound_connection()
+    if bound_connection is not None:
+        yield bound_connection
+        return
+
+    if not hasattr(__bound, 'connections'):
+        __bound.connections = {}
+
+    host = current_database()
+    with get_connection() as connection:
+        __bound.connections[host] = connection
+        try:
+            yield connection
+        finally:
+            del __bound.connections[host]
+
+
+def __bound_connection():
+    return getattr(__bound, 'connections', {}).get(current_database())
+
+
+@contextlib.contextmanager
+def get_connection() -> Generator[Any, None, None]:
+    bound_connection = __bound_connection()
+    if bound_connection is not None:
+        yield bound_connection
+        return
+
+    connection_pool = get_connection_pool()
+    connection = None
+
+    try:
+        connection = __acquire(connection_pool)
         yield connection
         connection.commit()
     except Exception:
-        if connection:
+        if connection and not connection.closed:
             connection.rollback()
         raise
     finally:
         if connection:
-            connection_pool.putconn(connection)
+            __release(connection_pool, connection)
 
 
 @contextlib.contextmanager
 def get_cursor() -> Generator[Any, None, None]:
-    with __get_connection() as connection:
+    with get_connection() as connection:
         cursor = None
         try:
             cursor = connection.cursor(cursor_factory=RealDictCursor)
@@ -49,3 +201,24 @@ def get_cursor() -> Generator[Any, None, None]:
         finally:
             if cursor:
                 cursor.close()
+
+
+@contextlib.contextmanager
+def get_independent_cursor() -> Generator[Any, None, None]:
+    """
+    transaction() 블록 안에서도 묶인 커넥션을 쓰지 않고 별도 커넥션에서 바로 커밋하는 커서
+    적재 트랜잭션이 DDL 잠금을 커밋 때까지 쥐고 있지 않도록 파티션 생성 등에 사용
+    """
+    connection_pool = get_connection_pool()
+    connection = __acquire(connection_pool)
+
+    try:
+        with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            yield cursor
+        connection.commit()
+    except Exception:
+        if not connection.closed:
+            connection.rollback()
+        raise
+    finally:
+        __release(connection_pool, connection)
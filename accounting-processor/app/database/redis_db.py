@@ -1,6 +1,7 @@
 import os
 
 import redis
+import redis.asyncio
 
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = os.getenv("REDIS_PORT", 6379)
@@ -11,3 +12,24 @@ REDIS_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}'
 
 def get_redis():
     return redis.Redis.from_url(REDIS_URL)
+
+
+def get_async_redis():
+    return redis.asyncio.Redis.from_url(REDIS_URL)
+
+
+__shared_client = None
+__shared_pid = None
+
+
+def get_shared_redis():
+    """
+    프로세스 단위로 공유하는 클라이언트 (샤드 프로세스처럼 클라이언트를 전달받을 수 없는 곳에서 사용)
+    """
+    global __shared_client, __shared_pid
+
+    if __shared_client is None or __shared_pid != os.getpid():
+        __shared_client = get_redis()
+        __shared_pid = os.getpid()
+
+    return __shared_client
@@ -0,0 +1,56 @@
+import hashlib
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+Host = Tuple[str, int]
+
+
+def parse_hosts(value: str, default_port: int = 5432) -> List[Host]:
+    """
+    'host[:port],host[:port]' 형식의 목록
+    """
+    hosts = []
+
+    for item in filter(None, (item.strip() for item in value.split(','))):
+        host, _, port = item.partition(':')
+        hosts.append((host, int(port or default_port)))
+
+    return hosts
+
+
+PRIMARY_HOST: Host = (os.getenv("POSTGRES_HOST", "postgres"), int(os.getenv("POSTGRES_PORT", 5432)))
+# 거래 내역/집계를 company_id 해시로 나눠 담는 DB 목록 (비우면 기본 DB 하나)
+# 작업/체크포인트/규칙 등 나머지 테이블은 기본 DB 에만 두며, 목록에 기본 DB 를 포함할 수 있다
+TENANT_SHARDS: List[Host] = parse_hosts(os.getenv("POSTGRES_TENANT_SHARDS", "")) or [PRIMARY_HOST]
+# 미분류 거래(company_id 없음)를 담는 샤드
+UNCLASSIFIED_SHARD = 0
+
+
+def tenant_shard_count() -> int:
+    return len(TENANT_SHARDS)
+
+
+def is_sharded() -> bool:
+    return len(TENANT_SHARDS) > 1
+
+
+def tenant_shard_of(company_id: Optional[str]) -> int:
+    """
+    accounting-api 의 read_router.tenant_shard_of 와 같은 규칙 (company_id md5 앞 8자리 % 샤드 수)
+    샤드 수를 바꾸면 기존 회사의 샤드가 달라지므로 데이터를 다시 나눠 담아야 한다
+    """
+    if company_id is None or len(TENANT_SHARDS) == 1:
+        return UNCLASSIFIED_SHARD
+
+    return int(hashlib.md5(company_id.encode()).hexdigest()[:8], 16) % len(TENANT_SHARDS)
+
+
+def tenant_shards_of(company_ids: pd.Series) -> np.ndarray:
+    # 회사 수는 행 수보다 훨씬 적으므로 고유값만 해시
+    codes, uniques = pd.factorize(company_ids)
+    shards = np.array([tenant_shard_of(company_id) for company_id in uniques] + [UNCLASSIFIED_SHARD])
+
+    return shards[codes]
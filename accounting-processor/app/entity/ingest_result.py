@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from typing import Set
+
+
+@dataclass
+class IngestResult:
+    processed_rows: int = 0
+    # 멱등 적재 모드에서 이미 저장되어 있어 건너뛴 행 수 (processed_rows 에 포함)
+    skipped_rows: int = 0
+    # 타입 변환/컬럼 수 오류로 적재하지 않고 rejects 파일로 뺀 행 수 (processed_rows 에 미포함)
+    rejected_rows: int = 0
+    company_ids: Set[str] = field(default_factory=set)
+
+    def merge(self, other: 'IngestResult') -> 'IngestResult':
+        self.processed_rows += other.processed_rows
+        self.skipped_rows += other.skipped_rows
+        self.rejected_rows += other.rejected_rows
+        self.company_ids |= other.company_ids
+
+        return self
@@ -17,7 +17,7 @@ class ProcessingJob:
     job_id: UUID
     status: str
     csv_file_path: str
-    rules_data: Dict[str, Any]
+    rules_data: Optional[Dict[str, Any]]
     total_rows: int
     processed_rows: int
     error_message: Optional[str]
@@ -25,6 +25,11 @@ class ProcessingJob:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     deleted_at: Optional[datetime] = None
+    rules_hash: Optional[str] = None
+    # 재분류 작업: 대상 거래 내역을 분류했던 이전 규칙 (rules_hash 가 새 규칙)
+    base_rules_hash: Optional[str] = None
+    # 재분류 작업의 대상 업로드 작업 (None 이면 base_rules_hash 로 분류된 모든 업로드 작업)
+    source_job_id: Optional[str] = None
 
     @classmethod
     def from_job_info(cls, job_id: str, job_info: Any) -> 'ProcessingJob':
@@ -33,7 +38,10 @@ class ProcessingJob:
             status=JobStatus.PENDING.value,
             csv_file_path=job_info['csv_file_path'],
             rules_data=job_info['rules_data'],
-            total_rows=0,
+            rules_hash=job_info['rules_hash'],
+            base_rules_hash=job_info.get('base_rules_hash'),
+            source_job_id=job_info.get('source_job_id'),
+            total_rows=job_info.get('total_rows') or 0,
             processed_rows=0,
             error_message=None,
             created_at=datetime.now()
@@ -45,8 +53,8 @@ class ProcessingJob:
 
         self.total_rows = total_rows
 
-    def processed(self):
-        self.processed_rows += 1
+    def processed(self, count: int = 1):
+        self.processed_rows += count
 
     def complete(self):
         self.status = JobStatus.COMPLETED
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+from app.reader.transaction_csv_reader import ByteRange
+
+
+@dataclass
+class ShardCheckpoint:
+    shard_no: int
+    range_start: int
+    range_end: int
+    # 마지막으로 커밋된 블록의 끝 = 재개 시 처음 읽을 행의 시작 오프셋
+    committed_offset: int
+    committed_rows: int
+
+    @classmethod
+    def from_row(cls, row) -> 'ShardCheckpoint':
+        return cls(
+            shard_no=row['shard_no'],
+            range_start=row['range_start'],
+            range_end=row['range_end'],
+            committed_offset=row['committed_offset'],
+            committed_rows=row['committed_rows']
+        )
+
+    @property
+    def done(self) -> bool:
+        return self.committed_offset >= self.range_end
+
+    @property
+    def remaining_range(self) -> ByteRange:
+        return self.committed_offset, self.range_end
@@ -3,6 +3,8 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from app.classifier.rule_matcher import Matcher
+
 
 @dataclass
 class Transaction:
@@ -32,20 +34,6 @@ class Transaction:
             created_at=datetime.now()
         )
 
-    def classify(self, rules: dict) -> None:
-        description_lower = self.description.lower()
-
-        for company in rules.get('companies', []):
-            company_id = company['company_id']
-
-            for category in company.get('categories', []):
-                keywords = category.get('keywords', [])
-
-                for keyword in keywords:
-                    if keyword.lower() in description_lower:
-                        self.company_id = company_id
-                        self.category_id = category['category_id']
-                        return
-
-        self.company_id = None
-        self.category_id = None
+    def classify(self, matcher: Matcher) -> None:
+        self.company_id, self.category_id = matcher.match(self.description, self.amount_in, self.amount_out,
+                                                          self.transaction_date)
@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Set
+
+
+@dataclass
+class TransactionBlock:
+    """
+    분류를 마치고 DB 에 쓸 형태로 변환해 둔 청크 (비동기 워커의 읽기/분류 단계 → 쓰기 단계 전달 단위)
+    """
+    # 이 청크를 커밋하면 체크포인트에 기록할 다음 행의 시작 오프셋
+    end_offset: int
+    rows: int
+    records: List[tuple]
+    months: List[date]
+    summary_rows: List[tuple]
+    company_ids: Set[str] = field(default_factory=set)
+    # 멱등 적재 모드에서만 채워진다
+    fingerprints: Optional[List[str]] = None
+    # 테넌트 샤드를 쓰면 company_id 해시로 나눈 샤드별 부분 청크 (이때 records/summary_rows 는 비어 있다)
+    parts: Dict[int, 'TransactionBlock'] = field(default_factory=dict)
@@ -0,0 +1,148 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.classifier.description_memo import DescriptionMemo
+from app.classifier.rule_matcher import Matcher
+from app.classifier.transaction_frame import TransactionFrameBuilder, fingerprint_rows, summarize_rows
+from app.database.postgres_db import transaction, use_tenant_shard
+from app.database.tenant_shards import is_sharded, tenant_shards_of
+from app.entity.ingest_result import IngestResult
+from app.metrics.worker_metrics import (
+    StageTimer, ROWS_PROCESSED, ROWS_SKIPPED, ROWS_REJECTED, DESCRIPTION_MEMO_LOOKUPS
+)
+from app.progress.job_progress_tracker import JobProgressTracker
+from app.reader.rejects_report import RejectsReport
+from app.reader.transaction_csv_reader import TransactionCsvReader, ByteRange
+from app.repository.processing_job_checkpoint_repository import ProcessingJobCheckpointRepository
+from app.repository.transaction_partition_repository import TransactionPartitionRepository
+from app.repository.transaction_repository import TransactionRepository
+from app.repository.transaction_summary_repository import TransactionSummaryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionIngestor:
+    """
+    CSV 의 한 구간(전체 또는 샤드)을 청크 단위로 읽어 분류/적재하는 단위 작업
+    샤드 프로세스로 전달(pickle)될 수 있도록 커넥션 등 프로세스 자원을 보관하지 않는다
+    """
+
+    def __init__(self, progress_tracker: JobProgressTracker, transaction_repository: TransactionRepository,
+                 checkpoint_repository: ProcessingJobCheckpointRepository,
+                 summary_repository: TransactionSummaryRepository,
+                 partition_repository: TransactionPartitionRepository):
+        self.__progress_tracker = progress_tracker
+        self.__transaction_repository = transaction_repository
+        self.__checkpoint_repository = checkpoint_repository
+        self.__summary_repository = summary_repository
+        self.__partition_repository = partition_repository
+
+    def ingest_range(self, job_id: str, csv_file_path: str, matcher: Matcher,
+                     shard_no: int, byte_range: ByteRange) -> IngestResult:
+        reader = TransactionCsvReader(csv_file_path)
+        memo = DescriptionMemo()
+        frame_builder = TransactionFrameBuilder(matcher, memo)
+        rejects = RejectsReport(csv_file_path, shard_no)
+        result = IngestResult()
+        timer = StageTimer()
+
+        # 청크 단위로 읽기 → 분류 → 적재를 끝낸 뒤 다음 청크를 읽어 메모리 사용량을 고정
+        for end_offset, chunk in reader.read_blocks(byte_range, rejects):
+            timer.lap('read')
+            frame = frame_builder.build(job_id, chunk)
+            timer.lap('classify')
+
+            if is_sharded():
+                saved = self.__write_tenant_shards(job_id, shard_no, end_offset, frame, timer)
+            else:
+                saved = self.__write(job_id, shard_no, end_offset, frame, timer)
+            rejected = rejects.flush(end_offset)
+
+            result.processed_rows += len(frame)
+            result.rejected_rows += rejected
+            result.skipped_rows += len(frame) - saved
+            result.company_ids.update(frame['company_id'].dropna().unique())
+            self.__progress_tracker.advance(job_id, len(frame))
+
+            ROWS_PROCESSED.inc(len(frame))
+            ROWS_SKIPPED.inc(len(frame) - saved)
+            ROWS_REJECTED.inc(rejected)
+            timer.finish()
+
+        self.__progress_tracker.checkpoint(job_id)
+        DESCRIPTION_MEMO_LOOKUPS.labels('hit').inc(memo.hits)
+        DESCRIPTION_MEMO_LOOKUPS.labels('miss').inc(memo.misses)
+
+        logger.info(f"Job {job_id} shard {shard_no} {byte_range}: {result.processed_rows} rows, "
+                    f"{result.skipped_rows} duplicates skipped, {result.rejected_rows} rejected, "
+                    f"description memo hits {memo.hits} / misses {memo.misses} ({memo.hit_rate:.1%})")
+        if result.rejected_rows:
+            logger.warning(f"Job {job_id} shard {shard_no}: {result.rejected_rows} rejected rows written to "
+                           f"{rejects.path}")
+
+        return result
+
+    def __write(self, job_id: str, shard_no: int, end_offset: int, frame: pd.DataFrame, timer: StageTimer) -> int:
+        # 월 파티션 생성은 적재 트랜잭션 밖에서 먼저 끝내 다른 샤드/조회를 막지 않는다
+        self.__partition_repository.ensure_months(
+            frame['transaction_date'].dt.to_period('M').dt.start_time.dt.date.unique()
+        )
+        timer.lap('partition')
+
+        # 적재, 집계 증분, 체크포인트를 같은 트랜잭션으로 커밋해 재시도 시 커밋된 블록 다음부터 정확히 한 번만 반영
+        with transaction():
+            saved = self.__transaction_repository.save_many(frame)
+            timer.lap('write')
+            self.__add_summary(job_id, frame, saved)
+            timer.lap('summary')
+            self.__checkpoint_repository.commit(job_id, shard_no, end_offset, len(frame))
+        timer.lap('commit')
+
+        return saved
+
+    def __write_tenant_shards(self, job_id: str, shard_no: int, end_offset: int, frame: pd.DataFrame,
+                              timer: StageTimer) -> int:
+        """
+        company_id 해시로 나눈 청크를 테넌트 샤드 DB 마다 적재/집계하고 같은 트랜잭션으로 그 샤드의 체크포인트를 기록
+        모든 샤드에 커밋한 뒤 기본 DB 체크포인트를 커밋하므로, 중간에 실패하면 재시도 때 이미 커밋한 샤드는 건너뛴다
+        """
+        shards = tenant_shards_of(frame['company_id'])
+        saved = 0
+
+        for shard in map(int, np.unique(shards)):
+            part = frame[shards == shard]
+
+            with use_tenant_shard(shard):
+                self.__partition_repository.ensure_months(
+                    part['transaction_date'].dt.to_period('M').dt.start_time.dt.date.unique()
+                )
+                timer.lap('partition')
+
+                with transaction():
+                    if self.__checkpoint_repository.find_tenant_offset(job_id, shard_no) >= end_offset:
+                        logger.info(f"Job {job_id} shard {shard_no}: block ending at {end_offset} already "
+                                    f"committed to tenant shard {shard}")
+                        saved += len(part)
+                        continue
+
+                    part_saved = self.__transaction_repository.save_many(part)
+                    timer.lap('write')
+                    self.__add_summary(job_id, part, part_saved)
+                    timer.lap('summary')
+                    self.__checkpoint_repository.commit_tenant(job_id, shard_no, end_offset, len(part))
+                timer.lap('commit')
+                saved += part_saved
+
+        self.__checkpoint_repository.commit(job_id, shard_no, end_offset, len(frame))
+        timer.lap('commit')
+
+        return saved
+
+    def __add_summary(self, job_id: str, frame, saved: int):
+        if saved == len(frame):
+            self.__summary_repository.add(summarize_rows(frame))
+        elif saved:
+            # 중복 제외로 일부만 적재된 청크는 실제로 들어간 행만 집계
+            self.__summary_repository.add_inserted(job_id, fingerprint_rows(frame).tolist())
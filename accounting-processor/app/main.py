@@ -1,43 +1,80 @@
-import asyncio
-import json
 import logging
+import os
 import signal
+import socket
 import sys
+import threading
+import time
 
 import redis
 from dotenv import load_dotenv
 
+from app.async_worker import AsyncWorker
+from app.cache.record_cache_invalidator import RecordCacheInvalidator
+from app.database.postgres_db import close_pool
 from app.database.redis_db import get_redis
+from app.metrics.worker_metrics import JOBS, JOB_SECONDS, MULTIPROC_DIR, reset_multiprocess_dir, start_exporter
 from app.processor import TransactionProcessor
+from app.profiling.job_profiler import JobProfiler
+from app.queue.reliable_task_queue import ReliableTaskQueue
+from app.queue.task_queue_core import Task, TASK_RECLASSIFY
+from app.reclassifier import TransactionReclassifier
 from app.repository.impl.postgres_processing_job_repository import PostgresProcessingJobRepository
 from app.repository.impl.postgres_transaction_repository import PostgresTransactionRepository
+from app.supervisor import Supervisor
 
 load_dotenv()
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+RUNTIME_SYNC = 'sync'
+RUNTIME_ASYNC = 'async'
+
 
 class Worker:
+    REDIS_QUEUE_NAME = 'accounting_tasks'
+    RESERVE_TIMEOUT = 5
+    REAP_INTERVAL = float(os.getenv("TASK_REAP_INTERVAL", 30))
+    HEARTBEAT_INTERVAL = float(os.getenv("TASK_HEARTBEAT_INTERVAL", 30))
+    # 0 이면 지표 exporter 를 띄우지 않는다
+    METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+    # sync: 작업을 하나씩 처리 (샤드 프로세스 분할), async: 한 이벤트 루프에서 여러 작업을 동시에 처리 (AsyncWorker)
+    RUNTIME = os.getenv("WORKER_RUNTIME", RUNTIME_SYNC)
+
     def __main__(self):
         pass
 
     def __init__(self):
         self.redis_client = get_redis()
+        self.processing_job_repository = PostgresProcessingJobRepository()
         self.processor = TransactionProcessor(
-            PostgresProcessingJobRepository(),
-            PostgresTransactionRepository()
+            self.processing_job_repository,
+            PostgresTransactionRepository(),
+            record_cache_invalidator=RecordCacheInvalidator(self.redis_client)
         )
+        self.reclassifier = TransactionReclassifier(
+            self.processing_job_repository,
+            PostgresTransactionRepository(),
+            record_cache_invalidator=RecordCacheInvalidator(self.redis_client)
+        )
+        self.task_queue = ReliableTaskQueue(self.redis_client, f"{socket.gethostname()}:{os.getpid()}",
+                                            queue_name=self.REDIS_QUEUE_NAME)
+        self.job_profiler = JobProfiler()
         self.running = True
+        self.__last_reaped_at = 0.0
 
     def signal_handler(self, signum, frame):
-        logger.info("종료 시그널 받음. 워커를 중지합니다...")
+        if not self.running:
+            logger.info("종료 시그널 재수신. 즉시 종료합니다")
+            sys.exit(1)
 
+        # 진행 중인 작업은 끝까지 처리한 뒤 다음 대기 루프에서 종료
+        logger.info("종료 시그널 받음. 현재 작업을 마친 뒤 워커를 중지합니다...")
         self.running = False
-        sys.exit(0)
 
     def run(self):
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -45,33 +82,113 @@ class Worker:
 
         logger.info("워커 시작. 작업 대기 중...")
 
-        while self.running:
-            try:
-                result = self.redis_client.brpop('accounting_tasks', timeout=5)
+        try:
+            self.__consume()
+        finally:
+            self.shutdown()
 
-                if result:
-                    _, task_data = result
-                    task = json.loads(task_data)
+    def shutdown(self):
+        close_pool()
+        self.redis_client.close()
 
-                    logger.info(f"작업 시작: {task['job_id']}")
+        logger.info("워커 종료")
 
-                    try:
-                        self.processor.process_job(task['job_id'])
-                        logger.info(f"작업 완료: {task['job_id']}")
+    def __consume(self):
+        while self.running:
+            try:
+                self.__reap_stalled_tasks()
+
+                task = self.task_queue.reserve(timeout=self.RESERVE_TIMEOUT)
 
-                    except Exception as e:
-                        logger.error(f"작업 실패: {task['job_id']}, 오류: {str(e)}")
+                if task:
+                    self.__handle(task)
 
             except redis.ConnectionError:
                 logger.error("Redis 연결 실패. 5초 후 재시도...")
-                asyncio.sleep(5)
+                time.sleep(5)
             except Exception as e:
                 logger.error(f"예상치 못한 오류: {str(e)}")
-                asyncio.sleep(1)
+                time.sleep(1)
+
+    def __handle(self, task: Task):
+        logger.info(f"작업 시작: {task.job_id} (시도 {task.attempts + 1})")
+
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self.__heartbeat, args=(task, heartbeat_stop), daemon=True)
+        heartbeat.start()
+        started = time.perf_counter()
+
+        try:
+            with self.job_profiler.profile(task.job_id):
+                if task.task_type == TASK_RECLASSIFY:
+                    self.reclassifier.process_job(task.job_id)
+                else:
+                    self.processor.process_job(task.job_id)
+            self.task_queue.ack(task)
+            JOBS.labels('completed').inc()
+            logger.info(f"작업 완료: {task.job_id}")
+
+        except Exception as e:
+            logger.error(f"작업 실패: {task.job_id}, 오류: {str(e)}")
+            self.task_queue.fail(task, str(e))
+            JOBS.labels('failed').inc()
+
+        finally:
+            JOB_SECONDS.observe(time.perf_counter() - started)
+            heartbeat_stop.set()
+            heartbeat.join()
+
+    def __heartbeat(self, task: Task, stop: threading.Event):
+        # 처리 중인 작업이 가시성 시간 초과로 회수되지 않도록 주기적으로 만료 시각을 연장
+        while not stop.wait(self.HEARTBEAT_INTERVAL):
+            try:
+                self.task_queue.heartbeat(task)
+            except redis.RedisError as e:
+                logger.warning(f"하트비트 실패: {task.job_id}, 오류: {str(e)}")
 
-        logger.info("워커 종료")
+    def __reap_stalled_tasks(self):
+        if time.monotonic() - self.__last_reaped_at < self.REAP_INTERVAL:
+            return
 
+        self.__last_reaped_at = time.monotonic()
+
+        for payload in self.task_queue.reap_stalled():
+            self.processing_job_repository.fail_job(payload['job_id'], Exception(payload.get('last_error')))
+
+
+def create_metrics_task_queue() -> ReliableTaskQueue:
+    # 지표 수집은 exporter 스레드에서 동기로 큐 길이를 조회
+    return ReliableTaskQueue(get_redis(), f"{socket.gethostname()}:{os.getpid()}", queue_name=Worker.REDIS_QUEUE_NAME)
+
+
+def run_worker(metrics_port: int = 0):
+    if Worker.RUNTIME not in (RUNTIME_SYNC, RUNTIME_ASYNC):
+        raise ValueError(f"Unknown worker runtime: {Worker.RUNTIME}")
+
+    worker = AsyncWorker() if Worker.RUNTIME == RUNTIME_ASYNC else Worker()
+
+    if metrics_port:
+        start_exporter(metrics_port, create_metrics_task_queue())
 
-if __name__ == "__main__":
-    worker = Worker()
     worker.run()
+
+
+def start_supervisor_exporter(metrics_port: int):
+    # 워커 프로세스마다 포트를 열지 않고 Supervisor 가 multiprocess 디렉터리의 지표를 합산해 노출
+    if not MULTIPROC_DIR:
+        logger.warning("PROMETHEUS_MULTIPROC_DIR 미설정. 워커 프로세스가 여러 개이면 지표 exporter 를 띄우지 않습니다")
+        return
+
+    start_exporter(metrics_port, create_metrics_task_queue())
+
+
+if __name__ == "__main__":
+    worker_processes = int(os.getenv("WORKER_PROCESSES", 1))
+    reset_multiprocess_dir()
+
+    if worker_processes > 1:
+        if Worker.METRICS_PORT:
+            start_supervisor_exporter(Worker.METRICS_PORT)
+        Supervisor(run_worker, worker_processes).run()
+    else:
+        run_worker(Worker.METRICS_PORT)
@@ -0,0 +1,61 @@
+import argparse
+import logging
+import os
+from datetime import date
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from app.database.postgres_db import close_pool, current_database, each_tenant_shard
+from app.repository.impl.postgres_transaction_partition_repository import PostgresTransactionPartitionRepository
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 월 파티션 ATTACH 는 기본 파티션 전체를 ACCESS EXCLUSIVE 로 잠근 채 스캔하므로, 이보다 커지면 경고
+DEFAULT_PARTITION_WARN_MB = int(os.getenv("PARTITION_DEFAULT_WARN_MB", 64))
+
+
+def main():
+    """
+    transactions 월 파티션 유지보수 (주기 실행용)
+    - 이번 달부터 --ahead 개월 뒤까지 파티션을 미리 생성
+    - 기본 파티션(transactions_default)에 들어간 행은 해당 월 파티션을 만들어 옮긴다
+      (크기가 PARTITION_DEFAULT_WARN_MB 를 넘으면 경고: 월 파티션을 만들 때마다 그만큼을 잠근 채 스캔한다)
+    - 테넌트 샤드(POSTGRES_TENANT_SHARDS)를 쓰면 샤드 DB 마다 실행
+
+    python -m app.maintain_partitions [--ahead 3]
+    """
+    parser = argparse.ArgumentParser(description="거래 내역 월 파티션 유지보수")
+    parser.add_argument('--ahead', type=int, default=3, help="미리 만들 개월 수 (기본 3)")
+    args = parser.parse_args()
+
+    repository = PostgresTransactionPartitionRepository()
+
+    try:
+        this_month = pd.Timestamp(date.today()).to_period('M')
+        upcoming = [(this_month + offset).start_time.date() for offset in range(args.ahead + 1)]
+
+        for _ in each_tenant_shard():
+            host, port = current_database()
+            default_size = repository.default_partition_size()
+            if default_size['bytes'] > DEFAULT_PARTITION_WARN_MB * 1024 * 1024:
+                logger.warning(f"{host}:{port} 기본 파티션이 {default_size['bytes'] / 2 ** 20:.0f}MiB "
+                               f"(약 {default_size['rows']}행) 입니다. 월 파티션 생성(ATTACH) 마다 이를 잠근 채 스캔하므로 "
+                               f"적재가 그동안 대기할 수 있습니다")
+            default_months = repository.find_default_months()
+
+            created = repository.ensure_months(upcoming + default_months)
+            logger.info(f"{host}:{port} 파티션 유지보수 완료: {len(created)}개 생성, "
+                        f"기본 파티션에서 옮긴 월 {len(default_months)}개")
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
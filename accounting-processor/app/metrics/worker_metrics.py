@@ -0,0 +1,112 @@
+import glob
+import logging
+import os
+import time
+from typing import Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, multiprocess, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+logger = logging.getLogger(__name__)
+
+# 설정되어 있으면 워커/샤드 프로세스가 이 디렉터리에 지표를 기록하고 exporter 가 합산 (prometheus_client multiprocess 모드)
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    # 지표 객체를 만드는 시점에 프로세스별 파일이 생성되므로 디렉터리가 먼저 있어야 한다
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+STAGE_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+JOB_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+
+ROWS_PROCESSED = Counter('accounting_rows_processed', '분류/적재한 거래 내역 행 수')
+ROWS_SKIPPED = Counter('accounting_rows_skipped', '중복 지문으로 건너뛴 행 수')
+ROWS_REJECTED = Counter('accounting_rows_rejected', '형식 오류로 적재하지 않고 rejects 파일로 뺀 행 수')
+JOBS = Counter('accounting_jobs', '처리를 마친 작업 수', ['status'])
+JOB_SECONDS = Histogram('accounting_job_seconds', '작업 하나의 처리 시간', buckets=JOB_BUCKETS)
+STAGE_SECONDS = Histogram('accounting_stage_seconds', '청크 단계별 처리 시간 (read, classify, partition, write, '
+                                                      'summary, commit)', ['stage'], buckets=STAGE_BUCKETS)
+BATCH_SECONDS = Histogram('accounting_batch_seconds', '청크 하나를 읽어 커밋하기까지 걸린 시간', buckets=STAGE_BUCKETS)
+MATCHER_CACHE_LOOKUPS = Counter('accounting_matcher_cache_lookups', '컴파일된 규칙 캐시 조회 (memory, disk, compiled)',
+                                ['result'])
+DESCRIPTION_MEMO_LOOKUPS = Counter('accounting_description_memo_lookups', '적요 분류 메모 조회 (hit, miss)',
+                                   ['result'])
+DB_POOL_IN_USE = Gauge('accounting_db_pool_in_use', '사용 중인 Postgres 커넥션 수', multiprocess_mode='livesum')
+DB_POOL_MAX = Gauge('accounting_db_pool_max', 'Postgres 커넥션 풀 최대 크기 (프로세스 합계)', multiprocess_mode='livesum')
+
+
+class StageTimer:
+    """
+    청크 처리 루프에서 직전 시점부터의 경과 시간을 단계별로 기록
+    """
+
+    def __init__(self):
+        self.__started = self.__last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        STAGE_SECONDS.labels(stage).observe(now - self.__last)
+        self.__last = now
+
+    def finish(self) -> None:
+        BATCH_SECONDS.observe(self.__last - self.__started)
+        self.__started = self.__last = time.perf_counter()
+
+
+class TaskQueueCollector(Collector):
+    """
+    수집 시점에 Redis 작업 큐 길이(대기, 지연 재시도, 처리 중, dead-letter)를 조회
+    """
+
+    def __init__(self, task_queue):
+        self.__task_queue = task_queue
+
+    def collect(self):
+        depth = GaugeMetricFamily('accounting_task_queue_depth', '작업 큐 상태별 작업 수', labels=['state'])
+
+        try:
+            for state, count in self.__task_queue.depths().items():
+                depth.add_metric([state], count)
+        except Exception as e:
+            logger.warning(f"작업 큐 길이 조회 실패: {str(e)}")
+
+        yield depth
+
+
+def reset_multiprocess_dir() -> None:
+    """
+    이전 실행이 남긴 지표 파일 정리 (워커 프로세스를 띄우기 전에 호출)
+
+    현재 프로세스 파일은 이미 열려 있으므로 남겨둔다
+    """
+    if not MULTIPROC_DIR:
+        return
+
+    own_suffix = f"_{os.getpid()}.db"
+    for path in glob.glob(os.path.join(MULTIPROC_DIR, '*.db')):
+        if not path.endswith(own_suffix):
+            os.remove(path)
+
+
+def mark_process_dead(pid: int) -> None:
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+def start_exporter(port: int, task_queue=None) -> Optional[CollectorRegistry]:
+    """
+    /metrics HTTP exporter 시작. multiprocess 모드면 모든 워커/샤드 프로세스의 지표를 합산해 노출
+    """
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    if task_queue is not None:
+        registry.register(TaskQueueCollector(task_queue))
+
+    start_http_server(port, registry=registry)
+    logger.info(f"지표 exporter 시작 (:{port}/metrics, multiprocess={bool(MULTIPROC_DIR)})")
+
+    return registry
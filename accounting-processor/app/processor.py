@@ -1,69 +1,165 @@
+import contextlib
 import logging
+import os
+import multiprocessing
 import traceback
-from datetime import datetime
-
-import pandas as pd
-
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from app.cache.record_cache_invalidator import RecordCacheInvalidator
+from app.classifier.rule_matcher import Matcher
+from app.classifier.matcher_cache import MatcherCache
+from app.database.postgres_db import close_pool, transaction
+from app.database.tenant_shards import is_sharded
+from app.entity.ingest_result import IngestResult
 from app.entity.processing_job import ProcessingJob
-from app.entity.transaction import Transaction
+from app.entity.shard_checkpoint import ShardCheckpoint
+from app.ingestor import TransactionIngestor
+from app.progress.job_progress_tracker import JobProgressTracker
+from app.reader.transaction_csv_reader import TransactionCsvReader
+from app.repository.impl.postgres_processing_job_checkpoint_repository import \
+    PostgresProcessingJobCheckpointRepository
+from app.repository.impl.postgres_rules_set_repository import PostgresRulesSetRepository
+from app.repository.impl.postgres_transaction_partition_repository import PostgresTransactionPartitionRepository
+from app.repository.impl.postgres_transaction_summary_repository import PostgresTransactionSummaryRepository
+from app.repository.processing_job_checkpoint_repository import ProcessingJobCheckpointRepository
 from app.repository.processing_job_repository import ProcessingJobRepository
+from app.repository.transaction_partition_repository import TransactionPartitionRepository
 from app.repository.transaction_repository import TransactionRepository
+from app.repository.transaction_summary_repository import TransactionSummaryRepository
 
 logger = logging.getLogger(__name__)
 
 
+def ingest_shard(ingestor: TransactionIngestor, *args) -> IngestResult:
+    # 샤드 프로세스가 끝날 때 커넥션을 반납해 풀 지표(livesum)에 종료된 프로세스 값이 남지 않게 한다
+    try:
+        return ingestor.ingest_range(*args)
+    finally:
+        close_pool()
+
+
 class TransactionProcessor:
     def __init__(self, processing_job_repository: ProcessingJobRepository,
-                 transaction_repository: TransactionRepository):
+                 transaction_repository: TransactionRepository,
+                 job_transaction: bool = os.getenv("PROCESSOR_JOB_TRANSACTION", "false").lower() == "true",
+                 shard_processes: int = int(os.getenv("SHARD_PROCESSES", 1)),
+                 shard_min_bytes: int = int(os.getenv("SHARD_MIN_MB", 64)) * 1024 * 1024,
+                 record_cache_invalidator: Optional[RecordCacheInvalidator] = None,
+                 matcher_cache: Optional[MatcherCache] = None,
+                 progress_tracker: Optional[JobProgressTracker] = None,
+                 checkpoint_repository: Optional[ProcessingJobCheckpointRepository] = None,
+                 summary_repository: Optional[TransactionSummaryRepository] = None,
+                 partition_repository: Optional[TransactionPartitionRepository] = None):
+        if job_transaction and is_sharded():
+            # 작업 단일 트랜잭션은 하나의 DB 커넥션으로만 묶을 수 있다
+            raise ValueError("PROCESSOR_JOB_TRANSACTION cannot be used with POSTGRES_TENANT_SHARDS")
+
         self.__processing_job_repository = processing_job_repository
-        self.__transaction_repository = transaction_repository
+        self.__checkpoint_repository = checkpoint_repository or PostgresProcessingJobCheckpointRepository()
+        self.__matcher_cache = matcher_cache or MatcherCache(PostgresRulesSetRepository())
+        self.__progress_tracker = progress_tracker or JobProgressTracker(processing_job_repository)
+        self.__ingestor = TransactionIngestor(self.__progress_tracker, transaction_repository,
+                                              self.__checkpoint_repository,
+                                              summary_repository or PostgresTransactionSummaryRepository(),
+                                              partition_repository or PostgresTransactionPartitionRepository())
+        self.__record_cache_invalidator = record_cache_invalidator
+        self.__job_transaction = job_transaction
+        self.__shard_processes = shard_processes
+        self.__shard_min_bytes = shard_min_bytes
 
     def process_job(self, job_id: str):
         try:
             job_info = self.__processing_job_repository.find_and_update_status(job_id)
             processing_job = ProcessingJob.from_job_info(job_id, job_info)
 
-            df = pd.read_csv(processing_job.csv_file_path, encoding='utf-8')
-            processing_job.set_total_rows(len(df))
-
-            for _, row in df.iterrows():
-                transaction = self.parse_transaction(job_id, row, processing_job.rules_data)
-                self.__transaction_repository.save(transaction)
-
-                processing_job.processed()
-
-                if processing_job.processed_rows % 1000 == 0:
-                    self.__processing_job_repository.update_progress(processing_job)
-
-            processing_job.complete()
-            self.__processing_job_repository.complete_job(processing_job)
+            reader = TransactionCsvReader(processing_job.csv_file_path)
+            # API 가 업로드하면서 센 행 수가 있으면 파일을 다시 읽지 않는다
+            if not processing_job.total_rows:
+                processing_job.set_total_rows(reader.count_rows())
+
+            checkpoints = self.__plan_shards(job_id, reader)
+            processing_job.processed(sum(checkpoint.committed_rows for checkpoint in checkpoints))
+            self.__processing_job_repository.update_progress(processing_job)
+            self.__progress_tracker.start(job_id, processing_job.total_rows, processing_job.processed_rows)
+
+            matcher = self.__matcher_cache.get(processing_job.rules_hash, processing_job.rules_data)
+            pending = [checkpoint for checkpoint in checkpoints if not checkpoint.done]
+
+            if len(pending) > 1 and not self.__job_transaction:
+                result = self.__ingest_shards(processing_job, matcher, pending)
+                processing_job.processed(result.processed_rows)
+                processing_job.complete()
+                self.__processing_job_repository.complete_job(processing_job)
+            else:
+                # 작업 단일 트랜잭션 모드: 하나의 커넥션/트랜잭션으로 적재부터 완료 처리까지 수행
+                with transaction() if self.__job_transaction else contextlib.nullcontext():
+                    result = IngestResult()
+                    for checkpoint in pending:
+                        result.merge(self.__ingestor.ingest_range(job_id, processing_job.csv_file_path, matcher,
+                                                                  checkpoint.shard_no, checkpoint.remaining_range))
+                    processing_job.processed(result.processed_rows)
+                    processing_job.complete()
+                    self.__processing_job_repository.complete_job(processing_job)
+
+            self.__checkpoint_repository.delete_by_job(job_id)
+            self.__progress_tracker.complete(job_id, processing_job.processed_rows)
+
+            if self.__record_cache_invalidator:
+                self.__record_cache_invalidator.invalidate(result.company_ids)
 
             return {
                 "job_id": job_id,
                 "status": "completed",
                 "processed_rows": processing_job.processed_rows,
+                "skipped_rows": result.skipped_rows,
+                "rejected_rows": result.rejected_rows,
                 "total_rows": processing_job.total_rows
             }
 
         except Exception as e:
             logger.error(f"Error processing job {job_id}: {str(e)}, trace: {traceback.format_exc()}")
             self.__processing_job_repository.fail_job(job_id, e)
+            self.__progress_tracker.fail(job_id, e)
 
             raise
 
-    def parse_transaction(self, job_id: str, row: pd.Series, rules: dict) -> Transaction:
-        row_data = row.to_dict()
-        logger.info('ROW_DATA: {}'.format(row_data))
-        transaction = Transaction.from_csv_row(job_id, row_data)
-        transaction.classify(rules)
-
-        return transaction
-
-    def __str_to_date(self, date_str: str) -> datetime:
-        try:
-            date = pd.to_datetime(date_str)
-        except Exception as e:
-            logger.error(e)
-            date = datetime.now()
-
-        return date
+    def __plan_shards(self, job_id: str, reader: TransactionCsvReader) -> List[ShardCheckpoint]:
+        """
+        이전 시도의 체크포인트가 있으면 그 구간 분할을 그대로 이어서 사용 (샤드 설정이 바뀌어도 같은 구간으로 재개)
+        """
+        checkpoints = self.__checkpoint_repository.find_by_job(job_id)
+
+        if checkpoints:
+            resumed = sum(checkpoint.committed_rows for checkpoint in checkpoints)
+            logger.info(f"Job {job_id} resumes from checkpoints ({resumed} rows already committed)")
+            return checkpoints
+
+        return self.__checkpoint_repository.save_plan(job_id, reader.split_byte_ranges(self.__shard_count(reader)))
+
+    def __shard_count(self, reader: TransactionCsvReader) -> int:
+        if self.__shard_processes <= 1 or self.__job_transaction or reader.file_size < self.__shard_min_bytes:
+            return 1
+
+        return self.__shard_processes
+
+    def __ingest_shards(self, processing_job: ProcessingJob, matcher: Matcher,
+                        checkpoints: List[ShardCheckpoint]) -> IngestResult:
+        logger.info(f"Job {processing_job.job_id} split into {len(checkpoints)} shards")
+
+        # 샤드마다 별도 프로세스가 자신의 DB 풀을 만들어 분류/적재하고 같은 작업의 진행 카운터를 증가
+        # 컴파일된 matcher 를 그대로 전달해 샤드마다 규칙을 다시 컴파일하지 않는다
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=len(checkpoints), mp_context=context) as executor:
+            futures = [
+                executor.submit(ingest_shard, self.__ingestor, str(processing_job.job_id),
+                                processing_job.csv_file_path, matcher,
+                                checkpoint.shard_no, checkpoint.remaining_range)
+                for checkpoint in checkpoints
+            ]
+
+            result = IngestResult()
+            for future in futures:
+                result.merge(future.result())
+
+            return result
@@ -0,0 +1,63 @@
+import contextlib
+import cProfile
+import logging
+import os
+import time
+from typing import Generator
+
+logger = logging.getLogger(__name__)
+
+PROFILER_CPROFILE = 'cprofile'
+PROFILER_PYINSTRUMENT = 'pyinstrument'
+
+
+class JobProfiler:
+    """
+    지정한 작업(job_ids, 'all' 이면 전체)을 처리하는 동안 프로파일을 떠서 output_dir 에 저장 (기본 비활성)
+
+    - cprofile: {job_id}-{시각}.prof (python -m pstats / snakeviz 로 확인)
+    - pyinstrument: {job_id}-{시각}.html (pyinstrument 설치 필요)
+    샤드 프로세스는 별도 프로세스이므로 샤드 처리 구간까지 보려면 SHARD_PROCESSES=1 로 실행
+    """
+
+    def __init__(self, job_ids: str = os.getenv("PROFILE_JOBS", ""),
+                 output_dir: str = os.getenv("PROFILE_DIR", "/app/shared/profiles"),
+                 profiler: str = os.getenv("PROFILER", PROFILER_CPROFILE)):
+        self.__job_ids = {job_id.strip() for job_id in job_ids.split(',') if job_id.strip()}
+        self.__output_dir = output_dir
+        self.__profiler = profiler
+
+    def enabled_for(self, job_id: str) -> bool:
+        return 'all' in self.__job_ids or job_id in self.__job_ids
+
+    @contextlib.contextmanager
+    def profile(self, job_id: str) -> Generator[None, None, None]:
+        if not self.enabled_for(job_id):
+            yield
+            return
+
+        os.makedirs(self.__output_dir, exist_ok=True)
+        path = os.path.join(self.__output_dir, f"{job_id}-{time.strftime('%Y%m%d%H%M%S')}")
+
+        if self.__profiler == PROFILER_PYINSTRUMENT:
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"{path}.html", 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+                logger.info(f"작업 프로파일 저장: {path}.html")
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(f"{path}.prof")
+            logger.info(f"작업 프로파일 저장: {path}.prof")
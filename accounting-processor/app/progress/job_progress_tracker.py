@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import time
+from typing import Dict
+
+import redis
+
+from app.database.redis_db import get_shared_redis
+from app.repository.processing_job_repository import ProcessingJobRepository
+
+logger = logging.getLogger(__name__)
+
+# accounting-api 의 RedisJobProgressRepository 와 공유하는 키/채널
+JOB_PROGRESS_KEY = 'job:progress:{job_id}'
+JOB_EVENTS_CHANNEL = 'job:events:{job_id}'
+
+PHASE_PROCESSING = 'processing'
+PHASE_COMPLETED = 'completed'
+PHASE_FAILED = 'failed'
+
+
+class JobProgressTracker:
+    """
+    작업 진행 상황을 Redis 스냅샷(HASH) 과 pub/sub 이벤트로 전달하고, DB 에는 일정 간격으로만 기록
+
+    - 샤드 프로세스들이 같은 스냅샷의 processed_rows 를 HINCRBY 로 함께 증가시킨다
+    - processing_jobs.processed_rows 는 checkpoint_interval 초마다 누적분만 반영
+    - Redis 장애는 작업 실패로 이어지지 않도록 경고만 남긴다
+    - 샤드 프로세스로 전달(pickle)될 수 있도록 Redis 클라이언트는 보관하지 않고 프로세스 공유 클라이언트를 사용
+    """
+
+    def __init__(self, processing_job_repository: ProcessingJobRepository,
+                 checkpoint_interval: float = float(os.getenv("PROGRESS_CHECKPOINT_INTERVAL", 30)),
+                 snapshot_ttl: int = int(os.getenv("PROGRESS_SNAPSHOT_TTL", 24 * 60 * 60))):
+        self.__processing_job_repository = processing_job_repository
+        self.__checkpoint_interval = checkpoint_interval
+        self.__snapshot_ttl = snapshot_ttl
+        self.__pending_rows: Dict[str, int] = {}
+        self.__checkpointed_at: Dict[str, float] = {}
+
+    def start(self, job_id: str, total_rows: int, processed_rows: int = 0) -> None:
+        now = time.time()
+        self.__checkpointed_at[job_id] = time.monotonic()
+
+        self.__publish(job_id, {
+            'phase': PHASE_PROCESSING,
+            'total_rows': total_rows,
+            'processed_rows': processed_rows,
+            # 체크포인트에서 재개한 경우 이미 처리된 행 수 (처리 속도 계산에서 제외)
+            'resumed_rows': processed_rows,
+            'rows_per_sec': 0,
+            'eta_seconds': '',
+            'started_at': now,
+            'updated_at': now
+        })
+
+    def advance(self, job_id: str, rows: int) -> None:
+        self.__pending_rows[job_id] = self.__pending_rows.get(job_id, 0) + rows
+        self.__checkpointed_at.setdefault(job_id, time.monotonic())
+
+        if time.monotonic() - self.__checkpointed_at[job_id] >= self.__checkpoint_interval:
+            self.checkpoint(job_id)
+
+        try:
+            key = JOB_PROGRESS_KEY.format(job_id=job_id)
+            pipeline = get_shared_redis().pipeline()
+            pipeline.hincrby(key, 'processed_rows', rows)
+            pipeline.hmget(key, 'total_rows', 'started_at', 'resumed_rows')
+            processed_rows, (total_rows, started_at, resumed_rows) = pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Job progress publish failed ({job_id}): {str(e)}")
+            return
+
+        now = time.time()
+        elapsed = now - float(started_at or now)
+        rows_per_sec = (processed_rows - int(resumed_rows or 0)) / elapsed if elapsed > 0 else 0
+        remaining = int(total_rows or 0) - processed_rows
+
+        self.__publish(job_id, {
+            'phase': PHASE_PROCESSING,
+            'rows_per_sec': round(rows_per_sec, 1),
+            'eta_seconds': round(remaining / rows_per_sec, 1) if rows_per_sec and remaining > 0 else 0,
+            'updated_at': now
+        }, processed_rows=processed_rows, total_rows=int(total_rows or 0))
+
+    def checkpoint(self, job_id: str) -> None:
+        """
+        아직 DB 에 반영하지 않은 처리 행 수를 processing_jobs 에 누적
+        """
+        rows = self.__pending_rows.pop(job_id, 0)
+        self.__checkpointed_at[job_id] = time.monotonic()
+
+        if rows:
+            self.__processing_job_repository.increment_progress(job_id, rows)
+
+    def complete(self, job_id: str, processed_rows: int) -> None:
+        self.__forget(job_id)
+        self.__publish(job_id, {
+            'phase': PHASE_COMPLETED,
+            'processed_rows': processed_rows,
+            'eta_seconds': 0,
+            'updated_at': time.time()
+        })
+
+    def fail(self, job_id: str, e: Exception) -> None:
+        self.__forget(job_id)
+        self.__publish(job_id, {
+            'phase': PHASE_FAILED,
+            'error_message': str(e),
+            'updated_at': time.time()
+        })
+
+    def __publish(self, job_id: str, fields: dict, **snapshot) -> None:
+        key = JOB_PROGRESS_KEY.format(job_id=job_id)
+
+        try:
+            pipeline = get_shared_redis().pipeline()
+            pipeline.hset(key, mapping=fields)
+            pipeline.expire(key, self.__snapshot_ttl)
+            pipeline.publish(JOB_EVENTS_CHANNEL.format(job_id=job_id),
+                             json.dumps({'job_id': job_id, **snapshot, **fields}))
+            pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Job progress publish failed ({job_id}): {str(e)}")
+
+    def __forget(self, job_id: str) -> None:
+        self.__pending_rows.pop(job_id, None)
+        self.__checkpointed_at.pop(job_id, None)
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.queue.task_queue_core import Task, TaskQueueCore, PROMOTE_LUA, RESERVE_LUA, SETTLE_LUA
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncReliableTaskQueue:
+    """
+    ReliableTaskQueue 의 redis.asyncio 버전 (비동기 워커용)
+
+    키 구성, 재시도 정책, Lua 스크립트는 TaskQueueCore 로 공유하고 I/O 만 비동기로 한다
+    동기 워커와 같은 큐를 함께 소비할 수 있다
+    """
+
+    def __init__(self, redis_client, worker_id: str, **options):
+        # options: TaskQueueCore 설정 (queue_name, visibility_timeout, max_retries, retry_backoff ...)
+        self.__redis = redis_client
+        self.__core = TaskQueueCore(worker_id, **options)
+        self.__promote = redis_client.register_script(PROMOTE_LUA)
+        self.__reserve = redis_client.register_script(RESERVE_LUA)
+        self.__settle = redis_client.register_script(SETTLE_LUA)
+
+        self.pending_key = self.__core.pending_key
+        self.processing_key = self.__core.processing_key
+        self.inflight_key = self.__core.inflight_key
+        self.owners_key = self.__core.owners_key
+        self.delayed_key = self.__core.delayed_key
+        self.dead_key = self.__core.dead_key
+
+    async def reserve(self, timeout: float) -> Optional[Task]:
+        deadline = time.monotonic() + timeout
+
+        while True:
+            keys, args = self.__core.reserve_call()
+            raw = await self.__reserve(keys=keys, args=args)
+            if raw is not None:
+                return Task(raw=raw, payload=json.loads(raw))
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.__core.poll_interval, remaining))
+
+    async def heartbeat(self, task: Task) -> None:
+        await self.__redis.zadd(self.inflight_key, {task.raw: self.__core.heartbeat_deadline()}, xx=True)
+
+    async def ack(self, task: Task) -> None:
+        keys, args = self.__core.ack_call(task.raw)
+        await self.__settle(keys=keys, args=args)
+
+    async def fail(self, task: Task, error: str) -> bool:
+        failure = self.__core.failure(task.payload, error)
+        keys, args = self.__core.settle_call(task.raw, failure)
+        if await self.__settle(keys=keys, args=args):
+            self.__core.log_failure(failure)
+
+        return failure.retried
+
+    async def promote_delayed(self) -> int:
+        keys, args = self.__core.promote_call()
+
+        return await self.__promote(keys=keys, args=args)
+
+    async def reap_stalled(self) -> List[Dict[str, Any]]:
+        buried = []
+        now = time.time()
+
+        for raw in await self.__redis.zrangebyscore(self.inflight_key, '-inf', now):
+            failure = self.__core.failure(json.loads(raw), "visibility timeout exceeded")
+            keys, args = self.__core.settle_call(raw, failure, expired_before=now)
+
+            if not await self.__settle(keys=keys, args=args):
+                continue
+
+            logger.warning(f"가시성 시간 초과 작업 회수: {failure.payload.get('job_id')}")
+            self.__core.log_failure(failure)
+            if not failure.retried:
+                buried.append(failure.payload)
+
+        return buried
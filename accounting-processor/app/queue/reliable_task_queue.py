@@ -0,0 +1,105 @@
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.queue.task_queue_core import Task, TaskQueueCore, PROMOTE_LUA, RESERVE_LUA, SETTLE_LUA
+
+logger = logging.getLogger(__name__)
+
+
+class ReliableTaskQueue:
+    """
+    Redis 리스트 기반 신뢰성 작업 큐
+
+    - 대기 큐(accounting_tasks)에서 워커별 처리 중 리스트로 옮기면서 inflight ZSET(가시성 만료 시각)과 owners 에 등록하는
+      것을 Lua 스크립트 하나로 실행해 워커가 어느 시점에 죽어도 작업이 사라지지 않음
+    - 만료된 처리 중 작업은 reap_stalled 가 회수해 재시도
+    - 실패한 작업은 지수 백오프로 delayed ZSET 에 넣었다가 재전달하고, max_retries 를 넘으면 dead-letter 리스트로 이동
+    - 키 구성/재시도 정책/스크립트는 비동기 워커의 AsyncReliableTaskQueue 와 TaskQueueCore 로 공유
+    """
+
+    def __init__(self, redis_client, worker_id: str, **options):
+        # options: TaskQueueCore 설정 (queue_name, visibility_timeout, max_retries, retry_backoff ...)
+        self.__redis = redis_client
+        self.__core = TaskQueueCore(worker_id, **options)
+        self.__promote = redis_client.register_script(PROMOTE_LUA)
+        self.__reserve = redis_client.register_script(RESERVE_LUA)
+        self.__settle = redis_client.register_script(SETTLE_LUA)
+
+        self.pending_key = self.__core.pending_key
+        self.processing_key = self.__core.processing_key
+        self.inflight_key = self.__core.inflight_key
+        self.owners_key = self.__core.owners_key
+        self.delayed_key = self.__core.delayed_key
+        self.dead_key = self.__core.dead_key
+
+    def reserve(self, timeout: float) -> Optional[Task]:
+        deadline = time.monotonic() + timeout
+
+        while True:
+            keys, args = self.__core.reserve_call()
+            raw = self.__reserve(keys=keys, args=args)
+            if raw is not None:
+                return Task(raw=raw, payload=json.loads(raw))
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.__core.poll_interval, remaining))
+
+    def heartbeat(self, task: Task) -> None:
+        self.__redis.zadd(self.inflight_key, {task.raw: self.__core.heartbeat_deadline()}, xx=True)
+
+    def ack(self, task: Task) -> None:
+        keys, args = self.__core.ack_call(task.raw)
+        self.__settle(keys=keys, args=args)
+
+    def fail(self, task: Task, error: str) -> bool:
+        """
+        실패 처리 후 재시도 예정이면 True, dead-letter 로 이동했으면 False
+        """
+        failure = self.__core.failure(task.payload, error)
+        keys, args = self.__core.settle_call(task.raw, failure)
+        if self.__settle(keys=keys, args=args):
+            self.__core.log_failure(failure)
+
+        return failure.retried
+
+    def promote_delayed(self) -> int:
+        keys, args = self.__core.promote_call()
+
+        return self.__promote(keys=keys, args=args)
+
+    def depths(self) -> Dict[str, int]:
+        pipeline = self.__redis.pipeline()
+        pipeline.llen(self.pending_key)
+        pipeline.zcard(self.delayed_key)
+        pipeline.zcard(self.inflight_key)
+        pipeline.llen(self.dead_key)
+        pending, delayed, inflight, dead = pipeline.execute()
+
+        return {'pending': pending, 'delayed': delayed, 'inflight': inflight, 'dead': dead}
+
+    def reap_stalled(self) -> List[Dict[str, Any]]:
+        """
+        가시성 만료 시각이 지난 처리 중 작업을 회수해 재시도하거나 dead-letter 로 보낸다
+        dead-letter 로 이동한 작업의 payload 목록을 반환
+        """
+        buried = []
+        now = time.time()
+
+        for raw in self.__redis.zrangebyscore(self.inflight_key, '-inf', now):
+            failure = self.__core.failure(json.loads(raw), "visibility timeout exceeded")
+            keys, args = self.__core.settle_call(raw, failure, expired_before=now)
+
+            # 스크립트 안에서 처리 중 리스트에서 제거에 성공한 경우만 회수된 것 (동시 회수/완료 방지)
+            if not self.__settle(keys=keys, args=args):
+                continue
+
+            logger.warning(f"가시성 시간 초과 작업 회수: {failure.payload.get('job_id')}")
+            self.__core.log_failure(failure)
+            if not failure.retried:
+                buried.append(failure.payload)
+
+        return buried
@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# accounting-api 가 작업 payload 의 task 로 넣는 작업 종류
+TASK_PROCESS = 'process_transactions'
+TASK_RECLASSIFY = 'reclassify_transactions'
+
+# 한 번에 대기 큐로 옮기는 재시도 예정 작업 수 (스크립트 실행 중에는 Redis 가 다른 명령을 처리하지 않는다)
+PROMOTE_BATCH = 100
+
+# KEYS[1]: pending, KEYS[2]: delayed / ARGV[1]: now, ARGV[2]: batch
+PROMOTE_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, raw in ipairs(due) do
+    redis.call('ZREM', KEYS[2], raw)
+    redis.call('LPUSH', KEYS[1], raw)
+end
+"""
+
+PROMOTE_LUA = PROMOTE_DUE_LUA + "return #due\n"
+
+# KEYS: pending, delayed, processing, inflight, owners / ARGV: now, batch, visibility deadline
+# 처리 중 리스트로 옮기기와 inflight/owners 등록을 한 스크립트로 실행해, 그 사이에 워커가 죽어도
+# 등록되지 않은 채 처리 중 리스트에 남는(회수되지 않는) 작업이 생기지 않는다
+RESERVE_LUA = PROMOTE_DUE_LUA + """
+local raw = redis.call('LMOVE', KEYS[1], KEYS[3], 'RIGHT', 'LEFT')
+if raw then
+    redis.call('ZADD', KEYS[4], ARGV[3], raw)
+    redis.call('HSET', KEYS[5], raw, KEYS[3])
+end
+return raw
+"""
+
+# KEYS: inflight, owners, target (delayed / dead) / ARGV: raw, expired_before, target type, target raw, target score
+# 처리 중 리스트에서 제거에 성공한 경우에만 재시도/dead-letter 로 보내므로 완료, 실패, 회수가 겹쳐도 한 번만 처리된다
+# expired_before 를 주면 가시성 만료 시각이 그 전인 경우에만 회수 (조회 후 하트비트로 연장된 작업은 건너뜀)
+SETTLE_LUA = """
+local raw = ARGV[1]
+if ARGV[2] ~= '' then
+    local deadline = redis.call('ZSCORE', KEYS[1], raw)
+    if not deadline or tonumber(deadline) > tonumber(ARGV[2]) then
+        return 0
+    end
+end
+local owner = redis.call('HGET', KEYS[2], raw)
+redis.call('ZREM', KEYS[1], raw)
+redis.call('HDEL', KEYS[2], raw)
+if not owner or redis.call('LREM', owner, 1, raw) == 0 then
+    return 0
+end
+if ARGV[3] == 'delayed' then
+    redis.call('ZADD', KEYS[3], ARGV[5], ARGV[4])
+elseif ARGV[3] == 'dead' then
+    redis.call('LPUSH', KEYS[3], ARGV[4])
+end
+return 1
+"""
+
+TARGET_DELAYED = 'delayed'
+TARGET_DEAD = 'dead'
+
+ScriptCall = Tuple[List[str], List[Any]]
+
+
+@dataclass
+class Task:
+    raw: bytes
+    payload: Dict[str, Any]
+
+    @property
+    def job_id(self) -> str:
+        return self.payload['job_id']
+
+    @property
+    def attempts(self) -> int:
+        return int(self.payload.get('attempts', 0))
+
+    @property
+    def task_type(self) -> str:
+        return self.payload.get('task', TASK_PROCESS)
+
+
+@dataclass
+class Failure:
+    """
+    실패한 작업을 보낼 곳 (재시도 예정 delayed ZSET 또는 dead-letter 리스트)
+    """
+    payload: Dict[str, Any]
+    retried: bool
+    raw: str
+    score: float
+    attempts: int
+    backoff: float
+
+
+class TaskQueueCore:
+    """
+    ReliableTaskQueue(동기) / AsyncReliableTaskQueue(비동기) 가 함께 쓰는 키 구성, 재시도 정책, Lua 스크립트 인자
+
+    Redis I/O 는 각 큐가 하고, 여기서는 스크립트에 넘길 KEYS/ARGV 와 재시도 payload 만 만든다
+    """
+
+    def __init__(self, worker_id: str,
+                 queue_name: str = 'accounting_tasks',
+                 visibility_timeout: float = float(os.getenv("TASK_VISIBILITY_TIMEOUT", 300)),
+                 max_retries: int = int(os.getenv("TASK_MAX_RETRIES", 3)),
+                 retry_backoff: float = float(os.getenv("TASK_RETRY_BACKOFF", 5)),
+                 retry_backoff_max: float = float(os.getenv("TASK_RETRY_BACKOFF_MAX", 300)),
+                 poll_interval: float = float(os.getenv("TASK_POLL_INTERVAL", 0.5))):
+        self.visibility_timeout = visibility_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        # 대기 큐가 비었을 때 다시 확인하는 간격 (스크립트 안에서는 블로킹 명령을 쓸 수 없다)
+        self.poll_interval = poll_interval
+
+        self.pending_key = queue_name
+        self.processing_key = f"{queue_name}:processing:{worker_id}"
+        self.inflight_key = f"{queue_name}:inflight"
+        self.owners_key = f"{queue_name}:owners"
+        self.delayed_key = f"{queue_name}:delayed"
+        self.dead_key = f"{queue_name}:dead"
+
+    def promote_call(self) -> ScriptCall:
+        return [self.pending_key, self.delayed_key], [time.time(), PROMOTE_BATCH]
+
+    def reserve_call(self) -> ScriptCall:
+        now = time.time()
+
+        return ([self.pending_key, self.delayed_key, self.processing_key, self.inflight_key, self.owners_key],
+                [now, PROMOTE_BATCH, now + self.visibility_timeout])
+
+    def heartbeat_deadline(self) -> float:
+        return time.time() + self.visibility_timeout
+
+    def ack_call(self, raw: bytes) -> ScriptCall:
+        return [self.inflight_key, self.owners_key, self.delayed_key], [raw, '', '', '', 0]
+
+    def settle_call(self, raw: bytes, failure: Failure, expired_before: Optional[float] = None) -> ScriptCall:
+        target_key, target = (self.delayed_key, TARGET_DELAYED) if failure.retried else (self.dead_key, TARGET_DEAD)
+
+        return ([self.inflight_key, self.owners_key, target_key],
+                [raw, '' if expired_before is None else expired_before, target, failure.raw, failure.score])
+
+    def failure(self, payload: Dict[str, Any], error: str) -> Failure:
+        attempts = int(payload.get('attempts', 0)) + 1
+        retried = {**payload, 'attempts': attempts, 'last_error': error}
+
+        if attempts > self.max_retries:
+            return Failure(payload, False, json.dumps({**retried, 'dead_at': time.time()}), 0, attempts, 0)
+
+        backoff = min(self.retry_backoff * 2 ** (attempts - 1), self.retry_backoff_max)
+
+        return Failure(payload, True, json.dumps(retried), time.time() + backoff, attempts, backoff)
+
+    def log_failure(self, failure: Failure) -> None:
+        job_id = failure.payload.get('job_id')
+
+        if failure.retried:
+            logger.info(f"작업 재시도 예약 ({failure.attempts}/{self.max_retries}, {failure.backoff:g}초 후): {job_id}")
+        else:
+            logger.error(f"재시도 한도 초과로 dead-letter 이동: {job_id}")
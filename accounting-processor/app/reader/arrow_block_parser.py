@@ -0,0 +1,156 @@
+import csv
+import io
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from app.reader.transaction_csv_reader import DATE_FORMATS
+from app.reader.rejects_report import Reject, REJECT_COLUMN_COUNT, REJECT_INVALID_DATE, REJECT_INVALID_AMOUNT, \
+    REJECT_MISSING_BALANCE
+
+AMOUNT_COLUMNS = ('입금액', '출금액', '거래후잔액')
+# 비어 있으면 적재할 수 없는 컬럼 (transactions.transaction_date, balance_after 는 NOT NULL)
+REQUIRED_COLUMNS = ('거래일시', '거래후잔액')
+AMOUNT_PATTERN = r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$'
+# CSV 컬럼 스키마: 파일에 없는 컬럼은 무시된다
+COLUMN_TYPES = {
+    '거래일시': pa.timestamp('s'),
+    '적요': pa.string(),
+    '입금액': pa.int64(),
+    '출금액': pa.int64(),
+    '거래후잔액': pa.int64(),
+    # 지점명은 종류가 적어 사전 인코딩 (pandas Categorical 로 변환)
+    '거래점': pa.dictionary(pa.int32(), pa.string()),
+}
+
+
+class ArrowBlockParser:
+    """
+    CSV 바이트 블록을 선언된 스키마로 pyarrow 멀티스레드 파서에서 바로 타입 변환
+
+    - 블록 전체가 스키마대로 변환되면 그대로 DataFrame 으로 만든다 (빠른 경로)
+    - 변환할 수 없는 값이 있으면 블록을 문자열로 다시 읽어 컬럼별로 변환하고, 변환되지 않는 행은 거부 행으로 뺀다
+    - 컬럼 수가 맞지 않는 행은 파서 단계에서 거부 행으로 뺀다
+    """
+
+    def __init__(self, columns: List[str], encoding: str = 'utf-8'):
+        self.__columns = list(columns)
+        self.__read_options = dict(column_names=self.__columns, encoding=encoding, use_threads=True)
+        self.__column_types = {name: COLUMN_TYPES[name] for name in self.__columns if name in COLUMN_TYPES}
+        self.__string_types = {name: pa.string() for name in self.__columns}
+
+    def parse(self, block: bytes) -> Tuple[pd.DataFrame, List[Reject]]:
+        rejects: List[Reject] = []
+
+        try:
+            table = self.__read(block, self.__column_types, rejects)
+            if not self.__has_missing_required(table):
+                return self.__to_frame(table), rejects
+        except pa.ArrowInvalid:
+            pass
+
+        rejects.clear()
+        table = self.__coerce(self.__read(block, self.__string_types, rejects), rejects)
+
+        return self.__to_frame(table), rejects
+
+    @staticmethod
+    def __has_missing_required(table: pa.Table) -> bool:
+        return any(table[name].null_count for name in REQUIRED_COLUMNS if name in table.column_names)
+
+    def __read(self, block: bytes, column_types: dict, rejects: List[Reject]) -> pa.Table:
+        def invalid_row(row) -> str:
+            rejects.append((REJECT_COLUMN_COUNT, row.text))
+            return 'skip'
+
+        # 따옴표 필드 안의 개행을 허용하면 pyarrow 의 병렬 청크 분할이 느려지므로 따옴표가 있는 블록에만 켠다
+        return pa_csv.read_csv(
+            io.BytesIO(block),
+            read_options=pa_csv.ReadOptions(**self.__read_options),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=b'"' in block, invalid_row_handler=invalid_row),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, timestamp_parsers=list(DATE_FORMATS),
+                                                  strings_can_be_null=True)
+        )
+
+    def __coerce(self, table: pa.Table, rejects: List[Reject]) -> pa.Table:
+        valid = pa.array(np.ones(table.num_rows, dtype=bool))
+        reasons = []
+        columns = {}
+
+        if '거래일시' in self.__column_types:
+            dates = self.__parse_dates(table['거래일시'])
+            columns['거래일시'] = dates
+            reasons.append((REJECT_INVALID_DATE, pc.is_valid(dates)))
+
+        for name in AMOUNT_COLUMNS:
+            if name not in self.__column_types:
+                continue
+
+            raw = table[name]
+            amounts = self.__parse_amounts(raw)
+            columns[name] = amounts
+            # 비어 있는 금액은 그대로 두고(입출금액은 0 으로 처리), 값이 있는데 숫자가 아니면 거부
+            reasons.append((REJECT_INVALID_AMOUNT, pc.or_(pc.is_null(raw), pc.is_valid(amounts))))
+
+        if '거래후잔액' in columns:
+            reasons.append((REJECT_MISSING_BALANCE, pc.is_valid(columns['거래후잔액'])))
+
+        rejected_reasons = pa.nulls(table.num_rows, pa.string())
+        for reason, ok in reasons:
+            rejected_reasons = pc.if_else(pc.and_(valid, pc.invert(ok)), reason, rejected_reasons)
+            valid = pc.and_(valid, ok)
+
+        if not pc.all(valid).as_py():
+            rejects.extend(self.__to_rejects(table, pc.invert(valid), rejected_reasons))
+
+        for name, column in columns.items():
+            table = table.set_column(table.schema.get_field_index(name), name, column)
+        if '거래점' in self.__column_types:
+            table = table.set_column(table.schema.get_field_index('거래점'), '거래점',
+                                     pc.dictionary_encode(table['거래점']))
+
+        return table.filter(valid)
+
+    def __to_rejects(self, raw: pa.Table, invalid: pa.Array, reasons: pa.Array) -> List[Reject]:
+        # 거부 행은 변환 전 문자열을 CSV 한 줄로 되돌려 기록
+        rejects = []
+
+        for reason, row in zip(reasons.filter(invalid).to_pylist(), raw.filter(invalid).to_pylist()):
+            line = io.StringIO()
+            csv.writer(line, lineterminator='').writerow(['' if row[name] is None else row[name]
+                                                          for name in self.__columns])
+            rejects.append((reason, line.getvalue()))
+
+        return rejects
+
+    @staticmethod
+    def __parse_dates(raw: pa.ChunkedArray) -> pa.ChunkedArray:
+        raw = pc.utf8_trim_whitespace(raw)
+        dates = pc.strptime(raw, format=DATE_FORMATS[0], unit='s', error_is_null=True)
+
+        # 다음 형식은 아직 변환되지 않은 값이 남아 있을 때만 시도
+        for date_format in DATE_FORMATS[1:]:
+            if dates.null_count == raw.null_count:
+                break
+            dates = pc.coalesce(dates, pc.strptime(raw, format=date_format, unit='s', error_is_null=True))
+
+        return dates
+
+    @staticmethod
+    def __parse_amounts(raw: pa.ChunkedArray) -> pa.ChunkedArray:
+        raw = pc.utf8_trim_whitespace(raw)
+        try:
+            return pc.cast(raw, pa.int64())
+        except pa.ArrowInvalid:
+            # pandas 경로(pd.to_numeric + round)와 같이 소수는 반올림하고 숫자가 아닌 값은 null
+            numeric = pc.match_substring_regex(raw, AMOUNT_PATTERN)
+            return pc.cast(pc.round(pc.cast(pc.if_else(numeric, raw, None), pa.float64())), pa.int64())
+
+    @staticmethod
+    def __to_frame(table: pa.Table) -> pd.DataFrame:
+        # pandas 경로와 같은 dtype (datetime64[ns], Int64) 으로 맞춰 이후 분류/적재 코드를 그대로 쓴다
+        return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get, coerce_temporal_nanoseconds=True)
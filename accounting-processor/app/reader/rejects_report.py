@@ -0,0 +1,57 @@
+import csv
+import os
+import threading
+from typing import List, Optional, Tuple
+
+REJECTS_COLUMNS = ['block_start', 'block_end', 'reason', 'row']
+
+# (사유, 원본 행)
+Reject = Tuple[str, str]
+
+REJECT_COLUMN_COUNT = 'column_count'
+REJECT_INVALID_DATE = 'invalid_date'
+REJECT_INVALID_AMOUNT = 'invalid_amount'
+REJECT_MISSING_BALANCE = 'missing_balance'
+
+
+class RejectsReport:
+    """
+    적재하지 못한 CSV 행(거부 행)을 원본 옆의 CSV 로 기록 (CSV_REJECTS_DIR 가 있으면 그 디렉터리)
+
+    - 읽기 단계에서 add 로 모아두고, 적재 트랜잭션이 커밋된 블록까지만 flush 로 기록한다
+      (커밋 전에 실패한 블록은 재시도 때 다시 읽히므로 같은 거부 행이 두 번 기록되지 않는다)
+    - 읽기(executor 스레드)와 쓰기(이벤트 루프)가 나뉜 비동기 적재에서도 쓸 수 있도록 잠금으로 보호
+    """
+    REJECTS_DIR = os.getenv("CSV_REJECTS_DIR")
+
+    def __init__(self, csv_file_path: str, shard_no: int, rejects_dir: Optional[str] = REJECTS_DIR):
+        directory = rejects_dir or os.path.dirname(os.path.abspath(csv_file_path))
+        self.path = os.path.join(directory, f"{os.path.basename(csv_file_path)}.rejects-{shard_no}.csv")
+        self.count = 0
+        self.__pending: List[Tuple[int, int, Reject]] = []
+        self.__lock = threading.Lock()
+
+    def add(self, block_start: int, block_end: int, rejects: List[Reject]) -> None:
+        with self.__lock:
+            self.__pending.extend((block_start, block_end, reject) for reject in rejects)
+
+    def flush(self, committed_offset: int) -> int:
+        """
+        committed_offset 까지 커밋된 블록의 거부 행을 기록하고 기록한 행 수를 반환
+        """
+        with self.__lock:
+            ready = [entry for entry in self.__pending if entry[1] <= committed_offset]
+            self.__pending = [entry for entry in self.__pending if entry[1] > committed_offset]
+
+        if not ready:
+            return 0
+
+        new_file = not os.path.exists(self.path)
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(REJECTS_COLUMNS)
+            writer.writerows([block_start, block_end, reason, row] for block_start, block_end, (reason, row) in ready)
+
+        self.count += len(ready)
+        return len(ready)
@@ -0,0 +1,246 @@
+import csv
+import gc
+import io
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.reader.rejects_report import Reject, RejectsReport, REJECT_INVALID_DATE
+
+# CSV 원본 1바이트가 DataFrame 변환 및 분류 과정에서 차지하는 메모리 배수 추정치
+MEMORY_AMPLIFICATION = 12
+SAMPLE_BYTES = 64 * 1024
+COUNT_BLOCK_BYTES = 1024 * 1024
+MIN_CHUNK_ROWS = 1000
+
+ENGINE_PANDAS = 'pandas'
+ENGINE_PYARROW = 'pyarrow'
+
+ByteRange = Tuple[int, int]
+QUOTE = b'"'
+
+# 은행 CSV 에서 보이는 거래일시 형식. 형식을 추론하지 않고 값마다 이 순서대로 시도한다 (두 파서 엔진 공통)
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M',
+                '%Y.%m.%d %H:%M:%S', '%Y.%m.%d %H:%M', '%Y-%m-%d', '%Y/%m/%d', '%Y.%m.%d')
+
+
+def count_row_ends(data: bytes, quoted: bool = False) -> Tuple[int, bool]:
+    """
+    따옴표로 감싼 필드 밖의 개행(행 끝) 수와 data 끝에서 따옴표 안인지 여부
+    quoted 는 data 시작 시점에 따옴표 안인지 여부 (이스케이프된 따옴표 "" 는 짝이 맞으므로 홀짝만 보면 된다)
+    """
+    if QUOTE not in data:
+        return (0 if quoted else data.count(b'\n')), quoted
+
+    parts = data.split(QUOTE)
+
+    return sum(part.count(b'\n') for part in parts[1 if quoted else 0::2]), quoted ^ (len(parts) % 2 == 0)
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    DATE_FORMATS 중 처음 맞는 형식으로 값마다 변환하고, 어느 형식에도 맞지 않으면 NaT
+    (pd.to_datetime 의 형식 추론은 블록의 첫 값 형식을 모든 값에 적용하므로 쓰지 않는다)
+    """
+    values = values.astype('string').str.strip()
+    dates = pd.to_datetime(values, format=DATE_FORMATS[0], errors='coerce')
+
+    # 다음 형식은 아직 변환되지 않은 값에만 시도
+    for date_format in DATE_FORMATS[1:]:
+        remaining = dates.isna() & values.notna()
+        if not remaining.any():
+            break
+        dates = dates.fillna(pd.to_datetime(values[remaining], format=date_format, errors='coerce'))
+
+    return dates
+
+
+class TransactionCsvReader:
+    """
+    거래 내역 CSV 를 메모리 상한(memory_limit_bytes) 안에서 고정 크기 청크로 나누어 읽는다
+
+    적요 등 따옴표로 감싼 필드 안의 개행은 행 끝으로 보지 않는다 (블록/샤드 경계, 행 수 모두 같은 기준)
+    RFC 4180 과 같이 따옴표는 필드 전체를 감쌀 때만 쓴다고 가정한다
+
+    블록 파싱 엔진 (CSV_ENGINE)
+    - pandas: 거래일시만 변환하고 나머지 컬럼은 추론 타입으로 읽어 변환은 TransactionFrameBuilder 가 수행.
+      거래일시를 변환할 수 없는 행은 rejects 로 빼고, 컬럼 수가 맞지 않는 행이 있으면 실패
+    - pyarrow: 선언된 스키마로 멀티스레드 파싱/타입 변환 (ArrowBlockParser). 변환할 수 없는 행은 rejects 로 빼고 계속 진행
+    """
+
+    def __init__(self, csv_file_path: str,
+                 memory_limit_bytes: int = int(os.getenv("CSV_MEMORY_LIMIT_MB", 64)) * 1024 * 1024,
+                 encoding: str = 'utf-8',
+                 engine: str = os.getenv("CSV_ENGINE", ENGINE_PANDAS)):
+        if engine not in (ENGINE_PANDAS, ENGINE_PYARROW):
+            raise ValueError(f"Unknown CSV engine: {engine}")
+
+        self.__csv_file_path = csv_file_path
+        self.__memory_limit_bytes = memory_limit_bytes
+        self.__encoding = encoding
+        self.__engine = engine
+
+    @property
+    def file_size(self) -> int:
+        return os.path.getsize(self.__csv_file_path)
+
+    @property
+    def chunk_rows(self) -> int:
+        row_bytes = self.__estimate_row_bytes()
+
+        return max(MIN_CHUNK_ROWS, self.__memory_limit_bytes // (row_bytes * MEMORY_AMPLIFICATION))
+
+    def count_rows(self) -> int:
+        lines = 0
+        quoted = False
+        last_block = b''
+
+        with open(self.__csv_file_path, 'rb') as f:
+            while block := f.read(COUNT_BLOCK_BYTES):
+                row_ends, quoted = count_row_ends(block, quoted)
+                lines += row_ends
+                last_block = block
+
+        # 마지막 행이 개행 없이 끝나는 경우
+        if last_block and not last_block.endswith(b'\n'):
+            lines += 1
+
+        # 헤더 제외
+        return max(lines - 1, 0)
+
+    def data_range(self) -> ByteRange:
+        """
+        헤더를 제외한 데이터 영역의 바이트 구간
+        """
+        with open(self.__csv_file_path, 'rb') as f:
+            f.readline()
+            return f.tell(), self.file_size
+
+    def split_byte_ranges(self, shards: int) -> List[ByteRange]:
+        """
+        헤더를 제외한 데이터 영역을 행 경계에 맞춘 shards 개 이하의 바이트 구간으로 분할
+        """
+        data_start, file_size = self.data_range()
+
+        with open(self.__csv_file_path, 'rb') as f:
+            boundaries = [data_start]
+            for shard in range(1, shards):
+                target = max(data_start + (file_size - data_start) * shard // shards, boundaries[-1])
+                # 직전 경계(행 시작)부터 target 까지의 따옴표 홀짝으로 target 이 필드 안인지 판단
+                quoted = self.__count_quotes(f, boundaries[-1], target) % 2 == 1
+                if target > data_start:
+                    self.__read_row_end(f, quoted)  # 다음 행의 시작으로 정렬
+                boundaries.append(min(f.tell(), file_size))
+            boundaries.append(file_size)
+
+        return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+    def read_chunks(self, byte_range: Optional[ByteRange] = None) -> Iterator[pd.DataFrame]:
+        for _, chunk in self.read_blocks(byte_range):
+            yield chunk
+
+    def read_blocks(self, byte_range: Optional[ByteRange] = None,
+                    rejects: Optional[RejectsReport] = None) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        행 경계에 맞춘 바이트 블록 단위로 읽어 (블록 끝 오프셋, DataFrame) 을 반환
+        블록 끝 오프셋은 다음에 읽을 행의 시작이므로 그대로 재개 지점(체크포인트)으로 쓸 수 있다
+        pyarrow 엔진의 거부 행은 rejects 에 블록 구간과 함께 모은다 (기록은 커밋 후 호출자가 flush)
+        """
+        columns = pd.read_csv(self.__csv_file_path, encoding=self.__encoding, nrows=0).columns
+        parse = self.__pandas_parser(columns) if self.__engine == ENGINE_PANDAS else self.__arrow_parser(columns)
+        start, end = byte_range or self.data_range()
+        block_bytes = self.chunk_rows * self.__estimate_row_bytes()
+
+        with open(self.__csv_file_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+
+            while offset < end:
+                # pandas 의 Copy-on-Write 참조(BlockValuesRefs)가 순환 참조를 만들어 지난 청크가 full GC 전까지 남으므로
+                # 다음 블록을 읽기 전에 young 세대만 수거해 메모리 상한을 지킨다
+                gc.collect(1)
+
+                block_start = offset
+                block = f.read(min(block_bytes, end - offset))
+                if offset + len(block) < end:
+                    # 행 중간(따옴표 필드 안의 개행 포함)에서 끊기지 않도록 따옴표 밖의 다음 개행까지
+                    quoted = block.count(QUOTE) % 2 == 1
+                    if quoted or not block.endswith(b'\n'):
+                        block += self.__read_row_end(f, quoted)
+                offset += len(block)
+
+                if block.strip():
+                    chunk, rejected = parse(block)
+                    if rejected and rejects is not None:
+                        rejects.add(block_start, offset, rejected)
+                    yield offset, chunk
+
+    @staticmethod
+    def __count_quotes(f, start: int, end: int) -> int:
+        f.seek(start)
+        quotes = 0
+
+        while start < end and (block := f.read(min(COUNT_BLOCK_BYTES, end - start))):
+            quotes += block.count(QUOTE)
+            start += len(block)
+
+        return quotes
+
+    @staticmethod
+    def __read_row_end(f, quoted: bool) -> bytes:
+        """
+        현재 위치부터 따옴표 밖의 개행까지 읽는다 (quoted: 현재 위치가 따옴표 안인지)
+        """
+        data = b''
+
+        while line := f.readline():
+            data += line
+            quoted ^= line.count(QUOTE) % 2 == 1
+            if not quoted:
+                break
+
+        return data
+
+    def __pandas_parser(self, columns):
+        def parse(block: bytes):
+            chunk = pd.read_csv(io.BytesIO(block), encoding=self.__encoding, header=None, names=columns)
+            if '거래일시' not in chunk.columns:
+                return chunk, []
+
+            # 변환할 수 없는 거래일시를 임의 값(현재 시각 등)으로 채우면 같은 행도 재시도/재업로드 때마다
+            # 행 지문과 파티션 키가 달라져 멱등 적재가 깨지므로 거부 행으로 뺀다
+            dates = parse_dates(chunk['거래일시'])
+            invalid = dates.isna()
+            rejects = self.__to_rejects(chunk[invalid], REJECT_INVALID_DATE) if invalid.any() else []
+
+            return chunk.assign(거래일시=dates)[~invalid].reset_index(drop=True), rejects
+
+        return parse
+
+    @staticmethod
+    def __to_rejects(rows: pd.DataFrame, reason: str) -> List[Reject]:
+        rejects = []
+
+        for row in rows.astype(object).where(rows.notna(), '').itertuples(index=False):
+            line = io.StringIO()
+            csv.writer(line, lineterminator='').writerow(row)
+            rejects.append((reason, line.getvalue()))
+
+        return rejects
+
+    def __arrow_parser(self, columns):
+        # pyarrow 는 선택한 경우에만 불러온다
+        from app.reader.arrow_block_parser import ArrowBlockParser
+
+        return ArrowBlockParser(list(columns), self.__encoding).parse
+
+    def __estimate_row_bytes(self) -> int:
+        with open(self.__csv_file_path, 'rb') as f:
+            sample = f.read(SAMPLE_BYTES)
+
+        lines = sample.split(b'\n')[1:-1]  # 헤더와 잘린 마지막 행 제외
+        if not lines:
+            return max(len(sample), 1)
+
+        return max(sum(len(line) + 1 for line in lines) // len(lines), 1)
@@ -0,0 +1,42 @@
+import argparse
+import logging
+
+from dotenv import load_dotenv
+
+from app.database.postgres_db import close_pool, use_tenant_shard, each_tenant_shard
+from app.database.tenant_shards import tenant_shard_of
+from app.repository.impl.postgres_transaction_summary_repository import PostgresTransactionSummaryRepository
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    transactions 로부터 transaction_summaries 를 다시 계산 (테넌트 샤드를 쓰면 회사가 속한 샤드 또는 모든 샤드 DB 에서)
+    python -m app.rebuild_summaries [--company-id com_1]
+    """
+    parser = argparse.ArgumentParser(description="거래 집계(transaction_summaries) 재계산")
+    parser.add_argument('--company-id', help="지정한 회사만 재계산 (기본: 전체)")
+    args = parser.parse_args()
+
+    try:
+        repository = PostgresTransactionSummaryRepository()
+
+        if args.company_id:
+            with use_tenant_shard(tenant_shard_of(args.company_id)):
+                rows = repository.rebuild(args.company_id)
+        else:
+            rows = sum(repository.rebuild() for _ in each_tenant_shard())
+        logger.info(f"거래 집계 재계산 완료: {args.company_id or '전체'} ({rows} rows)")
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
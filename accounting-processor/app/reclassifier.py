@@ -0,0 +1,198 @@
+import logging
+import os
+import traceback
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.cache.record_cache_invalidator import RecordCacheInvalidator
+from app.classifier.description_memo import DescriptionMemo
+from app.classifier.matcher_cache import MatcherCache
+from app.classifier.rules_diff import diff_rules
+from app.classifier.transaction_frame import TransactionFrameBuilder, summarize_rows
+from app.database.postgres_db import transaction, use_tenant_shard, each_tenant_shard
+from app.database.tenant_shards import is_sharded, tenant_shards_of
+from app.entity.processing_job import ProcessingJob
+from app.metrics.worker_metrics import ROWS_PROCESSED
+from app.progress.job_progress_tracker import JobProgressTracker
+from app.repository.impl.postgres_rules_set_repository import PostgresRulesSetRepository
+from app.repository.impl.postgres_transaction_repository import CATEGORY_UPDATE_COLUMNS
+from app.repository.impl.postgres_transaction_summary_repository import PostgresTransactionSummaryRepository
+from app.repository.processing_job_repository import ProcessingJobRepository
+from app.repository.rules_set_repository import RulesSetRepository
+from app.repository.transaction_repository import TransactionRepository
+from app.repository.transaction_summary_repository import TransactionSummaryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionReclassifier:
+    """
+    규칙 변경 재분류 작업: 이전 규칙(base_rules_hash)으로 분류된 업로드 작업들의 거래 내역을 새 규칙(rules_hash)으로 다시 분류
+    (source_job_id 가 있으면 그 업로드 작업만, 없으면 이전 규칙으로 분류된 모든 업로드 작업)
+
+    - 두 규칙의 차이(rules_diff)로 결과가 바뀔 수 있는 적요만 트라이그램 인덱스로 읽어 다시 분류
+    - 분류가 바뀐 행만 UPDATE ... FROM (VALUES ...) 로 갱신하고, 같은 트랜잭션에서 집계 증감을 반영
+    - 이미 새 규칙으로 바뀐 행은 결과가 같아 다시 갱신되지 않으므로 실패 후 재시도해도 안전
+    - 테넌트 샤드를 쓰면 샤드마다 후보를 읽고, 회사가 바뀌어 샤드가 달라진 행은 새 샤드로 옮긴다
+      (옮긴 행은 이후 샤드에서 다시 후보로 읽혀도 이미 새 규칙으로 분류했으므로 건너뛰고 진행 행 수에 한 번만 센다)
+    - 끝나면 대상 업로드 작업의 rules_hash 를 새 규칙으로 바꾼다
+    """
+
+    def __init__(self, processing_job_repository: ProcessingJobRepository,
+                 transaction_repository: TransactionRepository,
+                 batch_size: int = int(os.getenv("RECLASSIFY_BATCH_SIZE", 5000)),
+                 record_cache_invalidator: Optional[RecordCacheInvalidator] = None,
+                 matcher_cache: Optional[MatcherCache] = None,
+                 progress_tracker: Optional[JobProgressTracker] = None,
+                 rules_set_repository: Optional[RulesSetRepository] = None,
+                 summary_repository: Optional[TransactionSummaryRepository] = None):
+        self.__processing_job_repository = processing_job_repository
+        self.__transaction_repository = transaction_repository
+        self.__batch_size = batch_size
+        self.__record_cache_invalidator = record_cache_invalidator
+        self.__rules_set_repository = rules_set_repository or PostgresRulesSetRepository()
+        self.__matcher_cache = matcher_cache or MatcherCache(self.__rules_set_repository)
+        self.__progress_tracker = progress_tracker or JobProgressTracker(processing_job_repository)
+        self.__summary_repository = summary_repository or PostgresTransactionSummaryRepository()
+
+    def process_job(self, job_id: str):
+        try:
+            job_info = self.__processing_job_repository.find_and_update_status(job_id)
+            processing_job = ProcessingJob.from_job_info(job_id, job_info)
+            if not processing_job.base_rules_hash or not processing_job.rules_hash:
+                raise ValueError(f"Reclassify job requires base and new rules: {job_id}")
+
+            diff = diff_rules(self.__rules_set_repository.find_rules(processing_job.base_rules_hash),
+                              self.__rules_set_repository.find_rules(processing_job.rules_hash))
+            source_job_id = str(processing_job.source_job_id) if processing_job.source_job_id else None
+            target_job_ids = self.__processing_job_repository.find_job_ids_by_rules_hash(
+                processing_job.base_rules_hash, source_job_id)
+
+            logger.info(f"Reclassify job {job_id}: {len(target_job_ids)} upload jobs, "
+                        f"{len(diff.changed_categories)} changed categories, "
+                        f"{'full scan' if diff.full_scan else f'{len(diff.keywords)} candidate keywords'}")
+
+            self.__progress_tracker.start(job_id, 0)
+            changed_rows, company_ids = 0, set()
+
+            if target_job_ids and not diff.empty:
+                matcher = self.__matcher_cache.get(processing_job.rules_hash)
+                frame_builder = TransactionFrameBuilder(matcher, DescriptionMemo())
+                moved_ids = set()
+
+                for shard in each_tenant_shard():
+                    for candidates in self.__transaction_repository.find_reclassify_candidates(
+                            target_job_ids, None if diff.full_scan else diff.keywords, self.__batch_size):
+                        if moved_ids:
+                            candidates = candidates[~candidates['transaction_id'].isin(moved_ids)]
+                            if candidates.empty:
+                                continue
+                        updated = self.__reclassify_batch(frame_builder, candidates, shard, moved_ids)
+
+                        processing_job.processed(len(candidates))
+                        changed_rows += len(updated)
+                        company_ids |= set(updated['old_company_id'].dropna()) | set(updated['company_id'].dropna())
+                        self.__progress_tracker.advance(job_id, len(candidates))
+                        ROWS_PROCESSED.inc(len(candidates))
+
+            self.__processing_job_repository.update_rules_hash(target_job_ids, processing_job.rules_hash)
+
+            processing_job.set_total_rows(processing_job.processed_rows)
+            processing_job.complete()
+            self.__processing_job_repository.complete_job(processing_job)
+            self.__progress_tracker.complete(job_id, processing_job.processed_rows)
+
+            if self.__record_cache_invalidator:
+                self.__record_cache_invalidator.invalidate(company_ids)
+
+            logger.info(f"Reclassify job {job_id}: {processing_job.processed_rows} candidate rows, "
+                        f"{changed_rows} rows changed")
+
+            return {
+                "job_id": job_id,
+                "status": "completed",
+                "processed_rows": processing_job.processed_rows,
+                "changed_rows": changed_rows
+            }
+
+        except Exception as e:
+            logger.error(f"Error reclassifying job {job_id}: {str(e)}, trace: {traceback.format_exc()}")
+            self.__processing_job_repository.fail_job(job_id, e)
+            self.__progress_tracker.fail(job_id, e)
+
+            raise
+
+    def __reclassify_batch(self, frame_builder: TransactionFrameBuilder, candidates: pd.DataFrame,
+                           shard: int, moved_ids: set) -> pd.DataFrame:
+        transaction_dates = pd.to_datetime(candidates['transaction_date'])
+        company_ids, category_ids = frame_builder.classify(candidates['description'], candidates['amount_in'],
+                                                           candidates['amount_out'], transaction_dates)
+
+        changes = candidates.assign(old_company_id=candidates['company_id'], old_category_id=candidates['category_id'],
+                                    company_id=company_ids, category_id=category_ids)
+        changes = changes[(changes['company_id'].fillna('') != changes['old_company_id'].fillna('')) |
+                          (changes['category_id'].fillna('') != changes['old_category_id'].fillna(''))]
+        if changes.empty:
+            return changes
+
+        if not is_sharded():
+            return self.__update(changes)
+
+        targets = tenant_shards_of(changes['company_id'])
+        updated = [self.__update(changes[targets == shard])]
+        for target in map(int, np.unique(targets[targets != shard])):
+            updated.append(self.__move(changes[targets == target], target, moved_ids))
+
+        return pd.concat(updated, ignore_index=True)
+
+    def __update(self, changes: pd.DataFrame) -> pd.DataFrame:
+        if changes.empty:
+            return pd.DataFrame(columns=CATEGORY_UPDATE_COLUMNS)
+
+        # 분류 갱신과 집계 증감을 같은 트랜잭션으로 커밋
+        with transaction():
+            updated = self.__transaction_repository.update_categories(changes)
+            self.__summary_repository.apply_deltas(self.__summary_deltas(updated))
+
+        return updated
+
+    def __move(self, changes: pd.DataFrame, target: int, moved_ids: set) -> pd.DataFrame:
+        """
+        현재 샤드에서 행을 잠근 채 target 샤드에 넣고 커밋한 뒤 현재 샤드에서 지우고 커밋
+        두 커밋 사이에 실패하면 현재 샤드의 행이 남아 재시도 때 다시 옮기며, 이미 넣은 행은 target 에서 건너뛴다
+        옮긴 행의 transaction_id 는 moved_ids 에 모은다
+        """
+        with transaction():
+            rows = self.__transaction_repository.lock_moving_rows(changes)
+            if rows.empty:
+                return pd.DataFrame(columns=CATEGORY_UPDATE_COLUMNS)
+
+            with use_tenant_shard(target):
+                with transaction():
+                    inserted = self.__transaction_repository.insert_moved_rows(rows)
+                    self.__summary_repository.apply_deltas(
+                        self.__summary_deltas(inserted.assign(old_company_id=None, old_category_id=None)))
+
+            deleted = self.__transaction_repository.delete_moved_rows(rows)
+            self.__summary_repository.apply_deltas(
+                self.__summary_deltas(deleted.assign(company_id=None, category_id=None)))
+
+        moved_ids.update(rows['transaction_id'])
+        logger.info(f"{len(deleted)} reclassified rows moved to tenant shard {target}")
+
+        return rows[CATEGORY_UPDATE_COLUMNS]
+
+    @staticmethod
+    def __summary_deltas(updated: pd.DataFrame) -> pd.DataFrame:
+        amounts = updated[['transaction_date', 'amount_in', 'amount_out']].assign(
+            transaction_date=pd.to_datetime(updated['transaction_date']))
+        removed = summarize_rows(amounts.assign(company_id=updated['old_company_id'],
+                                                category_id=updated['old_category_id']))
+        added = summarize_rows(amounts.assign(company_id=updated['company_id'], category_id=updated['category_id']))
+
+        removed[['transaction_count', 'amount_in', 'amount_out']] *= -1
+        deltas = pd.concat([removed, added]).groupby(['company_id', 'category_id', 'month'], as_index=False).sum()
+
+        return deltas[(deltas[['transaction_count', 'amount_in', 'amount_out']] != 0).any(axis=1)]
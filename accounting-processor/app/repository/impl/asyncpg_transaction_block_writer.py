@@ -0,0 +1,229 @@
+import logging
+import os
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+import asyncpg
+import numpy as np
+import pandas as pd
+
+from app.classifier.transaction_frame import TRANSACTION_COLUMNS, fingerprint_rows, summarize_rows
+from app.database.asyncpg_db import get_async_pool
+from app.database.tenant_shards import Host, TENANT_SHARDS, is_sharded, tenant_shards_of
+from app.entity.transaction_block import TransactionBlock
+from app.repository.impl.postgres_transaction_repository import IDEMPOTENT_COLUMNS, PostgresTransactionRepository
+from app.repository.impl.postgres_transaction_summary_repository import (
+    SUMMARY_COLUMNS, ON_CONFLICT_ACCUMULATE, AGGREGATE_TRANSACTIONS_SQL
+)
+from app.repository.transaction_block_writer import TransactionBlockWriter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncpgTransactionBlockWriter(TransactionBlockWriter):
+    """
+    비동기 워커의 청크 적재: copy_records_to_table 로 적재하고 집계 증분, 체크포인트를 같은 트랜잭션으로 커밋
+
+    동기 경로(PostgresTransactionRepository, PostgresTransactionSummaryRepository,
+    PostgresTransactionPartitionRepository)와 같은 SQL 을 asyncpg 로 실행한다
+    """
+    ADD_SUMMARY_SQL = f"""
+        INSERT INTO transaction_summaries ({', '.join(SUMMARY_COLUMNS)})
+        SELECT * FROM unnest($1::varchar[], $2::varchar[], $3::date[], $4::bigint[], $5::bigint[], $6::bigint[])
+        ORDER BY 1, 2, 3
+        {ON_CONFLICT_ACCUMULATE}
+    """
+    ADD_INSERTED_SQL = f"""
+        INSERT INTO transaction_summaries ({', '.join(SUMMARY_COLUMNS)})
+        {AGGREGATE_TRANSACTIONS_SQL}
+          AND row_fingerprint = ANY($1::uuid[])
+          AND job_id = $2
+          AND xmin = pg_current_xact_id()::xid
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        {ON_CONFLICT_ACCUMULATE}
+    """
+    COMMIT_CHECKPOINT_SQL = """
+        UPDATE processing_job_checkpoints
+        SET committed_offset = $1,
+            committed_rows = committed_rows + $2,
+            updated_at = now()
+        WHERE job_id = $3 AND shard_no = $4
+    """
+    # PostgresProcessingJobCheckpointRepository.find_tenant_offset / commit_tenant 와 같은 SQL
+    FIND_TENANT_OFFSET_SQL = """
+        SELECT committed_offset
+        FROM tenant_shard_checkpoints
+        WHERE job_id = $1 AND shard_no = $2
+        FOR UPDATE
+    """
+    COMMIT_TENANT_CHECKPOINT_SQL = """
+        INSERT INTO tenant_shard_checkpoints (job_id, shard_no, committed_offset, committed_rows)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (job_id, shard_no) DO UPDATE
+        SET committed_offset = EXCLUDED.committed_offset,
+            committed_rows = tenant_shard_checkpoints.committed_rows + EXCLUDED.committed_rows,
+            updated_at = now()
+    """
+
+    def __init__(self,
+                 idempotent: bool = os.getenv("TRANSACTION_IDEMPOTENT", "false").lower() == "true",
+                 lock_timeout_ms: int = int(os.getenv("PARTITION_LOCK_TIMEOUT_MS", 5000))):
+        self.__idempotent = idempotent
+        self.__lock_timeout_ms = lock_timeout_ms
+        # DB(테넌트 샤드)별로 이미 확인한 월
+        self.__known_months: Dict[Host, Set[date]] = {}
+
+    def prepare(self, end_offset: int, frame: pd.DataFrame) -> TransactionBlock:
+        """
+        DataFrame 을 COPY 레코드/집계 행으로 변환 (CPU 작업이므로 이벤트 루프 밖의 executor 에서 호출)
+        테넌트 샤드를 쓰면 company_id 해시로 나눠 샤드별 부분 청크로 변환
+        """
+        if not is_sharded():
+            return self.__prepare(end_offset, frame)
+
+        shards = tenant_shards_of(frame['company_id'])
+
+        return TransactionBlock(
+            end_offset=end_offset,
+            rows=len(frame),
+            records=[],
+            months=list(frame['transaction_date'].dt.to_period('M').dt.start_time.dt.date.unique()),
+            summary_rows=[],
+            company_ids=set(frame['company_id'].dropna().unique()),
+            parts={shard: self.__prepare(end_offset, frame[shards == shard])
+                   for shard in map(int, np.unique(shards))}
+        )
+
+    def __prepare(self, end_offset: int, frame: pd.DataFrame) -> TransactionBlock:
+        columns = list(TRANSACTION_COLUMNS)
+        fingerprints = None
+
+        if self.__idempotent:
+            fingerprints = fingerprint_rows(frame)
+            frame = frame.assign(row_fingerprint=fingerprints)
+            columns = IDEMPOTENT_COLUMNS
+            fingerprints = fingerprints.tolist()
+
+        values = frame[columns].astype(object)
+        values = values.where(values.notna(), None)
+
+        summary = summarize_rows(frame)
+        summary_rows = [
+            (company_id, category_id, month.date(), int(count), int(amount_in), int(amount_out))
+            for company_id, category_id, month, count, amount_in, amount_out
+            in summary[SUMMARY_COLUMNS].itertuples(index=False, name=None)
+        ]
+
+        return TransactionBlock(
+            end_offset=end_offset,
+            rows=len(frame),
+            records=list(values.itertuples(index=False, name=None)),
+            months=list(frame['transaction_date'].dt.to_period('M').dt.start_time.dt.date.unique()),
+            summary_rows=summary_rows,
+            company_ids=set(frame['company_id'].dropna().unique()),
+            fingerprints=fingerprints
+        )
+
+    async def ensure_months(self, months: Iterable[date]) -> List[date]:
+        """
+        PostgresTransactionPartitionRepository.ensure_months 와 같이 적재 트랜잭션 밖에서 월 파티션을 만든다
+        """
+        created = []
+
+        # 테넌트 샤드를 쓰면 청크의 월 파티션을 모든 샤드에 만든다 (이미 확인한 월은 다시 조회하지 않는다)
+        for host in (TENANT_SHARDS if is_sharded() else [None]):
+            created += await self.__ensure_months(host, months)
+
+        return created
+
+    async def __ensure_months(self, host: Optional[Host], months: Iterable[date]) -> List[date]:
+        created = []
+        pool = await get_async_pool(host)
+        known_months = self.__known_months.setdefault(host, set())
+
+        for month in sorted(set(months) - known_months):
+            try:
+                async with pool.acquire() as connection:
+                    async with connection.transaction():
+                        await connection.execute("SELECT set_config('lock_timeout', $1, true)",
+                                                 f"{self.__lock_timeout_ms}ms")
+                        if await connection.fetchval("SELECT create_transaction_partition($1)", month):
+                            created.append(month)
+                            logger.info(f"거래 내역 파티션 생성: {month:%Y-%m}")
+            except asyncpg.exceptions.LockNotAvailableError:
+                logger.warning(f"거래 내역 파티션 {month:%Y-%m} 생성 잠금 대기 시간 초과. 기본 파티션에 적재합니다")
+                continue
+
+            known_months.add(month)
+
+        return created
+
+    async def write(self, job_id: str, shard_no: int, block: TransactionBlock) -> int:
+        """
+        저장된 행 수를 반환 (멱등 모드에서는 이미 저장되어 건너뛴 행 제외)
+        """
+        if block.parts:
+            return await self.__write_tenant_shards(job_id, shard_no, block)
+
+        pool = await get_async_pool()
+
+        async with pool.acquire() as connection:
+            async with connection.transaction():
+                saved = await self.__copy(connection, block)
+                await self.__add_summary(connection, job_id, block, saved)
+                await connection.execute(self.COMMIT_CHECKPOINT_SQL, block.end_offset, block.rows, job_id, shard_no)
+
+        return saved
+
+    async def __write_tenant_shards(self, job_id: str, shard_no: int, block: TransactionBlock) -> int:
+        """
+        TransactionIngestor 의 테넌트 샤드 적재와 같이 샤드마다 적재/집계/샤드 체크포인트를 커밋한 뒤 기본 DB 체크포인트를 커밋
+        """
+        saved = 0
+
+        for shard, part in block.parts.items():
+            pool = await get_async_pool(TENANT_SHARDS[shard])
+
+            async with pool.acquire() as connection:
+                async with connection.transaction():
+                    committed_offset = await connection.fetchval(self.FIND_TENANT_OFFSET_SQL, job_id, shard_no)
+                    if committed_offset is not None and committed_offset >= block.end_offset:
+                        logger.info(f"Job {job_id} shard {shard_no}: block ending at {block.end_offset} already "
+                                    f"committed to tenant shard {shard}")
+                        saved += part.rows
+                        continue
+
+                    part_saved = await self.__copy(connection, part)
+                    await self.__add_summary(connection, job_id, part, part_saved)
+                    await connection.execute(self.COMMIT_TENANT_CHECKPOINT_SQL, job_id, shard_no, block.end_offset,
+                                             part.rows)
+
+            saved += part_saved
+
+        pool = await get_async_pool()
+        await pool.execute(self.COMMIT_CHECKPOINT_SQL, block.end_offset, block.rows, job_id, shard_no)
+
+        return saved
+
+    async def __copy(self, connection, block: TransactionBlock) -> int:
+        if not self.__idempotent:
+            await connection.copy_records_to_table('transactions', records=block.records,
+                                                   columns=TRANSACTION_COLUMNS)
+            return block.rows
+
+        await connection.execute(PostgresTransactionRepository.CREATE_STAGING_SQL)
+        await connection.copy_records_to_table('transactions_staging', records=block.records,
+                                               columns=IDEMPOTENT_COLUMNS)
+        # 상태 문자열 'INSERT 0 <행 수>'
+        status = await connection.execute(PostgresTransactionRepository.MERGE_STAGING_SQL)
+
+        return int(status.split()[-1])
+
+    async def __add_summary(self, connection, job_id: str, block: TransactionBlock, saved: int):
+        if saved == block.rows:
+            if block.summary_rows:
+                await connection.execute(self.ADD_SUMMARY_SQL, *map(list, zip(*block.summary_rows)))
+        elif saved:
+            # 중복 제외로 일부만 적재된 청크는 실제로 들어간 행만 집계
+            await connection.execute(self.ADD_INSERTED_SQL, block.fingerprints, job_id)
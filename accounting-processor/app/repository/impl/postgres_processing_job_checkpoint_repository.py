@@ -0,0 +1,87 @@
+from typing import List
+
+from psycopg2.extras import execute_values
+
+from app.database.postgres_db import get_cursor, each_tenant_shard
+from app.entity.shard_checkpoint import ShardCheckpoint
+from app.reader.transaction_csv_reader import ByteRange
+from app.repository.processing_job_checkpoint_repository import ProcessingJobCheckpointRepository
+
+
+class PostgresProcessingJobCheckpointRepository(ProcessingJobCheckpointRepository):
+
+    def find_by_job(self, job_id: str) -> List[ShardCheckpoint]:
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    SELECT shard_no, range_start, range_end, committed_offset, committed_rows
+                    FROM processing_job_checkpoints
+                    WHERE job_id = %s
+                    ORDER BY shard_no
+                """, (job_id,))
+
+            return [ShardCheckpoint.from_row(row) for row in cursor.fetchall()]
+
+    def save_plan(self, job_id: str, byte_ranges: List[ByteRange]) -> List[ShardCheckpoint]:
+        checkpoints = [
+            ShardCheckpoint(shard_no=shard_no, range_start=start, range_end=end,
+                            committed_offset=start, committed_rows=0)
+            for shard_no, (start, end) in enumerate(byte_ranges)
+        ]
+        if not checkpoints:
+            return checkpoints
+
+        with get_cursor() as cursor:
+            execute_values(cursor, """
+                    INSERT INTO processing_job_checkpoints
+                        (job_id, shard_no, range_start, range_end, committed_offset, committed_rows)
+                    VALUES %s
+                    ON CONFLICT (job_id, shard_no) DO NOTHING
+                """, [(job_id, c.shard_no, c.range_start, c.range_end, c.committed_offset, c.committed_rows)
+                      for c in checkpoints])
+
+        return checkpoints
+
+    def commit(self, job_id: str, shard_no: int, committed_offset: int, rows: int):
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    UPDATE processing_job_checkpoints
+                    SET committed_offset = %s,
+                        committed_rows = committed_rows + %s,
+                        updated_at = now()
+                    WHERE job_id = %s AND shard_no = %s
+                """, (committed_offset, rows, job_id, shard_no))
+
+    def find_tenant_offset(self, job_id: str, shard_no: int) -> int:
+        """
+        현재 테넌트 샤드 DB 에 이 구간(shard_no)이 커밋한 마지막 오프셋 (없으면 -1)
+        적재 트랜잭션 안에서 행을 잠가 커밋할 때까지 같은 구간의 다른 시도가 기다리게 한다
+        """
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    SELECT committed_offset
+                    FROM tenant_shard_checkpoints
+                    WHERE job_id = %s AND shard_no = %s
+                    FOR UPDATE
+                """, (job_id, shard_no))
+            row = cursor.fetchone()
+
+            return row['committed_offset'] if row else -1
+
+    def commit_tenant(self, job_id: str, shard_no: int, committed_offset: int, rows: int):
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    INSERT INTO tenant_shard_checkpoints (job_id, shard_no, committed_offset, committed_rows)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (job_id, shard_no) DO UPDATE
+                    SET committed_offset = EXCLUDED.committed_offset,
+                        committed_rows = tenant_shard_checkpoints.committed_rows + EXCLUDED.committed_rows,
+                        updated_at = now()
+                """, (job_id, shard_no, committed_offset, rows))
+
+    def delete_by_job(self, job_id: str):
+        with get_cursor() as cursor:
+            cursor.execute("DELETE FROM processing_job_checkpoints WHERE job_id = %s", (job_id,))
+
+        for _ in each_tenant_shard():
+            with get_cursor() as cursor:
+                cursor.execute("DELETE FROM tenant_shard_checkpoints WHERE job_id = %s", (job_id,))
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from app.database.postgres_db import get_cursor
 from app.entity.processing_job import ProcessingJob
@@ -13,7 +14,7 @@ class PostgresProcessingJobRepository(ProcessingJobRepository):
                     UPDATE processing_jobs 
                     SET status = 'processing', started_at = %s
                     WHERE job_id = %s
-                    RETURNING csv_file_path, rules_data
+                    RETURNING csv_file_path, rules_hash, rules_data, total_rows, base_rules_hash, source_job_id
                 """, (datetime.now(), id))
 
             job_info = cursor.fetchone()
@@ -34,6 +35,15 @@ class PostgresProcessingJobRepository(ProcessingJobRepository):
                             processing_job.total_rows,
                             processing_job.job_id))
 
+    def increment_progress(self, job_id: str, rows: int):
+        with get_cursor() as cursor:
+            cursor.execute("""
+                            UPDATE processing_jobs 
+                            SET processed_rows = processed_rows + %s
+                            WHERE job_id = %s
+                            """,
+                           (rows, job_id))
+
     def complete_job(self, processing_job: ProcessingJob):
         with get_cursor() as cursor:
             cursor.execute("""
@@ -48,7 +58,7 @@ class PostgresProcessingJobRepository(ProcessingJobRepository):
                       processing_job.total_rows,
                       processing_job.job_id))
 
-    def fail_job(self, processing_job: ProcessingJob, e: Exception):
+    def fail_job(self, job_id: str, e: Exception):
         with get_cursor() as cursor:
             cursor.execute("""
                     UPDATE processing_jobs 
@@ -56,5 +66,27 @@ class PostgresProcessingJobRepository(ProcessingJobRepository):
                         error_message = %s,
                         completed_at = %s
                     WHERE job_id = %s
-                """, (str(e), datetime.now(),
-                      processing_job.job_id))
+                """, (str(e), datetime.now(), job_id))
+
+    def find_job_ids_by_rules_hash(self, rules_hash: str, job_id: Optional[str] = None) -> List[str]:
+        """
+        해당 규칙으로 분류를 마친 업로드 작업 (재분류 대상). job_id 를 주면 그 작업만
+        """
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    SELECT job_id
+                    FROM processing_jobs
+                    WHERE rules_hash = %s AND job_type = 'process' AND status = 'completed' AND deleted_at IS NULL
+                      AND (%s::uuid IS NULL OR job_id = %s::uuid)
+                    ORDER BY created_at
+                """, (rules_hash, job_id, job_id))
+
+            return [str(row['job_id']) for row in cursor.fetchall()]
+
+    def update_rules_hash(self, job_ids: List[str], rules_hash: str):
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    UPDATE processing_jobs
+                    SET rules_hash = %s
+                    WHERE job_id = ANY(%s::uuid[])
+                """, (rules_hash, job_ids))
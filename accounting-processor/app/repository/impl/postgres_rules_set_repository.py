@@ -0,0 +1,20 @@
+from app.database.postgres_db import get_cursor
+from app.repository.rules_set_repository import RulesSetRepository
+
+
+class PostgresRulesSetRepository(RulesSetRepository):
+
+    def find_rules(self, rules_hash: str) -> dict:
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    SELECT rules_data
+                    FROM rules_sets
+                    WHERE rules_hash = %s
+                """, (rules_hash,))
+
+            rules_set = cursor.fetchone()
+
+            if not rules_set:
+                raise Exception(f"Rules set not found: {rules_hash}")
+
+            return rules_set['rules_data']
@@ -0,0 +1,72 @@
+import logging
+import os
+from datetime import date
+from typing import Dict, Iterable, List, Set
+
+from psycopg2 import errors
+
+from app.database.postgres_db import get_cursor, get_independent_cursor, current_database
+from app.database.tenant_shards import Host
+from app.repository.transaction_partition_repository import TransactionPartitionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresTransactionPartitionRepository(TransactionPartitionRepository):
+    """
+    transactions 의 월별 범위 파티션 관리 (init.sql 의 create_transaction_partition 호출)
+    """
+
+    def __init__(self, lock_timeout_ms: int = int(os.getenv("PARTITION_LOCK_TIMEOUT_MS", 5000))):
+        self.__lock_timeout_ms = lock_timeout_ms
+        # 이 프로세스에서 DB(테넌트 샤드)별로 이미 확인한 월 (매 청크마다 DB 를 조회하지 않도록)
+        self.__known_months: Dict[Host, Set[date]] = {}
+
+    def ensure_months(self, months: Iterable[date]) -> List[date]:
+        """
+        월 파티션이 없으면 만들고 새로 만든 월 목록을 반환
+        잠금을 제한 시간 안에 얻지 못하면 건너뛰며, 그 월의 행은 기본 파티션에 적재됐다가 다음 생성 때 옮겨진다
+        """
+        created = []
+        known_months = self.__known_months.setdefault(current_database(), set())
+
+        for month in sorted(set(months) - known_months):
+            try:
+                with get_independent_cursor() as cursor:
+                    cursor.execute("SELECT set_config('lock_timeout', %s, true)", (f"{self.__lock_timeout_ms}ms",))
+                    cursor.execute("SELECT create_transaction_partition(%s) AS created", (month,))
+
+                    if cursor.fetchone()['created']:
+                        created.append(month)
+                        logger.info(f"거래 내역 파티션 생성: {month:%Y-%m}")
+            except errors.LockNotAvailable:
+                logger.warning(f"거래 내역 파티션 {month:%Y-%m} 생성 잠금 대기 시간 초과. 기본 파티션에 적재합니다")
+                continue
+
+            known_months.add(month)
+
+        return created
+
+    def find_default_months(self) -> List[date]:
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    SELECT DISTINCT date_trunc('month', transaction_date)::date AS month
+                    FROM transactions_default
+                    ORDER BY month
+                """)
+
+            return [row['month'] for row in cursor.fetchall()]
+
+    def default_partition_size(self) -> Dict[str, int]:
+        """
+        기본 파티션의 디스크 크기와 추정 행 수 (월 파티션 ATTACH 가 잠근 채 스캔하는 양)
+        """
+        with get_cursor() as cursor:
+            cursor.execute("""
+                    SELECT pg_total_relation_size('transactions_default') AS bytes,
+                           greatest(reltuples, 0)::bigint AS rows
+                    FROM pg_class
+                    WHERE oid = 'transactions_default'::regclass
+                """)
+
+            return dict(cursor.fetchone())
@@ -1,11 +1,124 @@
+import io
+import os
 from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
 
-from app.database.postgres_db import get_cursor
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from app.classifier.transaction_frame import TRANSACTION_COLUMNS, FINGERPRINT_COLUMN, fingerprint_rows
+from app.database.postgres_db import get_cursor, get_connection
 from app.entity.transaction import Transaction
 from app.repository.transaction_repository import TransactionRepository
 
+INSERT_METHOD_COPY = 'copy'
+INSERT_METHOD_VALUES = 'values'
+
+IDEMPOTENT_COLUMNS = TRANSACTION_COLUMNS + [FINGERPRINT_COLUMN]
+# idx_transactions_fingerprint 와 같은 컬럼/조건
+ON_CONFLICT_SKIP = "ON CONFLICT (row_fingerprint, transaction_date) WHERE deleted_at IS NULL DO NOTHING"
+
+RECLASSIFY_CANDIDATE_COLUMNS = ['transaction_id', 'transaction_date', 'description', 'amount_in', 'amount_out',
+                                'company_id', 'category_id']
+CATEGORY_CHANGE_COLUMNS = ['transaction_id', 'transaction_date', 'old_company_id', 'old_category_id',
+                           'company_id', 'category_id']
+CATEGORY_UPDATE_COLUMNS = ['transaction_date', 'amount_in', 'amount_out', 'old_company_id', 'old_category_id',
+                           'company_id', 'category_id']
+# 다른 테넌트 샤드로 옮기는 행 (transaction_id 는 003_tenant_shards 의 시퀀스로 샤드 사이에서 겹치지 않는다)
+MOVE_COLUMNS = ['transaction_id'] + IDEMPOTENT_COLUMNS
+
 
 class PostgresTransactionRepository(TransactionRepository):
+    COPY_SQL = f"""
+        COPY transactions ({', '.join(TRANSACTION_COLUMNS)})
+        FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (description))
+    """
+    INSERT_VALUES_SQL = f"""
+        INSERT INTO transactions ({', '.join(TRANSACTION_COLUMNS)}) VALUES %s
+    """
+    # 멱등 적재: 임시 테이블로 COPY 한 뒤 이미 저장된 지문의 행은 건너뛰고 INSERT
+    CREATE_STAGING_SQL = f"""
+        CREATE TEMP TABLE IF NOT EXISTS transactions_staging ON COMMIT DELETE ROWS AS
+        SELECT {', '.join(IDEMPOTENT_COLUMNS)} FROM transactions WITH NO DATA
+    """
+    COPY_STAGING_SQL = f"""
+        COPY transactions_staging ({', '.join(IDEMPOTENT_COLUMNS)})
+        FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (description))
+    """
+    MERGE_STAGING_SQL = f"""
+        INSERT INTO transactions ({', '.join(IDEMPOTENT_COLUMNS)})
+        SELECT {', '.join(IDEMPOTENT_COLUMNS)} FROM transactions_staging
+        {ON_CONFLICT_SKIP}
+    """
+    INSERT_VALUES_SKIP_SQL = f"""
+        INSERT INTO transactions ({', '.join(IDEMPOTENT_COLUMNS)}) VALUES %s
+        {ON_CONFLICT_SKIP}
+    """
+    # 적요 후보는 idx_transactions_description_trgm (lower(description) gin_trgm_ops) 로 찾는다
+    RECLASSIFY_CANDIDATES_SQL = """
+        SELECT transaction_id, transaction_date, description,
+               coalesce(amount_in, 0) AS amount_in, coalesce(amount_out, 0) AS amount_out, company_id, category_id
+        FROM transactions
+        WHERE job_id = ANY(%s::uuid[])
+          AND deleted_at IS NULL
+    """
+    # 읽은 뒤 다른 작업이 분류를 바꾼 행은 건너뛰어 집계 증분이 실제로 바뀐 행만 반영하도록 한다
+    UPDATE_CATEGORIES_SQL = """
+        UPDATE transactions AS t
+        SET company_id = v.company_id, category_id = v.category_id
+        FROM (VALUES %s) AS v (transaction_id, transaction_date, old_company_id, old_category_id,
+                               company_id, category_id)
+        WHERE t.transaction_id = v.transaction_id
+          AND t.transaction_date = v.transaction_date
+          AND t.deleted_at IS NULL
+          AND t.company_id IS NOT DISTINCT FROM v.old_company_id
+          AND t.category_id IS NOT DISTINCT FROM v.old_category_id
+        RETURNING t.transaction_date, coalesce(t.amount_in, 0) AS amount_in, coalesce(t.amount_out, 0) AS amount_out,
+                  v.old_company_id, v.old_category_id, v.company_id, v.category_id
+    """
+    UPDATE_CATEGORIES_TEMPLATE = "(%s::bigint, %s::timestamp, %s::varchar, %s::varchar, %s::varchar, %s::varchar)"
+    # 재분류로 회사의 테넌트 샤드가 바뀐 행: 원래 샤드에서 잠가 읽고 → 새 샤드에 넣고 → 원래 샤드에서 지운다
+    LOCK_MOVING_ROWS_SQL = f"""
+        SELECT {', '.join(f'v.{column}' if column in ('company_id', 'category_id') else f't.{column}'
+                          for column in MOVE_COLUMNS)},
+               v.old_company_id, v.old_category_id
+        FROM transactions AS t
+        JOIN (VALUES %s) AS v (transaction_id, transaction_date, old_company_id, old_category_id,
+                               company_id, category_id)
+          ON t.transaction_id = v.transaction_id AND t.transaction_date = v.transaction_date
+        WHERE t.deleted_at IS NULL
+          AND t.company_id IS NOT DISTINCT FROM v.old_company_id
+          AND t.category_id IS NOT DISTINCT FROM v.old_category_id
+        ORDER BY t.transaction_id
+        FOR UPDATE OF t
+    """
+    # 이전 시도가 이미 넣은 행은 건너뛰어 새 샤드 집계에 두 번 더하지 않는다
+    INSERT_MOVED_ROWS_SQL = f"""
+        INSERT INTO transactions ({', '.join(MOVE_COLUMNS)}) VALUES %s
+        ON CONFLICT DO NOTHING
+        RETURNING transaction_date, coalesce(amount_in, 0) AS amount_in, coalesce(amount_out, 0) AS amount_out,
+                  company_id, category_id
+    """
+    DELETE_MOVED_ROWS_SQL = """
+        DELETE FROM transactions AS t
+        USING (VALUES %s) AS v (transaction_id, transaction_date)
+        WHERE t.transaction_id = v.transaction_id
+          AND t.transaction_date = v.transaction_date
+        RETURNING t.transaction_date, coalesce(t.amount_in, 0) AS amount_in, coalesce(t.amount_out, 0) AS amount_out,
+                  t.company_id AS old_company_id, t.category_id AS old_category_id
+    """
+
+    def __init__(self,
+                 batch_size: int = int(os.getenv("TRANSACTION_BATCH_SIZE", 10000)),
+                 insert_method: str = os.getenv("TRANSACTION_INSERT_METHOD", INSERT_METHOD_COPY),
+                 idempotent: bool = os.getenv("TRANSACTION_IDEMPOTENT", "false").lower() == "true"):
+        if insert_method not in (INSERT_METHOD_COPY, INSERT_METHOD_VALUES):
+            raise ValueError(f"Unknown insert method: {insert_method}")
+
+        self.__batch_size = batch_size
+        self.__insert_method = insert_method
+        # 행 지문(row_fingerprint)으로 이미 저장된 거래 내역은 건너뛴다
+        self.__idempotent = idempotent
 
     def save(self, transaction: Transaction):
         with get_cursor() as cursor:
@@ -22,3 +135,142 @@ class PostgresTransactionRepository(TransactionRepository):
                 transaction.amount_in, transaction.amount_out, transaction.balance_after,
                 transaction.transaction_location, datetime.now()
             ))
+
+    def save_many(self, transactions: pd.DataFrame) -> int:
+        """
+        저장된 행 수를 반환 (멱등 모드에서는 이미 저장되어 건너뛴 행 제외)
+        batch_size 행씩 나눠 쓰되 호출 전체가 하나의 트랜잭션 (적재 작업은 TransactionIngestor 의 transaction() 안에서
+        체크포인트/집계와 함께 커밋된다)
+        """
+        if self.__idempotent:
+            transactions = transactions.assign(**{FINGERPRINT_COLUMN: fingerprint_rows(transactions)})
+
+        saved = 0
+
+        with get_connection() as connection:
+            with connection.cursor() as cursor:
+                for start in range(0, len(transactions), self.__batch_size):
+                    saved += self.__write_batch(cursor, transactions.iloc[start:start + self.__batch_size])
+
+        return saved
+
+    def __write_batch(self, cursor, batch: pd.DataFrame) -> int:
+        if self.__idempotent:
+            if self.__insert_method == INSERT_METHOD_COPY:
+                return self.__copy_skip_duplicates(cursor, batch)
+
+            return self.__insert_values(cursor, batch, IDEMPOTENT_COLUMNS, self.INSERT_VALUES_SKIP_SQL)
+
+        if self.__insert_method == INSERT_METHOD_COPY:
+            return self.__copy(cursor, batch, TRANSACTION_COLUMNS, self.COPY_SQL)
+
+        return self.__insert_values(cursor, batch, TRANSACTION_COLUMNS, self.INSERT_VALUES_SQL)
+
+    def __copy(self, cursor, batch: pd.DataFrame, columns: list, sql: str) -> int:
+        buffer = io.StringIO()
+        batch[columns].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        cursor.copy_expert(sql, buffer)
+
+        return len(batch)
+
+    def __copy_skip_duplicates(self, cursor, batch: pd.DataFrame) -> int:
+        cursor.execute(self.CREATE_STAGING_SQL)
+        self.__copy(cursor, batch, IDEMPOTENT_COLUMNS, self.COPY_STAGING_SQL)
+
+        cursor.execute(self.MERGE_STAGING_SQL)
+        saved = cursor.rowcount
+
+        # 같은 트랜잭션에서 다음 배치를 위해 비움 (커밋 시에도 ON COMMIT DELETE ROWS 로 비워짐)
+        cursor.execute("TRUNCATE transactions_staging")
+
+        return saved
+
+    def __insert_values(self, cursor, batch: pd.DataFrame, columns: list, sql: str) -> int:
+        values = batch[columns].astype(object)
+        values = values.where(values.notna(), None)
+
+        # page_size 가 배치 크기와 같아 하나의 INSERT 로 실행되므로 rowcount 가 저장된 행 수
+        execute_values(cursor, sql, values.itertuples(index=False, name=None), page_size=self.__batch_size)
+
+        return cursor.rowcount
+
+    def find_reclassify_candidates(self, job_ids: List[str], keywords: Optional[Iterable[str]],
+                                   batch_size: int) -> Iterator[pd.DataFrame]:
+        """
+        재분류 대상 작업의 거래 내역 중 keywords 를 하나라도 포함하는 행을 batch_size 씩 읽는다 (None 이면 전체)
+        서버 측 커서로 읽으므로 결과 전체를 메모리에 올리지 않는다
+        3자 미만 키워드가 하나라도 있으면 트라이그램 인덱스로 좁힐 수 없어 대상 작업의 행을 모두 읽고 LIKE 로 거른다
+        (tests/test_transaction_query_plans.py 가 두 경우의 실행 계획을 확인)
+        """
+        sql = self.RECLASSIFY_CANDIDATES_SQL
+        params = [job_ids]
+
+        if keywords is not None:
+            sql += " AND lower(description) LIKE ANY(%s)"
+            params.append([f"%{self.__escape_like(keyword)}%" for keyword in sorted(keywords)])
+
+        with get_connection() as connection:
+            with connection.cursor(name='reclassify_candidates') as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(sql, params)
+
+                while rows := cursor.fetchmany(batch_size):
+                    yield pd.DataFrame(rows, columns=RECLASSIFY_CANDIDATE_COLUMNS)
+
+    def update_categories(self, changes: pd.DataFrame) -> pd.DataFrame:
+        """
+        (transaction_id, transaction_date) 별로 분류를 바꾸고 실제로 바뀐 행의 이전/이후 분류와 금액을 반환
+        """
+        values = changes[CATEGORY_CHANGE_COLUMNS].astype(object)
+        values = values.where(values.notna(), None)
+
+        with get_cursor() as cursor:
+            rows = execute_values(cursor, self.UPDATE_CATEGORIES_SQL, values.itertuples(index=False, name=None),
+                                  template=self.UPDATE_CATEGORIES_TEMPLATE, page_size=self.__batch_size, fetch=True)
+
+        return pd.DataFrame(rows, columns=CATEGORY_UPDATE_COLUMNS)
+
+    def lock_moving_rows(self, changes: pd.DataFrame) -> pd.DataFrame:
+        """
+        분류가 바뀌어 다른 테넌트 샤드로 옮길 행을 새 분류로 바꾼 전체 컬럼으로 읽고 트랜잭션 끝까지 잠근다
+        (읽은 뒤 다른 작업이 분류를 바꾼 행은 update_categories 와 같이 제외)
+        """
+        values = changes[CATEGORY_CHANGE_COLUMNS].astype(object)
+        values = values.where(values.notna(), None)
+
+        with get_cursor() as cursor:
+            rows = execute_values(cursor, self.LOCK_MOVING_ROWS_SQL, values.itertuples(index=False, name=None),
+                                  template=self.UPDATE_CATEGORIES_TEMPLATE, page_size=self.__batch_size, fetch=True)
+
+        # 정수 컬럼의 NULL 이 float 로 바뀌지 않도록 object 로 유지
+        return pd.DataFrame(rows, columns=MOVE_COLUMNS + ['old_company_id', 'old_category_id'], dtype=object)
+
+    def insert_moved_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        옮겨 온 행을 넣고 실제로 들어간 행의 분류와 금액을 반환
+        """
+        with get_cursor() as cursor:
+            inserted = execute_values(cursor, self.INSERT_MOVED_ROWS_SQL,
+                                      rows[MOVE_COLUMNS].itertuples(index=False, name=None),
+                                      page_size=self.__batch_size, fetch=True)
+
+        return pd.DataFrame(inserted, columns=['transaction_date', 'amount_in', 'amount_out', 'company_id',
+                                               'category_id'])
+
+    def delete_moved_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        다른 샤드로 옮긴 행을 지우고 지운 행의 이전 분류와 금액을 반환
+        """
+        with get_cursor() as cursor:
+            deleted = execute_values(cursor, self.DELETE_MOVED_ROWS_SQL,
+                                     rows[['transaction_id', 'transaction_date']].itertuples(index=False, name=None),
+                                     template="(%s::bigint, %s::timestamp)", page_size=self.__batch_size, fetch=True)
+
+        return pd.DataFrame(deleted, columns=['transaction_date', 'amount_in', 'amount_out', 'old_company_id',
+                                              'old_category_id'])
+
+    @staticmethod
+    def __escape_like(keyword: str) -> str:
+        return keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
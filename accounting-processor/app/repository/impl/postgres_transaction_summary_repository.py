@@ -0,0 +1,102 @@
+from typing import List, Optional
+
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from app.database.postgres_db import get_cursor
+from app.repository.transaction_summary_repository import TransactionSummaryRepository
+
+SUMMARY_COLUMNS = ['company_id', 'category_id', 'month', 'transaction_count', 'amount_in', 'amount_out']
+
+ON_CONFLICT_ACCUMULATE = """
+    ON CONFLICT (company_id, category_id, month) DO UPDATE
+    SET transaction_count = transaction_summaries.transaction_count + EXCLUDED.transaction_count,
+        amount_in = transaction_summaries.amount_in + EXCLUDED.amount_in,
+        amount_out = transaction_summaries.amount_out + EXCLUDED.amount_out,
+        updated_at = now()
+"""
+
+AGGREGATE_TRANSACTIONS_SQL = """
+    SELECT company_id, category_id, date_trunc('month', transaction_date)::date AS month,
+           count(*), coalesce(sum(amount_in), 0), coalesce(sum(amount_out), 0)
+    FROM transactions
+    WHERE company_id IS NOT NULL AND deleted_at IS NULL
+"""
+
+
+class PostgresTransactionSummaryRepository(TransactionSummaryRepository):
+    """
+    (회사, 카테고리, 월) 집계 테이블 transaction_summaries 의 증분 반영과 재계산
+    """
+
+    def add(self, summary: pd.DataFrame):
+        if summary.empty:
+            return
+
+        rows = [
+            (company_id, category_id, month.date(), int(count), int(amount_in), int(amount_out))
+            for company_id, category_id, month, count, amount_in, amount_out
+            in summary[SUMMARY_COLUMNS].itertuples(index=False, name=None)
+        ]
+
+        with get_cursor() as cursor:
+            # 여러 샤드가 같은 집계 행을 갱신하므로 항상 같은 순서로 잠가 교착을 피한다
+            execute_values(cursor, f"""
+                    INSERT INTO transaction_summaries ({', '.join(SUMMARY_COLUMNS)})
+                    VALUES %s
+                    {ON_CONFLICT_ACCUMULATE}
+                """, sorted(rows, key=lambda row: row[:3]))
+
+    def add_inserted(self, job_id: str, row_fingerprints: List[str]):
+        """
+        중복 제외로 청크의 일부만 적재된 경우, 현재 트랜잭션이 실제로 넣은 행(xmin)만 SQL 로 집계해 반영
+        """
+        with get_cursor() as cursor:
+            cursor.execute(f"""
+                    INSERT INTO transaction_summaries ({', '.join(SUMMARY_COLUMNS)})
+                    {AGGREGATE_TRANSACTIONS_SQL}
+                      AND row_fingerprint = ANY(%s::uuid[])
+                      AND job_id = %s
+                      AND xmin = pg_current_xact_id()::xid
+                    GROUP BY 1, 2, 3
+                    ORDER BY 1, 2, 3
+                    {ON_CONFLICT_ACCUMULATE}
+                """, (row_fingerprints, job_id))
+
+    def apply_deltas(self, deltas: pd.DataFrame):
+        """
+        재분류로 옮겨진 행의 증감(음수 포함)을 반영하고 건수가 0 이 된 집계 행은 지운다
+        """
+        if deltas.empty:
+            return
+
+        self.add(deltas)
+
+        keys = sorted({(company_id, category_id, month.date()) for company_id, category_id, month
+                       in deltas[['company_id', 'category_id', 'month']].itertuples(index=False, name=None)})
+        with get_cursor() as cursor:
+            execute_values(cursor, """
+                    DELETE FROM transaction_summaries AS s
+                    USING (VALUES %s) AS k (company_id, category_id, month)
+                    WHERE s.company_id = k.company_id AND s.category_id = k.category_id AND s.month = k.month
+                      AND s.transaction_count = 0
+                """, keys, template="(%s, %s, %s::date)")
+
+    def rebuild(self, company_id: Optional[str] = None) -> int:
+        """
+        transactions 로부터 집계를 다시 계산 (company_id 가 없으면 전체)
+        집계 테이블을 잠근 뒤 계산하므로, 동시에 적재 중인 청크는 재계산이 커밋된 뒤 자신의 증분을 더한다
+        """
+        company_filter = "AND company_id = %s" if company_id else ""
+        params = (company_id,) if company_id else ()
+
+        with get_cursor() as cursor:
+            cursor.execute("LOCK TABLE transaction_summaries IN EXCLUSIVE MODE")
+            cursor.execute(f"DELETE FROM transaction_summaries WHERE TRUE {company_filter}", params)
+            cursor.execute(f"""
+                    INSERT INTO transaction_summaries ({', '.join(SUMMARY_COLUMNS)})
+                    {AGGREGATE_TRANSACTIONS_SQL} {company_filter}
+                    GROUP BY 1, 2, 3
+                """, params)
+
+            return cursor.rowcount
@@ -0,0 +1,32 @@
+from abc import abstractmethod
+from typing import List
+
+from app.entity.shard_checkpoint import ShardCheckpoint
+from app.reader.transaction_csv_reader import ByteRange
+
+
+class ProcessingJobCheckpointRepository:
+
+    @abstractmethod
+    def find_by_job(self, job_id: str) -> List[ShardCheckpoint]:
+        pass
+
+    @abstractmethod
+    def save_plan(self, job_id: str, byte_ranges: List[ByteRange]) -> List[ShardCheckpoint]:
+        pass
+
+    @abstractmethod
+    def commit(self, job_id: str, shard_no: int, committed_offset: int, rows: int):
+        pass
+
+    @abstractmethod
+    def find_tenant_offset(self, job_id: str, shard_no: int) -> int:
+        pass
+
+    @abstractmethod
+    def commit_tenant(self, job_id: str, shard_no: int, committed_offset: int, rows: int):
+        pass
+
+    @abstractmethod
+    def delete_by_job(self, job_id: str):
+        pass
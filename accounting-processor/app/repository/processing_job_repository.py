@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import List, Optional
 
 from app.entity.processing_job import ProcessingJob
 
@@ -13,10 +14,22 @@ class ProcessingJobRepository:
     def update_progress(self, processing_job: ProcessingJob):
         pass
 
+    @abstractmethod
+    def increment_progress(self, job_id: str, rows: int):
+        pass
+
     @abstractmethod
     def complete_job(self, processing_job: ProcessingJob):
         pass
 
     @abstractmethod
-    def fail_job(self, processing_job: ProcessingJob, e: Exception):
+    def fail_job(self, job_id: str, e: Exception):
+        pass
+
+    @abstractmethod
+    def find_job_ids_by_rules_hash(self, rules_hash: str, job_id: Optional[str] = None) -> List[str]:
+        pass
+
+    @abstractmethod
+    def update_rules_hash(self, job_ids: List[str], rules_hash: str):
         pass
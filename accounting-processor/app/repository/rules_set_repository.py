@@ -0,0 +1,8 @@
+from abc import abstractmethod
+
+
+class RulesSetRepository:
+
+    @abstractmethod
+    def find_rules(self, rules_hash: str) -> dict:
+        pass
@@ -0,0 +1,22 @@
+from abc import abstractmethod
+from datetime import date
+from typing import Iterable, List
+
+import pandas as pd
+
+from app.entity.transaction_block import TransactionBlock
+
+
+class TransactionBlockWriter:
+
+    @abstractmethod
+    def prepare(self, end_offset: int, frame: pd.DataFrame) -> TransactionBlock:
+        pass
+
+    @abstractmethod
+    async def ensure_months(self, months: Iterable[date]) -> List[date]:
+        pass
+
+    @abstractmethod
+    async def write(self, job_id: str, shard_no: int, block: TransactionBlock) -> int:
+        pass
@@ -0,0 +1,18 @@
+from abc import abstractmethod
+from datetime import date
+from typing import Dict, Iterable, List
+
+
+class TransactionPartitionRepository:
+
+    @abstractmethod
+    def ensure_months(self, months: Iterable[date]) -> List[date]:
+        pass
+
+    @abstractmethod
+    def find_default_months(self) -> List[date]:
+        pass
+
+    @abstractmethod
+    def default_partition_size(self) -> Dict[str, int]:
+        pass
@@ -1,4 +1,7 @@
 from abc import abstractmethod
+from typing import Iterable, Iterator, List, Optional
+
+import pandas as pd
 
 from app.entity.transaction import Transaction
 
@@ -7,3 +10,28 @@ class TransactionRepository:
     @abstractmethod
     def save(self, transaction: Transaction):
         pass
+
+    @abstractmethod
+    def save_many(self, transactions: pd.DataFrame) -> int:
+        pass
+
+    @abstractmethod
+    def find_reclassify_candidates(self, job_ids: List[str], keywords: Optional[Iterable[str]],
+                                   batch_size: int) -> Iterator[pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def update_categories(self, changes: pd.DataFrame) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def lock_moving_rows(self, changes: pd.DataFrame) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def insert_moved_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def delete_moved_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        pass
@@ -0,0 +1,23 @@
+from abc import abstractmethod
+from typing import List, Optional
+
+import pandas as pd
+
+
+class TransactionSummaryRepository:
+
+    @abstractmethod
+    def add(self, summary: pd.DataFrame):
+        pass
+
+    @abstractmethod
+    def add_inserted(self, job_id: str, row_fingerprints: List[str]):
+        pass
+
+    @abstractmethod
+    def apply_deltas(self, deltas: pd.DataFrame):
+        pass
+
+    @abstractmethod
+    def rebuild(self, company_id: Optional[str] = None) -> int:
+        pass
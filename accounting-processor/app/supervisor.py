@@ -0,0 +1,80 @@
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from typing import Callable, List
+
+from app.metrics.worker_metrics import mark_process_dead
+
+logger = logging.getLogger(__name__)
+
+
+def run_detached(target: Callable[[], None]) -> None:
+    # 터미널/컨테이너가 프로세스 그룹 전체에 보내는 시그널은 Supervisor 만 받고, 워커에는 한 번만 전달
+    os.setpgrp()
+    target()
+
+
+class Supervisor:
+    """
+    워커 프로세스 N 개를 띄우고 감시하는 상위 프로세스
+
+    - 각 워커는 spawn 으로 생성되어 자신만의 DB 풀과 Redis 커넥션을 가진다
+    - 비정상 종료된 워커는 재시작하고, SIGTERM/SIGINT 를 받으면 워커에 SIGTERM 을 전달해
+      진행 중인 작업을 마칠 때까지(drain_timeout) 기다린다
+    """
+
+    def __init__(self, target: Callable[[], None], processes: int,
+                 drain_timeout: float = float(os.getenv("WORKER_DRAIN_TIMEOUT", 300))):
+        self.__target = target
+        self.__process_count = processes
+        self.__drain_timeout = drain_timeout
+        self.__context = multiprocessing.get_context('spawn')
+        self.__processes: List[multiprocessing.Process] = []
+        self.running = True
+
+    def signal_handler(self, signum, frame):
+        logger.info("종료 시그널 받음. 워커 프로세스를 정리합니다...")
+
+        self.running = False
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.signal_handler)
+        signal.signal(signal.SIGTERM, self.signal_handler)
+
+        self.__processes = [self.__spawn(index) for index in range(self.__process_count)]
+        logger.info(f"워커 프로세스 {self.__process_count}개 시작")
+
+        while self.running:
+            for index, process in enumerate(self.__processes):
+                if not process.is_alive():
+                    logger.warning(f"워커 프로세스 {process.pid} 종료 감지 (exitcode={process.exitcode}). 재시작합니다")
+                    mark_process_dead(process.pid)
+                    self.__processes[index] = self.__spawn(index)
+
+            time.sleep(1)
+
+        self.__drain()
+
+    def __spawn(self, index: int) -> multiprocessing.Process:
+        process = self.__context.Process(target=run_detached, args=(self.__target,), name=f"worker-{index}")
+        process.start()
+
+        return process
+
+    def __drain(self):
+        for process in self.__processes:
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.__drain_timeout
+        for process in self.__processes:
+            process.join(max(deadline - time.monotonic(), 0))
+
+            if process.is_alive():
+                logger.warning(f"워커 프로세스 {process.pid} 가 제한 시간 내 종료되지 않아 강제 종료합니다")
+                process.kill()
+                process.join()
+
+        logger.info("모든 워커 프로세스 종료")
@@ -0,0 +1,80 @@
+"""
+Transaction.classify 벤치마크: 기존 중첩 루프 vs 컴파일된 KeywordMatcher
+
+    python -m bench.classify_bench --rows 100000 --keywords 5000
+"""
+import argparse
+import random
+import time
+
+from app.classifier.keyword_matcher import KeywordMatcher
+from bench.generator import make_rules, make_descriptions
+from bench.results import make_result, write_result, add_json_argument
+
+
+def legacy_classify(description: str, rules: dict):
+    description_lower = description.lower()
+
+    for company in rules.get('companies', []):
+        company_id = company['company_id']
+
+        for category in company.get('categories', []):
+            for keyword in category.get('keywords', []):
+                if keyword.lower() in description_lower:
+                    return company_id, category['category_id']
+
+    return None, None
+
+
+def run(rows: int, keyword_count: int, hit_ratio: float, legacy_rows: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rules = make_rules(keyword_count, companies=10, categories_per_company=10, rng=rng)
+    descriptions = make_descriptions(rules, rows, hit_ratio, rng)
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher.from_rules(rules)
+    compile_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = [matcher.match(description) for description in descriptions]
+    compiled_seconds = time.perf_counter() - started
+
+    # 기존 루프는 너무 느리므로 일부 행만 측정해 전체 시간을 추정
+    sample = descriptions[:legacy_rows]
+    started = time.perf_counter()
+    legacy = [legacy_classify(description, rules) for description in sample]
+    legacy_seconds = (time.perf_counter() - started) * rows / len(sample)
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+
+    print(f"rows={rows} keywords={keyword_count} hit_ratio={hit_ratio}")
+    print(f"compile          : {compile_seconds:8.3f}s")
+    print(f"compiled matcher : {compiled_seconds:8.3f}s ({rows / compiled_seconds:,.0f} rows/s)")
+    print(f"legacy loop      : {legacy_seconds:8.3f}s ({rows / legacy_seconds:,.0f} rows/s, "
+          f"estimated from {len(sample)} rows)")
+    print(f"speedup          : {legacy_seconds / compiled_seconds:8.1f}x")
+    print(f"mismatches       : {mismatches}")
+
+    return make_result('classify', {
+        'rows': rows, 'keywords': keyword_count, 'hit_ratio': hit_ratio, 'legacy_rows': len(sample), 'seed': seed
+    }, {
+        'compile_seconds': compile_seconds,
+        'matcher_seconds': compiled_seconds,
+        'matcher_rows_per_sec': rows / compiled_seconds,
+        'legacy_seconds_estimated': legacy_seconds,
+        'speedup': legacy_seconds / compiled_seconds,
+        'mismatches': mismatches,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--keywords", type=int, default=5_000)
+    parser.add_argument("--hit-ratio", type=float, default=0.7)
+    parser.add_argument("--legacy-rows", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    write_result(run(args.rows, args.keywords, args.hit_ratio, args.legacy_rows, args.seed), args.json)
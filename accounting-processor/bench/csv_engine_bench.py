@@ -0,0 +1,144 @@
+"""
+CSV 블록 파싱 엔진 벤치마크: pandas(추론 타입 + TransactionFrameBuilder 변환) vs pyarrow(스키마 지정 멀티스레드 파싱)
+
+엔진마다 새 프로세스에서 같은 파일을 읽어 파싱 시간, 파싱+분류 시간, 최대 메모리를 측정
+pyarrow 는 메모리를 자체 풀에서 할당해 tracemalloc 에 잡히지 않으므로 최대 RSS 증가량과 Arrow 풀 최대치를 함께 기록
+--reject-ratio 를 주면 그 비율의 행을 손상시켜(잘못된 금액/날짜, 컬럼 누락) pyarrow 엔진의 거부 행 수를 확인
+
+    python -m bench.csv_engine_bench --rows 1000000 --reject-ratio 0.001
+"""
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from app.classifier.keyword_matcher import KeywordMatcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+from app.reader.rejects_report import RejectsReport
+from app.reader.transaction_csv_reader import TransactionCsvReader, ENGINE_PANDAS, ENGINE_PYARROW
+from bench.frame_bench import JOB_ID
+from bench.generator import make_rules, write_csv
+from bench.results import make_result, write_result, add_json_argument
+
+ENGINES = (ENGINE_PANDAS, ENGINE_PYARROW)
+
+
+def corrupt_csv(path: str, ratio: float, rng: random.Random) -> int:
+    """
+    데이터 행의 ratio 만큼을 잘못된 금액, 잘못된 날짜, 컬럼 누락 순으로 손상시키고 손상시킨 행 수를 반환
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    targets = sorted(rng.sample(range(1, len(lines)), int((len(lines) - 1) * ratio)))
+    for i, line_no in enumerate(targets):
+        fields = lines[line_no].split(',')
+        if i % 3 == 0:
+            fields[2] = '1O00'
+        elif i % 3 == 1:
+            fields[0] = '2025-13-45 25:00:00'
+        else:
+            fields = fields[:4]
+        lines[line_no] = ','.join(fields)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    return len(targets)
+
+
+def rss_bytes() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def measure(path: str, rules: dict, engine: str, memory_limit_mb: int) -> dict:
+    # 엔진별 새 프로세스에서 실행 (최대 RSS 는 프로세스 단위로만 알 수 있다)
+    import pyarrow as pa
+
+    frame_builder = TransactionFrameBuilder(KeywordMatcher.from_rules(rules))
+    reader = TransactionCsvReader(path, memory_limit_bytes=memory_limit_mb * 1024 * 1024, engine=engine)
+    baseline = rss_bytes()
+
+    started = time.perf_counter()
+    parsed = sum(len(chunk) for _, chunk in reader.read_blocks())
+    parse_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        rejects = RejectsReport(path, 0, rejects_dir=directory)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        processed = 0
+        for end_offset, chunk in reader.read_blocks(rejects=rejects):
+            processed += len(frame_builder.build(JOB_ID, chunk))
+            rejects.flush(end_offset)
+        build_seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'parsed': parsed,
+        'processed': processed,
+        'rejected': rejects.count,
+        'parse_seconds': parse_seconds,
+        'build_seconds': build_seconds,
+        'python_peak_mib': peak / 2 ** 20,
+        'arrow_peak_mib': pa.default_memory_pool().max_memory() / 2 ** 20,
+        'rss_peak_mib': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - baseline) / 2 ** 20,
+    }
+
+
+def run(rows: int, keyword_count: int, memory_limit_mb: int, reject_ratio: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    rules = make_rules(keyword_count, companies=10, categories_per_company=10, rng=rng)
+    metrics = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bank_transactions.csv')
+        write_csv(path, rules, rows, rng)
+        corrupted = corrupt_csv(path, reject_ratio, rng) if reject_ratio else 0
+        file_bytes = os.path.getsize(path)
+
+        print(f"file={file_bytes / 2 ** 20:.1f}MiB rows={rows} corrupted={corrupted} cpus={os.cpu_count()}")
+        for engine in ENGINES:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                result = executor.submit(measure, path, rules, engine, memory_limit_mb).result()
+
+            print(f"{engine:8}: parse {result['parse_seconds']:7.3f}s ({rows / result['parse_seconds']:>11,.0f} rows/s)"
+                  f"  parse+classify {result['build_seconds']:7.3f}s"
+                  f"  peak python {result['python_peak_mib']:6.1f}MiB arrow {result['arrow_peak_mib']:6.1f}MiB"
+                  f" rss +{result['rss_peak_mib']:6.1f}MiB  rows {result['processed']} rejected {result['rejected']}")
+
+            assert result['processed'] + result['rejected'] == rows
+            metrics.update({f"{engine}_{name}": value for name, value in result.items()})
+
+    # pandas 엔진은 거래일시가 잘못된 행만 거부하고 나머지 손상 행은 NaN 으로 채워 적재한다
+    assert metrics[f"{ENGINE_PYARROW}_rejected"] == corrupted
+    assert metrics[f"{ENGINE_PANDAS}_rejected"] == (corrupted + 1) // 3
+
+    print(f"parse speedup: {metrics['pandas_parse_seconds'] / metrics['pyarrow_parse_seconds']:.2f}x, "
+          f"parse+classify speedup: {metrics['pandas_build_seconds'] / metrics['pyarrow_build_seconds']:.2f}x")
+
+    return make_result('csv_engine', {
+        'rows': rows, 'keywords': keyword_count, 'memory_limit_mb': memory_limit_mb, 'reject_ratio': reject_ratio,
+        'seed': seed
+    }, dict(metrics, file_mib=file_bytes / 2 ** 20, corrupted_rows=corrupted))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keywords", type=int, default=1_000)
+    parser.add_argument("--memory-limit-mb", type=int, default=64)
+    parser.add_argument("--reject-ratio", type=float, default=0.0, help="손상시킬 행 비율 (0 이면 손상 없음)")
+    parser.add_argument("--seed", type=int, default=42)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    write_result(run(args.rows, args.keywords, args.memory_limit_mb, args.reject_ratio, args.seed), args.json)
@@ -0,0 +1,178 @@
+"""
+E2E 벤치마크: API 업로드 → Redis 큐 → 프로세서 → Postgres 적재 → 조회 API 까지 측정
+
+docker compose 로 띄운 서비스(또는 로컬에서 실행한 uvicorn / python -m app.main)에 합성 데이터를 올리고
+작업 상태를 폴링해 대기/처리 시간과 처리량, 조회 API 지연 시간을 JSON 으로 남긴다.
+API 와 프로세서는 같은 업로드 디렉터리(/app/shared/uploads)를 공유해야 한다.
+
+    python -m bench.e2e_bench --api-url http://localhost:8000 --rows 1000000 --json results.jsonl
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from bench.generator import SEED_CATEGORIES, write_dataset
+from bench.results import make_result, write_result, add_json_argument
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+def multipart_body(files: List[Tuple[str, str, str]]) -> Tuple[str, int, Iterator[bytes]]:
+    """
+    (필드명, 파일 경로, Content-Type) 목록을 multipart/form-data 로 스트리밍 (파일을 메모리에 올리지 않는다)
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, path, content_type in files:
+        header = (f"--{boundary}\r\n"
+                  f"Content-Disposition: form-data; name=\"{name}\"; filename=\"{os.path.basename(path)}\"\r\n"
+                  f"Content-Type: {content_type}\r\n\r\n").encode()
+        parts.append((header, path))
+    closing = f"--{boundary}--\r\n".encode()
+
+    length = sum(len(header) + os.path.getsize(path) + 2 for header, path in parts) + len(closing)
+
+    def chunks() -> Iterator[bytes]:
+        for header, path in parts:
+            yield header
+            with open(path, 'rb') as f:
+                while chunk := f.read(UPLOAD_CHUNK_BYTES):
+                    yield chunk
+            yield b"\r\n"
+        yield closing
+
+    return f"multipart/form-data; boundary={boundary}", length, chunks()
+
+
+def request_json(url: str, method: str = 'GET', data=None, headers: Optional[dict] = None) -> dict:
+    request = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def upload(api_url: str, csv_path: str, rules_path: str) -> dict:
+    content_type, length, body = multipart_body([
+        ('transactions_file', csv_path, 'application/octet-stream'),
+        ('rules_file', rules_path, 'application/json'),
+    ])
+
+    return request_json(f"{api_url}/api/v1/accounting/process", method='POST', data=body,
+                        headers={'Content-Type': content_type, 'Content-Length': str(length)})
+
+
+def wait_for_job(api_url: str, job_id: str, poll_interval: float, timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+
+    while True:
+        job = request_json(f"{api_url}/api/v1/accounting/jobs/{job_id}")
+        if job['status'] in TERMINAL_STATUSES:
+            return job
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"job {job_id} did not finish in {timeout}s (status={job['status']})")
+
+        time.sleep(poll_interval)
+
+
+def measure_latency(url: str, repeats: int) -> dict:
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        request_json(url)
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    return {
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+    }
+
+
+def seconds_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    if not start or not end:
+        return None
+
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+def run(api_url: str, rows: int, keyword_count: int, vocabulary: int, duplicate_ratio: float, compress: bool,
+        seed: int, poll_interval: float, timeout: float, query_repeats: int) -> dict:
+    directory = tempfile.mkdtemp(prefix='e2e_bench_')
+
+    try:
+        dataset = write_dataset(directory, rows, keyword_count, seed, vocabulary=vocabulary,
+                                duplicate_ratio=duplicate_ratio, category_ids=SEED_CATEGORIES)
+        csv_path = dataset['csv_path']
+        if compress:
+            with open(csv_path, 'rb') as source, gzip.open(csv_path + '.gz', 'wb', compresslevel=6) as target:
+                shutil.copyfileobj(source, target)
+            csv_path += '.gz'
+        upload_bytes = os.path.getsize(csv_path)
+
+        started = time.perf_counter()
+        job = upload(api_url, csv_path, dataset['rules_path'])
+        upload_seconds = time.perf_counter() - started
+
+        job = wait_for_job(api_url, str(job['job_id']), poll_interval, timeout)
+        end_to_end_seconds = time.perf_counter() - started
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    processing_seconds = seconds_between(job.get('started_at'), job.get('completed_at'))
+    company_id = next(iter(SEED_CATEGORIES))
+    query = urllib.parse.urlencode({'companyId': company_id})
+
+    metrics = {
+        'status': job['status'],
+        'processed_rows': job['processed_rows'],
+        'upload_mib': upload_bytes / 2 ** 20,
+        'upload_seconds': upload_seconds,
+        'queue_wait_seconds': seconds_between(job.get('created_at'), job.get('started_at')),
+        'processing_seconds': processing_seconds,
+        'processing_rows_per_sec': rows / processing_seconds if processing_seconds else None,
+        'end_to_end_seconds': end_to_end_seconds,
+        'end_to_end_rows_per_sec': rows / end_to_end_seconds,
+    }
+    for name, path in (('records', f"records?{query}&limit=100"), ('summaries', f"summaries?{query}")):
+        for stat, value in measure_latency(f"{api_url}/api/v1/accounting/{path}", query_repeats).items():
+            metrics[f"{name}_{stat}"] = value
+
+    print(f"rows={rows} keywords={keyword_count} duplicate_ratio={duplicate_ratio} compress={compress}")
+    for name, value in metrics.items():
+        print(f"{name:<26}: {value:,.3f}" if isinstance(value, float) else f"{name:<26}: {value}")
+
+    return make_result('e2e', {
+        'api_url': api_url, 'rows': rows, 'keywords': keyword_count, 'vocabulary': vocabulary,
+        'duplicate_ratio': duplicate_ratio, 'compress': compress, 'seed': seed
+    }, metrics)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--keywords", type=int, default=1_000)
+    parser.add_argument("--vocabulary", type=int, default=5_000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--gzip", action="store_true", help="CSV 를 gzip 으로 압축해 업로드")
+    # 같은 내용을 다시 올리면 API 가 기존 작업을 돌려주므로 기본값은 실행마다 다른 시드
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=3600)
+    parser.add_argument("--query-repeats", type=int, default=20)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else time.time_ns() % 2 ** 31
+    write_result(run(args.api_url, args.rows, args.keywords, args.vocabulary, args.duplicate_ratio, args.gzip,
+                     seed, args.poll_interval, args.timeout, args.query_repeats), args.json)
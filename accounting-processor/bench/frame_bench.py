@@ -0,0 +1,86 @@
+"""
+TransactionProcessor 분류 경로 벤치마크: df.iterrows() 행 단위 vs TransactionFrameBuilder 컬럼 단위
+
+    python -m bench.frame_bench --rows 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from app.classifier.keyword_matcher import KeywordMatcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+from app.entity.transaction import Transaction
+from bench.generator import make_rules, write_csv
+from bench.results import make_result, write_result, add_json_argument
+
+JOB_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def row_path(df: pd.DataFrame, matcher: KeywordMatcher) -> int:
+    count = 0
+    for _, row in df.iterrows():
+        transaction = Transaction.from_csv_row(JOB_ID, row.to_dict())
+        transaction.classify(matcher)
+        count += 1
+
+    return count
+
+
+def run(rows: int, keyword_count: int, legacy_rows: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rules = make_rules(keyword_count, companies=10, categories_per_company=10, rng=rng)
+    matcher = KeywordMatcher.from_rules(rules)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bank_transactions.csv')
+        write_csv(path, rules, rows, rng)
+
+        started = time.perf_counter()
+        df = pd.read_csv(path, encoding='utf-8')
+        read_seconds = time.perf_counter() - started
+
+    # iterrows 경로는 일부 행만 측정해 전체 시간을 추정
+    started = time.perf_counter()
+    row_path(df.head(legacy_rows), matcher)
+    row_seconds = (time.perf_counter() - started) * rows / min(rows, legacy_rows)
+
+    frame_builder = TransactionFrameBuilder(matcher)
+    started = time.perf_counter()
+    frame = frame_builder.build(JOB_ID, df)
+    frame_seconds = time.perf_counter() - started
+
+    print(f"rows={rows} keywords={keyword_count}")
+    print(f"read_csv          : {read_seconds:8.3f}s")
+    print(f"iterrows path     : {row_seconds:8.3f}s ({rows / row_seconds:,.0f} rows/s, "
+          f"estimated from {min(rows, legacy_rows)} rows)")
+    print(f"column-wise path  : {frame_seconds:8.3f}s ({rows / frame_seconds:,.0f} rows/s)")
+    print(f"speedup           : {row_seconds / frame_seconds:8.1f}x")
+    print(f"classified rows   : {int(frame['company_id'].notna().sum())}")
+
+    return make_result('frame', {
+        'rows': rows, 'keywords': keyword_count, 'legacy_rows': min(rows, legacy_rows), 'seed': seed
+    }, {
+        'read_csv_seconds': read_seconds,
+        'read_csv_rows_per_sec': rows / read_seconds,
+        'iterrows_seconds_estimated': row_seconds,
+        'frame_seconds': frame_seconds,
+        'frame_rows_per_sec': rows / frame_seconds,
+        'speedup': row_seconds / frame_seconds,
+        'classified_rows': int(frame['company_id'].notna().sum()),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keywords", type=int, default=5_000)
+    parser.add_argument("--legacy-rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    write_result(run(args.rows, args.keywords, args.legacy_rows, args.seed), args.json)
@@ -0,0 +1,143 @@
+"""
+합성 은행 거래 내역(bank_transactions.csv) / 분류 규칙(rules.json) 생성기
+
+- 키워드 수, 적요 어휘 크기(서로 다른 적요 수), 키워드 적중률, 중복 행 비율을 조절
+- 중복 행은 앞서 나온 행을 그대로 다시 넣어(거래일시/적요/금액/잔액 동일) 멱등 적재 경로를 재현한다
+
+    python -m bench.generator --out /tmp/bench --rows 1000000 --keywords 5000 --vocabulary 5000 --duplicate-ratio 0.05
+"""
+import argparse
+import json
+import os
+import random
+import string
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CSV_COLUMNS = ['거래일시', '적요', '입금액', '출금액', '거래후잔액', '거래점']
+LOCATIONS = ['온라인', '강남지점', '판교지점']
+
+# database/init.sql 의 초기 회사/카테고리 (실제 DB 에 적재하는 E2E 벤치마크는 FK 때문에 이 ID 를 써야 한다)
+SEED_CATEGORIES = {
+    'com_1': ['cat_101', 'cat_102', 'cat_103'],
+    'com_2': ['cat_201', 'cat_202', 'cat_203', 'cat_204'],
+}
+
+
+def make_rules(keyword_count: int, companies: int, categories_per_company: int, rng: random.Random,
+               category_ids: Optional[Dict[str, List[str]]] = None) -> dict:
+    category_ids = category_ids or {
+        f"com_{c}": [f"cat_{c}_{k}" for k in range(categories_per_company)] for c in range(companies)
+    }
+    keywords = [f"{''.join(rng.choices(string.ascii_letters, k=6))}{i}" for i in range(keyword_count)]
+    per_category = max(1, keyword_count // sum(len(categories) for categories in category_ids.values()))
+
+    rules = {"companies": []}
+    cursor = 0
+    for company_id, categories in category_ids.items():
+        company = {"company_id": company_id, "categories": []}
+        for category_id in categories:
+            company["categories"].append({
+                "category_id": category_id,
+                "keywords": keywords[cursor:cursor + per_category]
+            })
+            cursor += per_category
+        rules["companies"].append(company)
+
+    return rules
+
+
+def make_descriptions(rules: dict, rows: int, hit_ratio: float, rng: random.Random) -> list:
+    keywords = [kw for company in rules["companies"] for category in company["categories"]
+                for kw in category["keywords"]]
+
+    descriptions = []
+    for _ in range(rows):
+        filler = ''.join(rng.choices(string.ascii_lowercase + ' ', k=24))
+        if rng.random() < hit_ratio:
+            descriptions.append(f"{filler[:12]}{rng.choice(keywords).upper()}{filler[12:]}")
+        else:
+            descriptions.append(filler)
+
+    return descriptions
+
+
+def make_transactions(rules: dict, rows: int, rng: random.Random, vocabulary: int = 5_000,
+                      hit_ratio: float = 0.8, duplicate_ratio: float = 0.0) -> pd.DataFrame:
+    # 실제 은행 내역처럼 적요가 반복되도록 작은 어휘에서 뽑는다
+    descriptions = make_descriptions(rules, vocabulary, hit_ratio=hit_ratio, rng=rng)
+    np_rng = np.random.default_rng(rng.randrange(2 ** 32))
+
+    unique_rows = rows - int(rows * duplicate_ratio)
+    frame = pd.DataFrame({
+        '거래일시': pd.date_range('2025-01-01', periods=unique_rows, freq='min').strftime('%Y-%m-%d %H:%M:%S'),
+        '적요': rng.choices(descriptions, k=unique_rows),
+        '입금액': np_rng.integers(0, 11, unique_rows) * 1000 * np_rng.integers(0, 2, unique_rows),
+        '출금액': np_rng.integers(0, 11, unique_rows) * 1000 * np_rng.integers(0, 2, unique_rows),
+        '거래후잔액': np_rng.integers(0, 10_000_000, unique_rows),
+        '거래점': rng.choices(LOCATIONS, k=unique_rows),
+    })[CSV_COLUMNS]
+
+    if unique_rows == rows:
+        return frame
+
+    # 중복 행은 앞서 나온 행을 복제해 무작위 위치에 섞는다 (같은 파일 안 중복 / 재업로드 시뮬레이션)
+    duplicates = frame.iloc[np_rng.integers(0, unique_rows, rows - unique_rows)]
+    positions = np.sort(np_rng.choice(rows, rows - unique_rows, replace=False))
+    order = np.empty(rows, dtype=np.int64)
+    mask = np.zeros(rows, dtype=bool)
+    mask[positions] = True
+    order[~mask] = np.arange(unique_rows)
+    order[mask] = np.arange(unique_rows, rows)
+
+    return pd.concat([frame, duplicates], ignore_index=True).iloc[order].reset_index(drop=True)
+
+
+def write_csv(path: str, rules: dict, rows: int, rng: random.Random, vocabulary: int = 5_000,
+              hit_ratio: float = 0.8, duplicate_ratio: float = 0.0) -> None:
+    make_transactions(rules, rows, rng, vocabulary, hit_ratio, duplicate_ratio).to_csv(path, index=False,
+                                                                                      encoding='utf-8')
+
+
+def write_dataset(directory: str, rows: int, keyword_count: int, seed: int, vocabulary: int = 5_000,
+                  hit_ratio: float = 0.8, duplicate_ratio: float = 0.0, companies: int = 10,
+                  categories_per_company: int = 10, category_ids: Optional[Dict[str, List[str]]] = None) -> dict:
+    """
+    directory 에 bank_transactions.csv 와 rules.json 을 만들고 경로를 반환
+    """
+    rng = random.Random(seed)
+    rules = make_rules(keyword_count, companies, categories_per_company, rng, category_ids)
+
+    os.makedirs(directory, exist_ok=True)
+    csv_path = os.path.join(directory, 'bank_transactions.csv')
+    rules_path = os.path.join(directory, 'rules.json')
+
+    write_csv(csv_path, rules, rows, rng, vocabulary, hit_ratio, duplicate_ratio)
+    with open(rules_path, 'w', encoding='utf-8') as f:
+        json.dump(rules, f, ensure_ascii=False)
+
+    return {'csv_path': csv_path, 'rules_path': rules_path, 'rules': rules}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--keywords", type=int, default=5_000)
+    parser.add_argument("--vocabulary", type=int, default=5_000)
+    parser.add_argument("--hit-ratio", type=float, default=0.8)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--seed-categories", action="store_true",
+                        help="init.sql 의 초기 회사/카테고리 ID 로 규칙 생성 (실제 DB 적재용)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    dataset = write_dataset(args.out, args.rows, args.keywords, args.seed, args.vocabulary, args.hit_ratio,
+                            args.duplicate_ratio, args.companies, args.categories,
+                            SEED_CATEGORIES if args.seed_categories else None)
+    print(f"{dataset['csv_path']} ({os.path.getsize(dataset['csv_path']) / 2 ** 20:.1f}MiB, {args.rows} rows)")
+    print(dataset['rules_path'])
@@ -0,0 +1,109 @@
+"""
+PostgresTransactionRepository 쓰기 벤치마크: 행 단위 INSERT vs execute_values vs COPY
+
+POSTGRES_* 환경 변수가 가리키는 DB 에 임시 작업을 만들어 적재한 뒤 삭제한다.
+
+    python -m bench.ingest_bench --rows 100000
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from app.classifier.transaction_frame import TRANSACTION_COLUMNS
+from app.database.postgres_db import get_cursor
+from app.entity.transaction import Transaction
+from app.repository.impl.postgres_transaction_repository import (
+    PostgresTransactionRepository, INSERT_METHOD_COPY, INSERT_METHOD_VALUES
+)
+from bench.results import make_result, write_result, add_json_argument
+
+
+def make_frame(job_id: str, rows: int) -> pd.DataFrame:
+    now = datetime.now()
+
+    return pd.DataFrame({
+        'job_id': job_id,
+        'company_id': ['com_1' if i % 3 else None for i in range(rows)],
+        'category_id': ['cat_101' if i % 3 else None for i in range(rows)],
+        'transaction_date': pd.date_range('2025-01-01', periods=rows, freq='min'),
+        'description': [f"쿠팡 정산 {i % 500}" for i in range(rows)],
+        'amount_in': pd.array([(i % 10) * 1000 for i in range(rows)], dtype='Int64'),
+        'amount_out': pd.array([0] * rows, dtype='Int64'),
+        'balance_after': pd.array(range(rows), dtype='Int64'),
+        'transaction_location': '온라인',
+        'created_at': now,
+    })[TRANSACTION_COLUMNS]
+
+
+def create_job() -> str:
+    job_id = str(uuid.uuid4())
+    with get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO processing_jobs (job_id, status, csv_file_path, rules_data, created_at)
+            VALUES (%s, 'processing', 'bench', %s, %s)
+        """, (job_id, json.dumps({"companies": []}), datetime.now()))
+
+    return job_id
+
+
+def delete_job(job_id: str) -> None:
+    with get_cursor() as cursor:
+        cursor.execute("DELETE FROM transactions WHERE job_id = %s", (job_id,))
+        cursor.execute("DELETE FROM processing_jobs WHERE job_id = %s", (job_id,))
+
+
+def measure(name: str, rows: int, write) -> float:
+    job_id = create_job()
+    frame = make_frame(job_id, rows)
+
+    try:
+        started = time.perf_counter()
+        write(frame)
+        seconds = time.perf_counter() - started
+    finally:
+        delete_job(job_id)
+
+    print(f"{name:<14}: {seconds:8.3f}s ({rows / seconds:,.0f} rows/s)")
+
+    return rows / seconds
+
+
+def run(rows: int, row_rows: int, batch_size: int) -> dict:
+    row_repository = PostgresTransactionRepository()
+
+    def per_row(frame: pd.DataFrame) -> None:
+        values = frame.astype(object).where(frame.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            row_repository.save(Transaction(*row))
+
+    print(f"rows={rows} batch_size={batch_size}")
+    metrics = {
+        'per_row_rows_per_sec': measure("per-row", min(rows, row_rows), per_row),
+        'execute_values_rows_per_sec': measure(
+            "execute_values", rows,
+            PostgresTransactionRepository(batch_size=batch_size, insert_method=INSERT_METHOD_VALUES).save_many),
+        'copy_rows_per_sec': measure(
+            "copy", rows,
+            PostgresTransactionRepository(batch_size=batch_size, insert_method=INSERT_METHOD_COPY).save_many),
+        'copy_idempotent_rows_per_sec': measure(
+            "copy+skip", rows,
+            PostgresTransactionRepository(batch_size=batch_size, insert_method=INSERT_METHOD_COPY,
+                                          idempotent=True).save_many),
+    }
+
+    return make_result('ingest', {'rows': rows, 'row_rows': min(rows, row_rows), 'batch_size': batch_size}, metrics)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--row-rows", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    write_result(run(args.rows, args.row_rows, args.batch_size), args.json)
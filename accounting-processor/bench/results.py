@@ -0,0 +1,50 @@
+"""
+벤치마크 결과를 JSON 으로 남겨 회귀를 추적한다
+
+각 실행은 한 줄짜리 JSON 객체(JSON Lines)로 --json 파일에 추가되며 '-' 이면 표준 출력으로 쓴다
+
+    {"bench": "classify", "timestamp": "...", "git_commit": "...", "params": {...}, "metrics": {...}}
+"""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_result(bench: str, params: dict, metrics: dict) -> dict:
+    return {
+        'bench': bench,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'params': params,
+        'metrics': {name: round(value, 6) if isinstance(value, float) else value for name, value in metrics.items()},
+    }
+
+
+def write_result(result: dict, path: Optional[str]) -> None:
+    if not path:
+        return
+
+    line = json.dumps(result, ensure_ascii=False)
+    if path == '-':
+        print(line, file=sys.stdout)
+        return
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line + '\n')
+
+
+def add_json_argument(parser) -> None:
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON Lines 로 추가할 파일 ('-' 이면 표준 출력)")
@@ -0,0 +1,180 @@
+"""
+확장 규칙(v2) 분류 벤치마크: 규칙 수를 늘려가며 RuleMatcher 처리량 측정
+
+- 규칙마다 include/exclude 키워드, 금액 범위, 날짜 구간, priority 를 무작위로 두고 일부는 정규식을 쓴다
+- 같은 키워드의 v1 규칙(KeywordMatcher) 처리량을 기준으로 함께 측정
+- 모든 규칙을 행마다 순서대로 검사하는 필터 체인과 일부 행의 결과를 비교해 불일치 수를 함께 기록
+
+    python -m bench.rules_bench --rows 200000 --rules 100,1000,10000
+"""
+import argparse
+import random
+import re
+import time
+from datetime import date
+
+import pandas as pd
+
+from app.classifier.description_memo import DescriptionMemo
+from app.classifier.keyword_matcher import KeywordMatcher
+from app.classifier.rule_matcher import RuleMatcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+from bench.generator import make_rules, make_transactions
+from bench.results import make_result, write_result, add_json_argument
+
+JOB_ID = '00000000-0000-0000-0000-000000000000'
+KEYWORDS_PER_RULE = 5
+
+
+def make_extended_rules(rule_count: int, regex_ratio: float, rng: random.Random) -> dict:
+    companies = max(1, rule_count // 100)
+    rules = make_rules(rule_count * KEYWORDS_PER_RULE, companies, rule_count // companies, rng)
+
+    for company in rules['companies']:
+        for category in company['categories']:
+            keywords = category.pop('keywords')
+            conditions = {'exclude_keywords': [keywords[-1]]}
+
+            if rng.random() < regex_ratio:
+                conditions['include_regex'] = [f"{re.escape(keywords[0].lower())}\\s*\\w*"]
+            else:
+                conditions['include_keywords'] = keywords[:-1]
+
+            field = rng.choice(['amount_in', 'amount_out'])
+            low = rng.randrange(0, 8) * 1000
+            conditions['amount_range'] = {'field': field, 'min_amount': low,
+                                          'max_amount': rng.choice([None, low + rng.randrange(1, 5) * 1000])}
+
+            if rng.random() < 0.5:
+                month = rng.randrange(1, 12)
+                conditions['date_range'] = {'from': f"2025-{month:02d}-01", 'to': f"2025-{month + 1:02d}-01"}
+
+            category['priority'] = rng.randrange(0, 10)
+            category['conditions'] = conditions
+
+    return rules
+
+
+def filter_chain(rules: dict):
+    """
+    규칙마다 모든 조건을 순서대로 검사하는 기준 구현 (CategorizingLogic.md 의 FilterChain)
+    """
+    declared = [(company['company_id'], category)
+                for company in rules['companies'] for category in company['categories']]
+    ordered = [declared[i] for i in sorted(range(len(declared)),
+                                           key=lambda i: (declared[i][1].get('priority') is None,
+                                                          declared[i][1].get('priority') or 0, i))]
+
+    def classify(description: str, amounts: dict, transaction_date: date):
+        text = description.lower()
+
+        for company_id, category in ordered:
+            conditions = category.get('conditions', {})
+            includes = conditions.get('include_keywords', [])
+            patterns = conditions.get('include_regex', [])
+
+            if (includes or patterns) and not (any(keyword.lower() in text for keyword in includes) or
+                                               any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)):
+                continue
+            if any(keyword.lower() in text for keyword in conditions.get('exclude_keywords', [])):
+                continue
+
+            amount_range = conditions.get('amount_range')
+            if amount_range:
+                amount = amounts[amount_range['field']]
+                if amount_range.get('min_amount') is not None and amount < amount_range['min_amount']:
+                    continue
+                if amount_range.get('max_amount') is not None and amount > amount_range['max_amount']:
+                    continue
+
+            date_range = conditions.get('date_range')
+            if date_range and not (date.fromisoformat(date_range['from']) <= transaction_date
+                                   <= date.fromisoformat(date_range['to'])):
+                continue
+
+            return company_id, category['category_id']
+
+        return None, None
+
+    return classify
+
+
+def measure_build(df: pd.DataFrame, matcher) -> tuple:
+    started = time.perf_counter()
+    frame = TransactionFrameBuilder(matcher, DescriptionMemo()).build(JOB_ID, df)
+
+    return frame, time.perf_counter() - started
+
+
+def run_one(df: pd.DataFrame, keyword_rules: dict, rule_count: int, regex_ratio: float, chain_rows: int,
+            rng: random.Random) -> dict:
+    # 적요는 v1 키워드 규칙으로 만들었으므로 같은 시드로 규칙을 다시 만들면 같은 키워드가 적중한다
+    rules = make_extended_rules(rule_count, regex_ratio, rng)
+    _, keyword_seconds = measure_build(df, KeywordMatcher.from_rules(keyword_rules))
+
+    started = time.perf_counter()
+    matcher = RuleMatcher.from_rules(rules)
+    compile_seconds = time.perf_counter() - started
+
+    frame, build_seconds = measure_build(df, matcher)
+
+    # 필터 체인은 규칙 수에 비례해 느려지므로 일부 행만 측정해 전체 시간을 추정
+    classify = filter_chain(rules)
+    sample = frame.head(chain_rows)
+    started = time.perf_counter()
+    expected = [classify(row.description, {'amount_in': row.amount_in, 'amount_out': row.amount_out},
+                         row.transaction_date.date())
+                for row in sample.itertuples(index=False)]
+    chain_seconds = (time.perf_counter() - started) * len(df) / len(sample)
+
+    mismatches = sum(1 for (company_id, category_id), row in zip(expected, sample.itertuples(index=False))
+                     if (company_id, category_id) != (row.company_id, row.category_id))
+    classified = float(frame['category_id'].notna().mean())
+
+    print(f"rules={rule_count:<6} compile {compile_seconds:7.3f}s | frame build {build_seconds:7.3f}s "
+          f"({len(df) / build_seconds:,.0f} rows/s, keywords only {len(df) / keyword_seconds:,.0f} rows/s) | "
+          f"filter chain {chain_seconds:9.3f}s "
+          f"({len(df) / chain_seconds:,.0f} rows/s, estimated) | classified {classified:.1%} | "
+          f"mismatches {mismatches}")
+
+    return {
+        'rules': rule_count,
+        'compile_seconds': compile_seconds,
+        'build_rows_per_sec': len(df) / build_seconds,
+        'keyword_build_rows_per_sec': len(df) / keyword_seconds,
+        'filter_chain_rows_per_sec_estimated': len(df) / chain_seconds,
+        'classified_ratio': classified,
+        'mismatches': mismatches,
+    }
+
+
+def run(rows: int, rule_counts: list, regex_ratio: float, chain_rows: int, seed: int) -> dict:
+    results = []
+
+    for rule_count in rule_counts:
+        companies = max(1, rule_count // 100)
+        keyword_rules = make_rules(rule_count * KEYWORDS_PER_RULE, companies, rule_count // companies,
+                                   random.Random(seed))
+        df = make_transactions(keyword_rules, rows, random.Random(seed), vocabulary=20_000)
+        # 적요 외 조건이 행마다 다르게 걸리도록 거래일시를 한 해에 고르게 펼친다
+        df['거래일시'] = pd.date_range('2025-01-01', '2025-12-31', periods=rows).strftime('%Y-%m-%d %H:%M:%S')
+
+        results.append(run_one(df, keyword_rules, rule_count, regex_ratio, chain_rows, random.Random(seed)))
+
+    return make_result('rules', {
+        'rows': rows, 'rules': rule_counts, 'regex_ratio': regex_ratio, 'chain_rows': chain_rows, 'seed': seed
+    }, {'by_rules': results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--rules", default="100,1000,10000", help="쉼표로 구분한 규칙 수 목록")
+    parser.add_argument("--regex-ratio", type=float, default=0.01)
+    parser.add_argument("--chain-rows", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    write_result(run(args.rows, [int(count) for count in args.rules.split(',')], args.regex_ratio,
+                     args.chain_rows, args.seed), args.json)
@@ -0,0 +1,76 @@
+"""
+청크 스트리밍 읽기 벤치마크: 메모리 상한보다 큰 CSV 를 읽고 분류하며 최대 메모리 사용량을 측정
+
+    python -m bench.stream_bench --rows 1000000 --memory-limit-mb 16
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from app.classifier.keyword_matcher import KeywordMatcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+from app.reader.transaction_csv_reader import TransactionCsvReader
+from bench.frame_bench import JOB_ID
+from bench.generator import make_rules, write_csv
+from bench.results import make_result, write_result, add_json_argument
+
+
+def run(rows: int, keyword_count: int, memory_limit_mb: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rules = make_rules(keyword_count, companies=10, categories_per_company=10, rng=rng)
+    frame_builder = TransactionFrameBuilder(KeywordMatcher.from_rules(rules))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bank_transactions.csv')
+        write_csv(path, rules, rows, rng)
+        file_bytes = os.path.getsize(path)
+
+        reader = TransactionCsvReader(path, memory_limit_bytes=memory_limit_mb * 1024 * 1024)
+        chunk_rows = reader.chunk_rows
+
+        started = time.perf_counter()
+        total_rows = reader.count_rows()
+        count_seconds = time.perf_counter() - started
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        processed = 0
+        for chunk in reader.read_chunks():
+            processed += len(frame_builder.build(JOB_ID, chunk))
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"file={file_bytes / 2 ** 20:.1f}MiB rows={rows} chunk_rows={chunk_rows}")
+    print(f"line count   : {count_seconds:8.3f}s (total_rows={total_rows})")
+    print(f"stream       : {seconds:8.3f}s ({processed / seconds:,.0f} rows/s, processed={processed})")
+    print(f"peak memory  : {peak / 2 ** 20:8.1f}MiB (limit {memory_limit_mb}MiB)")
+
+    assert total_rows == rows == processed
+    assert peak <= memory_limit_mb * 1024 * 1024, "peak memory exceeded the configured limit"
+
+    return make_result('stream', {
+        'rows': rows, 'keywords': keyword_count, 'memory_limit_mb': memory_limit_mb, 'seed': seed
+    }, {
+        'file_mib': file_bytes / 2 ** 20,
+        'chunk_rows': chunk_rows,
+        'count_seconds': count_seconds,
+        'stream_seconds': seconds,
+        'stream_rows_per_sec': processed / seconds,
+        'peak_mib': peak / 2 ** 20,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keywords", type=int, default=1_000)
+    parser.add_argument("--memory-limit-mb", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    write_result(run(args.rows, args.keywords, args.memory_limit_mb, args.seed), args.json)
@@ -0,0 +1,50 @@
+"""
+벤치마크 모음 실행: 마이크로 벤치마크(분류, CSV 파싱/컬럼 분류, 스트리밍 읽기, CSV 파싱 엔진, 확장 규칙 분류)와
+선택적으로 DB 쓰기(--with-db), E2E(--api-url) 를 같은 --json 파일에 기록
+
+    python -m bench.suite --scale 1 --json results.jsonl
+    python -m bench.suite --scale 10 --with-db --api-url http://localhost:8000 --json results.jsonl
+"""
+import argparse
+import time
+
+from bench import classify_bench, csv_engine_bench, frame_bench, rules_bench, stream_bench
+from bench.results import write_result, add_json_argument
+
+
+def run(scale: int, with_db: bool, api_url: str, seed: int, path: str) -> None:
+    rows = 100_000 * scale
+
+    results = [
+        classify_bench.run(rows, keyword_count=5_000, hit_ratio=0.7, legacy_rows=2_000, seed=seed),
+        frame_bench.run(rows, keyword_count=5_000, legacy_rows=20_000, seed=seed),
+        stream_bench.run(rows, keyword_count=1_000, memory_limit_mb=16, seed=seed),
+        csv_engine_bench.run(rows, keyword_count=1_000, memory_limit_mb=64, reject_ratio=0.001, seed=seed),
+        rules_bench.run(rows, rule_counts=[100, 1_000, 10_000], regex_ratio=0.01, chain_rows=200, seed=seed),
+    ]
+
+    if with_db:
+        from bench import ingest_bench
+        results.append(ingest_bench.run(rows, row_rows=5_000, batch_size=10_000))
+
+    if api_url:
+        from bench import e2e_bench
+        # 같은 내용은 API 가 기존 작업을 반환하므로 E2E 는 실행마다 다른 시드
+        results.append(e2e_bench.run(api_url, rows, keyword_count=1_000, vocabulary=5_000, duplicate_ratio=0.0,
+                                     compress=False, seed=time.time_ns() % 2 ** 31, poll_interval=0.5,
+                                     timeout=3600, query_repeats=20))
+
+    for result in results:
+        write_result(result, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1, help="행 수 배율 (1 = 10만 행)")
+    parser.add_argument("--with-db", action="store_true", help="POSTGRES_* 가 가리키는 DB 로 쓰기 벤치마크 포함")
+    parser.add_argument("--api-url", default=None, help="지정하면 실행 중인 서비스로 E2E 벤치마크 포함")
+    parser.add_argument("--seed", type=int, default=42)
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    run(args.scale, args.with_db, args.api_url, args.seed, args.json)
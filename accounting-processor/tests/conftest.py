@@ -0,0 +1,20 @@
+import os
+
+import psycopg2
+import pytest
+
+from app.database.postgres_db import get_cursor
+
+
+@pytest.fixture(scope='session')
+def database():
+    """
+    POSTGRES_* 환경 변수가 가리키는 DB 가 필요한 테스트용. DB 가 없으면 건너뛴다
+    """
+    if not os.getenv("POSTGRES_DATABASE"):
+        pytest.skip("POSTGRES_DATABASE 미설정")
+    try:
+        with get_cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except psycopg2.Error as e:
+        pytest.skip(f"DB 에 연결할 수 없음: {e}")
@@ -0,0 +1,102 @@
+import random
+
+import pandas as pd
+import pytest
+
+from app.classifier.rule_matcher import RuleMatcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+from app.reader.arrow_block_parser import ArrowBlockParser
+from app.reader.rejects_report import REJECT_COLUMN_COUNT, REJECT_INVALID_AMOUNT, REJECT_MISSING_BALANCE
+from app.reader.transaction_csv_reader import TransactionCsvReader, ENGINE_PANDAS, ENGINE_PYARROW
+
+COLUMNS = ['거래일시', '적요', '입금액', '출금액', '거래후잔액', '거래점']
+RULES = {'companies': [{'company_id': 'com_1', 'categories': [
+    {'category_id': 'cat_101', 'keywords': ['쿠팡']},
+    {'category_id': 'cat_102', 'keywords': ['환불'], 'conditions': {'amount_range': {'field': 'amount_in'}}},
+]}]}
+
+
+def parse(*lines: str):
+    return ArrowBlockParser(COLUMNS).parse(''.join(line + '\n' for line in lines).encode())
+
+
+def test_empty_amounts_are_nullable_int64():
+    frame, rejects = parse('2025-07-01 10:00:00,쿠팡,,5000,10000,온라인',
+                           '2025-07-01 11:00:00,환불,3000,,13000,')
+
+    assert rejects == []
+    assert all(frame[name].dtype == pd.Int64Dtype() for name in ('입금액', '출금액', '거래후잔액'))
+    assert frame['입금액'].isna().tolist() == [True, False]
+    assert frame['출금액'].tolist()[0] == 5000 and frame['출금액'].isna().tolist() == [False, True]
+
+
+@pytest.mark.parametrize('malformed', [False, True], ids=['typed', 'coerced'])
+def test_location_is_dictionary_encoded(malformed):
+    # 변환할 수 없는 행이 있으면 문자열로 다시 읽는 경로에서도 같은 dtype
+    lines = ['2025-07-01 10:00:00,쿠팡,1000,0,1000,온라인', '2025-07-01 11:00:00,쿠팡,1000,0,2000,본점',
+             '2025-07-01 12:00:00,쿠팡,1000,0,3000,온라인', '2025-07-01 13:00:00,쿠팡,1000,0,4000,']
+    if malformed:
+        lines.append('2025-07-01 14:00:00,쿠팡,천원,0,5000,온라인')
+
+    frame, _ = parse(*lines)
+
+    assert isinstance(frame['거래점'].dtype, pd.CategoricalDtype)
+    assert sorted(frame['거래점'].cat.categories) == ['본점', '온라인']
+    assert frame['거래점'].tolist()[:3] == ['온라인', '본점', '온라인'] and pd.isna(frame['거래점'].iloc[3])
+
+
+def test_malformed_rows_are_rejected_and_the_rest_are_kept():
+    frame, rejects = parse('2025-07-01 10:00:00,정상,1000,0,1000,온라인',
+                           '2025-07-01 11:00:00,컬럼 부족,1000,0',
+                           '2025-07-01 12:00:00,컬럼 초과,1000,0,2000,온라인,추가',
+                           '2025-07-01 13:00:00,금액 오류,천원,0,3000,온라인',
+                           '2025-07-01 14:00:00,잔액 없음,1000,0,,온라인',
+                           '2025-07-01 15:00:00,소수 금액,1000.6,0,4000,온라인')
+
+    assert frame['적요'].tolist() == ['정상', '소수 금액']
+    assert frame['입금액'].tolist() == [1000, 1001]
+    assert sorted(rejects) == sorted([
+        (REJECT_COLUMN_COUNT, '2025-07-01 11:00:00,컬럼 부족,1000,0'),
+        (REJECT_COLUMN_COUNT, '2025-07-01 12:00:00,컬럼 초과,1000,0,2000,온라인,추가'),
+        (REJECT_INVALID_AMOUNT, '2025-07-01 13:00:00,금액 오류,천원,0,3000,온라인'),
+        (REJECT_MISSING_BALANCE, '2025-07-01 14:00:00,잔액 없음,1000,0,,온라인'),
+    ])
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = random.Random(11)
+    formats = ['%Y-%m-%d %H:%M:%S', '%Y/%m/%d %H:%M', '%Y.%m.%d']
+    rows = []
+    for i in range(3000):
+        date = pd.Timestamp('2025-07-01') + pd.Timedelta(minutes=37 * i)
+        description = rng.choice(['쿠팡 결제', '환불 처리', '스타벅스', '쿠팡\n반품 "재결제"'])
+        rows.append({
+            '거래일시': date.strftime(rng.choice(formats)),
+            '적요': description,
+            '입금액': rng.choice([None, 0, rng.randint(1, 10 ** 9)]),
+            '출금액': rng.choice([None, rng.randint(1, 10 ** 6)]),
+            '거래후잔액': rng.randint(0, 10 ** 12),
+            '거래점': rng.choice([None, '온라인', '본점', '강남지점']),
+        })
+    path = tmp_path / 'bank_transactions.csv'
+    pd.DataFrame(rows).astype({'입금액': 'Int64', '출금액': 'Int64'}).to_csv(path, index=False)
+
+    return str(path)
+
+
+def build(path: str, engine: str) -> pd.DataFrame:
+    reader = TransactionCsvReader(path, memory_limit_bytes=64 * 1024, engine=engine)
+    builder = TransactionFrameBuilder(RuleMatcher(RULES))
+
+    frames = [builder.build('job-1', chunk) for chunk in reader.read_chunks()]
+
+    return pd.concat(frames, ignore_index=True).drop(columns='created_at')
+
+
+def test_pandas_and_pyarrow_engines_build_the_same_frame(csv_path):
+    pandas_frame = build(csv_path, ENGINE_PANDAS)
+    arrow_frame = build(csv_path, ENGINE_PYARROW)
+
+    assert len(arrow_frame) == 3000
+    pd.testing.assert_frame_equal(arrow_frame, pandas_frame)
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+
+from app.queue.async_reliable_task_queue import AsyncReliableTaskQueue
+from app.queue.reliable_task_queue import ReliableTaskQueue
+
+QUEUE = 'test_tasks'
+OPTIONS = {'queue_name': QUEUE, 'retry_backoff': 0, 'poll_interval': 0.01}
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def test_reserve_fail_and_redeliver(server):
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis(server=server)
+        queue = AsyncReliableTaskQueue(redis_client, 'async-1', max_retries=1, **OPTIONS)
+        await redis_client.lpush(QUEUE, json.dumps({'job_id': 'job-1'}))
+
+        assert await queue.fail(await queue.reserve(timeout=1), 'boom') is True
+        task = await queue.reserve(timeout=1)
+        assert task.attempts == 1
+        assert await queue.fail(task, 'boom again') is False
+        assert await queue.reserve(timeout=0.02) is None
+
+        return await redis_client.llen(queue.dead_key), await redis_client.zcard(queue.inflight_key)
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_sync_worker_reaps_task_reserved_by_async_worker(server):
+    async def reserve_and_die():
+        redis_client = fakeredis.FakeAsyncRedis(server=server)
+        await redis_client.lpush(QUEUE, json.dumps({'job_id': 'job-1'}))
+        queue = AsyncReliableTaskQueue(redis_client, 'async-dead', visibility_timeout=0, **OPTIONS)
+
+        return await queue.reserve(timeout=1)
+
+    task = asyncio.run(reserve_and_die())
+    sync_queue = ReliableTaskQueue(fakeredis.FakeRedis(server=server), 'sync-1', **OPTIONS)
+
+    assert sync_queue.reap_stalled() == []
+    redelivered = sync_queue.reserve(timeout=1)
+    assert redelivered.job_id == task.job_id and redelivered.attempts == 1
+    sync_queue.ack(redelivered)
+    assert sync_queue.depths() == {'pending': 0, 'delayed': 0, 'inflight': 0, 'dead': 0}
@@ -0,0 +1,325 @@
+"""
+적재 중 실패한 작업의 재시도: 커밋된 블록(행, 집계 증분, 체크포인트)은 한 번만 반영되고 그 다음 블록부터 이어서 적재한다
+"""
+import contextlib
+import copy
+import functools
+import json
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import app.ingestor
+import app.processor
+from app.classifier.rule_matcher import RuleMatcher
+from app.classifier.transaction_frame import fingerprint_rows
+from app.database.postgres_db import get_cursor
+from app.entity.ingest_result import IngestResult
+from app.entity.shard_checkpoint import ShardCheckpoint
+from app.ingestor import TransactionIngestor
+from app.processor import TransactionProcessor
+from app.reader.transaction_csv_reader import TransactionCsvReader
+from app.repository.impl.postgres_processing_job_checkpoint_repository import \
+    PostgresProcessingJobCheckpointRepository
+from app.repository.impl.postgres_transaction_partition_repository import PostgresTransactionPartitionRepository
+from app.repository.impl.postgres_transaction_repository import PostgresTransactionRepository
+from app.repository.impl.postgres_transaction_summary_repository import PostgresTransactionSummaryRepository
+from app.repository.processing_job_checkpoint_repository import ProcessingJobCheckpointRepository
+from app.repository.processing_job_repository import ProcessingJobRepository
+from app.repository.transaction_partition_repository import TransactionPartitionRepository
+from app.repository.transaction_repository import TransactionRepository
+from app.repository.transaction_summary_repository import TransactionSummaryRepository
+
+ROWS = 3500
+RULES = {'companies': [{'company_id': 'com_1', 'categories': [{'category_id': 'cat_101', 'keywords': ['쿠팡']}]}]}
+# 청크가 MIN_CHUNK_ROWS(1000) 행씩 나뉘도록 메모리 상한을 작게 둔다
+SMALL_BLOCKS = functools.partial(TransactionCsvReader, memory_limit_bytes=64 * 1024)
+
+
+class FakeDatabase:
+    """
+    transaction() 블록이 예외로 끝나면 블록 시작 시점의 상태로 되돌린다
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.summaries = {}
+        self.checkpoints = {}
+
+    @contextlib.contextmanager
+    def transaction(self):
+        snapshot = copy.deepcopy((self.rows, self.summaries, self.checkpoints))
+        try:
+            yield
+        except BaseException:
+            self.rows, self.summaries, self.checkpoints = snapshot
+            raise
+
+
+class FakeTransactionRepository(TransactionRepository):
+
+    def __init__(self, database: FakeDatabase):
+        self.__database = database
+
+    def save_many(self, transactions: pd.DataFrame) -> int:
+        self.__database.rows.extend(fingerprint_rows(transactions))
+
+        return len(transactions)
+
+
+class FakeSummaryRepository(TransactionSummaryRepository):
+
+    def __init__(self, database: FakeDatabase, fail_on_call: int = 0):
+        self.__database = database
+        self.__fail_on_call = fail_on_call
+        self.calls = 0
+
+    def add(self, summary: pd.DataFrame):
+        self.calls += 1
+        for row in summary.itertuples(index=False):
+            totals = self.__database.summaries.setdefault((row.company_id, row.category_id, row.month), [0, 0])
+            totals[0] += int(row.transaction_count)
+            totals[1] += int(row.amount_in)
+
+        # 같은 트랜잭션의 행 적재 뒤, 체크포인트 커밋 전에 실패
+        if self.calls == self.__fail_on_call:
+            raise RuntimeError("connection lost")
+
+
+class FakeCheckpointRepository(ProcessingJobCheckpointRepository):
+
+    def __init__(self, database: FakeDatabase):
+        self.__database = database
+
+    def find_by_job(self, job_id: str):
+        return [copy.copy(checkpoint) for _, checkpoint in sorted(self.__database.checkpoints.items())]
+
+    def save_plan(self, job_id: str, byte_ranges):
+        for shard_no, (start, end) in enumerate(byte_ranges):
+            self.__database.checkpoints[shard_no] = ShardCheckpoint(shard_no, start, end, start, 0)
+
+        return self.find_by_job(job_id)
+
+    def commit(self, job_id: str, shard_no: int, committed_offset: int, rows: int):
+        checkpoint = self.__database.checkpoints[shard_no]
+        checkpoint.committed_offset = committed_offset
+        checkpoint.committed_rows += rows
+
+    def delete_by_job(self, job_id: str):
+        self.__database.checkpoints.clear()
+
+
+class FakePartitionRepository(TransactionPartitionRepository):
+
+    def ensure_months(self, months):
+        return []
+
+
+class FakeJobRepository(ProcessingJobRepository):
+
+    def __init__(self, csv_file_path: str):
+        self.__csv_file_path = csv_file_path
+        self.completed = None
+        self.failures = []
+
+    def find_and_update_status(self, id: str):
+        return {'csv_file_path': self.__csv_file_path, 'rules_data': RULES, 'rules_hash': None, 'total_rows': 0}
+
+    def update_progress(self, processing_job):
+        pass
+
+    def complete_job(self, processing_job):
+        self.completed = processing_job
+
+    def fail_job(self, job_id: str, e: Exception):
+        self.failures.append(e)
+
+
+class FakeProgressTracker:
+
+    def __getattr__(self, name):
+        # start / advance / checkpoint / complete / fail 모두 무시
+        return lambda *args, **kwargs: None
+
+
+class FakeMatcherCache:
+
+    def get(self, rules_hash, rules_data):
+        return RuleMatcher(rules_data)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    frame = pd.DataFrame({
+        '거래일시': [f"2025-{7 + i % 2:02d}-{i % 28 + 1:02d} 12:00:00" for i in range(ROWS)],
+        '적요': [f"쿠팡 정산 {i}" for i in range(ROWS)],
+        '입금액': range(ROWS),
+        '출금액': 0,
+        '거래후잔액': [i * 10 for i in range(ROWS)],
+        '거래점': '온라인',
+    })
+    path = tmp_path / 'bank_transactions.csv'
+    frame.to_csv(path, index=False)
+
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(app.ingestor, 'TransactionCsvReader', SMALL_BLOCKS)
+    monkeypatch.setattr(app.processor, 'TransactionCsvReader', SMALL_BLOCKS)
+
+
+def make_processor(database: FakeDatabase, job_repository: FakeJobRepository, summary_repository=None):
+    return TransactionProcessor(job_repository, FakeTransactionRepository(database), shard_processes=1,
+                                matcher_cache=FakeMatcherCache(), progress_tracker=FakeProgressTracker(),
+                                checkpoint_repository=FakeCheckpointRepository(database),
+                                summary_repository=summary_repository or FakeSummaryRepository(database),
+                                partition_repository=FakePartitionRepository())
+
+
+def expected_summaries(csv_path: str) -> dict:
+    frame = pd.read_csv(csv_path, parse_dates=['거래일시'])
+    grouped = frame.groupby(frame['거래일시'].dt.to_period('M').dt.start_time)['입금액'].agg(['size', 'sum'])
+
+    return {('com_1', 'cat_101', month): [int(count), int(amount)]
+            for month, (count, amount) in grouped.iterrows()}
+
+
+def test_failed_block_is_rolled_back_and_retry_resumes_after_last_commit(monkeypatch, csv_path):
+    database = FakeDatabase()
+    monkeypatch.setattr(app.ingestor, 'transaction', database.transaction)
+    job_repository = FakeJobRepository(csv_path)
+    failing = FakeSummaryRepository(database, fail_on_call=2)
+
+    with pytest.raises(RuntimeError):
+        make_processor(database, job_repository, failing).process_job('job-1')
+
+    # 첫 블록만 커밋: 실패한 블록의 행과 집계 증분은 체크포인트와 함께 되돌려진다
+    checkpoint, = database.checkpoints.values()
+    assert len(job_repository.failures) == 1
+    assert 0 < len(database.rows) == checkpoint.committed_rows < ROWS
+    assert checkpoint.range_start < checkpoint.committed_offset < checkpoint.range_end
+    assert sum(count for count, _ in database.summaries.values()) == len(database.rows)
+
+    result = make_processor(database, job_repository).process_job('job-1')
+
+    assert len(database.rows) == len(set(database.rows)) == ROWS
+    assert database.summaries == expected_summaries(csv_path)
+    assert result['processed_rows'] == job_repository.completed.processed_rows == ROWS
+    assert result['skipped_rows'] == result['rejected_rows'] == 0
+    assert database.checkpoints == {}
+
+
+def test_resume_keeps_saved_shard_plan_and_skips_finished_shards(monkeypatch, csv_path):
+    database = FakeDatabase()
+    monkeypatch.setattr(app.ingestor, 'transaction', database.transaction)
+    reader = SMALL_BLOCKS(csv_path)
+    ranges = reader.split_byte_ranges(3)
+    shard_rows = [sum(len(chunk) for chunk in reader.read_chunks(byte_range)) for byte_range in ranges]
+    # 이전 시도에서 0, 2 번 구간은 끝났고 1 번 구간은 시작하지 못했다
+    for shard_no, (start, end) in enumerate(ranges):
+        done = shard_no != 1
+        database.checkpoints[shard_no] = ShardCheckpoint(shard_no, start, end, end if done else start,
+                                                         shard_rows[shard_no] if done else 0)
+
+    result = make_processor(database, FakeJobRepository(csv_path)).process_job('job-1')
+
+    remaining = pd.concat(reader.read_chunks(ranges[1]))
+    assert len(database.rows) == shard_rows[1] == len(remaining)
+    assert result['processed_rows'] == ROWS
+
+
+def test_ingest_result_merge_adds_counts_and_companies():
+    result = IngestResult(processed_rows=10, skipped_rows=2, rejected_rows=1, company_ids={'com_1'})
+
+    result.merge(IngestResult(processed_rows=5, skipped_rows=0, rejected_rows=3, company_ids={'com_2'}))
+
+    assert result == IngestResult(processed_rows=15, skipped_rows=2, rejected_rows=4, company_ids={'com_1', 'com_2'})
+
+
+class FailingSummaryRepository(PostgresTransactionSummaryRepository):
+
+    def __init__(self, fail_on_call: int):
+        self.__fail_on_call = fail_on_call
+        self.__calls = 0
+
+    def add(self, summary: pd.DataFrame):
+        super().add(summary)
+        self.__calls += 1
+        if self.__calls == self.__fail_on_call:
+            raise RuntimeError("connection lost")
+
+
+def test_retry_against_database_neither_duplicates_rows_nor_double_counts_summaries(database, tmp_path):
+    # 운영 데이터와 섞이지 않는 먼 미래의 월에 적재
+    rows = 2500
+    frame = pd.DataFrame({
+        '거래일시': [f"2092-0{1 + i % 2}-{i % 28 + 1:02d} 12:00:00" for i in range(rows)],
+        '적요': [f"쿠팡 정산 {i}" for i in range(rows)],
+        '입금액': range(rows),
+        '출금액': 0,
+        '거래후잔액': range(rows),
+        '거래점': '온라인',
+    })
+    csv_path = str(tmp_path / 'bank_transactions.csv')
+    frame.to_csv(csv_path, index=False)
+
+    job_id = str(uuid.uuid4())
+    with get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO processing_jobs (job_id, status, csv_file_path, rules_data, created_at)
+            VALUES (%s, 'processing', %s, %s, %s)
+        """, (job_id, csv_path, json.dumps(RULES), datetime.now()))
+
+    checkpoints = PostgresProcessingJobCheckpointRepository()
+    partitions = PostgresTransactionPartitionRepository()
+    created = []
+
+    def ingestor(summary_repository):
+        class RecordingPartitions(PostgresTransactionPartitionRepository):
+            def ensure_months(self, months):
+                months = partitions.ensure_months(months)
+                created.extend(months)
+                return months
+
+        return TransactionIngestor(FakeProgressTracker(), PostgresTransactionRepository(), checkpoints,
+                                   summary_repository, RecordingPartitions())
+
+    try:
+        checkpoint, = checkpoints.save_plan(job_id, [SMALL_BLOCKS(csv_path).data_range()])
+        with pytest.raises(RuntimeError):
+            ingestor(FailingSummaryRepository(fail_on_call=2)).ingest_range(
+                job_id, csv_path, RuleMatcher(RULES), 0, checkpoint.remaining_range)
+
+        checkpoint, = checkpoints.find_by_job(job_id)
+        assert 0 < checkpoint.committed_rows < rows
+        ingestor(PostgresTransactionSummaryRepository()).ingest_range(
+            job_id, csv_path, RuleMatcher(RULES), 0, checkpoint.remaining_range)
+
+        with get_cursor() as cursor:
+            cursor.execute("SELECT count(*) AS n, count(DISTINCT description) AS d FROM transactions WHERE job_id = %s",
+                           (job_id,))
+            counts = cursor.fetchone()
+            cursor.execute("""
+                SELECT coalesce(sum(transaction_count), 0) AS n, coalesce(sum(amount_in), 0) AS amount_in
+                FROM transaction_summaries
+                WHERE company_id = 'com_1' AND category_id = 'cat_101'
+                  AND month >= '2092-01-01' AND month < '2092-03-01'
+            """)
+            summaries = cursor.fetchone()
+
+        assert counts['n'] == counts['d'] == rows
+        assert (summaries['n'], summaries['amount_in']) == (rows, sum(range(rows)))
+    finally:
+        with get_cursor() as cursor:
+            cursor.execute("DELETE FROM transactions WHERE job_id = %s", (job_id,))
+            cursor.execute("DELETE FROM processing_jobs WHERE job_id = %s", (job_id,))
+            cursor.execute("""
+                DELETE FROM transaction_summaries
+                WHERE company_id = 'com_1' AND month >= '2092-01-01' AND month < '2092-03-01'
+            """)
+            for month in created:
+                cursor.execute(f"DROP TABLE IF EXISTS transactions_{month:%Y_%m}")
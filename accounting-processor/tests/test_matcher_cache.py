@@ -0,0 +1,81 @@
+import os
+import pickle
+
+import pytest
+
+from app.classifier.matcher_cache import MatcherCache, hash_rules
+from app.repository.rules_set_repository import RulesSetRepository
+
+RULES = {'companies': [{'company_id': 'com_1', 'categories': [{'category_id': 'cat_101', 'keywords': ['쿠팡']}]}]}
+OTHER_RULES = {'companies': [{'company_id': 'com_2', 'categories': [{'category_id': 'cat_201', 'keywords': ['토스']}]}]}
+
+
+class CountingRulesSetRepository(RulesSetRepository):
+
+    def __init__(self):
+        self.calls = 0
+
+    def find_rules(self, rules_hash: str) -> dict:
+        self.calls += 1
+        return {hash_rules(RULES): RULES, hash_rules(OTHER_RULES): OTHER_RULES}[rules_hash]
+
+
+class Exploit:
+    # unpickle 되면 표시 파일을 만든다
+    def __reduce__(self):
+        return open, (os.environ['EXPLOIT_MARKER'], 'w')
+
+
+def cache(tmp_path, cache_key='secret'):
+    repository = CountingRulesSetRepository()
+    return MatcherCache(repository, cache_dir=str(tmp_path), cache_key=cache_key), repository
+
+
+def cache_file(tmp_path, rules) -> str:
+    name, = [name for name in os.listdir(tmp_path) if hash_rules(rules) in name]
+    return str(tmp_path / name)
+
+
+def test_signed_file_is_reused_by_another_worker(tmp_path):
+    cache(tmp_path)[0].get(hash_rules(RULES))
+
+    matcher_cache, repository = cache(tmp_path)
+    matcher = matcher_cache.get(hash_rules(RULES))
+
+    assert repository.calls == 0
+    assert list(matcher.targets) == [('com_1', 'cat_101')]
+
+
+@pytest.mark.parametrize('forge', ['unsigned', 'other key', 'renamed'])
+def test_forged_file_is_not_unpickled(tmp_path, monkeypatch, forge):
+    marker = tmp_path / 'exploited'
+    monkeypatch.setenv('EXPLOIT_MARKER', str(marker))
+    cache(tmp_path)[0].get(hash_rules(RULES))
+    path = cache_file(tmp_path, RULES)
+
+    if forge == 'unsigned':
+        with open(path, 'wb') as f:
+            pickle.dump(Exploit(), f)
+    elif forge == 'other key':
+        # 다른 키로 서명한 파일
+        cache(tmp_path / 'other', cache_key='guessed')[0].get(hash_rules(RULES))
+        os.replace(cache_file(tmp_path / 'other', RULES), path)
+    else:
+        # 같은 키로 서명된 다른 규칙의 파일을 이름만 바꾼 경우
+        cache(tmp_path)[0].get(hash_rules(OTHER_RULES))
+        os.replace(cache_file(tmp_path, OTHER_RULES), path)
+
+    matcher_cache, repository = cache(tmp_path)
+    matcher = matcher_cache.get(hash_rules(RULES))
+
+    assert not marker.exists()
+    assert repository.calls == 1
+    assert list(matcher.targets) == [('com_1', 'cat_101')]
+
+
+def test_without_key_disk_cache_is_not_used(tmp_path):
+    matcher_cache, _ = cache(tmp_path, cache_key=None)
+
+    matcher_cache.get(hash_rules(RULES))
+
+    assert os.listdir(tmp_path) == []
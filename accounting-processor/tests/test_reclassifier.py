@@ -0,0 +1,181 @@
+"""
+재분류 작업의 대상 범위(source_job_id)와 테넌트 샤드 사이 이동 시 진행 행 수
+DB 대신 샤드별 행을 메모리에 두는 저장소와 2개 샤드로 실행한다
+"""
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.reclassifier
+from app.classifier.rule_matcher import compile_rules
+from app.reclassifier import TransactionReclassifier
+from app.repository.impl.postgres_transaction_repository import RECLASSIFY_CANDIDATE_COLUMNS
+from app.repository.processing_job_repository import ProcessingJobRepository
+from app.repository.rules_set_repository import RulesSetRepository
+from app.repository.transaction_repository import TransactionRepository
+from app.repository.transaction_summary_repository import TransactionSummaryRepository
+
+
+def rules(company_id, category_id):
+    return {'companies': [{'company_id': company_id, 'categories': [{'category_id': category_id,
+                                                                     'keywords': ['쿠팡']}]}]}
+
+
+RULES = {'old': rules('com_1', 'cat_1'), 'new': rules('com_2', 'cat_2')}
+# com_1 은 0 번, com_2 는 1 번 샤드
+SHARDS = {'com_1': 0, 'com_2': 1}
+
+
+class FakeShards:
+
+    def __init__(self):
+        self.rows = {0: {}, 1: {}}
+        self.current = 0
+
+    @contextlib.contextmanager
+    def use(self, shard: int):
+        previous, self.current = self.current, shard
+        try:
+            yield
+        finally:
+            self.current = previous
+
+    def each(self):
+        for shard in self.rows:
+            with self.use(shard):
+                yield shard
+
+    @property
+    def table(self) -> dict:
+        return self.rows[self.current]
+
+
+class FakeTransactionRepository(TransactionRepository):
+
+    def __init__(self, shards: FakeShards):
+        self.__shards = shards
+
+    def find_reclassify_candidates(self, job_ids, keywords, batch_size):
+        rows = [row for row in self.__shards.table.values() if row['job_id'] in job_ids]
+        for start in range(0, len(rows), batch_size):
+            yield pd.DataFrame(rows[start:start + batch_size])[RECLASSIFY_CANDIDATE_COLUMNS]
+
+    def update_categories(self, changes: pd.DataFrame) -> pd.DataFrame:
+        for change in changes.itertuples():
+            self.__shards.table[change.transaction_id].update(company_id=change.company_id,
+                                                              category_id=change.category_id)
+        return changes
+
+    def lock_moving_rows(self, changes: pd.DataFrame) -> pd.DataFrame:
+        return changes.assign(job_id=[self.__shards.table[i]['job_id'] for i in changes['transaction_id']])
+
+    def insert_moved_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        for row in rows.to_dict('records'):
+            self.__shards.table[row['transaction_id']] = {name: row[name] for name in
+                                                          RECLASSIFY_CANDIDATE_COLUMNS + ['job_id']}
+        return rows[['transaction_date', 'amount_in', 'amount_out', 'company_id', 'category_id']]
+
+    def delete_moved_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        for transaction_id in rows['transaction_id']:
+            del self.__shards.table[transaction_id]
+        return rows[['transaction_date', 'amount_in', 'amount_out', 'old_company_id', 'old_category_id']]
+
+
+class FakeSummaryRepository(TransactionSummaryRepository):
+
+    def apply_deltas(self, deltas: pd.DataFrame):
+        pass
+
+
+class FakeRulesSetRepository(RulesSetRepository):
+
+    def find_rules(self, rules_hash: str) -> dict:
+        return RULES[rules_hash]
+
+
+class FakeMatcherCache:
+
+    def get(self, rules_hash, rules_data=None):
+        return compile_rules(RULES[rules_hash])
+
+
+class FakeJobRepository(ProcessingJobRepository):
+
+    def __init__(self, source_job_id):
+        self.__source_job_id = source_job_id
+        self.updated_job_ids = None
+        self.completed = None
+
+    def find_and_update_status(self, id: str):
+        return {'csv_file_path': None, 'rules_data': None, 'rules_hash': 'new', 'base_rules_hash': 'old',
+                'source_job_id': self.__source_job_id}
+
+    def find_job_ids_by_rules_hash(self, rules_hash, job_id=None):
+        return [candidate for candidate in ('job-a', 'job-b') if job_id in (None, candidate)]
+
+    def update_rules_hash(self, job_ids, rules_hash):
+        self.updated_job_ids = job_ids
+
+    def complete_job(self, processing_job):
+        self.completed = processing_job
+
+    def fail_job(self, job_id, e):
+        pass
+
+
+class FakeProgressTracker:
+
+    def __init__(self):
+        self.advanced = 0
+
+    def advance(self, job_id, rows):
+        self.advanced += rows
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    shards = FakeShards()
+    for transaction_id, job_id in enumerate(['job-a'] * 3 + ['job-b'] * 2):
+        shards.rows[0][transaction_id] = {
+            'transaction_id': transaction_id, 'job_id': job_id, 'transaction_date': pd.Timestamp('2025-07-01'),
+            'description': f"쿠팡 결제 {transaction_id}", 'amount_in': 0, 'amount_out': 1000,
+            'company_id': 'com_1', 'category_id': 'cat_1'}
+
+    monkeypatch.setattr(app.reclassifier, 'each_tenant_shard', shards.each)
+    monkeypatch.setattr(app.reclassifier, 'use_tenant_shard', shards.use)
+    monkeypatch.setattr(app.reclassifier, 'transaction', contextlib.nullcontext)
+    monkeypatch.setattr(app.reclassifier, 'is_sharded', lambda: True)
+    monkeypatch.setattr(app.reclassifier, 'tenant_shards_of',
+                        lambda company_ids: np.array([SHARDS[company_id] for company_id in company_ids]))
+
+    return shards
+
+
+@pytest.mark.parametrize('source_job_id, job_ids', [
+    ('job-a', ['job-a']),
+    (None, ['job-a', 'job-b']),
+], ids=['scope=job', 'scope=rules'])
+def test_moved_rows_are_counted_once_and_scope_limits_targets(shards, source_job_id, job_ids):
+    job_repository = FakeJobRepository(source_job_id)
+    progress_tracker = FakeProgressTracker()
+    reclassifier = TransactionReclassifier(job_repository, FakeTransactionRepository(shards),
+                                           matcher_cache=FakeMatcherCache(), progress_tracker=progress_tracker,
+                                           rules_set_repository=FakeRulesSetRepository(),
+                                           summary_repository=FakeSummaryRepository())
+
+    result = reclassifier.process_job('reclassify-1')
+
+    moved = list(shards.rows[1].values())
+    expected = 3 if source_job_id else 5
+    assert sorted(row['job_id'] for row in moved) == [job_id for job_id in ['job-a'] * 3 + ['job-b'] * 2
+                                                      if job_id in job_ids]
+    assert {(row['company_id'], row['category_id']) for row in moved} == {('com_2', 'cat_2')}
+    # 1 번 샤드로 옮긴 행은 그 샤드를 읽을 때 다시 세지 않는다
+    assert result['processed_rows'] == result['changed_rows'] == progress_tracker.advanced == expected
+    assert job_repository.updated_job_ids == job_ids
+    assert len(shards.rows[0]) == 5 - expected
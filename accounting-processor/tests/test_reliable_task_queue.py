@@ -0,0 +1,123 @@
+import json
+import time
+
+import fakeredis
+import pytest
+
+from app.queue.reliable_task_queue import ReliableTaskQueue
+
+QUEUE = 'test_tasks'
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+def make_queue(redis_client, worker_id='worker-1', **options):
+    options = {'queue_name': QUEUE, 'retry_backoff': 0, 'poll_interval': 0.01, **options}
+
+    return ReliableTaskQueue(redis_client, worker_id, **options)
+
+
+def enqueue(redis_client, job_id='job-1'):
+    redis_client.lpush(QUEUE, json.dumps({'job_id': job_id, 'task': 'process_transactions'}))
+
+
+def test_reserve_registers_task_and_ack_removes_it(redis_client):
+    queue = make_queue(redis_client)
+    enqueue(redis_client)
+
+    task = queue.reserve(timeout=1)
+
+    assert task.job_id == 'job-1' and task.attempts == 0
+    assert redis_client.lrange(queue.processing_key, 0, -1) == [task.raw]
+    assert redis_client.zscore(queue.inflight_key, task.raw) > time.time()
+    assert redis_client.hget(queue.owners_key, task.raw) == queue.processing_key.encode()
+
+    queue.ack(task)
+
+    assert queue.depths() == {'pending': 0, 'delayed': 0, 'inflight': 0, 'dead': 0}
+    assert redis_client.llen(queue.processing_key) == 0
+    assert redis_client.hlen(queue.owners_key) == 0
+
+
+def test_reserve_returns_none_after_timeout(redis_client):
+    queue = make_queue(redis_client)
+
+    started = time.monotonic()
+    assert queue.reserve(timeout=0.05) is None
+    assert time.monotonic() - started >= 0.05
+
+
+def test_failed_task_is_delayed_then_promoted_and_redelivered(redis_client):
+    queue = make_queue(redis_client, retry_backoff=60)
+    enqueue(redis_client)
+
+    assert queue.fail(queue.reserve(timeout=1), 'boom') is True
+    assert queue.depths() == {'pending': 0, 'delayed': 1, 'inflight': 0, 'dead': 0}
+    # 백오프가 지나기 전에는 재전달되지 않는다
+    assert queue.promote_delayed() == 0
+    assert queue.reserve(timeout=0.02) is None
+
+    (raw, score), = redis_client.zrange(queue.delayed_key, 0, -1, withscores=True)
+    assert 55 < score - time.time() <= 60
+    redis_client.zadd(queue.delayed_key, {raw: time.time() - 1})
+
+    task = queue.reserve(timeout=1)
+
+    assert task.job_id == 'job-1'
+    assert task.attempts == 1 and task.payload['last_error'] == 'boom'
+    assert queue.depths()['delayed'] == 0
+
+
+def test_task_is_dead_lettered_after_max_retries(redis_client):
+    queue = make_queue(redis_client, max_retries=2)
+    enqueue(redis_client)
+
+    results = [queue.fail(queue.reserve(timeout=1), f'error {attempt}') for attempt in range(3)]
+
+    assert results == [True, True, False]
+    assert queue.depths() == {'pending': 0, 'delayed': 0, 'inflight': 0, 'dead': 1}
+    dead = json.loads(redis_client.lindex(queue.dead_key, 0))
+    assert dead['job_id'] == 'job-1' and dead['attempts'] == 3 and dead['last_error'] == 'error 2'
+
+
+def test_expired_task_of_dead_worker_is_reaped_by_another_worker(redis_client):
+    dead_worker = make_queue(redis_client, worker_id='worker-dead', visibility_timeout=0)
+    reaper = make_queue(redis_client, worker_id='worker-2')
+    enqueue(redis_client)
+    task = dead_worker.reserve(timeout=1)
+
+    assert reaper.reap_stalled() == []
+
+    assert redis_client.llen(dead_worker.processing_key) == 0
+    assert reaper.depths() == {'pending': 0, 'delayed': 1, 'inflight': 0, 'dead': 0}
+    redelivered = reaper.reserve(timeout=1)
+    assert redelivered.job_id == task.job_id and redelivered.attempts == 1
+    # 회수된 작업을 원래 워커가 뒤늦게 완료/실패 처리해도 다시 재시도되지 않는다
+    assert dead_worker.fail(task, 'late failure') is True
+    assert reaper.depths() == {'pending': 0, 'delayed': 0, 'inflight': 1, 'dead': 0}
+
+
+def test_reaping_expired_task_past_max_retries_returns_buried_payload(redis_client):
+    dead_worker = make_queue(redis_client, worker_id='worker-dead', visibility_timeout=0, max_retries=0)
+    enqueue(redis_client)
+    dead_worker.reserve(timeout=1)
+
+    buried = make_queue(redis_client, worker_id='worker-2', max_retries=0).reap_stalled()
+
+    assert [payload['job_id'] for payload in buried] == ['job-1']
+    assert dead_worker.depths() == {'pending': 0, 'delayed': 0, 'inflight': 0, 'dead': 1}
+
+
+def test_task_within_visibility_timeout_is_not_reaped(redis_client):
+    worker = make_queue(redis_client, visibility_timeout=60)
+    enqueue(redis_client)
+    task = worker.reserve(timeout=1)
+
+    assert make_queue(redis_client, worker_id='worker-2').reap_stalled() == []
+
+    worker.heartbeat(task)
+    assert redis_client.lrange(worker.processing_key, 0, -1) == [task.raw]
+    assert worker.depths()['inflight'] == 1
@@ -0,0 +1,136 @@
+import random
+import re
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from app.classifier.rule_matcher import RuleMatcher
+from app.classifier.transaction_frame import TransactionFrameBuilder
+
+ALPHABET = 'abcd '
+REGEXES = ['a.c', 'ab+', '^b', 'c$', 'b[ac]', '(ab|ca)', 'd\\s?a']
+START = date(2025, 1, 1)
+
+
+def random_range(rng: random.Random, span: int):
+    low, high = sorted(rng.randint(0, span) for _ in range(2))
+
+    return (None if rng.random() < 0.2 else low), (None if rng.random() < 0.2 else high)
+
+
+def random_rules(rng: random.Random, rule_count: int) -> dict:
+    categories = []
+    for i in range(rule_count):
+        conditions = {}
+        if rng.random() < 0.5:
+            conditions['include_keywords'] = [random_word(rng) for _ in range(rng.randint(1, 2))]
+        if rng.random() < 0.3:
+            conditions['exclude_keywords'] = [random_word(rng)]
+        if rng.random() < 0.3:
+            conditions['include_regex'] = [rng.choice(REGEXES)]
+        if rng.random() < 0.2:
+            conditions['exclude_regex'] = [rng.choice(REGEXES)]
+        if rng.random() < 0.5:
+            ranges = []
+            for _ in range(rng.randint(1, 3)):
+                low, high = random_range(rng, 300)
+                ranges.append({'field': rng.choice(['amount_in', 'amount_out']), 'min_amount': low, 'max_amount': high})
+            conditions['amount_range'] = ranges if len(ranges) > 1 or rng.random() < 0.5 else ranges[0]
+        if rng.random() < 0.3:
+            low, high = random_range(rng, 60)
+            conditions['date_range'] = {'from': None if low is None else str(START + timedelta(days=low)),
+                                        'to': None if high is None else str(START + timedelta(days=high))}
+
+        category = {'category_id': f"cat_{i}", 'keywords': [random_word(rng)] if rng.random() < 0.3 else [],
+                    'conditions': conditions}
+        if rng.random() < 0.7:
+            category['priority'] = rng.randint(1, 4)
+        categories.append(category)
+
+    return {'companies': [{'company_id': 'com_a', 'categories': categories[::2]},
+                          {'company_id': 'com_b', 'categories': categories[1::2]}]}
+
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choices(ALPHABET.strip(), k=rng.randint(1, 3)))
+
+
+def reference_match(rules: dict, description: str, amount_in: int, amount_out: int, day: date):
+    """
+    규칙마다 조건을 그대로 평가하는 기준 구현 (priority, 선언 순서로 처음 만족하는 규칙)
+    """
+    declared = [(company['company_id'], category) for company in rules['companies']
+                for category in company['categories']]
+    order = sorted(range(len(declared)), key=lambda i: (declared[i][1].get('priority') is None,
+                                                        declared[i][1].get('priority') or 0, i))
+    text = description.lower()
+    amounts = {'amount_in': amount_in, 'amount_out': amount_out}
+
+    for index in order:
+        company_id, category = declared[index]
+        conditions = category.get('conditions', {})
+        includes = category.get('keywords', []) + conditions.get('include_keywords', [])
+        include_regex = conditions.get('include_regex', [])
+
+        if (includes or include_regex) and not (any(keyword in text for keyword in includes)
+                                                or any(re.search(p, text, re.IGNORECASE) for p in include_regex)):
+            continue
+        if any(keyword in text for keyword in conditions.get('exclude_keywords', [])) \
+                or any(re.search(p, text, re.IGNORECASE) for p in conditions.get('exclude_regex', [])):
+            continue
+
+        ranges = conditions.get('amount_range') or []
+        ranges = ranges if isinstance(ranges, list) else [ranges]
+        fields = {amount_range['field'] for amount_range in ranges}
+        if not all(any(within(amounts[field], r['min_amount'], r['max_amount']) for r in ranges if r['field'] == field)
+                   for field in fields):
+            continue
+
+        date_range = conditions.get('date_range')
+        if date_range and not within(day, *(date.fromisoformat(value) if value else None
+                                            for value in (date_range['from'], date_range['to']))):
+            continue
+
+        return company_id, category['category_id']
+
+    return None, None
+
+
+def within(value, low, high) -> bool:
+    return (low is None or low <= value) and (high is None or value <= high)
+
+
+def test_overlapping_amount_ranges_of_one_rule_are_a_union():
+    matcher = RuleMatcher({'companies': [{'company_id': 'com_a', 'categories': [{
+        'category_id': 'cat_1',
+        'conditions': {'amount_range': [{'field': 'amount_out', 'min_amount': 0, 'max_amount': 100},
+                                         {'field': 'amount_out', 'min_amount': 50, 'max_amount': 200}]}
+    }]}]})
+
+    assert [matcher.match('x', amount_out=value) for value in (60, 150, 201)] == \
+           [('com_a', 'cat_1'), ('com_a', 'cat_1'), (None, None)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_rule_matcher_agrees_with_per_rule_evaluation(seed):
+    rng = random.Random(seed)
+    rules = random_rules(rng, rng.randint(1, 12))
+    matcher = RuleMatcher(rules)
+
+    rows = 400
+    descriptions = [''.join(rng.choices(ALPHABET, k=rng.randint(0, 10))) for _ in range(rows)]
+    amount_in = [rng.choice([0, rng.randint(0, 320)]) for _ in range(rows)]
+    amount_out = [rng.choice([0, rng.randint(0, 320)]) for _ in range(rows)]
+    days = [START + timedelta(days=rng.randint(-5, 65)) for _ in range(rows)]
+    expected = [reference_match(rules, *row) for row in zip(descriptions, amount_in, amount_out, days)]
+
+    assert [matcher.match(*row) for row in zip(descriptions, amount_in, amount_out, days)] == expected
+
+    # 청크 경로 (고유 적요 마스크 + 구간 조합별 판정)
+    company_ids, category_ids = TransactionFrameBuilder(matcher).classify(
+        pd.Series(descriptions), pd.Series(amount_in), pd.Series(amount_out),
+        pd.Series(pd.to_datetime(days))
+    )
+    assert list(zip(company_ids, category_ids)) == expected
+    assert any(company_id is not None for company_id in company_ids)
@@ -0,0 +1,165 @@
+import copy
+import itertools
+import random
+
+import pytest
+
+from app.classifier.rules_diff import diff_rules
+
+
+def category(category_id, keywords=(), **conditions):
+    return {'category_id': category_id, 'keywords': list(keywords), 'conditions': conditions}
+
+
+def rules(*categories, company_id='com_1'):
+    return {'companies': [{'company_id': company_id, 'categories': list(categories)}]}
+
+
+BASE = rules(
+    category('cat_1', ['쿠팡']),
+    category('cat_2', ['네이버페이']),
+    category('cat_3', ['스타벅스'], include_keywords=['커피']),
+    category('cat_4', ['배달의민족']),
+)
+
+
+def test_identical_rules_have_empty_diff():
+    diff = diff_rules(BASE, copy.deepcopy(BASE))
+
+    assert diff.empty and diff.keywords == set() and not diff.full_scan
+
+
+def test_keyword_case_and_order_do_not_change_signature():
+    old_rules = copy.deepcopy(BASE)
+    old_rules['companies'][0]['categories'][2]['keywords'] = ['스타벅스', 'starbucks']
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'][0]['categories'][2]['keywords'] = ['STARBUCKS', '스타벅스']
+
+    assert diff_rules(old_rules, new_rules).empty
+
+
+def test_changed_keywords_include_old_and_new_keywords():
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'][0]['categories'][1]['keywords'] = ['Naver Pay']
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert diff.changed_categories == {('com_1', 'cat_2')}
+    assert diff.keywords == {'네이버페이', 'naver pay'} and not diff.full_scan
+
+
+def test_changed_exclude_condition_uses_include_keywords():
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'][0]['categories'][2]['conditions']['exclude_keywords'] = ['환불']
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert diff.changed_categories == {('com_1', 'cat_3')}
+    assert diff.keywords == {'스타벅스', '커피'}
+
+
+def test_added_and_removed_categories_are_changed():
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'][0]['categories'][3] = category('cat_5', ['토스'])
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert diff.changed_categories == {('com_1', 'cat_4'), ('com_1', 'cat_5')}
+    assert diff.keywords == {'배달의민족', '토스'}
+
+
+def test_same_relative_order_with_new_priorities_is_not_a_change():
+    new_rules = copy.deepcopy(BASE)
+    for priority, rule in enumerate(new_rules['companies'][0]['categories'], start=1):
+        rule['priority'] = priority * 10
+
+    assert diff_rules(BASE, new_rules).empty
+
+
+def test_moving_one_category_marks_only_that_category():
+    new_rules = copy.deepcopy(BASE)
+    # cat_4 를 맨 앞으로: 나머지의 상대 순서는 그대로
+    new_rules['companies'][0]['categories'][3]['priority'] = 1
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert diff.changed_categories == {('com_1', 'cat_4')}
+    assert diff.keywords == {'배달의민족'}
+
+
+def test_swapping_two_categories_marks_one_of_them():
+    new_rules = copy.deepcopy(BASE)
+    categories = new_rules['companies'][0]['categories']
+    categories[1], categories[2] = categories[2], categories[1]
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert len(diff.changed_categories) == 1
+    assert diff.changed_categories <= {('com_1', 'cat_2'), ('com_1', 'cat_3')}
+
+
+def test_reversed_order_keeps_one_category():
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'][0]['categories'].reverse()
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert len(diff.changed_categories) == 3
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_moved_categories_are_a_minimal_set(seed):
+    rng = random.Random(seed)
+    old_rules = rules(*(category(f"cat_{i}", [f"kw{i}"]) for i in range(rng.randint(1, 7))))
+    new_rules = copy.deepcopy(old_rules)
+    rng.shuffle(new_rules['companies'][0]['categories'])
+    new_order = [rule['category_id'] for rule in new_rules['companies'][0]['categories']]
+
+    moved = {category_id for _, category_id in diff_rules(old_rules, new_rules).changed_categories}
+
+    # 남은 카테고리는 이전 순서 그대로이고, 그보다 적게 옮겨서 순서를 맞출 수 있는 방법은 없다
+    kept = [category_id for category_id in new_order if category_id not in moved]
+    assert kept == sorted(kept, key=lambda category_id: int(category_id[4:]))
+    assert not any(list(subset) == sorted(subset, key=lambda category_id: int(category_id[4:]))
+                   for subset in itertools.combinations(new_order, len(kept) + 1))
+
+
+@pytest.mark.parametrize('changed_rule', [
+    category('cat_2', ['네이버페이'], include_regex=['^NAVER\\s']),
+    category('cat_2', [], amount_range={'field': 'amount_in', 'min_amount': 0, 'max_amount': 1000}),
+])
+def test_regex_or_keywordless_category_requires_full_scan(changed_rule):
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'][0]['categories'][1] = changed_rule
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert diff.changed_categories == {('com_1', 'cat_2')} and diff.full_scan
+
+
+def test_removed_keywordless_category_requires_full_scan():
+    old_rules = copy.deepcopy(BASE)
+    old_rules['companies'][0]['categories'].append(category('cat_9', [], amount_range={'field': 'amount_out'}))
+
+    assert diff_rules(old_rules, BASE).full_scan
+
+
+def test_unchanged_regex_category_does_not_require_full_scan():
+    old_rules = copy.deepcopy(BASE)
+    old_rules['companies'][0]['categories'].append(category('cat_9', include_regex=['\\d{4}']))
+    new_rules = copy.deepcopy(old_rules)
+    new_rules['companies'][0]['categories'][0]['keywords'] = ['쿠팡', '쿠팡이츠']
+
+    diff = diff_rules(old_rules, new_rules)
+
+    assert diff.changed_categories == {('com_1', 'cat_1')} and not diff.full_scan
+
+
+def test_duplicate_category_declaration_requires_full_scan():
+    new_rules = copy.deepcopy(BASE)
+    new_rules['companies'].append(
+        {'company_id': 'com_1', 'categories': [category('cat_1', ['쿠팡'])]})
+
+    diff = diff_rules(BASE, new_rules)
+
+    assert diff.full_scan and not diff.empty
@@ -0,0 +1,43 @@
+"""
+rules_hash 는 API 가 rules_sets 에 저장할 때와 프로세서가 컴파일 캐시 키를 만들 때 따로 계산하므로
+accounting-api 의 tests/test_rules_hash.py 와 같은 규칙 파일/해시로 두 구현을 고정한다
+"""
+import json
+
+from app.classifier.matcher_cache import hash_rules
+
+# 키 순서가 뒤섞이고 한글/정규식/소수가 들어간 규칙 파일
+RULES_FILE = '''
+{
+  "version": 2,
+  "companies": [
+    {
+      "company_name": "쿠팡 주식회사",
+      "company_id": "com_1",
+      "categories": [
+        {
+          "keywords": ["쿠팡", "Coupang"],
+          "category_name": "온라인 쇼핑",
+          "category_id": "cat_101",
+          "conditions": {
+            "amount_range": {"max_amount": 100000.5, "field": "amount_out", "min_amount": 0},
+            "include_regex": ["^쿠팡\\\\s\\\\d+"]
+          }
+        }
+      ]
+    }
+  ]
+}
+'''
+RULES_HASH = 'acf9cdbc796d65bec904fe91dd87c5940fcb3b6103e8f869587b846c56418016'
+
+
+def test_rules_hash_is_pinned():
+    assert hash_rules(json.loads(RULES_FILE)) == RULES_HASH
+
+
+def test_rules_hash_ignores_key_order_and_whitespace():
+    rules = json.loads(RULES_FILE)
+    reordered = json.loads(json.dumps(dict(reversed(list(rules.items()))), indent=4))
+
+    assert hash_rules(reordered) == RULES_HASH
@@ -0,0 +1,92 @@
+import csv
+import random
+
+import pandas as pd
+import pytest
+
+from app.reader.rejects_report import RejectsReport, REJECT_INVALID_DATE
+from app.reader.transaction_csv_reader import TransactionCsvReader, ENGINE_PANDAS, ENGINE_PYARROW, count_row_ends
+
+ROWS = 5000
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = random.Random(7)
+    descriptions = []
+    for i in range(ROWS):
+        description = f"거래 {i}"
+        if rng.random() < 0.05:
+            description += "\n둘째 줄"
+        if rng.random() < 0.05:
+            description += ' "인용" 포함'
+        descriptions.append(description)
+
+    frame = pd.DataFrame({
+        '거래일시': [f"2025-07-{i % 28 + 1:02d} 12:00:00" for i in range(ROWS)],
+        '적요': descriptions,
+        '입금액': [i for i in range(ROWS)],
+        '출금액': [0] * ROWS,
+        '거래후잔액': [i * 10 for i in range(ROWS)],
+        '거래점': ['온라인'] * ROWS,
+    })
+    path = tmp_path / 'bank_transactions.csv'
+    frame.to_csv(path, index=False)
+
+    return str(path), descriptions
+
+
+def test_count_row_ends_ignores_quoted_newlines():
+    assert count_row_ends(b'a,"x\ny",1\nb,"z",2\n') == (2, False)
+    # 블록이 따옴표 필드 안에서 끝나면 다음 블록은 따옴표 안에서 시작
+    assert count_row_ends(b'a,"x\n') == (0, True)
+    assert count_row_ends(b'y",1\n', quoted=True) == (1, False)
+    assert count_row_ends(b'a,"x ""y""\nz",1\n') == (1, False)
+
+
+def test_count_rows_counts_records_not_lines(csv_path):
+    path, _ = csv_path
+
+    assert TransactionCsvReader(path).count_rows() == ROWS
+
+
+@pytest.mark.parametrize('engine', [ENGINE_PANDAS, ENGINE_PYARROW])
+@pytest.mark.parametrize('shards', [1, 3, 8])
+def test_shards_and_blocks_split_on_record_boundaries(csv_path, engine, shards):
+    path, descriptions = csv_path
+    reader = TransactionCsvReader(path, memory_limit_bytes=64 * 1024, engine=engine)
+
+    ranges = reader.split_byte_ranges(shards)
+    chunks = [chunk for byte_range in ranges for _, chunk in reader.read_blocks(byte_range)]
+
+    assert len(chunks) > 1
+    assert ranges[0][0] == reader.data_range()[0] and ranges[-1][1] == reader.file_size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert pd.concat(chunks)['적요'].tolist() == descriptions
+
+
+@pytest.mark.parametrize('engine', [ENGINE_PANDAS, ENGINE_PYARROW])
+def test_unparseable_dates_are_rejected_not_replaced(tmp_path, engine):
+    path = tmp_path / 'bank_transactions.csv'
+    path.write_text('거래일시,적요,입금액,출금액,거래후잔액\n'
+                    '2025-07-01 10:00:00,정상,1000,0,1000\n'
+                    '2025.07.02 11:00,점 구분,1000,0,2000\n'
+                    '2025-13-45 25:00:00,날짜 오류,2000,0,4000\n'
+                    '2025/07/03,날짜만,1000,0,5000\n'
+                    ',날짜 없음,3000,0,8000\n', encoding='utf-8')
+    rejects = RejectsReport(str(path), 0, rejects_dir=str(tmp_path))
+    reader = TransactionCsvReader(str(path), engine=engine)
+
+    chunks = [chunk for _, chunk in reader.read_blocks(rejects=rejects)]
+    rejects.flush(reader.file_size)
+
+    frame = pd.concat(chunks)
+    # 블록의 첫 값과 형식이 다른 행도 값마다 변환된다
+    assert frame['적요'].tolist() == ['정상', '점 구분', '날짜만']
+    assert frame['거래일시'].tolist() == [pd.Timestamp('2025-07-01 10:00:00'), pd.Timestamp('2025-07-02 11:00'),
+                                      pd.Timestamp('2025-07-03')]
+    assert rejects.count == 2
+    with open(rejects.path, encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['reason'] for row in rows] == [REJECT_INVALID_DATE] * 2
+    assert rows[0]['row'].startswith('2025-13-45 25:00:00,날짜 오류')
@@ -0,0 +1,203 @@
+"""
+transactions 조회의 실행 계획 회귀 테스트: 시드 데이터를 적재한 뒤 EXPLAIN 으로 검사
+
+POSTGRES_* 환경 변수가 가리키는 DB 에 먼 미래 월의 임시 작업/파티션을 만들고 끝나면 삭제한다
+DB 가 없으면(POSTGRES_DATABASE 미설정 또는 연결 실패) 건너뛰고, 인덱스가 없는 검사(pg_trgm 미설치, 004 미적용)도 건너뛴다
+"""
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from app.classifier.transaction_frame import TRANSACTION_COLUMNS
+from app.database.postgres_db import get_connection, get_cursor
+from app.repository.impl.postgres_transaction_partition_repository import PostgresTransactionPartitionRepository
+from app.repository.impl.postgres_transaction_repository import PostgresTransactionRepository
+
+SEED_ROWS = int(os.getenv("PLAN_TEST_ROWS", 100_000))
+# 운영 데이터와 섞이지 않는 먼 미래의 월에 시드
+SEED_START = pd.Timestamp('2091-01-01')
+SEED_MONTHS = 6
+# 시드 적요는 '쿠팡 정산 {i % 500}' 이고, 분류된 행 5000 개마다 하나만 이 적요로 바꾼다
+RARE_DESCRIPTION = '네이버페이 환불'
+
+COVERING_INDEX = 'idx_transactions_company_date'
+TRGM_INDEX = 'idx_transactions_description_trgm'
+BIGRAM_INDEX = 'idx_transactions_description_bigram'
+
+# accounting-api PostgresCompanyRecordRepository.find_company_records 와 같은 조회
+RECORDS_SQL = """
+    SELECT t.transaction_id, t.transaction_date, t.category_id, t.created_at, t.company_id,
+           companies.company_name, categories.category_name
+    FROM transactions t
+    JOIN categories ON t.category_id = categories.category_id
+    JOIN companies ON t.company_id = companies.company_id
+    WHERE t.company_id = %(company_id)s
+      AND t.deleted_at IS NULL
+      AND t.transaction_date >= %(date_from)s
+      AND t.transaction_date < %(date_to)s
+    ORDER BY t.transaction_date DESC, t.transaction_id DESC
+    LIMIT 101
+"""
+
+# accounting-api PostgresTransactionSearchRepository.search 와 같은 조회 (2자 검색어면 바이그램 조건이 붙는다)
+SEARCH_SQL = """
+    SELECT t.transaction_id, t.transaction_date, t.category_id, t.created_at, t.company_id, t.description,
+           coalesce(t.amount_in, 0) AS amount_in, coalesce(t.amount_out, 0) AS amount_out, t.transaction_location,
+           companies.company_name, categories.category_name
+    FROM transactions t
+    JOIN categories ON t.category_id = categories.category_id
+    JOIN companies ON t.company_id = companies.company_id
+    WHERE t.company_id = %(company_id)s
+      AND t.deleted_at IS NULL
+      AND lower(t.description) LIKE %(pattern)s
+      {bigram}
+    ORDER BY t.transaction_date DESC, t.transaction_id DESC
+    LIMIT 51
+"""
+
+
+@pytest.fixture(scope='module')
+def job_id(database):
+    job_id = str(uuid.uuid4())
+    with get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO processing_jobs (job_id, status, csv_file_path, rules_data, created_at)
+            VALUES (%s, 'processing', 'plan_test', %s, %s)
+        """, (job_id, json.dumps({"companies": []}), datetime.now()))
+
+    created = []
+    try:
+        created = seed(job_id, SEED_ROWS)
+        yield job_id
+    finally:
+        with get_cursor() as cursor:
+            cursor.execute("DELETE FROM transactions WHERE job_id = %s", (job_id,))
+            cursor.execute("DELETE FROM processing_jobs WHERE job_id = %s", (job_id,))
+            for month in created:
+                cursor.execute(f"DROP TABLE IF EXISTS transactions_{month:%Y_%m}")
+
+
+def seed(job_id: str, rows: int) -> list:
+    frame = pd.DataFrame({
+        'job_id': job_id,
+        'company_id': ['com_1' if i % 3 else None for i in range(rows)],
+        'category_id': ['cat_101' if i % 3 else None for i in range(rows)],
+        'transaction_date': SEED_START + pd.Series(range(rows)) * (pd.Timedelta(days=30 * SEED_MONTHS) / rows),
+        'description': [f"쿠팡 정산 {i % 500}" for i in range(rows)],
+        'amount_in': pd.array([(i % 10) * 1000 for i in range(rows)], dtype='Int64'),
+        'amount_out': pd.array([0] * rows, dtype='Int64'),
+        'balance_after': pd.array(range(rows), dtype='Int64'),
+        'transaction_location': '온라인',
+        'created_at': datetime.now(),
+    })[TRANSACTION_COLUMNS]
+    frame.loc[(frame.index % 5000 == 1) & frame['company_id'].notna(), 'description'] = RARE_DESCRIPTION
+
+    months = frame['transaction_date'].dt.to_period('M').dt.start_time.dt.date.unique()
+    created = PostgresTransactionPartitionRepository().ensure_months(months)
+    PostgresTransactionRepository().save_many(frame)
+
+    # index-only scan 이 힙을 확인하지 않도록 가시성 맵 갱신 (VACUUM 은 트랜잭션 밖에서 실행)
+    with get_connection() as connection:
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM ANALYZE transactions")
+        finally:
+            connection.autocommit = False
+
+    return created
+
+
+def explain(sql: str, params) -> dict:
+    with get_cursor() as cursor:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+        return cursor.fetchone()['QUERY PLAN'][0]['Plan']
+
+
+def require_index(name: str):
+    with get_cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS found", (name,))
+        if not cursor.fetchone()['found']:
+            pytest.skip(f"{name} 없음")
+
+
+def partition_indexes(name: str) -> set:
+    """
+    파티션 테이블 인덱스와 각 파티션에 만들어진 하위 인덱스 이름
+    """
+    with get_cursor() as cursor:
+        cursor.execute("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+        """, (name,))
+        return {row['relname'] for row in cursor.fetchall()} | {name}
+
+
+def transaction_scans(plan: dict) -> Iterator[dict]:
+    if plan.get('Relation Name', '').startswith('transactions'):
+        yield plan
+    for child in plan.get('Plans', []):
+        yield from transaction_scans(child)
+
+
+def used_indexes(plan: dict) -> set:
+    # Bitmap Index Scan 노드에는 Relation Name 이 없으므로 인덱스 이름으로 모은다
+    names = {plan['Index Name']} if 'Index Name' in plan else set()
+    for child in plan.get('Plans', []):
+        names |= used_indexes(child)
+
+    return names
+
+
+def month(offset: int, days: int = 0) -> pd.Timestamp:
+    return SEED_START + pd.DateOffset(months=offset, days=days)
+
+
+@pytest.mark.parametrize('date_from, date_to, partitions', [
+    (month(1), month(2), [month(1)]),
+    (month(2, days=10), month(3, days=10), [month(2), month(3)]),
+], ids=['one month', 'two months'])
+def test_records_read_only_requested_partitions_with_index_only_scan(job_id, date_from, date_to, partitions):
+    plan = explain(RECORDS_SQL, {'company_id': 'com_1', 'date_from': date_from, 'date_to': date_to})
+    scans = list(transaction_scans(plan))
+
+    assert sorted({scan['Relation Name'] for scan in scans}) == [f"transactions_{p:%Y_%m}" for p in partitions]
+    assert {scan['Node Type'] for scan in scans} == {'Index Only Scan'}
+    assert {scan['Index Name'] for scan in scans} <= partition_indexes(COVERING_INDEX)
+    assert sum(scan.get('Heap Fetches', 0) for scan in scans) == 0
+
+
+@pytest.mark.parametrize('keywords, uses_trgm', [
+    (['정산 417'], True),
+    # 3자 미만 키워드가 섞이면 트라이그램을 만들 수 없어 대상 작업의 행을 모두 읽는다 (의도한 fallback)
+    (['정산 417', '17'], False),
+], ids=['long keyword', 'short keyword'])
+def test_reclassify_candidates_use_trigram_index_only_for_long_keywords(job_id, keywords, uses_trgm):
+    require_index(TRGM_INDEX)
+    # PostgresTransactionRepository.find_reclassify_candidates 와 같은 조회
+    sql = PostgresTransactionRepository.RECLASSIFY_CANDIDATES_SQL + " AND lower(description) LIKE ANY(%s)"
+
+    plan = explain(sql, ([job_id], [f"%{keyword}%" for keyword in keywords]))
+
+    assert bool(used_indexes(plan) & partition_indexes(TRGM_INDEX)) == uses_trgm
+
+
+@pytest.mark.parametrize('keyword, index', [
+    ('환불', BIGRAM_INDEX),
+    ('네이버페이', TRGM_INDEX),
+], ids=['2-char term', '3+ char term'])
+def test_rare_search_terms_use_description_index(job_id, keyword, index):
+    require_index(index)
+    bigram = "AND description_bigrams(lower(t.description)) @> ARRAY[%(keyword)s]" if len(keyword) == 2 else ""
+
+    plan = explain(SEARCH_SQL.format(bigram=bigram),
+                   {'company_id': 'com_1', 'pattern': f"%{keyword}%", 'keyword': keyword})
+
+    assert used_indexes(plan) & partition_indexes(index)
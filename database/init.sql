@@ -1,6 +1,8 @@
 -- PostgreSQL 초기화 스크립트
 -- UUID 확장 설치 (processing_jobs 테이블에서 사용)
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- 트라이그램 인덱스 (적요 부분 일치 검색)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- 1. 회사 (companies) 테이블
 CREATE TABLE companies
@@ -36,14 +38,28 @@ CREATE INDEX idx_categories_company_id ON categories (company_id)
 CREATE UNIQUE INDEX idx_categories_company_name ON categories (company_id, category_name)
     WHERE deleted_at IS NULL;
 
--- 3. 분류 작업 (processing_jobs) 테이블
+-- 3. 분류 규칙 (rules_sets) 테이블: 내용 해시(sha256)로 중복 없이 한 번만 저장
+CREATE TABLE rules_sets
+(
+    rules_hash CHAR(64) PRIMARY KEY,
+    rules_data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 4. 분류 작업 (processing_jobs) 테이블
 CREATE TABLE processing_jobs
 (
     job_id         UUID PRIMARY KEY     DEFAULT uuid_generate_v4(),
     status         VARCHAR(20) NOT NULL DEFAULT 'pending'
         CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
+    job_type       VARCHAR(20) NOT NULL DEFAULT 'process'
+        CHECK (job_type IN ('process', 'reclassify')),
     csv_file_path  VARCHAR(500),
-    rules_data     JSONB,
+    content_hash   CHAR(64), -- 압축 해제한 CSV 내용의 sha256 (중복 업로드 확인용)
+    rules_hash     CHAR(64) REFERENCES rules_sets (rules_hash),
+    base_rules_hash CHAR(64) REFERENCES rules_sets (rules_hash), -- 재분류 작업: 대상 거래 내역을 분류했던 이전 규칙
+    source_job_id  UUID REFERENCES processing_jobs (job_id), -- 재분류 작업: 대상 업로드 작업 (NULL 이면 같은 규칙의 모든 작업)
+    rules_data     JSONB, -- rules_hash 도입 이전 작업 호환용
     total_rows     INTEGER              DEFAULT 0,
     processed_rows INTEGER              DEFAULT 0,
     error_message  TEXT,
@@ -57,14 +73,33 @@ CREATE TABLE processing_jobs
 CREATE INDEX idx_processing_jobs_status ON processing_jobs (status)
     WHERE deleted_at IS NULL;
 
+-- 중복 업로드 조회 (삭제되지 않은 것만)
+CREATE INDEX idx_processing_jobs_content_hash ON processing_jobs (content_hash, rules_hash)
+    WHERE deleted_at IS NULL;
+
 -- 최근 작업 조회 최적화 (삭제되지 않은 것만)
 CREATE INDEX idx_processing_jobs_created_at ON processing_jobs (created_at DESC)
     WHERE deleted_at IS NULL;
 
--- 4. 거래 내역 (transactions) 테이블
+-- 5. 작업 체크포인트 (processing_job_checkpoints) 테이블
+-- 샤드(바이트 구간)별로 마지막으로 커밋된 블록의 끝 오프셋을 거래 내역 적재와 같은 트랜잭션으로 기록
+CREATE TABLE processing_job_checkpoints
+(
+    job_id           UUID    NOT NULL REFERENCES processing_jobs (job_id) ON DELETE CASCADE,
+    shard_no         INTEGER NOT NULL,
+    range_start      BIGINT  NOT NULL,
+    range_end        BIGINT  NOT NULL,
+    committed_offset BIGINT  NOT NULL,
+    committed_rows   INTEGER NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMP        DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, shard_no)
+);
+
+-- 6. 거래 내역 (transactions) 테이블: 거래일시 기준 월별 범위 파티션
+-- 파티션 테이블의 유니크 키는 파티션 키를 포함해야 하므로 기본 키는 (transaction_id, transaction_date)
 CREATE TABLE transactions
 (
-    transaction_id       BIGSERIAL PRIMARY KEY,
+    transaction_id       BIGSERIAL,
     job_id               UUID        NOT NULL REFERENCES processing_jobs (job_id) ON DELETE CASCADE,
     company_id           VARCHAR(50) REFERENCES companies (company_id) ON DELETE SET NULL,
     category_id          VARCHAR(50) REFERENCES categories (category_id) ON DELETE SET NULL,
@@ -74,9 +109,14 @@ CREATE TABLE transactions
     amount_out           INTEGER   DEFAULT 0,
     balance_after        INTEGER     NOT NULL,
     transaction_location VARCHAR(200),
+    row_fingerprint      UUID,
     created_at           TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    deleted_at           TIMESTAMP DEFAULT NULL
-);
+    deleted_at           TIMESTAMP DEFAULT NULL,
+    PRIMARY KEY (transaction_id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+-- 월 파티션이 아직 없는 거래일시의 행이 들어가는 파티션 (create_transaction_partition 이 해당 월로 옮김)
+CREATE TABLE transactions_default PARTITION OF transactions DEFAULT;
 
 -- 성능 최적화 인덱스 (삭제되지 않은 것만)
 CREATE INDEX idx_transactions_company_id ON transactions (company_id)
@@ -88,11 +128,101 @@ CREATE INDEX idx_transactions_job_id ON transactions (job_id)
 CREATE INDEX idx_transactions_date ON transactions (transaction_date)
     WHERE deleted_at IS NULL;
 
+-- 커버링 인덱스: 회사별 거래 내역 키셋 페이지네이션 (transaction_date, transaction_id) DESC
+-- 조회 컬럼(category_id, created_at)을 INCLUDE 해 힙을 읽지 않는 index-only scan 으로 처리
+CREATE INDEX idx_transactions_company_date ON transactions (company_id, transaction_date DESC, transaction_id DESC)
+    INCLUDE (category_id, created_at)
+    WHERE deleted_at IS NULL;
+
 -- 복합 인덱스: 회사별 분류된 거래 조회 (삭제되지 않은 것만)
 CREATE INDEX idx_transactions_company_category ON transactions (company_id, category_id)
     WHERE deleted_at IS NULL;
 
--- 테이블 생성 확인
+-- 트라이그램 인덱스: 규칙 변경 시 바뀐 키워드를 포함하는 적요만 찾아 재분류 (lower(description) LIKE '%키워드%')
+CREATE INDEX idx_transactions_description_trgm ON transactions USING gin (lower(description) gin_trgm_ops)
+    WHERE deleted_at IS NULL;
+
+-- 적요의 2자 조각 배열: 트라이그램을 만들 수 없는 2자 검색어(예: '쿠팡')용 인덱스
+CREATE OR REPLACE FUNCTION description_bigrams(value TEXT) RETURNS TEXT[]
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+AS $$
+    SELECT coalesce(array_agg(DISTINCT substr(value, i, 2)), '{}')
+    FROM generate_series(1, length(value) - 1) AS i
+$$;
+
+CREATE INDEX idx_transactions_description_bigram ON transactions USING gin (description_bigrams(lower(description)))
+    WHERE deleted_at IS NULL;
+
+-- 멱등 적재: 같은 행 지문(거래일시, 적요, 금액, 잔액)의 거래는 한 번만 저장 (지문이 없는 행은 제외)
+CREATE UNIQUE INDEX idx_transactions_fingerprint ON transactions (row_fingerprint, transaction_date)
+    WHERE deleted_at IS NULL;
+
+-- 월 파티션 생성: 기본 파티션에 들어가 있던 해당 월의 행을 옮긴 뒤 연결. 이미 있으면 false
+-- 부모 테이블을 ACCESS EXCLUSIVE 로 잠그는 CREATE TABLE ... PARTITION OF 대신 별도 테이블을 만들어 ATTACH 하므로
+-- 적재/조회를 막지 않는다 (CHECK 제약으로 ATTACH 시 새 파티션 검증 스캔 생략)
+-- 단, ATTACH 는 기본 파티션을 ACCESS EXCLUSIVE 로 잠근 채 전체를 스캔해 새 범위의 행이 없는지 확인한다.
+-- 기본 파티션에 CHECK 제약을 미리 거는 것도 같은 잠금으로 스캔하므로(NOT VALID 후 VALIDATE 는 트랜잭션을 나눠야 하고
+-- 그 사이 해당 월 적재가 제약 위반으로 실패) 대신 기본 파티션을 비워 두는 것으로 스캔 비용을 작게 유지한다:
+-- 프로세서는 적재 전에 월 파티션을 만들고, maintain_partitions 가 남은 행을 옮기며 크기가 커지면 경고한다
+CREATE OR REPLACE FUNCTION create_transaction_partition(p_month DATE) RETURNS BOOLEAN
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    v_from DATE := date_trunc('month', p_month)::date;
+    v_to   DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    v_name TEXT := 'transactions_' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    -- 여러 워커/샤드가 같은 월을 동시에 만들지 않도록 직렬화
+    PERFORM pg_advisory_xact_lock(hashtext('create_transaction_partition'));
+
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS)', v_name);
+    EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I CHECK (transaction_date >= %L AND transaction_date < %L)',
+                   v_name, v_name || '_range', v_from, v_to);
+    EXECUTE format('WITH moved AS (DELETE FROM transactions_default
+                                   WHERE transaction_date >= %L AND transaction_date < %L RETURNING *)
+                    INSERT INTO %I SELECT * FROM moved', v_from, v_to, v_name);
+    EXECUTE format('ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   v_name, v_from, v_to);
+
+    RETURN TRUE;
+END;
+$$;
+
+-- 7. 거래 집계 (transaction_summaries) 테이블: 회사/카테고리/월 별 건수와 입출금 합계
+-- 프로세서가 커밋하는 청크마다 증분 반영하며, 재계산은 python -m app.rebuild_summaries
+CREATE TABLE transaction_summaries
+(
+    company_id        VARCHAR(50) NOT NULL REFERENCES companies (company_id) ON DELETE CASCADE,
+    category_id       VARCHAR(50) NOT NULL REFERENCES categories (category_id) ON DELETE CASCADE,
+    month             DATE        NOT NULL,
+    transaction_count BIGINT      NOT NULL DEFAULT 0,
+    amount_in         BIGINT      NOT NULL DEFAULT 0,
+    amount_out        BIGINT      NOT NULL DEFAULT 0,
+    updated_at        TIMESTAMP            DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (company_id, category_id, month)
+);
+
+-- 회사별 월 범위 조회
+CREATE INDEX idx_transaction_summaries_company_month ON transaction_summaries (company_id, month);
+
+-- 8. 테넌트 샤드 체크포인트 (tenant_shard_checkpoints) 테이블
+-- POSTGRES_TENANT_SHARDS 로 거래 내역을 여러 DB 에 나눠 담을 때, 각 샤드 DB 에 구간(shard_no)별로 커밋한 오프셋을
+-- 거래 내역 적재와 같은 트랜잭션으로 기록 (processing_jobs 는 기본 DB 에만 있으므로 외래 키 없음)
+CREATE TABLE tenant_shard_checkpoints
+(
+    job_id           UUID    NOT NULL,
+    shard_no         INTEGER NOT NULL,
+    committed_offset BIGINT  NOT NULL,
+    committed_rows   INTEGER NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMP        DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, shard_no)
+);
+
+
 SELECT tablename,
        (SELECT COUNT(*) FROM companies)  as companies_count,
        (SELECT COUNT(*) FROM categories) as categories_count
@@ -0,0 +1,21 @@
+-- 분류 규칙을 내용 해시(sha256)로 한 번만 저장하는 rules_sets 와 processing_jobs.rules_hash 추가
+-- 최초 init.sql(rules_sets 이전)로 만들어진 DB 에 000_* 를 번호 순서대로 적용한 뒤 001 부터 적용
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/000_1_rules_sets.sql
+--
+-- 기존 작업은 rules_hash 가 NULL 로 남고 rules_data 로 규칙을 읽는다 (해시는 애플리케이션의 정규화 JSON 기준이라
+-- SQL 로 채우지 않는다)
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS rules_sets
+(
+    rules_hash CHAR(64) PRIMARY KEY,
+    rules_data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE processing_jobs
+    ADD COLUMN IF NOT EXISTS rules_hash CHAR(64) REFERENCES rules_sets (rules_hash);
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- 멱등 적재(TRANSACTION_IDEMPOTENT=true)용 transactions.row_fingerprint 와 지문 유니크 인덱스 추가
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/000_2_row_fingerprint.sql
+--
+-- 컬럼 추가는 기본값이 없어 테이블을 다시 쓰지 않지만, 인덱스를 만드는 동안 transactions 쓰기는 대기한다
+-- 기존 행은 지문이 NULL 이라 중복 제외 대상이 아니다
+
+BEGIN;
+
+ALTER TABLE transactions
+    ADD COLUMN IF NOT EXISTS row_fingerprint UUID;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_fingerprint ON transactions (row_fingerprint, transaction_date)
+    WHERE deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- 중복 업로드 확인용 processing_jobs.content_hash 와 (content_hash, rules_hash) 인덱스 추가
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/000_3_upload_content_hash.sql
+
+BEGIN;
+
+ALTER TABLE processing_jobs
+    ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+CREATE INDEX IF NOT EXISTS idx_processing_jobs_content_hash ON processing_jobs (content_hash, rules_hash)
+    WHERE deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- 샤드(바이트 구간)별 커밋 오프셋을 기록하는 processing_job_checkpoints 추가
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/000_4_job_checkpoints.sql
+--
+-- 적용 전에 실패한 작업은 체크포인트가 없으므로 재시도하면 처음부터 다시 적재한다
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS processing_job_checkpoints
+(
+    job_id           UUID    NOT NULL REFERENCES processing_jobs (job_id) ON DELETE CASCADE,
+    shard_no         INTEGER NOT NULL,
+    range_start      BIGINT  NOT NULL,
+    range_end        BIGINT  NOT NULL,
+    committed_offset BIGINT  NOT NULL,
+    committed_rows   INTEGER NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMP        DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, shard_no)
+);
+
+COMMIT;
@@ -0,0 +1,35 @@
+-- 회사/카테고리/월 집계 transaction_summaries 추가 후 기존 거래 내역으로 채움
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/000_5_transaction_summaries.sql
+--
+-- 집계하는 동안 transactions 쓰기를 막아 적재 중인 작업의 증분이 빠지거나 두 번 반영되지 않도록 한다
+-- (이후 재계산은 python -m app.rebuild_summaries)
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS transaction_summaries
+(
+    company_id        VARCHAR(50) NOT NULL REFERENCES companies (company_id) ON DELETE CASCADE,
+    category_id       VARCHAR(50) NOT NULL REFERENCES categories (category_id) ON DELETE CASCADE,
+    month             DATE        NOT NULL,
+    transaction_count BIGINT      NOT NULL DEFAULT 0,
+    amount_in         BIGINT      NOT NULL DEFAULT 0,
+    amount_out        BIGINT      NOT NULL DEFAULT 0,
+    updated_at        TIMESTAMP            DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (company_id, category_id, month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_transaction_summaries_company_month ON transaction_summaries (company_id, month);
+
+LOCK TABLE transactions IN SHARE MODE;
+
+-- PostgresTransactionSummaryRepository.rebuild 와 같은 집계
+DELETE FROM transaction_summaries;
+INSERT INTO transaction_summaries (company_id, category_id, month, transaction_count, amount_in, amount_out)
+SELECT company_id, category_id, date_trunc('month', transaction_date)::date AS month,
+       count(*), coalesce(sum(amount_in), 0), coalesce(sum(amount_out), 0)
+FROM transactions
+WHERE company_id IS NOT NULL AND deleted_at IS NULL
+GROUP BY 1, 2, 3;
+
+COMMIT;
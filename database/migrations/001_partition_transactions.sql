@@ -0,0 +1,111 @@
+-- transactions 를 거래일시 기준 월별 범위 파티션 테이블로 전환
+-- 단일 테이블 transactions 로 만들어진 기존 DB 에 한 번 적용 (새로 만드는 DB 는 init.sql 이 이미 파티션 테이블로 생성)
+-- 최초 init.sql 로 만든 DB 는 먼저 000_* 마이그레이션(규칙 해시, 행 지문, 업로드 해시, 체크포인트, 집계)을 적용
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/001_partition_transactions.sql
+--
+-- 전체를 하나의 트랜잭션으로 실행하며, 행을 복사하는 동안 transactions 에 대한 쓰기/조회는 대기한다
+
+BEGIN;
+
+LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE;
+
+-- 기존 테이블은 이름을 바꿔 두고 인덱스/기본 키 이름을 새 테이블에 넘긴다
+ALTER TABLE transactions RENAME TO transactions_unpartitioned;
+ALTER TABLE transactions_unpartitioned RENAME CONSTRAINT transactions_pkey TO transactions_unpartitioned_pkey;
+DROP INDEX IF EXISTS idx_transactions_company_id;
+DROP INDEX IF EXISTS idx_transactions_job_id;
+DROP INDEX IF EXISTS idx_transactions_date;
+DROP INDEX IF EXISTS idx_transactions_company_date;
+DROP INDEX IF EXISTS idx_transactions_company_category;
+DROP INDEX IF EXISTS idx_transactions_fingerprint;
+
+-- 기존 시퀀스를 이어 써서 transaction_id 가 겹치지 않도록 한다
+CREATE TABLE transactions
+(
+    transaction_id       BIGINT      NOT NULL DEFAULT nextval('transactions_transaction_id_seq'),
+    job_id               UUID        NOT NULL REFERENCES processing_jobs (job_id) ON DELETE CASCADE,
+    company_id           VARCHAR(50) REFERENCES companies (company_id) ON DELETE SET NULL,
+    category_id          VARCHAR(50) REFERENCES categories (category_id) ON DELETE SET NULL,
+    transaction_date     TIMESTAMP   NOT NULL,
+    description          TEXT        NOT NULL,
+    amount_in            INTEGER   DEFAULT 0,
+    amount_out           INTEGER   DEFAULT 0,
+    balance_after        INTEGER     NOT NULL,
+    transaction_location VARCHAR(200),
+    row_fingerprint      UUID,
+    created_at           TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    deleted_at           TIMESTAMP DEFAULT NULL,
+    PRIMARY KEY (transaction_id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+ALTER SEQUENCE transactions_transaction_id_seq OWNED BY transactions.transaction_id;
+
+CREATE TABLE transactions_default PARTITION OF transactions DEFAULT;
+
+CREATE INDEX idx_transactions_company_id ON transactions (company_id)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX idx_transactions_job_id ON transactions (job_id)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX idx_transactions_date ON transactions (transaction_date)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX idx_transactions_company_date ON transactions (company_id, transaction_date DESC, transaction_id DESC)
+    INCLUDE (category_id, created_at)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX idx_transactions_company_category ON transactions (company_id, category_id)
+    WHERE deleted_at IS NULL;
+
+CREATE UNIQUE INDEX idx_transactions_fingerprint ON transactions (row_fingerprint, transaction_date)
+    WHERE deleted_at IS NULL;
+
+-- init.sql 과 같은 함수
+CREATE OR REPLACE FUNCTION create_transaction_partition(p_month DATE) RETURNS BOOLEAN
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    v_from DATE := date_trunc('month', p_month)::date;
+    v_to   DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    v_name TEXT := 'transactions_' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('create_transaction_partition'));
+
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS)', v_name);
+    EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I CHECK (transaction_date >= %L AND transaction_date < %L)',
+                   v_name, v_name || '_range', v_from, v_to);
+    EXECUTE format('WITH moved AS (DELETE FROM transactions_default
+                                   WHERE transaction_date >= %L AND transaction_date < %L RETURNING *)
+                    INSERT INTO %I SELECT * FROM moved', v_from, v_to, v_name);
+    EXECUTE format('ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   v_name, v_from, v_to);
+
+    RETURN TRUE;
+END;
+$$;
+
+-- 기존 데이터가 있는 월의 파티션을 먼저 만든 뒤 복사 (행이 기본 파티션에 쌓이지 않도록)
+SELECT create_transaction_partition(month)
+FROM (SELECT DISTINCT date_trunc('month', transaction_date)::date AS month FROM transactions_unpartitioned) months
+ORDER BY month;
+
+INSERT INTO transactions (transaction_id, job_id, company_id, category_id, transaction_date, description,
+                          amount_in, amount_out, balance_after, transaction_location, row_fingerprint,
+                          created_at, deleted_at)
+SELECT transaction_id, job_id, company_id, category_id, transaction_date, description,
+       amount_in, amount_out, balance_after, transaction_location, row_fingerprint,
+       created_at, deleted_at
+FROM transactions_unpartitioned;
+
+DROP TABLE transactions_unpartitioned;
+
+COMMIT;
+
+-- index-only scan 이 힙을 확인하지 않도록 가시성 맵 갱신
+VACUUM ANALYZE transactions;
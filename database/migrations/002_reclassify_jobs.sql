@@ -0,0 +1,20 @@
+-- 규칙 변경 재분류 작업 (job_type = 'reclassify') 과 적요 트라이그램 인덱스 추가
+-- 002 이전 init.sql 로 만들어진 DB 에 한 번 적용
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/002_reclassify_jobs.sql
+--
+-- 파티션 테이블의 인덱스는 CONCURRENTLY 로 만들 수 없으므로 인덱스를 만드는 동안 transactions 쓰기는 대기한다
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE processing_jobs
+    ADD COLUMN job_type VARCHAR(20) NOT NULL DEFAULT 'process'
+        CHECK (job_type IN ('process', 'reclassify')),
+    ADD COLUMN base_rules_hash CHAR(64) REFERENCES rules_sets (rules_hash);
+
+CREATE INDEX idx_transactions_description_trgm ON transactions USING gin (lower(description) gin_trgm_ops)
+    WHERE deleted_at IS NULL;
+
+COMMIT;
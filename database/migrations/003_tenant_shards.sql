@@ -0,0 +1,37 @@
+-- 테넌트 샤드: 거래 내역/집계를 company_id 해시로 여러 DB 에 나눠 담기 위한 준비
+-- init.sql 로 만든 모든 샤드 DB(기본 DB 포함)에 샤드 번호와 샤드 수를 주어 한 번씩 적용
+-- (POSTGRES_TENANT_SHARDS 의 순서가 샤드 번호, 기본 DB 가 목록에 없으면 기본 DB 에는 control=true 로 적용)
+--
+--   psql -v ON_ERROR_STOP=1 -v shard_index=0 -v shard_count=2 -v control=true \
+--        -f database/migrations/003_tenant_shards.sql
+--   psql -v ON_ERROR_STOP=1 -v shard_index=1 -v shard_count=2 -v control=false \
+--        -f database/migrations/003_tenant_shards.sql
+--
+-- 재분류로 회사가 바뀐 행은 다른 샤드로 옮겨지므로 transaction_id 가 샤드 사이에서 겹치지 않도록
+-- 시퀀스를 샤드 수 간격으로 바꾸고 기존 id 보다 큰 2^40 + 샤드 번호부터 다시 시작한다
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS tenant_shard_checkpoints
+(
+    job_id           UUID    NOT NULL,
+    shard_no         INTEGER NOT NULL,
+    committed_offset BIGINT  NOT NULL,
+    committed_rows   INTEGER NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMP        DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, shard_no)
+);
+
+SELECT :shard_index + 1099511627776 AS id_start \gset
+ALTER SEQUENCE transactions_transaction_id_seq
+    INCREMENT BY :shard_count
+    RESTART WITH :id_start;
+
+-- 작업(processing_jobs)은 기본 DB 에만 있으므로 다른 샤드에서는 job_id 외래 키를 뺀다
+-- (작업 삭제 시 거래 내역 CASCADE 삭제는 기본 DB 에서만 일어난다)
+SELECT NOT :control AS drop_job_fk \gset
+\if :drop_job_fk
+ALTER TABLE transactions DROP CONSTRAINT IF EXISTS transactions_job_id_fkey;
+\endif
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- 2자 검색어용 적요 바이그램 인덱스 추가
+-- 004 이전 init.sql 로 만들어진 모든 DB(테넌트 샤드 포함)에 한 번 적용
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/004_description_bigram_index.sql
+--
+-- 트라이그램 인덱스는 3자 미만 검색어(예: '쿠팡')에서 트라이그램을 만들 수 없어 쓰이지 않으므로
+-- 적요의 2자 조각 배열에 GIN 인덱스를 만들어 2자 검색어를 인덱스로 찾는다
+-- 파티션 테이블의 인덱스는 CONCURRENTLY 로 만들 수 없으므로 인덱스를 만드는 동안 transactions 쓰기는 대기한다
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION description_bigrams(value TEXT) RETURNS TEXT[]
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+AS $$
+    SELECT coalesce(array_agg(DISTINCT substr(value, i, 2)), '{}')
+    FROM generate_series(1, length(value) - 1) AS i
+$$;
+
+CREATE INDEX idx_transactions_description_bigram ON transactions USING gin (description_bigrams(lower(description)))
+    WHERE deleted_at IS NULL;
+
+COMMIT;
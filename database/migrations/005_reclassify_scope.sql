@@ -0,0 +1,13 @@
+-- 재분류 범위: 요청한 업로드 작업만(source_job_id) 또는 같은 규칙으로 분류된 모든 업로드 작업(source_job_id IS NULL)
+-- 005 이전 init.sql 로 만들어진 DB 에 한 번 적용 (002 이후)
+--
+--   psql -v ON_ERROR_STOP=1 -f database/migrations/005_reclassify_scope.sql
+--
+-- 이미 만들어진 재분류 작업은 source_job_id 가 NULL 이므로 이전과 같이 규칙 단위로 처리된다
+
+BEGIN;
+
+ALTER TABLE processing_jobs
+    ADD COLUMN IF NOT EXISTS source_job_id UUID REFERENCES processing_jobs (job_id);
+
+COMMIT;